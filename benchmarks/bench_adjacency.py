@@ -0,0 +1,79 @@
+"""Benchmark the kernel routines dominated by vertex adjacency queries.
+
+Times loading a closed torus from arrays, which fixes its connectivity, a
+second explicit connectivity fix on the loaded mesh, and filling the holes
+cut into the torus. Each step is timed on its own, after an untimed setup,
+and each timing is the best of several runs.
+
+Run with::
+
+    python benchmarks/bench_adjacency.py --resolution 1000
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+from bench_memory import torus
+
+from pymeshfix import _meshfix
+
+
+def holes(points: np.ndarray, faces: np.ndarray, n_holes: int) -> np.ndarray:
+    """Return ``faces`` without the faces around ``n_holes`` vertices."""
+    rng = np.random.default_rng(0)
+    centers = points[rng.choice(len(points), n_holes, replace=False)]
+    radius = 4 * np.linalg.norm(points[faces[0, 0]] - points[faces[0, 1]])
+    removed = np.zeros(len(faces), dtype=bool)
+    for center in centers:
+        dist = np.linalg.norm(points[faces[:, 0]] - center, axis=1)
+        removed |= dist < radius
+    return faces[~removed]
+
+
+def best_time(func, repeat: int, setup=None) -> float:
+    """Return the shortest time of ``repeat`` calls of ``func`` on a fresh mesh.
+
+    ``setup`` is called on the mesh before ``func`` and is not timed.
+    """
+    times = []
+    for _ in range(repeat):
+        tin = _meshfix.PyTMesh()
+        tin.set_quiet(True)
+        if setup is not None:
+            setup(tin)
+        tstart = time.perf_counter()
+        func(tin)
+        times.append(time.perf_counter() - tstart)
+    return min(times)
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=1000, help="torus resolution")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per timing")
+    args = parser.parse_args()
+
+    points, faces = torus(args.resolution)
+    cut = holes(points, faces, 200)
+
+    def load(tin: _meshfix.PyTMesh) -> None:
+        tin.load_array(points, faces)
+
+    def load_cut(tin: _meshfix.PyTMesh) -> None:
+        tin.load_array(points, cut)
+
+    t_load = best_time(load, args.repeat)
+    t_fix = best_time(lambda tin: tin.fix_connectivity(), args.repeat, setup=load)
+    t_fill = best_time(lambda tin: tin.fill_small_boundaries(), args.repeat, setup=load_cut)
+
+    print(f"{len(faces)} faces, {len(faces) - len(cut)} removed for the holes")
+    print(f"{'load_array':<32}{t_load:>8.3f} s")
+    print(f"{'fix_connectivity':<32}{t_fix:>8.3f} s")
+    print(f"{'fill_small_boundaries':<32}{t_fill:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
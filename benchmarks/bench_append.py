@@ -0,0 +1,132 @@
+"""Benchmark loading a mesh in chunks with ``PyTMesh.append_arrays``.
+
+Builds a closed torus from slabs of rows generated one at a time, as from a
+tiled reconstruction, and compares appending each slab to the mesh with
+concatenating all the slabs first and loading them with
+``PyTMesh.load_array``. Each case runs in a fresh process and reports its
+time and the peak resident set size (RSS) of the whole process.
+
+Concatenation does not weld the points shared by the slabs, so its mesh is
+open along the seams. It is only a baseline for the time and memory.
+
+Run with::
+
+    python benchmarks/bench_append.py --resolution 1000 --chunks 100
+
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+from bench_memory import _max_rss
+
+from pymeshfix import _meshfix
+
+CASES = ["concatenate", "append"]
+
+
+def torus_chunks(resolution: int, n_chunks: int):
+    """Yield the points and faces of slabs of rows of a closed torus.
+
+    Slabs share the points of their boundary rows, with the same
+    coordinates, and together have ``2 * resolution**2`` faces.
+    """
+    bounds = np.linspace(0, resolution, n_chunks + 1).astype(int)
+    for i0, i1 in zip(bounds[:-1], bounds[1:]):
+        rows = np.arange(i0, i1 + 1) % resolution
+        u, v = np.meshgrid(
+            2 * np.pi * rows / resolution,
+            2 * np.pi * np.arange(resolution) / resolution,
+            indexing="ij",
+        )
+        radius = 1 + 0.3 * np.cos(v)
+        points = np.column_stack(
+            (
+                radius.ravel() * np.cos(u.ravel()),
+                radius.ravel() * np.sin(u.ravel()),
+                0.3 * np.sin(v.ravel()),
+            )
+        )
+
+        i, j = np.meshgrid(np.arange(i1 - i0), np.arange(resolution), indexing="ij")
+        a = i * resolution + j
+        b = (i + 1) * resolution + j
+        c = (i + 1) * resolution + (j + 1) % resolution
+        d = i * resolution + (j + 1) % resolution
+        faces = np.vstack(
+            (
+                np.column_stack((a.ravel(), b.ravel(), c.ravel())),
+                np.column_stack((a.ravel(), c.ravel(), d.ravel())),
+            )
+        )
+        yield points, faces.astype(np.int32)
+
+
+def run_case(case: str, resolution: int, n_chunks: int) -> dict:
+    """Run a single case in this process."""
+    tin = _meshfix.PyTMesh()
+    tin.set_quiet(True)
+    tstart = time.perf_counter()
+    if case == "append":
+        for points, faces in torus_chunks(resolution, n_chunks):
+            tin.append_arrays(points, faces)
+        tin.finalize()
+    else:
+        chunks = list(torus_chunks(resolution, n_chunks))
+        offsets = np.cumsum([0] + [len(points) for points, _ in chunks[:-1]])
+        points = np.concatenate([points for points, _ in chunks])
+        faces = np.concatenate([faces + offset for (_, faces), offset in zip(chunks, offsets)])
+        del chunks
+        tin.load_array(points, faces)
+
+    return {
+        "case": case,
+        "n_points": tin.n_points,
+        "n_faces": tin.n_faces,
+        "time": time.perf_counter() - tstart,
+        "peak_rss": _max_rss(),
+    }
+
+
+def main() -> None:
+    """Run all cases in separate processes and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=1000, help="torus resolution")
+    parser.add_argument("--chunks", type=int, default=100, help="number of chunks")
+    parser.add_argument("--case", choices=CASES, help="run a single case in this process")
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.resolution, args.chunks)))
+        return
+
+    print(f"{'case':<16}{'points':>10}{'faces':>10}{'time [s]':>10}{'peak':>12}")
+    for case in CASES:
+        result = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--case",
+                case,
+                "--resolution",
+                str(args.resolution),
+                "--chunks",
+                str(args.chunks),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        record = json.loads(result.stdout)
+        print(
+            f"{record['case']:<16}{record['n_points']:>10}{record['n_faces']:>10}"
+            f"{record['time']:>10.2f}{record['peak_rss'] / 2**20:>8.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
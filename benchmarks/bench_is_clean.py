@@ -0,0 +1,95 @@
+"""Benchmark the inspection of a clean mesh with high valence vertices.
+
+Checks a closed UV sphere, whose two poles are shared by a fan of
+``resolution`` faces, with ``pymeshfix.is_clean`` and compares it with
+``pymeshfix.inspect`` and with repairing the mesh with
+``pymeshfix.clean_from_arrays``. The faces around the poles overlap every
+cell of the intersection index near the poles, so the faces sharing a
+vertex dominate the search for intersections. Each timing is the best of
+several runs.
+
+Run with::
+
+    python benchmarks/bench_is_clean.py --resolution 200 300
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import pymeshfix
+
+
+def uv_sphere(resolution: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the points and faces of a closed UV sphere.
+
+    The sphere has ``resolution`` meridians and parallels, as
+    ``pyvista.Sphere(theta_resolution=resolution, phi_resolution=resolution)``,
+    and ``2 * resolution * (resolution - 2)`` faces.
+    """
+    theta = 2 * np.pi * np.arange(resolution) / resolution
+    phi = np.pi * np.arange(1, resolution - 1) / (resolution - 1)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    points = np.vstack(
+        (
+            [[0, 0, 1], [0, 0, -1]],
+            np.column_stack(
+                (
+                    (np.sin(p) * np.cos(t)).ravel(),
+                    (np.sin(p) * np.sin(t)).ravel(),
+                    np.cos(p).ravel(),
+                )
+            ),
+        )
+    )
+
+    n_rings = resolution - 2
+    i, j = np.meshgrid(np.arange(resolution), np.arange(n_rings - 1), indexing="ij")
+    a = 2 + i * n_rings + j
+    b = 2 + (i + 1) % resolution * n_rings + j
+    quads = np.vstack(
+        (
+            np.column_stack((a.ravel(), b.ravel(), b.ravel() + 1)),
+            np.column_stack((a.ravel(), b.ravel() + 1, a.ravel() + 1)),
+        )
+    )
+    first = 2 + np.arange(resolution) * n_rings
+    last = first + n_rings - 1
+    north = np.column_stack((np.zeros(resolution, int), np.roll(first, -1), first))
+    south = np.column_stack((np.ones(resolution, int), last, np.roll(last, -1)))
+    return points, np.vstack((north, quads, south)).astype(np.int32)
+
+
+def best_time(func, repeat: int) -> float:
+    """Return the shortest time of ``repeat`` calls of ``func``."""
+    times = []
+    for _ in range(repeat):
+        tstart = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - tstart)
+    return min(times)
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--resolution", type=int, nargs="+", default=[200, 300], help="sphere resolutions"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per timing")
+    args = parser.parse_args()
+
+    print(f"{'faces':>10}{'is_clean':>12}{'inspect':>12}{'repair':>12}")
+    for resolution in args.resolution:
+        points, faces = uv_sphere(resolution)
+        assert pymeshfix.is_clean(points, faces)
+        t_check = best_time(lambda: pymeshfix.is_clean(points, faces), args.repeat)
+        t_inspect = best_time(lambda: pymeshfix.inspect(points, faces), args.repeat)
+        t_repair = best_time(lambda: pymeshfix.clean_from_arrays(points, faces), args.repeat)
+        print(f"{len(faces):>10}{t_check:>12.3f}{t_inspect:>12.3f}{t_repair:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark the peak memory usage of exporting repaired meshes to arrays.
+
+Each case runs in a fresh process on a closed torus and reports the peak
+resident set size (RSS) of the whole process, the RSS before the export, the
+peak RSS during the export and the RSS once the export is done.
+
+Run with::
+
+    python benchmarks/bench_memory.py --resolution 1000
+
+RSS values other than the peak of the whole process are read from
+``/proc/self`` and require Linux.
+
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from pymeshfix import _meshfix
+
+CASES = ["export", "export-release", "repair-export", "repair-export-release"]
+
+
+def torus(resolution: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return a closed torus with ``2 * resolution**2`` faces."""
+    u, v = np.meshgrid(
+        np.linspace(0, 2 * np.pi, resolution, endpoint=False),
+        np.linspace(0, 2 * np.pi, resolution, endpoint=False),
+        indexing="ij",
+    )
+    radius = 1 + 0.3 * np.cos(v)
+    points = np.column_stack(
+        (
+            radius.ravel() * np.cos(u.ravel()),
+            radius.ravel() * np.sin(u.ravel()),
+            0.3 * np.sin(v.ravel()),
+        )
+    )
+
+    i, j = np.meshgrid(np.arange(resolution), np.arange(resolution), indexing="ij")
+    a = i * resolution + j
+    b = ((i + 1) % resolution) * resolution + j
+    c = ((i + 1) % resolution) * resolution + (j + 1) % resolution
+    d = i * resolution + (j + 1) % resolution
+    faces = np.vstack(
+        (
+            np.column_stack((a.ravel(), b.ravel(), c.ravel())),
+            np.column_stack((a.ravel(), c.ravel(), d.ravel())),
+        )
+    )
+    return points, faces.astype(np.int32)
+
+
+def _read_status(key: str) -> int | None:
+    """Return a ``/proc/self/status`` entry in bytes, if available."""
+    try:
+        with open("/proc/self/status") as fid:
+            for line in fid:
+                if line.startswith(key):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as fid:
+            fid.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _max_rss() -> int:
+    """Return the peak RSS of this process in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def run_case(case: str, resolution: int) -> dict:
+    """Run a single case in this process."""
+    points, faces = torus(resolution)
+    tin = _meshfix.PyTMesh()
+    tin.set_quiet(True)
+    # the input arrays stay alive like in clean_from_arrays
+    tin.load_array(points, faces)
+    if case.startswith("repair"):
+        tin.clean()
+
+    rss_before = _read_status("VmRSS:")
+    can_reset = _reset_peak_rss()
+    tstart = time.perf_counter()
+    arrays = tin.return_arrays(release=case.endswith("release"))
+    elapsed = time.perf_counter() - tstart
+
+    record = {
+        "case": case,
+        "n_faces": int(arrays[1].shape[0]),
+        "time_export": elapsed,
+        "peak_rss": _max_rss(),
+        "rss_before": rss_before,
+        "export_peak_rss": _read_status("VmHWM:") if can_reset else None,
+        "rss_after": _read_status("VmRSS:"),
+    }
+    return record
+
+
+def main() -> None:
+    """Run all cases in separate processes and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=1000, help="torus resolution")
+    parser.add_argument("--case", choices=CASES, help="run a single case in this process")
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.resolution)))
+        return
+
+    records = []
+    for case in CASES:
+        result = subprocess.run(
+            [sys.executable, __file__, "--case", case, "--resolution", str(args.resolution)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        records.append(json.loads(result.stdout))
+
+    def mib(nbytes: int | None) -> str:
+        return "n/a" if nbytes is None else f"{nbytes / 2**20:.0f} MiB"
+
+    columns = ["faces", "export [s]", "peak", "before", "export peak", "after"]
+    print(f"{'case':<24}" + "".join(f"{column:>13}" for column in columns))
+    for record in records:
+        values = [
+            str(record["n_faces"]),
+            f"{record['time_export']:.2f}",
+            mib(record["peak_rss"]),
+            mib(record["rss_before"]),
+            mib(record["export_peak_rss"]),
+            mib(record["rss_after"]),
+        ]
+        print(f"{record['case']:<24}" + "".join(f"{value:>13}" for value in values))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark the spatial reordering of the elements of a mesh.
+
+Loads a closed torus whose points and faces are shuffled, as after hole
+filling and repairs which append new elements out of order, and compares
+the mesh as loaded with the mesh sorted along a Morton and a Hilbert curve.
+Times ``PyTMesh.reorder``, ``PyTMesh.clean``, which is dominated by the
+detection of intersections, and a downstream traversal of the exported
+arrays computing the point normals. The mean index distance between the
+points of a face measures the locality of the exported faces. Each timing
+is the best of several runs.
+
+Run with::
+
+    python benchmarks/bench_reorder.py --resolution 1000
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+from bench_memory import torus
+
+from pymeshfix import _meshfix
+
+
+def point_normals(points: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Return the area weighted normals of the points."""
+    tri = points[faces]
+    face_normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    normals = np.zeros_like(points)
+    for k in range(3):
+        for axis in range(3):
+            normals[:, axis] += np.bincount(
+                faces[:, k], weights=face_normals[:, axis], minlength=len(points)
+            )
+    return normals
+
+
+def best_time(func, repeat: int, setup=None) -> float:
+    """Return the shortest time of ``repeat`` calls of ``func``.
+
+    ``func`` is called with the result of ``setup``, which is not timed.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        tstart = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - tstart)
+    return min(times)
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=1000, help="torus resolution")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per timing")
+    args = parser.parse_args()
+
+    points, faces = torus(args.resolution)
+    rng = np.random.default_rng(0)
+    perm = rng.permutation(len(points))
+    points = points[perm]
+    faces = np.argsort(perm).astype(np.int32)[faces][rng.permutation(len(faces))]
+    print(f"{len(faces)} faces, shuffled")
+    print(f"{'method':<10}{'reorder':>10}{'clean':>10}{'normals':>10}{'face span':>12}")
+
+    def load() -> _meshfix.PyTMesh:
+        tin = _meshfix.PyTMesh()
+        tin.set_quiet(True)
+        tin.load_array(points, faces)
+        return tin
+
+    for method in (None, "morton", "hilbert"):
+
+        def load_sorted() -> _meshfix.PyTMesh:
+            tin = load()
+            if method is not None:
+                tin.reorder(method)
+            return tin
+
+        t_reorder = 0.0
+        if method is not None:
+            t_reorder = best_time(lambda tin: tin.reorder(method), args.repeat, setup=load)
+        t_clean = best_time(lambda tin: tin.clean(1, 1), args.repeat, setup=load_sorted)
+
+        v, f = load_sorted().return_arrays()
+        t_normals = best_time(lambda _: point_normals(v, f), args.repeat)
+        span = np.abs(np.diff(f, axis=1, append=f[:, :1])).mean()
+        print(
+            f"{method or 'none':<10}{t_reorder:>10.3f}{t_clean:>10.3f}"
+            f"{t_normals:>10.3f}{span:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark welding the vertices of a triangle soup.
+
+Writes a closed torus to a binary STL file, which stores each triangle with
+its own vertices, and times loading it. Loading welds the coincident
+vertices, by sorting the vertices by their coordinates, and rebuilds the
+connectivity of the mesh. The timing is the best of several runs.
+
+Run with::
+
+    python benchmarks/bench_weld.py --resolution 700
+
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from bench_memory import torus
+
+from pymeshfix import _meshfix
+
+STL_DTYPE = np.dtype([("normal", "<f4", 3), ("points", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+def write_stl(filename: str, points: np.ndarray, faces: np.ndarray) -> None:
+    """Write the triangles of ``faces`` to a binary STL file."""
+    records = np.zeros(len(faces), dtype=STL_DTYPE)
+    records["points"] = points[faces]
+    with open(filename, "wb") as f:
+        f.write(bytes(80))
+        f.write(np.uint32(len(faces)).tobytes())
+        records.tofile(f)
+
+
+def main() -> None:
+    """Run the benchmark and print the timing."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=int, default=1000, help="torus resolution")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs")
+    args = parser.parse_args()
+
+    points, faces = torus(args.resolution)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "torus.stl")
+        write_stl(filename, points, faces)
+
+        times = []
+        for _ in range(args.repeat):
+            tin = _meshfix.PyTMesh()
+            tin.set_quiet(True)
+            tstart = time.perf_counter()
+            tin.load_file(filename)
+            times.append(time.perf_counter() - tstart)
+
+    print(f"{len(faces)} faces, {3 * len(faces)} vertices welded to {tin.n_points}")
+    print(f"{'load_file (STL)':<32}{min(times):>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
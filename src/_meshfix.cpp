@@ -1,14 +1,35 @@
 // Python interface to meshfix via nanobind.
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
 #include <cstring>
 #include <iostream>
+#include <limits>
+#include <memory>
+#include <numeric>
 #include <stdexcept>
+#include <string>
+#include <vector>
 
 #include <nanobind/nanobind.h>
 #include <nanobind/ndarray.h>
+#include <nanobind/stl/array.h>
+#include <nanobind/stl/optional.h>
 #include <nanobind/stl/string.h>
+#include <nanobind/stl/variant.h>
 #include <nanobind/stl/vector.h>
 
 #include "array_support.h"
+#include "decimation.h"
+#include "detectIntersections.h"
+#include "localRepair.h"
+#include "meshAppend.h"
+#include "meshInspection.h"
+#include "meshIntersection.h"
+#include "spatialOrder.h"
 #include "tmesh.h"
 
 using namespace T_MESH;
@@ -91,7 +112,7 @@ bool joinClosestComponents(Basic_TMesh *tin) {
     bloops_array = (List **)boundary_loops.toArray();
     numloops = boundary_loops.numels();
 
-    int numtris = tin->T.numels();
+    int64_t numtris = tin->T.numels();
     double adist, mindist = DBL_MAX;
 
     gv = NULL;
@@ -120,6 +141,411 @@ bool joinClosestComponents(Basic_TMesh *tin) {
     return (gv != NULL);
 }
 
+// Throw if the refinement parameters of hole patches are invalid.
+void checkPatchRefinement(
+    int64_t max_new_triangles, double target_edge_length, double density_scale) {
+    if (max_new_triangles < 0) {
+        throw std::invalid_argument("max_new_triangles must not be negative");
+    }
+    if (target_edge_length < 0) {
+        throw std::invalid_argument("target_edge_length must not be negative");
+    }
+    if (!(density_scale > 0)) {
+        throw std::invalid_argument("density_scale must be positive");
+    }
+}
+
+// Number of faces left by decimating a mesh of 'n_faces' faces to
+// 'target_faces' or by the fraction 'target_reduction' of its faces. Throw
+// unless exactly one of them is given and valid.
+int64_t decimationTarget(
+    int64_t n_faces,
+    std::optional<int64_t> target_faces,
+    std::optional<double> target_reduction) {
+    if (target_faces.has_value() == target_reduction.has_value()) {
+        throw std::invalid_argument(
+            "Exactly one of target_faces and target_reduction must be given");
+    }
+    if (target_faces) {
+        if (*target_faces < 0) {
+            throw std::invalid_argument("target_faces must not be negative");
+        }
+        return *target_faces;
+    }
+    if (!(*target_reduction >= 0 && *target_reduction < 1)) {
+        throw std::invalid_argument("target_reduction must be in [0, 1)");
+    }
+    return (int64_t)std::ceil(n_faces * (1 - *target_reduction));
+}
+
+// Convert 'tris_per_cell' given as a positive integer or "auto" to the
+// value expected by selectIntersectingTriangles(), where 0 is automatic.
+UINT16 trisPerCell(const std::variant<int, std::string> &tris_per_cell) {
+    if (std::holds_alternative<std::string>(tris_per_cell)) {
+        if (std::get<std::string>(tris_per_cell) != "auto") {
+            throw std::invalid_argument("tris_per_cell must be a positive integer or 'auto'");
+        }
+        return 0;
+    }
+    int value = std::get<int>(tris_per_cell);
+    if (value < 1 || value > UINT16_MAX) {
+        throw std::invalid_argument("tris_per_cell must be between 1 and 65535 or 'auto'");
+    }
+    return (UINT16)value;
+}
+
+// Convert the name of a space-filling curve to the curve.
+SpaceFillingCurve curveMethod(const std::string &method) {
+    if (method == "morton") {
+        return SpaceFillingCurve::Morton;
+    }
+    if (method == "hilbert") {
+        return SpaceFillingCurve::Hilbert;
+    }
+    throw std::invalid_argument("method must be 'morton' or 'hilbert'");
+}
+
+// Raised as MemoryError when an operation would exceed the memory limit of
+// a mesh.
+class MemoryLimitError : public std::runtime_error {
+  public:
+    using std::runtime_error::runtime_error;
+};
+
+// Estimated bytes taken by a heap allocation of 'size' bytes, including the
+// header and the alignment of the allocator.
+size_t heapBytes(size_t size) { return std::max<size_t>(32, (size + 8 + 15) & ~(size_t)15); }
+
+// Estimated memory of a Basic_TMesh in bytes. 'buffers' holds the temporary
+// memory needed on top of the mesh at the peak of an operation.
+struct MemoryEstimate {
+    size_t vertices = 0, edges = 0, triangles = 0, list_nodes = 0, buffers = 0;
+
+    MemoryEstimate(size_t nv, size_t ne, size_t nt) {
+        vertices = nv * heapBytes(sizeof(Vertex));
+        edges = ne * heapBytes(sizeof(Edge));
+        triangles = nt * heapBytes(sizeof(Triangle));
+        list_nodes = (nv + ne + nt) * heapBytes(sizeof(Node));
+        // the cells of the intersection detection list each triangle up to
+        // DI_AUTO_MAX_DUPLICATION times
+        buffers = DI_AUTO_MAX_DUPLICATION * nt * heapBytes(sizeof(Node));
+    }
+
+    size_t total() const { return vertices + edges + triangles + list_nodes; }
+
+    nb::dict dict() const {
+        nb::dict d;
+        d["vertices"] = vertices;
+        d["edges"] = edges;
+        d["triangles"] = triangles;
+        d["list_nodes"] = list_nodes;
+        d["buffers"] = buffers;
+        d["total"] = total();
+        d["peak"] = total() + buffers;
+        return d;
+    }
+};
+
+// Number of edges of a mesh with 'nt' triangles, as each interior edge is
+// shared by two of them.
+size_t estimatedEdges(size_t nt) { return (3 * nt + 1) / 2; }
+
+// Temporary memory used while loading 'nv' points, the indexed vertices and
+// the lists of their edges.
+size_t loadBuffers(size_t nv, size_t ne) {
+    return nv * (sizeof(ExtVertex *) + heapBytes(sizeof(ExtVertex))) +
+           2 * ne * heapBytes(sizeof(Node));
+}
+
+std::string formatBytes(size_t bytes) {
+    char buf[32];
+    std::snprintf(buf, sizeof(buf), "%.1f MB", bytes / 1e6);
+    return buf;
+}
+
+// Estimate the memory needed to load and repair a mesh given as arrays of
+// 'n_points' and 'n_faces', adding 'new_faces' faces.
+nb::dict estimate_memory(int64_t n_points, int64_t n_faces, int64_t new_faces) {
+    if (n_points < 0 || n_faces < 0 || new_faces < 0) {
+        throw std::invalid_argument("The numbers of points and faces must not be negative");
+    }
+    // each new vertex splits a triangle into three
+    size_t nv = n_points + new_faces / 2, nt = n_faces + new_faces;
+    MemoryEstimate estimate(nv, estimatedEdges(nt), nt);
+
+    size_t ne0 = estimatedEdges(n_faces);
+    MemoryEstimate loaded(n_points, ne0, n_faces);
+    size_t load_peak = loaded.total() + loadBuffers(n_points, ne0);
+    if (load_peak > estimate.total() + estimate.buffers) {
+        estimate.buffers = load_peak - estimate.total();
+    }
+    return estimate.dict();
+}
+
+// A stage of a repair pipeline and its parameters. Only the parameters
+// listed for each stage in 'stageParameters' are used.
+struct RepairStage {
+    std::string name;
+    int max_iters = 10;
+    int inner_loops = 3;
+    int64_t n_edges = 0;
+    bool refine = true;
+    int64_t max_new_triangles = 0;
+    double target_edge_length = 0.0;
+    double density_scale = 1.0;
+    bool refill = false;
+    double time_limit = 0.0; // seconds, no limit if not positive
+    UINT16 tris_per_cell = 50;
+    std::optional<int64_t> target_faces;
+    std::optional<double> target_reduction;
+    std::string method = "morton";
+};
+
+// Outcome of a stage. 'result' is a count, or 0/1 for the cleaning stages.
+struct StageReport {
+    int64_t result = 0;
+    double time = 0.0;
+    bool timed_out = false;
+};
+
+// Return the parameters accepted by a stage, or throw for unknown stages.
+const std::vector<std::string> &stageParameters(const std::string &name) {
+    static const std::vector<std::pair<std::string, std::vector<std::string>>> stages = {
+        {"remove_components", {}},
+        {"join_components", {}},
+        {"fill_holes",
+         {"n_edges", "refine", "max_new_triangles", "target_edge_length", "density_scale"}},
+        {"clean", {"max_iters", "inner_loops", "time_limit", "refill", "tris_per_cell"}},
+        {"degeneracy_removal", {"max_iters"}},
+        {"intersection_removal", {"max_iters", "tris_per_cell"}},
+        {"decimate", {"target_faces", "target_reduction"}},
+        {"reorder", {"method"}},
+    };
+    for (const auto &stage : stages) {
+        if (stage.first == name) {
+            return stage.second;
+        }
+    }
+    throw std::invalid_argument("Unknown repair stage '" + name + "'");
+}
+
+// Whether a stage reports a 0/1 success flag rather than a count.
+bool isCleaningStage(const std::string &name) {
+    return name == "clean" || name == "degeneracy_removal" || name == "intersection_removal";
+}
+
+// Parse a stage given as a dict with a "stage" name and its parameters.
+RepairStage parseRepairStage(const nb::dict &spec) {
+    if (!spec.contains("stage")) {
+        throw std::invalid_argument("Each repair stage requires a 'stage' name");
+    }
+
+    RepairStage stage;
+    stage.name = nb::cast<std::string>(spec["stage"]);
+    const std::vector<std::string> &allowed = stageParameters(stage.name);
+    if (stage.name == "degeneracy_removal" || stage.name == "intersection_removal") {
+        stage.max_iters = 3;
+    }
+
+    for (auto [key, value] : spec) {
+        std::string param = nb::cast<std::string>(key);
+        if (param == "stage") {
+            continue;
+        }
+        if (std::find(allowed.begin(), allowed.end(), param) == allowed.end()) {
+            throw std::invalid_argument(
+                "Invalid parameter '" + param + "' for repair stage '" + stage.name + "'");
+        }
+        if (param == "max_iters") {
+            stage.max_iters = nb::cast<int>(value);
+        } else if (param == "inner_loops") {
+            stage.inner_loops = nb::cast<int>(value);
+        } else if (param == "n_edges") {
+            stage.n_edges = nb::cast<int64_t>(value);
+        } else if (param == "refine") {
+            stage.refine = nb::cast<bool>(value);
+        } else if (param == "max_new_triangles") {
+            stage.max_new_triangles = nb::cast<int64_t>(value);
+        } else if (param == "target_edge_length") {
+            stage.target_edge_length = nb::cast<double>(value);
+        } else if (param == "density_scale") {
+            stage.density_scale = nb::cast<double>(value);
+        } else if (param == "refill") {
+            stage.refill = nb::cast<bool>(value);
+        } else if (param == "time_limit") {
+            stage.time_limit = nb::cast<double>(value);
+        } else if (param == "tris_per_cell") {
+            stage.tris_per_cell =
+                trisPerCell(nb::cast<std::variant<int, std::string>>(value));
+        } else if (param == "target_faces") {
+            stage.target_faces = nb::cast<int64_t>(value);
+        } else if (param == "target_reduction") {
+            stage.target_reduction = nb::cast<double>(value);
+        } else if (param == "method") {
+            stage.method = nb::cast<std::string>(value);
+        }
+    }
+    checkPatchRefinement(
+        stage.max_new_triangles, stage.target_edge_length, stage.density_scale);
+    if (stage.name == "decimate") {
+        decimationTarget(0, stage.target_faces, stage.target_reduction);
+    }
+    curveMethod(stage.method);
+    return stage;
+}
+
+// Set the quiet state of the kernel messages of this thread, which is
+// thread local, and restore it at the end of the scope.
+class QuietScope {
+  public:
+    explicit QuietScope(bool quiet) : previous(TMesh::quiet) { TMesh::quiet = quiet; }
+    ~QuietScope() { TMesh::quiet = previous; }
+
+    QuietScope(const QuietScope &) = delete;
+    QuietScope &operator=(const QuietScope &) = delete;
+
+  private:
+    bool previous;
+};
+
+// Value of the coordinate 'x' after Basic_TMesh::coordBackApproximation(),
+// which rounds the coordinates to the single precision decimals printed by
+// "%f" during the repair.
+double backApproximated(double x) {
+    char buf[64];
+    std::snprintf(buf, sizeof(buf), "%f", (float)x);
+    return std::strtof(buf, NULL);
+}
+
+// True if the coordinate 'x' of a vertex is the input coordinate 'p', or
+// only differs from it by the rounding of the repair.
+bool sameCoordinate(coord x, double p) {
+    return x == p || TMESH_TO_DOUBLE(x) == backApproximated(p);
+}
+
+// Whether 'fan' has the elements of 'list' in the same order. 'list' is
+// deleted.
+template <typename T> bool sameFan(List *list, const VertexFan<T> &fan) {
+    bool same = list->numels() == fan.numels();
+    Node *n = list->head();
+    for (int i = 0; same && i < fan.numels(); i++, n = n->next()) {
+        same = n->data == fan[i];
+    }
+    delete list;
+    return same;
+}
+
+// Throw if 'faces' does not index triangles of 'points'.
+template <typename I>
+void checkMeshArrays(
+    const NDArray<const double, 2> &points, const NDArray<const I, 2> &faces) {
+    if (points.shape(1) != 3) {
+        throw std::invalid_argument("Point array must have shape (N,3)");
+    }
+    if (faces.shape(1) != 3) {
+        throw std::invalid_argument("Face array must have shape (M,3)");
+    }
+    const size_t nv = points.shape(0);
+    const I *f = faces.data();
+    for (size_t i = 0; i < 3 * faces.shape(0); ++i) {
+        if (f[i] < 0 || (size_t)f[i] >= nv) {
+            throw std::invalid_argument("Face indices must be within the point array");
+        }
+    }
+}
+
+// Cast 'out' to an output array of 'n' rows of 3 values of type T. Return
+// false if 'out' is not a writable C-contiguous 2D array of type T, and throw
+// if it has the wrong shape.
+template <typename T>
+bool outputArray(nb::handle out, size_t n, const char *name, NDArray<T, 2> &arr) {
+    if (!nb::try_cast(out, arr, false)) {
+        return false;
+    }
+    if (arr.shape(0) != n || arr.shape(1) != 3) {
+        throw std::invalid_argument(
+            std::string(name) + " has shape (" + std::to_string(arr.shape(0)) + ", " +
+            std::to_string(arr.shape(1)) + "), expected (" + std::to_string(n) + ", 3)");
+    }
+    return true;
+}
+
+// Whether the faces of a mesh of 'nv' points are indexed by int64, as asked
+// by 'int64' or else when int32 is too small. Throw if int32 is asked for
+// but is too small.
+bool int64Indices(size_t nv, std::optional<bool> int64) {
+    bool too_large = nv > INT32_MAX;
+    if (int64.value_or(too_large)) {
+        return true;
+    }
+    if (too_large) {
+        throw std::overflow_error("The mesh has too many points for int32 face indices");
+    }
+    return false;
+}
+
+// Arrays the points and faces of a mesh are written to. Only the faces array
+// of the index type is set.
+struct OutputArrays {
+    NDArray<double, 2> points;
+    NDArray<int32_t, 2> faces32;
+    NDArray<int64_t, 2> faces64;
+    bool int64;
+    nb::object out_points, out_faces;
+
+    // Return the arrays, as the caller's objects where given.
+    nb::tuple result() {
+        nb::object p = out_points.is_none() ? nb::cast(points) : out_points;
+        nb::object f = out_faces;
+        if (f.is_none()) {
+            f = int64 ? nb::cast(faces64) : nb::cast(faces32);
+        }
+        return nb::make_tuple(p, f);
+    }
+};
+
+// Return the arrays for 'nv' points and 'nt' faces, see
+// PyTMesh::return_arrays(). 'out_points' and 'out_faces' are used if given,
+// and the others are allocated.
+OutputArrays outputArrays(
+    size_t nv,
+    size_t nt,
+    std::optional<bool> int64,
+    nb::object out_points,
+    nb::object out_faces) {
+    OutputArrays arrays;
+    arrays.out_points = out_points;
+    arrays.out_faces = out_faces;
+
+    if (out_points.is_none()) {
+        arrays.points = MakeNDArray<double, 2>({nv, 3});
+    } else if (!outputArray(out_points, nv, "out_points", arrays.points)) {
+        throw std::invalid_argument(
+            "out_points must be a writable C-contiguous float64 array");
+    }
+
+    if (out_faces.is_none()) {
+        arrays.int64 = int64Indices(nv, int64);
+        if (arrays.int64) {
+            arrays.faces64 = MakeNDArray<int64_t, 2>({nt, 3});
+        } else {
+            arrays.faces32 = MakeNDArray<int32_t, 2>({nt, 3});
+        }
+        return arrays;
+    }
+
+    arrays.int64 = !outputArray(out_faces, nt, "out_faces", arrays.faces32);
+    if (arrays.int64 && !outputArray(out_faces, nt, "out_faces", arrays.faces64)) {
+        throw std::invalid_argument(
+            "out_faces must be a writable C-contiguous int32 or int64 array");
+    }
+    if (int64.has_value() && *int64 != arrays.int64) {
+        throw std::invalid_argument("int64 does not match the type of out_faces");
+    }
+    int64Indices(nv, arrays.int64);
+    return arrays;
+}
+
 class PyTMesh : public Basic_TMesh {
 
   public:
@@ -128,16 +554,30 @@ class PyTMesh : public Basic_TMesh {
     PyTMesh() { tmesh = T_MESH::Basic_TMesh(); }
 
     void load_file(std::string filename_str) {
-        if (V.numels()) {
+        if (V.numels() || appender) {
             throw std::runtime_error(
                 "Cannot load a mesh after points have already been loaded");
         }
 
+        QuietScope scope(quiet);
         const char *filename = filename_str.c_str();
         int ret = load(filename);
         if (ret) {
             throw std::runtime_error("Failed to load mesh file");
         }
+        set_origins();
+    }
+
+    // Record the index of each element as loaded so that the input elements
+    // can be traced through the repair.
+    void set_origins() {
+        Node *n;
+        Vertex *v;
+        Triangle *t;
+        int64_t i = 0;
+        FOREACHVERTEX(v, n) v->origin = i++;
+        i = 0;
+        FOREACHTRIANGLE(t, n) t->origin = i++;
     }
 
     // Save cleaned mesh to file
@@ -157,6 +597,7 @@ class PyTMesh : public Basic_TMesh {
     // coherence is necessary between in-memory and saved data.
     // A non-zero return value is returned if errors occur.
     void save_file(std::string filename_str, bool back_approx = false) {
+        QuietScope scope = use();
         if (!V.numels()) {
             throw std::runtime_error("This mesh contains no points");
         }
@@ -168,10 +609,11 @@ class PyTMesh : public Basic_TMesh {
         }
     }
 
-    void load_array(
-        const NDArray<const double, 2> point_arr, const NDArray<const int, 2> face_arr) {
+    template <typename I>
+    void
+    load_array(const NDArray<const double, 2> point_arr, const NDArray<const I, 2> face_arr) {
 
-        if (V.numels()) {
+        if (V.numels() || appender) {
             throw std::runtime_error(
                 "Cannot load arrays after arrays have already been loaded");
         }
@@ -185,13 +627,26 @@ class PyTMesh : public Basic_TMesh {
 
         const size_t nv = point_arr.shape(0);
         const size_t nt = face_arr.shape(0);
+        if (memory_limit) {
+            const size_t ne = estimatedEdges(nt);
+            size_t needed = MemoryEstimate(nv, ne, nt).total() + loadBuffers(nv, ne);
+            if (needed > (size_t)*memory_limit) {
+                throw MemoryLimitError(
+                    "Loading the mesh needs about " + formatBytes(needed) +
+                    ", above the memory limit of " + formatBytes(*memory_limit));
+            }
+        }
+        QuietScope scope(quiet);
+        nb::gil_scoped_release release;
 
         // Load vertices
         for (size_t i = 0; i < nv; ++i) {
             double x = point_arr(i, 0);
             double y = point_arr(i, 1);
             double z = point_arr(i, 2);
-            V.appendTail(newVertex(x, y, z));
+            Vertex *v = newVertex(x, y, z);
+            v->origin = (int64_t)i;
+            V.appendTail(v);
         }
 
         // Create ExtVertex array for indexed triangles
@@ -204,24 +659,27 @@ class PyTMesh : public Basic_TMesh {
         // Load faces
         TMesh::begin_progress();
         for (size_t i = 0; i < nt; ++i) {
-            const int *f = &face_arr(i, 0);
+            const I *f = &face_arr(i, 0);
             int i4 = face_arr.shape(1); // number of indices in this face
             if (i4 < 3) {
-                TMesh::warning("Face %d has fewer than 3 vertices. Skipping.", i);
+                TMesh::warning("Face %zu has fewer than 3 vertices. Skipping.", i);
                 continue;
             }
 
-            int i1 = f[0];
-            int i2 = f[1];
-            int i3;
+            int64_t i1 = f[0];
+            int64_t i2 = f[1];
+            int64_t i3;
 
             for (int j = 2; j < i4; ++j) {
                 i3 = f[j];
 
+                Triangle *t = NULL;
                 if (i1 == i2 || i2 == i3 || i3 == i1) {
-                    TMesh::warning("Coincident indices at triangle %d. Skipping.", i);
-                } else if (!CreateIndexedTriangle(var, i1, i2, i3)) {
-                    TMesh::warning("Failed to create triangle at face %d. Skipping.", i);
+                    TMesh::warning("Coincident indices at triangle %zu. Skipping.", i);
+                } else if ((t = CreateIndexedTriangle(var, i1, i2, i3)) == NULL) {
+                    TMesh::warning("Failed to create triangle at face %zu. Skipping.", i);
+                } else {
+                    t->origin = (int64_t)i;
                 }
 
                 i2 = i3;
@@ -233,130 +691,681 @@ class PyTMesh : public Basic_TMesh {
         }
         TMesh::end_progress();
 
+        for (size_t i = 0; i < nv; ++i) {
+            delete var[i];
+        }
+        free(var);
+
         // Optional connectivity fix
         fixConnectivity();
         eulerUpdate();
     }
 
-    void fix_connectivity() { fixConnectivity(); }
+    // Append a chunk of points and faces to the mesh, welding its points to
+    // the points of the previous chunks, see MeshAppender. The connectivity
+    // is only fixed by finalize(). Returns the number of welded points.
+    template <typename I>
+    size_t append_arrays(
+        const NDArray<const double, 2> point_arr,
+        const NDArray<const I, 2> face_arr,
+        std::optional<double> weld_tol) {
+        if (V.numels() && !appender) {
+            throw std::runtime_error(
+                "Cannot append arrays to a mesh that is loaded or finalized");
+        }
+        checkMeshArrays(point_arr, face_arr);
+        const double tol = weld_tol.value_or(0.0);
+        if (!(tol >= 0 && std::isfinite(tol))) {
+            throw std::invalid_argument("weld_tol must be a non-negative number");
+        }
+
+        const size_t nv = point_arr.shape(0);
+        const size_t nt = face_arr.shape(0);
+        if (memory_limit) {
+            const size_t total_nv = V.numels() + nv;
+            const size_t total_nt = T.numels() + nt;
+            const size_t ne = estimatedEdges(total_nt);
+            size_t needed =
+                MemoryEstimate(total_nv, ne, total_nt).total() + loadBuffers(total_nv, ne);
+            if (needed > (size_t)*memory_limit) {
+                throw MemoryLimitError(
+                    "Appending the arrays needs about " + formatBytes(needed) +
+                    ", above the memory limit of " + formatBytes(*memory_limit));
+            }
+        }
+        if (!appender) {
+            appender = std::make_unique<MeshAppender>(this);
+        }
+        QuietScope scope(quiet);
+        nb::gil_scoped_release release;
+
+        std::vector<int64_t> index(nv);
+        size_t n_welded = appender->addPoints(point_arr.data(), nv, tol, index.data());
+        appender->addTriangles(face_arr.data(), nt, index.data());
+        return n_welded;
+    }
+
+    // Fix the connectivity of a mesh built with append_arrays().
+    void finalize() {
+        if (!appender) {
+            throw std::runtime_error("No arrays have been appended");
+        }
+        QuietScope scope(quiet);
+        nb::gil_scoped_release release;
+        appender->finish();
+        appender.reset();
+    }
+
+    void fix_connectivity() {
+        QuietScope scope = use();
+        fixConnectivity();
+    }
+
+    // Estimated memory of the mesh in bytes by category.
+    nb::dict memory_usage() {
+        return MemoryEstimate(V.numels(), E.numels(), T.numels()).dict();
+    }
+
+    std::optional<int64_t> get_memory_limit() const { return memory_limit; }
+
+    // Limit the estimated peak memory of the mesh to 'limit' bytes. Loading
+    // arrays beyond it fails, and hole filling stops at the number of
+    // triangles whose peak memory fits.
+    void set_memory_limit(std::optional<int64_t> limit) {
+        if (limit && *limit <= 0) {
+            throw std::invalid_argument("memory_limit must be positive");
+        }
+        memory_limit = limit;
+        max_triangles = 0;
+        if (limit) {
+            // each new vertex adds two triangles and three edges
+            MemoryEstimate pair(1, 3, 2);
+            max_triangles = std::max<int64_t>(1, 2 * *limit / (pair.total() + pair.buffers));
+        }
+    }
 
     // Return the number of faces in mesh
-    int n_faces() { return T.numels(); }
-    int n_points() { return V.numels(); }
+    int64_t n_faces() { return T.numels(); }
+    int64_t n_points() { return V.numels(); }
 
-    // Enable/disable console print out
-    void set_quiet(int quiet) { TMesh::quiet = quiet; }
+    // Enable/disable console print out of the methods of this mesh
+    void set_quiet(int quiet) { this->quiet = quiet; }
 
     // Joins multiple open components
     void join_closest_components() {
+        QuietScope scope = use();
         TMesh::begin_progress();
         while (joinClosestComponents(this))
             TMesh::report_progress("Num. components: %d       ", this->shells());
         TMesh::end_progress();
         this->deselectTriangles();
+        checkMemoryLimit();
+    }
+
+    // Return points and faces arrays.
+    //
+    // If 'release' is set, the vertices, edges and triangles are deleted as
+    // they are written so that the mesh and the arrays are never both
+    // entirely in memory. The mesh is left empty.
+    //
+    // The arrays are written to 'out_points' and 'out_faces' when given,
+    // which are returned as is. They must be writable C-contiguous arrays of
+    // the shapes of output_shape(), and the type of 'out_faces' sets the type
+    // of the indices. Both are checked before anything is written.
+    //
+    // If 'reorder' is set, the mesh is first sorted along the space-filling
+    // curve it names, or a Morton curve if it is true, see reorder().
+    nb::tuple return_arrays(
+        std::optional<bool> int64 = std::nullopt,
+        bool release = false,
+        nb::object out_points = nb::none(),
+        nb::object out_faces = nb::none(),
+        const std::variant<bool, std::string> &reorder = false) {
+        QuietScope scope = use();
+        OutputArrays arrays =
+            outputArrays(V.numels(), T.numels(), int64, out_points, out_faces);
+        if (std::holds_alternative<std::string>(reorder)) {
+            spatialReorder(this, curveMethod(std::get<std::string>(reorder)));
+        } else if (std::get<bool>(reorder)) {
+            spatialReorder(this, SpaceFillingCurve::Morton);
+        }
+        if (release) {
+            // faces first, as they need the vertices to be indexed
+            if (arrays.int64) {
+                releaseFaces(arrays.faces64.data());
+            } else {
+                releaseFaces(arrays.faces32.data());
+            }
+            releasePoints(arrays.points.data());
+        } else {
+            writePoints(arrays.points.data());
+            if (arrays.int64) {
+                writeFaces(arrays.faces64.data());
+            } else {
+                writeFaces(arrays.faces32.data());
+            }
+        }
+        return arrays.result();
+    }
+
+    // Return the shapes of the points and faces arrays of return_arrays().
+    nb::tuple output_shape() {
+        QuietScope scope = use();
+        return nb::make_tuple(nb::make_tuple(V.numels(), 3), nb::make_tuple(T.numels(), 3));
+    }
+
+    NDArray<double, 2> return_points() {
+        QuietScope scope = use();
+        NDArray<double, 2> points_arr = MakeNDArray<double, 2>({(size_t)V.numels(), 3});
+        writePoints(points_arr.data());
+        return points_arr;
     }
 
-    // return points and faces arrays
-    nb::tuple return_arrays() {
+    // Return the faces array. Indices are int32 unless 'int64' is set or the
+    // mesh has too many points for them to fit.
+    nb::object return_faces(std::optional<bool> int64 = std::nullopt) {
+        QuietScope scope = use();
+        if (int64Indices(V.numels(), int64)) {
+            return nb::cast(faceArray<int64_t>());
+        }
+        return nb::cast(faceArray<int32_t>());
+    }
+
+    // Write the coordinates of the vertices to 'points'.
+    void writePoints(double *points) {
         Node *n;
         Vertex *v;
-        coord *ocds;
-        int i;
-
-        int n_points = V.numels();
-        NDArray<double, 2> points_arr = MakeNDArray<double, 2>({n_points, 3});
-        double *points = points_arr.data();
 
-        // Populate points
-        int c = 0;
+        size_t c = 0;
         FOREACHVERTEX(v, n) {
             points[c] = v->x;
             points[c + 1] = v->y;
             points[c + 2] = v->z;
             c += 3;
         }
+    }
 
-        ocds = new coord[V.numels()];
-        i = 0;
-        FOREACHVERTEX(v, n) ocds[i++] = v->x;
-        i = 0;
-        FOREACHVERTEX(v, n) v->x = i++;
-
-        int n_faces = T.numels();
-        NDArray<int, 2> faces_arr = MakeNDArray<int, 2>({n_faces, 3});
-        int *faces = faces_arr.data();
-
-        // Populate faces
-        c = 0;
-        FOREACHNODE(T, n) {
-            faces[c] = TVI1(n);
-            faces[c + 1] = TVI2(n);
-            faces[c + 2] = TVI3(n);
+    // Write the vertex indices of the triangles to 'faces' while deleting the
+    // triangles and edges.
+    template <typename I> void releaseFaces(I *faces) {
+        Node *n;
+        Vertex *v;
+        Edge *e;
+        Triangle *t;
+
+        int64_t i = 0;
+        FOREACHVERTEX(v, n) v->info = (void *)(intptr_t)i++;
+
+        // pages of the output are only committed as they are written, while
+        // the memory of the deleted triangles is periodically given back
+        size_t c = 0;
+        while ((t = (Triangle *)T.popHead()) != NULL) {
+            faces[c] = (I)(intptr_t)t->v1()->info;
+            faces[c + 1] = (I)(intptr_t)t->v2()->info;
+            faces[c + 2] = (I)(intptr_t)t->v3()->info;
+            delete t;
             c += 3;
+            if (c % (3 * RELEASE_BATCH) == 0) {
+                ReleaseFreedMemory();
+            }
         }
 
-        // clean up
-        i = 0;
-        FOREACHVERTEX(v, n) v->x = ocds[i++];
-        delete[] ocds;
-
-        return nb::make_tuple(points_arr, faces_arr);
+        while ((e = (Edge *)E.popHead()) != NULL) {
+            delete e;
+        }
+        ReleaseFreedMemory();
     }
 
-    NDArray<double, 2> return_points() {
-        Node *n;
+    // Write the coordinates of the vertices to 'points' while deleting them.
+    void releasePoints(double *points) {
         Vertex *v;
 
-        int n_points = V.numels();
-        NDArray<double, 2> points_arr = MakeNDArray<double, 2>({n_points, 3});
-        double *points = points_arr.data();
-
-        // Populate points
-        int c = 0;
-        FOREACHVERTEX(v, n) {
+        size_t c = 0;
+        while ((v = (Vertex *)V.popHead()) != NULL) {
             points[c] = v->x;
             points[c + 1] = v->y;
             points[c + 2] = v->z;
+            delete v;
             c += 3;
+            if (c % (3 * RELEASE_BATCH) == 0) {
+                ReleaseFreedMemory();
+            }
         }
+        ReleaseFreedMemory();
 
-        return points_arr;
+        d_boundaries = d_handles = d_shells = true;
+    }
+
+    // Return the faces array with vertex indices of type I.
+    template <typename I> NDArray<I, 2> faceArray() {
+        NDArray<I, 2> faces_arr = MakeNDArray<I, 2>({(size_t)T.numels(), 3});
+        writeFaces(faces_arr.data());
+        return faces_arr;
     }
 
-    NDArray<int, 2> return_faces() {
+    // Write the vertex indices of the triangles to 'faces'.
+    template <typename I> void writeFaces(I *faces) {
         Node *n;
         Vertex *v;
-        coord *ocds;
-        int i, c;
+        Triangle *t;
 
-        ocds = new coord[V.numels()];
-        i = 0;
-        FOREACHVERTEX(v, n) ocds[i++] = v->x;
-        i = 0;
-        FOREACHVERTEX(v, n) v->x = i++;
-
-        int n_faces = T.numels();
-        NDArray<int, 2> faces_arr = MakeNDArray<int, 2>({n_faces, 3});
-        int *faces = faces_arr.data();
-
-        // Populate faces
-        c = 0;
-        FOREACHNODE(T, n) {
-            faces[c] = TVI1(n);
-            faces[c + 1] = TVI2(n);
-            faces[c + 2] = TVI3(n);
+        void **ovinfo = new void *[V.numels()];
+        int64_t i = 0;
+        FOREACHVERTEX(v, n) {
+            ovinfo[i] = v->info;
+            v->info = (void *)(intptr_t)i++;
+        }
+
+        size_t c = 0;
+        FOREACHTRIANGLE(t, n) {
+            faces[c] = (I)(intptr_t)t->v1()->info;
+            faces[c + 1] = (I)(intptr_t)t->v2()->info;
+            faces[c + 2] = (I)(intptr_t)t->v3()->info;
             c += 3;
         }
 
         // clean up
         i = 0;
-        FOREACHVERTEX(v, n) v->x = ocds[i++];
-        delete[] ocds;
+        FOREACHVERTEX(v, n) v->info = ovinfo[i++];
+        delete[] ovinfo;
+    }
 
-        return faces_arr;
+    // Return the changes made to the loaded arrays as the indices of the
+    // removed faces and the new vertices and faces.
+    //
+    // 'points' and 'faces' are the arrays the mesh was loaded from. A vertex
+    // keeps its input index if it was not moved, or only rounded by
+    // coordBackApproximation(), while new vertices and the
+    // copies of input vertices are numbered after the input points. A face
+    // is unchanged if it is the first face derived from an input face with
+    // the same vertices in the same cyclic order. All the other faces are
+    // new, and the input faces without an unchanged face are removed.
+    template <typename I>
+    nb::tuple
+    return_delta(const NDArray<const double, 2> points, const NDArray<const I, 2> faces) {
+        QuietScope scope = use();
+        checkMeshArrays(points, faces);
+        const size_t nv = points.shape(0), nt = faces.shape(0);
+        const double *p = points.data();
+        const I *f = faces.data();
+
+        std::vector<double> new_points;
+        std::vector<int64_t> new_faces, removed;
+        {
+            nb::gil_scoped_release release;
+            Node *n;
+            Vertex *v;
+            Triangle *t;
+
+            std::vector<void *> ovinfo;
+            ovinfo.reserve(V.numels());
+            std::vector<bool> claimed(nv, false), kept(nt, false);
+            int64_t k = (int64_t)nv;
+            FOREACHVERTEX(v, n) {
+                ovinfo.push_back(v->info);
+                int64_t o = v->origin;
+                int64_t index;
+                if (o >= 0 && (size_t)o < nv && !claimed[o] &&
+                    sameCoordinate(v->x, p[3 * o]) && sameCoordinate(v->y, p[3 * o + 1]) &&
+                    sameCoordinate(v->z, p[3 * o + 2])) {
+                    claimed[o] = true;
+                    index = o;
+                } else {
+                    index = k++;
+                    new_points.insert(new_points.end(), {v->x, v->y, v->z});
+                }
+                v->info = (void *)(intptr_t)index;
+            }
+
+            FOREACHTRIANGLE(t, n) {
+                int64_t a = (intptr_t)t->v1()->info, b = (intptr_t)t->v2()->info,
+                        c = (intptr_t)t->v3()->info;
+                int64_t o = t->origin;
+                if (o >= 0 && (size_t)o < nt && !kept[o]) {
+                    const I *g = f + 3 * o;
+                    for (int r = 0; r < 3; r++) {
+                        if (g[r] == a && g[(r + 1) % 3] == b && g[(r + 2) % 3] == c) {
+                            kept[o] = true;
+                        }
+                    }
+                    if (kept[o]) {
+                        continue;
+                    }
+                }
+                new_faces.insert(new_faces.end(), {a, b, c});
+            }
+
+            size_t i = 0;
+            FOREACHVERTEX(v, n) v->info = ovinfo[i++];
+            for (size_t j = 0; j < nt; j++) {
+                if (!kept[j]) {
+                    removed.push_back((int64_t)j);
+                }
+            }
+        }
+
+        NDArray<int64_t, 1> removed_arr = MakeNDArray<int64_t, 1>({removed.size()});
+        NDArray<double, 2> points_arr = MakeNDArray<double, 2>({new_points.size() / 3, 3});
+        NDArray<int64_t, 2> faces_arr = MakeNDArray<int64_t, 2>({new_faces.size() / 3, 3});
+        std::copy(removed.begin(), removed.end(), removed_arr.data());
+        std::copy(new_points.begin(), new_points.end(), points_arr.data());
+        std::copy(new_faces.begin(), new_faces.end(), faces_arr.data());
+        return nb::make_tuple(removed_arr, points_arr, faces_arr);
+    }
+
+    // Return the provenance of the output vertices and faces.
+    //
+    // Each output vertex and face is mapped to the index of the input element
+    // it derives from, or -1 if it was created during the repair. Every
+    // vertex also receives up to three parent input vertices with
+    // interpolation weights. Input vertices are their own single parent,
+    // while new vertices are attributed to the three closest input vertices
+    // reached through the surrounding patch, weighted by inverse distance.
+    // Unused parents are -1 with a zero weight.
+    nb::dict return_provenance() {
+        QuietScope scope = use();
+        Node *n, *m;
+        Vertex *v, *w;
+        Triangle *t;
+
+        size_t n_points = V.numels();
+        size_t n_faces = T.numels();
+        NDArray<int64_t, 1> vorigin_arr = MakeNDArray<int64_t, 1>({n_points});
+        NDArray<int64_t, 1> forigin_arr = MakeNDArray<int64_t, 1>({n_faces});
+        NDArray<int64_t, 2> parents_arr = MakeNDArray<int64_t, 2>({n_points, 3});
+        NDArray<double, 2> weights_arr = MakeNDArray<double, 2>({n_points, 3});
+        int64_t *vorigin = vorigin_arr.data();
+        int64_t *forigin = forigin_arr.data();
+        int64_t *parents = parents_arr.data();
+        double *weights = weights_arr.data();
+
+        size_t i = 0;
+        FOREACHTRIANGLE(t, n) forigin[i++] = t->origin;
+
+        // closest input vertices found so far for each vertex
+        std::vector<Vertex *> sources(3 * n_points, NULL);
+        std::vector<double> dists(3 * n_points, DBL_MAX);
+        std::vector<Vertex *> queue;
+        void **ovinfo = new void *[n_points];
+
+        i = 0;
+        FOREACHVERTEX(v, n) {
+            ovinfo[i] = v->info;
+            v->info = (void *)(intptr_t)i;
+            vorigin[i] = v->origin;
+            if (v->origin >= 0) {
+                sources[3 * i] = v;
+                dists[3 * i] = 0.0;
+            }
+            i++;
+        }
+
+        // breadth first traversal of the created vertices starting from the
+        // ones adjacent to input vertices
+        FOREACHVERTEX(v, n) if (v->origin < 0) {
+            List *vv = v->VV();
+            FOREACHVVVERTEX(vv, w, m) if (w->origin >= 0) {
+                MARK_VISIT2(v);
+                queue.push_back(v);
+                break;
+            }
+            delete vv;
+        }
+
+        for (size_t q = 0; q < queue.size(); q++) {
+            v = queue[q];
+            size_t vi = 3 * (intptr_t)v->info;
+            List *vv = v->VV();
+            FOREACHVVVERTEX(vv, w, m) {
+                if (w->origin < 0 && !IS_VISITED2(w)) {
+                    MARK_VISIT2(w);
+                    queue.push_back(w);
+                }
+                size_t wi = 3 * (intptr_t)w->info;
+                for (int k = 0; k < 3; k++) {
+                    Vertex *s = sources[wi + k];
+                    if (s == NULL) {
+                        break;
+                    }
+                    double d = v->distance(s);
+                    int j = 0;
+                    while (j < 3 && sources[vi + j] != s && d >= dists[vi + j]) {
+                        j++;
+                    }
+                    if (j == 3 || sources[vi + j] == s) {
+                        continue;
+                    }
+                    for (int l = 2; l > j; l--) {
+                        sources[vi + l] = sources[vi + l - 1];
+                        dists[vi + l] = dists[vi + l - 1];
+                    }
+                    sources[vi + j] = s;
+                    dists[vi + j] = d;
+                }
+            }
+            delete vv;
+        }
+
+        i = 0;
+        FOREACHVERTEX(v, n) {
+            UNMARK_VISIT2(v);
+            double wsum = 0.0;
+            for (int k = 0; k < 3; k++) {
+                Vertex *s = sources[3 * i + k];
+                parents[3 * i + k] = (s == NULL) ? -1 : s->origin;
+                if (s == NULL) {
+                    weights[3 * i + k] = 0.0;
+                } else if (dists[3 * i] == 0.0) {
+                    weights[3 * i + k] = (k == 0) ? 1.0 : 0.0;
+                } else {
+                    weights[3 * i + k] = 1.0 / dists[3 * i + k];
+                }
+                wsum += weights[3 * i + k];
+            }
+            if (wsum > 0.0) {
+                for (int k = 0; k < 3; k++) {
+                    weights[3 * i + k] /= wsum;
+                }
+            }
+            v->info = ovinfo[i++];
+        }
+        delete[] ovinfo;
+
+        nb::dict provenance;
+        provenance["vertex_origin"] = vorigin_arr;
+        provenance["face_origin"] = forigin_arr;
+        provenance["vertex_parents"] = parents_arr;
+        provenance["vertex_weights"] = weights_arr;
+        return provenance;
+    }
+
+    int n_boundaries() {
+        QuietScope scope = use();
+        return boundaries();
+    }
+
+    // Measure the distances between this mesh and an original mesh.
+    //
+    // The distance of each vertex to the other surface is measured from
+    // this mesh and, if 'symmetric', from the original mesh. Points sampled
+    // on the faces at most 'sample_spacing' apart are also measured when it
+    // is positive. The measurement stops at the first distance above
+    // 'tolerance' if given.
+    template <typename I>
+    nb::dict deviation(
+        const NDArray<const double, 2> points,
+        const NDArray<const I, 2> faces,
+        bool symmetric = true,
+        double sample_spacing = 0.0,
+        std::optional<double> tolerance = std::nullopt,
+        const std::variant<int, std::string> &tris_per_cell = "auto") {
+        QuietScope scope = use();
+        checkMeshArrays(points, faces);
+        UINT16 tpc = trisPerCell(tris_per_cell);
+        if (sample_spacing < 0) {
+            throw std::invalid_argument("sample_spacing must not be negative");
+        }
+        if (tolerance.has_value() && !(*tolerance >= 0)) {
+            throw std::invalid_argument("tolerance must not be negative");
+        }
+        const double tol = tolerance.value_or(-1.0);
+        const size_t nv = points.shape(0), nt = faces.shape(0);
+
+        NDArray<double, 1> dist_arr = MakeNDArray<double, 1>({(size_t)V.numels()});
+        NDArray<double, 1> odist_arr = MakeNDArray<double, 1>({symmetric ? nv : 0});
+        double *dist = dist_arr.data(), *odist = odist_arr.data();
+        std::fill(dist, dist + V.numels(), std::numeric_limits<double>::quiet_NaN());
+        std::fill(
+            odist, odist + (symmetric ? nv : 0), std::numeric_limits<double>::quiet_NaN());
+
+        double max = 0.0, sum = 0.0;
+        size_t count = 0;
+        bool within;
+        {
+            nb::gil_scoped_release release;
+            TriangleIndex repaired(this, tpc);
+            TriangleIndex original(points.data(), nv, faces.data(), nt, tpc);
+            within =
+                repaired.deviation(original, sample_spacing, tol, dist, &max, &sum, &count);
+            if (within && symmetric) {
+                within = original.deviation(
+                    repaired, sample_spacing, tol, odist, &max, &sum, &count);
+            }
+        }
+
+        nb::dict report;
+        report["distances"] = dist_arr;
+        if (symmetric) {
+            report["original_distances"] = odist_arr;
+        } else {
+            report["original_distances"] = nb::none();
+        }
+        report["hausdorff"] = max;
+        report["mean"] = count ? sum / count : std::numeric_limits<double>::quiet_NaN();
+        report["exceeded"] = !within;
+        return report;
+    }
+
+    // Return the ordered boundary loops.
+    //
+    // Each loop is walked with Vertex::nextOnBoundary and stored back to back
+    // in 'indices', loop i spanning indices[offsets[i]:offsets[i + 1]]. Vertex
+    // indices follow the order of return_arrays(). The number of edges,
+    // perimeter and axis aligned bounds (xmin, xmax, ymin, ymax, zmin, zmax)
+    // of each loop are computed during the same walk.
+    //
+    // On non-manifold boundaries, a walk may stop before returning to its
+    // first vertex. It is then an open chain, which ends at the vertex of
+    // another chain it reached, if any, and has no closing edge.
+    nb::dict boundary_loops() {
+        QuietScope scope = use();
+        Node *n;
+        Vertex *v, *w, *u;
+
+        void **ovinfo = new void *[V.numels()];
+        std::vector<Vertex *> loop_vertices;
+        std::vector<int64_t> offsets = {0};
+        std::vector<double> perimeters, bounds;
+        std::vector<bool> closed;
+
+        int64_t i = 0;
+        FOREACHVERTEX(v, n) {
+            ovinfo[i] = v->info;
+            v->info = (void *)(intptr_t)i++;
+            if (IS_VISITED2(v) || !v->isOnBoundary()) {
+                continue;
+            }
+
+            double perimeter = 0.0;
+            double b[6] = {DBL_MAX, -DBL_MAX, DBL_MAX, -DBL_MAX, DBL_MAX, -DBL_MAX};
+            auto add = [&](Vertex *x) {
+                loop_vertices.push_back(x);
+                for (unsigned char k = 0; k < 3; k++) {
+                    b[2 * k] = std::min(b[2 * k], (double)(*x)[k]);
+                    b[2 * k + 1] = std::max(b[2 * k + 1], (double)(*x)[k]);
+                }
+            };
+            bool is_closed = false;
+            w = v;
+            while (true) {
+                MARK_VISIT2(w);
+                add(w);
+                if ((u = w->nextOnBoundary()) == NULL) {
+                    break;
+                }
+                perimeter += w->distance(u);
+                if (u == v) {
+                    is_closed = true;
+                    break;
+                }
+                if (IS_VISITED2(u)) {
+                    add(u);
+                    break;
+                }
+                w = u;
+            }
+
+            offsets.push_back((int64_t)loop_vertices.size());
+            perimeters.push_back(perimeter);
+            bounds.insert(bounds.end(), b, b + 6);
+            closed.push_back(is_closed);
+        }
+
+        size_t n_loops = perimeters.size();
+        NDArray<int64_t, 1> indices_arr = MakeNDArray<int64_t, 1>({loop_vertices.size()});
+        NDArray<int64_t, 1> offsets_arr = MakeNDArray<int64_t, 1>({n_loops + 1});
+        NDArray<int64_t, 1> n_edges_arr = MakeNDArray<int64_t, 1>({n_loops});
+        NDArray<double, 1> perimeter_arr = MakeNDArray<double, 1>({n_loops});
+        NDArray<double, 2> bounds_arr = MakeNDArray<double, 2>({n_loops, 6});
+        NDArray<bool, 1> closed_arr = MakeNDArray<bool, 1>({n_loops});
+
+        int64_t *indices = indices_arr.data();
+        for (size_t j = 0; j < loop_vertices.size(); j++) {
+            indices[j] = (int64_t)(intptr_t)loop_vertices[j]->info;
+            UNMARK_VISIT2(loop_vertices[j]);
+        }
+        std::copy(offsets.begin(), offsets.end(), offsets_arr.data());
+        for (size_t j = 0; j < n_loops; j++) {
+            n_edges_arr.data()[j] = offsets[j + 1] - offsets[j] - !closed[j];
+            closed_arr.data()[j] = closed[j];
+        }
+        std::copy(perimeters.begin(), perimeters.end(), perimeter_arr.data());
+        std::copy(bounds.begin(), bounds.end(), bounds_arr.data());
+
+        i = 0;
+        FOREACHVERTEX(v, n) v->info = ovinfo[i++];
+        delete[] ovinfo;
+
+        nb::dict loops;
+        loops["indices"] = indices_arr;
+        loops["offsets"] = offsets_arr;
+        loops["n_edges"] = n_edges_arr;
+        loops["perimeter"] = perimeter_arr;
+        loops["bounds"] = bounds_arr;
+        loops["closed"] = closed_arr;
+        return loops;
     }
 
-    int n_boundaries() { return boundaries(); }
+    // Number of vertices whose VertexFan relations differ from the List
+    // versions, to test the allocation-free adjacency queries.
+    int64_t _vertex_fan_mismatches() {
+        QuietScope scope = use();
+        VertexFan<Edge> ve;
+        VertexFan<Vertex> vv;
+        VertexFan<Triangle> vt;
+        Node *n;
+        Vertex *v;
+        int64_t mismatches = 0;
+        FOREACHVERTEX(v, n) {
+            v->VE(ve);
+            v->VV(vv);
+            v->VT(vt);
+            if (!sameFan(v->VE(), ve) || !sameFan(v->VV(), vv) || !sameFan(v->VT(), vt)) {
+                mismatches++;
+            }
+        }
+        return mismatches;
+    }
 
     void _boundaries() {
         throw std::runtime_error("`boundaries()` is deprecated. Use `n_boundaries` instead.");
@@ -370,15 +1379,27 @@ class PyTMesh : public Basic_TMesh {
     // aforementioned methods are called up to max_iter times and
     // each of them is called using 'inner_loops' as a parameter.
     // Returns true only if the mesh could be completely cleaned.
-    bool clean(int max_iters = 10, int inner_loops = 3) {
-        return meshclean(max_iters, inner_loops);
+    //
+    // 'tris_per_cell' is passed to selectIntersectingTriangles(), see
+    // select_intersecting_triangles().
+    bool clean(
+        int max_iters = 10,
+        int inner_loops = 3,
+        const std::variant<int, std::string> &tris_per_cell = 50) {
+        QuietScope scope = use();
+        bool is_clean = meshclean(max_iters, inner_loops, trisPerCell(tris_per_cell));
+        checkMemoryLimit();
+        return is_clean;
     }
 
     bool strong_degeneracy_removal(int max_iters) {
+        QuietScope scope = use();
         return strongDegeneracyRemoval(max_iters);
     };
-    bool strong_intersection_removal(int max_iters) {
-        return strongIntersectionRemoval(max_iters);
+    bool strong_intersection_removal(
+        int max_iters, const std::variant<int, std::string> &tris_per_cell = 50) {
+        QuietScope scope = use();
+        return strongIntersectionRemoval(max_iters, trisPerCell(tris_per_cell));
     };
 
     // Fill small boundaries.
@@ -388,35 +1409,205 @@ class PyTMesh : public Basic_TMesh {
     // the sampling density of the surroundings. Returns number of
     // holes patched.  If 'nbe' is 0 (default), all the holes are
     // patched.
-    int fill_small_boundaries(int nbe = 0, bool refine = true) {
-        return fillSmallBoundaries(nbe, refine);
+    int64_t fill_small_boundaries(int64_t nbe = 0, bool refine = true) {
+        QuietScope scope = use();
+        int64_t n_filled = fillSmallBoundaries(nbe, refine);
+        checkMemoryLimit();
+        return n_filled;
     }
 
-    // Selects all intersecting triangles.
-    // Selects all the triangles that improperly intersect other
-    // parts of the mesh and return their number. The parameter
-    // 'tris_per_cell' determines the depth of the recursive space
-    // subdivision used to keep the complexity under a reasonable
-    // threshold. The default value is safe in most cases.
+    // Fill the holes with less than 'nbe' boundary edges (all if 0) and
+    // return the number of triangles added to each of them.
     //
-    // If ``justproper`` is true, coincident edges and vertices are not
-    // regarded as intersections even if they are not common
+    // The patches are refined to edges of 'target_edge_length', or of the
+    // length of the surrounding edges if not positive, with a sampling
+    // density scaled by 'density_scale'. If 'max_new_triangles' is
+    // positive, patches expected to exceed it are refined with longer
+    // edges and the refinement stops at the limit.
+    NDArray<int64_t, 1> fill_holes(
+        int64_t nbe = 0,
+        bool refine = true,
+        int64_t max_new_triangles = 0,
+        double target_edge_length = 0.0,
+        double density_scale = 1.0) {
+        QuietScope scope = use();
+        checkPatchRefinement(max_new_triangles, target_edge_length, density_scale);
+
+        Node *n;
+        Vertex *v;
+        size_t n_boundary_vertices = 0;
+        FOREACHVERTEX(v, n) {
+            if (v->isOnBoundary()) {
+                n_boundary_vertices++;
+            }
+        }
+
+        std::vector<int64_t> sizes(n_boundary_vertices + 1);
+        int64_t n_filled = fillSmallBoundaries(
+            nbe, refine, target_edge_length, density_scale, max_new_triangles, sizes.data());
+        checkMemoryLimit();
+
+        NDArray<int64_t, 1> sizes_arr = MakeNDArray<int64_t, 1>({(size_t)n_filled});
+        std::copy(sizes.begin(), sizes.begin() + n_filled, sizes_arr.data());
+        return sizes_arr;
+    }
+
+    // Return a mask of the faces with a vertex within the axis aligned
+    // 'bounds' (xmin, xmax, ymin, ymax, zmin, zmax) and within 'radius' of
+    // 'center'. Each constraint is ignored when not given.
+    NDArray<bool, 1> faces_in_region(
+        std::optional<std::array<double, 6>> bounds = std::nullopt,
+        std::optional<std::array<double, 3>> center = std::nullopt,
+        double radius = 0.0) {
+        QuietScope scope = use();
+        if (center && radius <= 0.0) {
+            throw std::runtime_error("radius must be positive");
+        }
+
+        Node *n;
+        Vertex *v;
+        Triangle *t;
+
+        FOREACHVERTEX(v, n) {
+            bool inside = true;
+            if (bounds) {
+                const std::array<double, 6> &b = *bounds;
+                inside =
+                    (v->x >= b[0] && v->x <= b[1] && v->y >= b[2] && v->y <= b[3] &&
+                     v->z >= b[4] && v->z <= b[5]);
+            }
+            if (inside && center) {
+                Point c((*center)[0], (*center)[1], (*center)[2]);
+                inside = (v->squaredDistance(&c) <= radius * radius);
+            }
+            if (inside) {
+                MARK_VISIT2(v);
+            }
+        }
+
+        NDArray<bool, 1> mask_arr = MakeNDArray<bool, 1>({(size_t)T.numels()});
+        bool *mask = mask_arr.data();
+        size_t i = 0;
+        FOREACHTRIANGLE(t, n) {
+            mask[i++] = IS_VISITED2(t->v1()) || IS_VISITED2(t->v2()) || IS_VISITED2(t->v3());
+        }
+        FOREACHVERTEX(v, n) UNMARK_VISIT2(v);
+
+        return mask_arr;
+    }
+
+    // Select the faces flagged in 'face_mask'.
+    void select_face_mask(const NDArray<const bool, 1> &face_mask) {
+        if (face_mask.shape(0) != (size_t)T.numels()) {
+            throw std::runtime_error("face_mask must contain one entry per face");
+        }
+        selectTrianglesFromMask(this, face_mask.data(), face_mask.shape(0));
+    }
+
+    // Return the indices of the selected faces and deselect them.
+    NDArray<int64_t, 1> pop_selected_faces() {
+        Node *n;
+        Triangle *t;
+
+        std::vector<int64_t> selected;
+        int64_t i = 0;
+        FOREACHTRIANGLE(t, n) {
+            if (IS_VISITED(t)) {
+                selected.push_back(i);
+                UNMARK_VISIT(t);
+            }
+            i++;
+        }
+
+        NDArray<int64_t, 1> faces_arr = MakeNDArray<int64_t, 1>({selected.size()});
+        std::copy(selected.begin(), selected.end(), faces_arr.data());
+        return faces_arr;
+    }
+
+    // Remove degenerate faces and self-intersections from the faces flagged in
+    // 'face_mask' grown by 'halo' rings of neighbors. Returns whether the
+    // region could be completely cleaned and the indices of the faces created
+    // or modified by the repair.
+    nb::tuple clean_region(
+        const NDArray<const bool, 1> &face_mask,
+        int halo = 2,
+        int max_iters = 10,
+        int inner_loops = 3,
+        const std::variant<int, std::string> &tris_per_cell = 50) {
+        QuietScope scope = use();
+        UINT16 tpc = trisPerCell(tris_per_cell);
+        select_face_mask(face_mask);
+        bool localized, is_clean;
+        {
+            nb::gil_scoped_release release;
+            is_clean =
+                cleanSelectedRegion(this, halo, max_iters, inner_loops, &localized, tpc);
+        }
+        return nb::make_tuple(is_clean, pop_selected_faces());
+    }
+
+    // Fill the holes with less than 'nbe' boundary edges (all if 0) that are
+    // surrounded by the faces flagged in 'face_mask' grown by 'halo' rings
+    // of neighbors. Returns the number of holes patched and the indices of
+    // the new faces.
+    nb::tuple fill_region_boundaries(
+        const NDArray<const bool, 1> &face_mask,
+        int halo = 2,
+        int64_t nbe = 0,
+        bool refine = true,
+        int64_t max_new_triangles = 0,
+        double target_edge_length = 0.0,
+        double density_scale = 1.0) {
+        QuietScope scope = use();
+        checkPatchRefinement(max_new_triangles, target_edge_length, density_scale);
+        select_face_mask(face_mask);
+        int64_t n_filled;
+        {
+            nb::gil_scoped_release release;
+            n_filled = fillSelectedRegionHoles(
+                this,
+                halo,
+                nbe,
+                refine,
+                target_edge_length,
+                density_scale,
+                max_new_triangles);
+        }
+        checkMemoryLimit();
+        return nb::make_tuple(n_filled, pop_selected_faces());
+    }
+
+    // Selects all intersecting triangles.
+    // Selects all the triangles that improperly intersect other
+    // parts of the mesh and return their number. The parameter
+    // 'tris_per_cell' determines the depth of the recursive space
+    // subdivision used to keep the complexity under a reasonable
+    // threshold. The default value is safe in most cases.
+    //
+    // If ``justproper`` is true, coincident edges and vertices are not
+    // regarded as intersections even if they are not common
     // subsimplexes.
-    NDArray<int, 2>
-    select_intersecting_triangles(int tris_per_cell = 50, bool justproper = false) {
+    //
+    // If 'tris_per_cell' is "auto", it is chosen along with the maximum
+    // number of subdivisions from the overlaps of the triangle bounding
+    // boxes.
+    NDArray<int64_t, 2> select_intersecting_triangles(
+        const std::variant<int, std::string> &tris_per_cell = 50, bool justproper = false) {
+        QuietScope scope = use();
         // Return the number of intersecting triangles
-        int n_intersecting = selectIntersectingTriangles(tris_per_cell, justproper);
+        size_t n_intersecting =
+            selectIntersectingTriangles(trisPerCell(tris_per_cell), justproper);
 
         // Create a face array and populate it with the intersecting faces
-        NDArray<int, 2> faces_arr = MakeNDArray<int, 2>({n_intersecting, 3});
-        int *faces = faces_arr.data();
+        NDArray<int64_t, 2> faces_arr = MakeNDArray<int64_t, 2>({n_intersecting, 3});
+        int64_t *faces = faces_arr.data();
 
         // populate the array
         Node *n;
         Triangle *t;
 
-        int c = 0;
-        int i = 0;
+        int64_t c = 0;
+        size_t i = 0;
         FOREACHTRIANGLE(t, n) {
             if (IS_VISITED(t)) {
                 faces[i] = c;
@@ -424,11 +1615,190 @@ class PyTMesh : public Basic_TMesh {
             }
             c++;
         }
+        std::fill(faces + i, faces + 3 * n_intersecting, 0);
 
         return faces_arr;
     }
 
-    int remove_smallest_components() { return removeSmallestComponents(); };
+    int64_t remove_smallest_components() {
+        QuietScope scope = use();
+        return removeSmallestComponents();
+    };
+
+    // Collapse edges by quadric error until the mesh has 'target_faces'
+    // faces or 'target_reduction' of its faces are removed, see
+    // decimateMesh(). Returns the number of faces removed.
+    int64_t
+    decimate(std::optional<int64_t> target_faces, std::optional<double> target_reduction) {
+        QuietScope scope = use();
+        int64_t target = decimationTarget(T.numels(), target_faces, target_reduction);
+        nb::gil_scoped_release release;
+        return decimateMesh(this, target);
+    }
+
+    // Sort the vertices, edges and faces along a space-filling curve, see
+    // spatialReorder().
+    void reorder(const std::string &method) {
+        QuietScope scope = use();
+        SpaceFillingCurve curve = curveMethod(method);
+        nb::gil_scoped_release release;
+        spatialReorder(this, curve);
+    }
+
+    // Run a repair pipeline given as a sequence of stage dicts.
+    //
+    // The stages are parsed before the GIL is released, so the whole
+    // pipeline runs in a single call without holding it. Returns a report
+    // for each stage.
+    nb::list run_pipeline(const nb::list &stages) {
+        QuietScope scope = use();
+        std::vector<RepairStage> parsed;
+        for (nb::handle spec : stages) {
+            parsed.push_back(parseRepairStage(nb::cast<nb::dict>(spec)));
+        }
+
+        std::vector<StageReport> reports(parsed.size());
+        {
+            nb::gil_scoped_release release;
+            for (size_t i = 0; i < parsed.size() && !max_triangles_reached; ++i) {
+                reports[i] = runStage(parsed[i]);
+            }
+        }
+        checkMemoryLimit();
+
+        nb::list out;
+        for (size_t i = 0; i < parsed.size(); ++i) {
+            nb::dict report;
+            report["stage"] = parsed[i].name;
+            if (isCleaningStage(parsed[i].name)) {
+                report["result"] = reports[i].result != 0;
+            } else {
+                report["result"] = reports[i].result;
+            }
+            report["time"] = reports[i].time;
+            report["timed_out"] = reports[i].timed_out;
+            out.append(report);
+        }
+        return out;
+    }
+
+  private:
+    typedef std::chrono::steady_clock Clock;
+
+    std::optional<int64_t> memory_limit;
+    // Chunks appended by append_arrays() until finalize().
+    std::unique_ptr<MeshAppender> appender;
+
+    // Kernel messages of the methods of this mesh are only printed when
+    // false, from whichever thread runs them.
+    bool quiet = false;
+
+    // Throw if chunks were appended and not finalized, as the appender still
+    // refers to the vertices and edges of the mesh. Otherwise, return the
+    // scope of the quiet state of the mesh for a method using it.
+    QuietScope use() const {
+        if (appender) {
+            throw std::runtime_error("Call finalize() after append_arrays() to use the mesh");
+        }
+        return QuietScope(quiet);
+    }
+
+    // Throw if hole filling stopped at the memory limit.
+    void checkMemoryLimit() {
+        if (max_triangles_reached) {
+            max_triangles_reached = false;
+            throw MemoryLimitError(
+                "Filling holes would exceed the memory limit of " +
+                formatBytes(*memory_limit) + ", the holes filled so far are kept");
+        }
+    }
+
+    static double secondsSince(Clock::time_point start) {
+        return std::chrono::duration<double>(Clock::now() - start).count();
+    }
+
+    StageReport runStage(const RepairStage &stage) {
+        StageReport report;
+        Clock::time_point start = Clock::now();
+
+        if (stage.name == "remove_components") {
+            report.result = removeSmallestComponents();
+        } else if (stage.name == "join_components") {
+            TMesh::begin_progress();
+            while (joinClosestComponents(this)) {
+                report.result++;
+                TMesh::report_progress("Num. components: %d       ", shells());
+            }
+            TMesh::end_progress();
+            deselectTriangles();
+        } else if (stage.name == "fill_holes") {
+            if (boundaries()) {
+                report.result = fillSmallBoundaries(
+                    stage.n_edges,
+                    stage.refine,
+                    stage.target_edge_length,
+                    stage.density_scale,
+                    stage.max_new_triangles);
+            }
+        } else if (stage.name == "clean") {
+            bool is_clean = cleanWithin(stage, start, &report.timed_out);
+            // cleaning may open new holes when removing intersecting triangles
+            if (stage.refill && !report.timed_out && boundaries()) {
+                if (stage.time_limit > 0 && secondsSince(start) >= stage.time_limit) {
+                    report.timed_out = true;
+                    is_clean = false;
+                } else {
+                    fillSmallBoundaries(0, true);
+                    is_clean = cleanWithin(stage, start, &report.timed_out);
+                }
+            }
+            report.result = is_clean;
+        } else if (stage.name == "degeneracy_removal") {
+            report.result = strongDegeneracyRemoval(stage.max_iters);
+        } else if (stage.name == "intersection_removal") {
+            report.result = strongIntersectionRemoval(stage.max_iters, stage.tris_per_cell);
+        } else if (stage.name == "decimate") {
+            report.result = decimateMesh(
+                this,
+                decimationTarget(T.numels(), stage.target_faces, stage.target_reduction));
+        } else if (stage.name == "reorder") {
+            spatialReorder(this, curveMethod(stage.method));
+        }
+
+        report.time = secondsSince(start);
+        return report;
+    }
+
+    // Same as meshclean(), but stop once the time limit of the stage is
+    // exceeded. The limit is checked between iterations, so the first
+    // iteration of the stage always runs.
+    bool cleanWithin(const RepairStage &stage, Clock::time_point start, bool *timed_out) {
+        Node *m;
+        Triangle *t;
+
+        deselectTriangles();
+        invertSelection();
+
+        for (int n = 0; n < stage.max_iters; n++) {
+            if (n > 0 && stage.time_limit > 0 && secondsSince(start) >= stage.time_limit) {
+                *timed_out = true;
+                return false;
+            }
+
+            TMesh::info("********* ITERATION %d *********\n", n);
+            bool nd = strongDegeneracyRemoval(stage.inner_loops);
+            deselectTriangles();
+            invertSelection();
+            bool ni = strongIntersectionRemoval(stage.inner_loops, stage.tris_per_cell);
+            if (ni && nd) {
+                FOREACHTRIANGLE(t, m) if (t->isExactlyDegenerate()) ni = false;
+                if (ni) {
+                    return true;
+                }
+            }
+        }
+        return false;
+    }
 
 }; // class
 
@@ -439,7 +1809,7 @@ void repair(
     bool remove_smallest_components = true) {
 
     if (remove_smallest_components) {
-        int sc = tin.remove_smallest_components();
+        int64_t sc = tin.remove_smallest_components();
         if (sc && verbose) {
             std::cout << "Removed " << sc << " small components\n";
         }
@@ -453,7 +1823,7 @@ void repair(
         if (verbose) {
             std::cout << "Patching holes...\n";
         }
-        int holespatched = tin.fill_small_boundaries();
+        int64_t holespatched = tin.fill_small_boundaries();
         if (verbose) {
             std::cout << "Patched " << holespatched << " holes\n";
         }
@@ -469,7 +1839,7 @@ void repair(
         if (verbose) {
             std::cout << "Patching holes...\n";
         }
-        int holespatched = tin.fill_small_boundaries();
+        int64_t holespatched = tin.fill_small_boundaries();
         if (verbose) {
             std::cout << "Patched " << holespatched << " holes\n";
         }
@@ -500,23 +1870,278 @@ void clean_from_file(
     tin.save_file(outfile, false);
 }
 
+// Whether a mesh given as arrays has nothing for the repair to fix, see
+// MeshInspection::isClean().
+template <typename I>
+bool is_clean(
+    const NDArray<const double, 2> points,
+    const NDArray<const I, 2> faces,
+    bool single_component) {
+    checkMeshArrays(points, faces);
+    const double *p = points.data();
+    const I *f = faces.data();
+    const size_t nv = points.shape(0), nt = faces.shape(0);
+
+    nb::gil_scoped_release release;
+    MeshInspection report = inspectMesh(p, nv, f, nt);
+    // the intersections are the expensive check, so they are only looked
+    // for when nothing else needs a repair, up to the first one found
+    report.intersecting_faces = 0;
+    if (!report.isClean(single_component)) {
+        return false;
+    }
+    report.intersecting_faces = intersectingFaces(p, nv, f, nt, true);
+    return report.isClean(single_component);
+}
+
+// Return the points and faces buffers of clean_from_arrays() returned by
+// 'out' for 'nv' points and 'nt' faces, or None for both without 'out'.
+nb::tuple outputBuffers(nb::object out, size_t nv, size_t nt) {
+    if (out.is_none()) {
+        return nb::make_tuple(nb::none(), nb::none());
+    }
+    nb::object buffers = out(nv, nt);
+    if (!nb::isinstance<nb::tuple>(buffers) || nb::len(buffers) != 2) {
+        throw std::invalid_argument("out must return a tuple of the points and faces arrays");
+    }
+    return nb::borrow<nb::tuple>(buffers);
+}
+
+// Return the input of clean_from_arrays() as its output, for a mesh the
+// repair would not change. The face indices are converted only if 'int64'
+// asks for the other type, and the arrays are only copied to the buffers
+// returned by 'out'.
+template <typename I>
+nb::tuple unchanged_arrays(
+    const NDArray<const double, 2> v,
+    const NDArray<const I, 2> f,
+    bool provenance,
+    std::optional<bool> int64,
+    bool delta,
+    nb::object out) {
+    const size_t nv = v.shape(0), nt = f.shape(0);
+    if (delta) {
+        return nb::make_tuple(
+            MakeNDArray<int64_t, 1>({0}),
+            MakeNDArray<double, 2>({0, 3}),
+            MakeNDArray<int64_t, 2>({0, 3}));
+    }
+
+    nb::object points = nb::cast(v);
+    nb::object faces = nb::cast(f);
+    if (!out.is_none()) {
+        nb::tuple buffers = outputBuffers(out, nv, nt);
+        // a new faces array keeps the input type by default
+        if (buffers[1].is_none()) {
+            int64 = int64.value_or(sizeof(I) == sizeof(int64_t));
+        }
+        OutputArrays arrays = outputArrays(nv, nt, int64, buffers[0], buffers[1]);
+        std::copy(v.data(), v.data() + 3 * nv, arrays.points.data());
+        if (arrays.int64) {
+            std::copy(f.data(), f.data() + 3 * nt, arrays.faces64.data());
+        } else {
+            std::copy(f.data(), f.data() + 3 * nt, arrays.faces32.data());
+        }
+        nb::tuple result = arrays.result();
+        points = result[0];
+        faces = result[1];
+    } else if (int64.has_value() && *int64 != (sizeof(I) == sizeof(int64_t))) {
+        if (*int64) {
+            NDArray<int64_t, 2> faces_arr = MakeNDArray<int64_t, 2>({nt, 3});
+            std::copy(f.data(), f.data() + 3 * nt, faces_arr.data());
+            faces = nb::cast(faces_arr);
+        } else {
+            if (nv > INT32_MAX) {
+                throw std::overflow_error(
+                    "The mesh has too many points for int32 face indices");
+            }
+            NDArray<int32_t, 2> faces_arr = MakeNDArray<int32_t, 2>({nt, 3});
+            std::copy(f.data(), f.data() + 3 * nt, faces_arr.data());
+            faces = nb::cast(faces_arr);
+        }
+    }
+    if (!provenance) {
+        return nb::make_tuple(points, faces);
+    }
+
+    NDArray<int64_t, 1> vorigin_arr = MakeNDArray<int64_t, 1>({nv});
+    NDArray<int64_t, 1> forigin_arr = MakeNDArray<int64_t, 1>({nt});
+    NDArray<int64_t, 2> parents_arr = MakeNDArray<int64_t, 2>({nv, 3});
+    NDArray<double, 2> weights_arr = MakeNDArray<double, 2>({nv, 3});
+    int64_t *vorigin = vorigin_arr.data(), *parents = parents_arr.data();
+    double *weights = weights_arr.data();
+    for (size_t i = 0; i < nv; i++) {
+        vorigin[i] = (int64_t)i;
+        parents[3 * i] = (int64_t)i;
+        parents[3 * i + 1] = parents[3 * i + 2] = -1;
+        weights[3 * i] = 1.0;
+        weights[3 * i + 1] = weights[3 * i + 2] = 0.0;
+    }
+    std::iota(forigin_arr.data(), forigin_arr.data() + nt, (int64_t)0);
+
+    nb::dict prov;
+    prov["vertex_origin"] = vorigin_arr;
+    prov["face_origin"] = forigin_arr;
+    prov["vertex_parents"] = parents_arr;
+    prov["vertex_weights"] = weights_arr;
+    return nb::make_tuple(points, faces, prov);
+}
+
+template <typename I>
 nb::tuple clean_from_arrays(
     const NDArray<const double, 2> v,
-    const NDArray<const int, 2> f,
+    const NDArray<const I, 2> f,
     bool verbose = false,
     bool joincomp = false,
-    bool remove_smallest_components = true) {
+    bool remove_smallest_components = true,
+    bool provenance = false,
+    std::optional<bool> int64 = std::nullopt,
+    bool delta = false,
+    bool skip_if_clean = false,
+    std::optional<int64_t> memory_limit = std::nullopt,
+    nb::object out = nb::none()) {
+
+    if (delta && provenance) {
+        throw std::invalid_argument("provenance is not available with delta");
+    }
+    if (delta && !out.is_none()) {
+        throw std::invalid_argument("out is not available with delta");
+    }
+
+    if (skip_if_clean) {
+        if (is_clean<I>(v, f, remove_smallest_components)) {
+            if (verbose) {
+                std::cout << "Nothing to fix\n";
+            }
+            return unchanged_arrays(v, f, provenance, int64, delta, out);
+        }
+    }
 
     PyTMesh tin;
 
     tin.set_quiet(!verbose);
+    tin.set_memory_limit(memory_limit);
     tin.load_array(v, f);
     repair(tin, verbose, joincomp, remove_smallest_components);
 
-    return tin.return_arrays();
+    if (delta) {
+        return tin.return_delta(v, f);
+    }
+    nb::tuple buffers = outputBuffers(out, tin.n_points(), tin.n_faces());
+    if (provenance) {
+        nb::dict prov = tin.return_provenance();
+        nb::tuple arrays = tin.return_arrays(int64, true, buffers[0], buffers[1]);
+        return nb::make_tuple(arrays[0], arrays[1], prov);
+    }
+    return tin.return_arrays(int64, true, buffers[0], buffers[1]);
+}
+
+// Count the defects of a mesh given as arrays, see inspectMesh().
+template <typename I>
+nb::dict inspect(
+    const NDArray<const double, 2> points,
+    const NDArray<const I, 2> faces,
+    bool intersections,
+    const std::variant<int, std::string> &tris_per_cell) {
+    checkMeshArrays(points, faces);
+    UINT16 tpc = trisPerCell(tris_per_cell);
+    const double *p = points.data();
+    const I *f = faces.data();
+    const size_t nv = points.shape(0), nt = faces.shape(0);
+
+    MeshInspection report;
+    {
+        nb::gil_scoped_release release;
+        report = inspectMesh(p, nv, f, nt);
+        if (intersections) {
+            report.intersecting_faces = intersectingFaces(p, nv, f, nt, false, tpc);
+        }
+    }
+
+    nb::dict d;
+    d["n_points"] = nv;
+    d["n_faces"] = nt;
+    d["boundary_edges"] = report.boundary_edges;
+    d["nonmanifold_edges"] = report.nonmanifold_edges;
+    d["misoriented_edges"] = report.misoriented_edges;
+    d["nonmanifold_vertices"] = report.nonmanifold_vertices;
+    d["duplicate_faces"] = report.duplicate_faces;
+    d["degenerate_faces"] = report.degenerate_faces;
+    d["unused_vertices"] = report.unused_vertices;
+    d["components"] = report.components;
+    if (intersections) {
+        d["intersecting_faces"] = report.intersecting_faces;
+    } else {
+        d["intersecting_faces"] = nb::none();
+    }
+    return d;
+}
+
+// Build the intersection index of a mesh given as arrays.
+template <typename I>
+void init_mesh_index(
+    TriangleIndex *self,
+    const NDArray<const double, 2> points,
+    const NDArray<const I, 2> faces,
+    const std::variant<int, std::string> &tris_per_cell) {
+    checkMeshArrays(points, faces);
+    UINT16 tpc = trisPerCell(tris_per_cell);
+    const size_t nv = points.shape(0), nt = faces.shape(0);
+    const I *f = faces.data();
+
+    nb::gil_scoped_release release;
+    new (self) TriangleIndex(points.data(), nv, f, nt, tpc);
+}
+
+// Return the intersecting face pairs of two indexed meshes as an (n, 2) array.
+NDArray<int64_t, 2>
+mesh_index_intersect(const TriangleIndex &self, const TriangleIndex &other, bool justproper) {
+    std::vector<std::array<int64_t, 2>> pairs;
+    {
+        nb::gil_scoped_release release;
+        self.intersect(other, justproper, false, pairs);
+    }
+
+    NDArray<int64_t, 2> pairs_arr = MakeNDArray<int64_t, 2>({pairs.size(), 2});
+    if (!pairs.empty()) {
+        std::memcpy(pairs_arr.data(), pairs.data(), pairs.size() * 2 * sizeof(int64_t));
+    }
+    return pairs_arr;
+}
+
+bool mesh_index_intersects(
+    const TriangleIndex &self, const TriangleIndex &other, bool justproper) {
+    std::vector<std::array<int64_t, 2>> pairs;
+    nb::gil_scoped_release release;
+    return self.intersect(other, justproper, true, pairs) > 0;
+}
+
+// Return whether each of the (n, 3) points is enclosed by an indexed mesh.
+NDArray<bool, 1>
+mesh_index_contains(const TriangleIndex &self, const NDArray<const double, 2> points) {
+    if (points.shape(1) != 3) {
+        throw std::invalid_argument("Point array must have shape (N,3)");
+    }
+    const size_t n = points.shape(0);
+    NDArray<bool, 1> inside_arr = MakeNDArray<bool, 1>({n});
+    const double *p = points.data();
+    bool *inside = inside_arr.data();
+    {
+        nb::gil_scoped_release release;
+        self.contains(p, n, inside);
+    }
+    return inside_arr;
 }
 
 NB_MODULE(_meshfix, m) { // "_meshfix" must match library name from CMakeLists.txt
+    nb::register_exception_translator([](const std::exception_ptr &p, void *) {
+        try {
+            std::rethrow_exception(p);
+        } catch (const MemoryLimitError &e) {
+            PyErr_SetString(PyExc_MemoryError, e.what());
+        }
+    });
+
     nb::class_<PyTMesh>(
         m,
         "PyTMesh",
@@ -532,6 +2157,48 @@ Provides methods to inspect, repair, and extract mesh data.
             &PyTMesh::n_boundaries,
             R"doc(
 Number of boundary loops in the mesh.
+)doc")
+        .def(
+            "boundary_loops",
+            &PyTMesh::boundary_loops,
+            R"doc(
+Return the ordered boundary loops of the mesh.
+
+Loops are walked vertex by vertex along the boundary in a single pass
+over the points, without building any intermediate mesh. They are
+returned in compressed sparse row form, where loop ``i`` is
+``indices[offsets[i]:offsets[i + 1]]``.
+
+Returns
+-------
+dict[str, np.ndarray]
+    Dictionary with the following keys:
+
+    - ``"indices"``: ``(n,)`` vertex indices of all loops, back to back.
+      Indices match the points from :func:`PyTMesh.return_arrays`.
+    - ``"offsets"``: ``(n_loops + 1,)`` start of each loop in ``indices``.
+    - ``"n_edges"``: ``(n_loops,)`` number of edges of each loop.
+    - ``"perimeter"``: ``(n_loops,)`` length of each loop.
+    - ``"bounds"``: ``(n_loops, 6)`` bounds of each loop as
+      ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+    - ``"closed"``: ``(n_loops,)`` whether each loop is closed.
+
+Loops are closed on manifold boundaries, which include all the
+boundaries of a loaded mesh, as its non-manifold vertices are split.
+Otherwise, the walk along a boundary may stop before returning to its
+first vertex. The loop is then an open chain, which ends at the vertex of
+another loop it reached, if any. Its number of edges is its number of
+vertices minus one and its perimeter has no closing edge.
+
+Examples
+--------
+>>> from pymeshfix import _meshfix
+>>> from pymeshfix.examples import planar_mesh
+>>> mfix = _meshfix.PyTMesh()
+>>> mfix.load_file(planar_mesh)
+>>> loops = mfix.boundary_loops()
+>>> loops["n_edges"].size == mfix.n_boundaries
+True
 )doc")
         .def_prop_ro(
             "n_faces",
@@ -557,6 +2224,10 @@ Join the closest disconnected mesh components.
             R"doc(
 Enable or disable console output.
 
+The setting only applies to the methods of this mesh, whichever thread
+runs them, so that meshes can be repaired concurrently from threads with
+different settings.
+
 Parameters
 ----------
 quiet : bool
@@ -567,6 +2238,60 @@ quiet : bool
             &PyTMesh::fix_connectivity,
             R"doc(
 Repair mesh connectivity issues.
+)doc")
+        .def(
+            "memory_usage",
+            &PyTMesh::memory_usage,
+            R"doc(
+Return the estimated memory used by the mesh.
+
+Sizes are estimated from the number of elements and the size of their
+allocations, including the overhead of the allocator.
+
+Returns
+-------
+dict[str, int]
+    Bytes used by ``"vertices"``, ``"edges"``, ``"triangles"`` and the
+    ``"list_nodes"`` linking them, their ``"total"``, the temporary
+    ``"buffers"`` of the intersection detection and the ``"peak"``
+    including them.
+
+Examples
+--------
+>>> from pymeshfix import _meshfix
+>>> from pymeshfix.examples import planar_mesh
+>>> tin = _meshfix.PyTMesh()
+>>> tin.load_file(planar_mesh)
+>>> usage = tin.memory_usage()
+>>> usage["total"] > usage["triangles"] > 0
+True
+)doc")
+        .def_prop_rw(
+            "memory_limit",
+            &PyTMesh::get_memory_limit,
+            &PyTMesh::set_memory_limit,
+            nb::arg("limit").none(),
+            R"doc(
+Limit of the estimated peak memory of the mesh in bytes, or ``None``.
+
+Loading arrays whose estimated peak memory exceeds the limit raises a
+``MemoryError`` before allocating the mesh. Hole filling, including the
+repair and cleaning methods, stops before the filled mesh would exceed
+the limit and raises a ``MemoryError``. The holes filled until then are
+kept.
+
+Examples
+--------
+>>> import numpy as np
+>>> from pymeshfix import _meshfix
+>>> tin = _meshfix.PyTMesh()
+>>> tin.memory_limit = 1000
+>>> v = np.random.random((1000, 3))
+>>> f = np.random.randint(0, 1000, (2000, 3))
+>>> tin.load_array(v, f)
+Traceback (most recent call last):
+...
+MemoryError: Loading the mesh needs about ...
 )doc")
         .def(
             "return_arrays",
@@ -574,13 +2299,164 @@ Repair mesh connectivity issues.
             R"doc(
 Return mesh data as vertex and face arrays.
 
+Parameters
+----------
+int64 : bool, optional
+    Return the face indices as ``int64``. By default they are ``int32``
+    unless the mesh has too many points to index them with ``int32``.
+release : bool, default: False
+    Delete the vertices, edges and faces of the mesh as they are written
+    to the arrays, which lowers the peak memory usage of the export. The
+    mesh is empty afterwards.
+out_points : numpy.ndarray[np.float64], optional
+    Writable C-contiguous array of shape ``(N, 3)`` to write the vertices
+    to instead of a new array, such as an array backed by shared memory or
+    a :class:`numpy.memmap`. See :func:`PyTMesh.output_shape`.
+out_faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64], optional
+    Writable C-contiguous array of shape ``(M, 3)`` to write the faces to
+    instead of a new array. Its type sets the type of the indices, and
+    ``int64`` must match it if given.
+reorder : bool | str, default: False
+    Sort the mesh along a space-filling curve before writing it, so that
+    points and faces close in space are close in the arrays. Either
+    ``"morton"`` or ``"hilbert"``, or ``True`` for ``"morton"``. See
+    :func:`PyTMesh.reorder`.
+
 Returns
 -------
 numpy.ndarray
-    Vertex array of shape (N, 3).
+    Vertex array of shape (N, 3), ``out_points`` if given.
 numpy.ndarray
-    Face array of shape (M, 3).
+    Face array of shape (M, 3), ``out_faces`` if given.
+
+Examples
+--------
+Export the mesh to arrays in shared memory.
+
+>>> from multiprocessing import shared_memory
+>>> points_shape, faces_shape = tin.output_shape()
+>>> shm = shared_memory.SharedMemory(create=True, size=8 * 3 * points_shape[0])
+>>> points = np.ndarray(points_shape, dtype=np.float64, buffer=shm.buf)
+>>> points, faces = tin.return_arrays(out_points=points)
+
+)doc",
+            nb::arg("int64") = nb::none(),
+            nb::arg("release") = false,
+            nb::arg("out_points") = nb::none(),
+            nb::arg("out_faces") = nb::none(),
+            nb::arg("reorder") = false)
+        .def(
+            "output_shape",
+            &PyTMesh::output_shape,
+            R"doc(
+Return the shapes of the arrays returned by :func:`PyTMesh.return_arrays`.
+
+Use it to allocate the ``out_points`` and ``out_faces`` arrays.
+
+Returns
+-------
+tuple[int, int]
+    Shape ``(N, 3)`` of the vertex array.
+tuple[int, int]
+    Shape ``(M, 3)`` of the face array.
 )doc")
+        .def(
+            "return_provenance",
+            &PyTMesh::return_provenance,
+            R"doc(
+Return the provenance of the vertices and faces of the mesh.
+
+Maps the vertices and faces returned by :func:`PyTMesh.return_arrays` back
+to the loaded arrays so attributes can be transferred with NumPy indexing.
+
+Returns
+-------
+dict[str, numpy.ndarray]
+    Dictionary containing:
+
+    * ``"vertex_origin"`` - Index of the input vertex of each vertex, or
+      ``-1`` if it was created during the repair. Shaped ``(N,)``.
+    * ``"face_origin"`` - Index of the input face of each face, or ``-1``
+      if it was created during the repair. Shaped ``(M,)``.
+    * ``"vertex_parents"`` - Up to three input vertices of each vertex.
+      Input vertices are their own parent, while new vertices use the
+      closest input vertices bounding their patch. Unused entries are
+      ``-1``. Shaped ``(N, 3)``.
+    * ``"vertex_weights"`` - Normalized inverse distance interpolation
+      weights of ``vertex_parents``, zero for unused entries. Shaped
+      ``(N, 3)``.
+
+Examples
+--------
+Transfer per-vertex scalars to the repaired mesh.
+
+>>> from pymeshfix import _meshfix
+>>> from pymeshfix.examples import bunny_scan
+>>> tin = _meshfix.PyTMesh()
+>>> tin.set_quiet(True)
+>>> tin.load_file(bunny_scan)
+>>> scalars = tin.return_points()[:, 2]
+>>> n_filled = tin.fill_small_boundaries()
+>>> prov = tin.return_provenance()
+>>> parents, weights = prov["vertex_parents"], prov["vertex_weights"]
+>>> new_scalars = (scalars[parents] * weights).sum(axis=1)
+>>> new_scalars.shape == (tin.n_points,)
+True
+
+)doc")
+        .def(
+            "return_delta",
+            &PyTMesh::return_delta<int32_t>,
+            R"doc(
+Return the changes made to the loaded arrays.
+
+Only the faces and vertices changed by the repair are returned, so the size
+of the output depends on the size of the defects rather than the size of the
+mesh. The new vertices are indexed after the input points, and applying the
+changes to the input arrays gives the repaired mesh with its faces in a
+different order. Input vertices no longer used are left in place.
+
+A vertex keeps its input index unless it was moved. The repair rounds the
+coordinates of the mesh to single precision with 6 decimals, which moves
+the vertices by up to about ``1e-6``. Vertices only moved by this rounding
+keep their input index and input coordinates, so the patched arrays may
+differ from the repaired mesh by the rounding. A face is unchanged if it
+derives from an input face and has the same vertices in the same cyclic
+order.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Vertex array the mesh was loaded from.
+faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array the mesh was loaded from.
+
+Returns
+-------
+numpy.ndarray[np.int64]
+    Indices of the removed input faces. Shaped ``(r,)``.
+numpy.ndarray[np.float64]
+    New vertices, indexed from ``len(points)``. Shaped ``(k, 3)``.
+numpy.ndarray[np.int64]
+    New faces indexing the input points followed by the new vertices.
+    Shaped ``(j, 3)``.
+
+Examples
+--------
+Apply the changes to the input arrays.
+
+>>> removed, new_points, new_faces = tin.return_delta(points, faces)
+>>> points = np.vstack((points, new_points))
+>>> faces = np.vstack((np.delete(faces, removed, axis=0), new_faces))
+
+)doc",
+            nb::arg("points"),
+            nb::arg("faces"))
+        .def(
+            "return_delta",
+            &PyTMesh::return_delta<int64_t>,
+            nb::arg("points"),
+            nb::arg("faces"))
         .def(
             "return_points",
             &PyTMesh::return_points,
@@ -597,7 +2473,18 @@ numpy.ndarray
             &PyTMesh::strong_intersection_removal,
             R"doc(
 Iteratively removes self-intersecting triangles.
-)doc")
+
+Parameters
+----------
+max_iters : int
+    Maximum number of iterations.
+tris_per_cell : int | str, default: 50
+    Maximum number of triangles per cell of the space subdivision used to
+    detect intersections, or ``"auto"``. See
+    :func:`select_intersecting_triangles`.
+)doc",
+            nb::arg("max_iters"),
+            nb::arg("tris_per_cell") = 50)
         .def(
             "strong_degeneracy_removal",
             &PyTMesh::strong_degeneracy_removal,
@@ -610,11 +2497,19 @@ Iteratively removes degenerate triangles and closes holes.
             R"doc(
 Return the face array.
 
+Parameters
+----------
+int64 : bool, optional
+    Return the face indices as ``int64``. By default they are ``int32``
+    unless the mesh has too many points to index them with ``int32``.
+    Setting this to ``False`` for such a mesh raises an ``OverflowError``.
+
 Returns
 -------
-numpy.ndarray[np.int32]
-    Fase array of shape ``(M, 3)``.
-)doc")
+numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array of shape ``(M, 3)``.
+)doc",
+            nb::arg("int64") = nb::none())
         .def(
             "load_file",
             &PyTMesh::load_file,
@@ -642,6 +2537,161 @@ refine : bool, default: True
 )doc",
             nb::arg("nbe") = 0,
             nb::arg("refine") = true)
+        .def(
+            "fill_holes",
+            &PyTMesh::fill_holes,
+            R"doc(
+Fill holes with bounded refinement and report the size of each patch.
+
+Each hole is triangulated and, if ``refine`` is set, refined by inserting
+vertices until the edges of the patch match the edges surrounding the hole.
+The refinement can be bounded so that large holes on finely sampled meshes
+do not add millions of faces. When a patch is expected to exceed
+``max_new_triangles``, it is refined with longer edges to fit, and the
+refinement stops once the limit is reached. The initial triangulation of a
+hole is always kept, even when it alone exceeds the limit.
+
+Parameters
+----------
+nbe : int, default: 0
+    Maximum number of boundary edges to fill. If 0, fill all.
+refine : bool, default: True
+    Refine filled regions.
+max_new_triangles : int, default: 0
+    Maximum number of faces added to each hole. If 0, there is no limit.
+target_edge_length : float, default: 0.0
+    Edge length of the refined patches. If 0, the length of the edges
+    surrounding each hole is used.
+density_scale : float, default: 1.0
+    Scale of the number of vertices per unit area of the refined patches.
+    Values below 1 produce coarser patches.
+
+Returns
+-------
+numpy.ndarray[np.int64]
+    Number of faces added to each hole filled.
+
+Examples
+--------
+>>> sizes = mfix.fill_holes(max_new_triangles=10_000, density_scale=0.25)
+>>> sizes.size, sizes.sum()
+(12, 5413)
+)doc",
+            nb::arg("nbe") = 0,
+            nb::arg("refine") = true,
+            nb::arg("max_new_triangles") = 0,
+            nb::arg("target_edge_length") = 0.0,
+            nb::arg("density_scale") = 1.0)
+        .def(
+            "faces_in_region",
+            &PyTMesh::faces_in_region,
+            R"doc(
+Return a mask of the faces within an axis aligned box and/or a sphere.
+
+A face is within the region when any of its vertices is.
+
+Parameters
+----------
+bounds : sequence[float], optional
+    Bounds of the box as ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+center : sequence[float], optional
+    Center of the sphere.
+radius : float, default: 0.0
+    Radius of the sphere. Required when ``center`` is given.
+
+Returns
+-------
+numpy.ndarray[bool]
+    Boolean mask with one entry per face.
+)doc",
+            nb::arg("bounds") = nb::none(),
+            nb::arg("center") = nb::none(),
+            nb::arg("radius") = 0.0)
+        .def(
+            "clean_region",
+            &PyTMesh::clean_region,
+            R"doc(
+Remove degenerate faces and self-intersections within a region of the mesh.
+
+The flagged faces, grown by ``halo`` rings of neighboring faces, are copied
+out of the mesh, cleaned with their seam to the rest of the mesh held fixed,
+and spliced back. Only the region is visited by the repair, so its cost
+scales with the size of the region rather than with the size of the mesh.
+When the region cannot be cleaned without modifying its seam, the whole mesh
+is cleaned instead and all faces are reported as changed.
+
+Defects outside of the region, including intersections between the region
+and the rest of the mesh, are left untouched.
+
+Parameters
+----------
+face_mask : numpy.ndarray[bool]
+    Boolean mask with one entry per face flagging the region to clean.
+halo : int, default: 2
+    Number of rings of neighboring faces added to the region. A wider halo
+    gives the repair more room to work without touching the seam.
+max_iters : int, default: 10
+    Maximum number of cleaning iterations.
+inner_loops : int, default: 3
+    Number of inner optimization loops per iteration.
+tris_per_cell : int | str, default: 50
+    Maximum number of triangles per cell of the space subdivision used to
+    detect intersections, or ``"auto"``. See
+    :func:`select_intersecting_triangles`.
+
+Returns
+-------
+bool
+    ``True`` when the region could be completely cleaned.
+numpy.ndarray[np.int64]
+    Indices of the faces created or modified by the repair.
+)doc",
+            nb::arg("face_mask"),
+            nb::arg("halo") = 2,
+            nb::arg("max_iters") = 10,
+            nb::arg("inner_loops") = 3,
+            nb::arg("tris_per_cell") = 50)
+        .def(
+            "fill_region_boundaries",
+            &PyTMesh::fill_region_boundaries,
+            R"doc(
+Fill the holes within a region of the mesh.
+
+Only the holes whose boundary is entirely surrounded by the flagged faces,
+grown by ``halo`` rings of neighboring faces, are filled.
+
+Parameters
+----------
+face_mask : numpy.ndarray[bool]
+    Boolean mask with one entry per face flagging the region to fill.
+halo : int, default: 2
+    Number of rings of neighboring faces added to the region.
+nbe : int, default: 0
+    Maximum number of boundary edges to fill. If 0, fill all.
+refine : bool, default: True
+    Refine filled regions.
+max_new_triangles : int, default: 0
+    Maximum number of faces added to each hole. See :func:`fill_holes`.
+target_edge_length : float, default: 0.0
+    Edge length of the refined patches. See :func:`fill_holes`.
+density_scale : float, default: 1.0
+    Scale of the sampling density of the refined patches. See
+    :func:`fill_holes`.
+
+Returns
+-------
+int
+    Number of holes filled.
+numpy.ndarray[np.int64]
+    Indices of the new faces.
+)doc",
+            nb::arg("face_mask"),
+            nb::arg("halo") = 2,
+            nb::arg("nbe") = 0,
+            nb::arg("refine") = true,
+            nb::arg("max_new_triangles") = 0,
+            nb::arg("target_edge_length") = 0.0,
+            nb::arg("density_scale") = 1.0)
         .def(
             "clean",
             &PyTMesh::clean,
@@ -654,9 +2704,19 @@ max_iters : int, default: 10
     Maximum number of cleaning iterations.
 inner_loops : int, default: 3
     Number of inner optimization loops per iteration.
+tris_per_cell : int | str, default: 50
+    Maximum number of triangles per cell of the space subdivision used to
+    detect intersections, or ``"auto"``. See
+    :func:`select_intersecting_triangles`.
 )doc",
             nb::arg("max_iters") = 10,
-            nb::arg("inner_loops") = 3)
+            nb::arg("inner_loops") = 3,
+            nb::arg("tris_per_cell") = 50)
+        .def(
+            "_vertex_fan_mismatches",
+            &PyTMesh::_vertex_fan_mismatches,
+            "Number of vertices whose allocation-free adjacency queries differ from "
+            "the List versions.")
         .def("boundaries", &PyTMesh::_boundaries)
         .def(
             "save_file",
@@ -682,11 +2742,20 @@ Select intersecting triangles in the mesh.
 
 Parameters
 ----------
-tris_per_cell : int, default: 50
+tris_per_cell : int | str, default: 50
     The depth of the recursive space subdivision used to keep
     the complexity under a reasonable threshold. The default value
     is safe in most cases.
 
+    With ``"auto"``, the number of triangles per cell is chosen from a
+    sampled count of the triangle bounding boxes overlapping each other,
+    between 8 and 400, and the maximum number of subdivisions grows with
+    the number of triangles. A cell is also left whole when most of its
+    triangles straddle the cut, as splitting it would only duplicate them,
+    and the subdivision stops when the cells hold four times as many
+    entries as there are triangles. This suits meshes with uneven triangle
+    sizes or many overlaps.
+
 justproper : bool, default: False
     If ``justproper`` is true, coincident edges and vertices are not
     regarded as intersections even if they are not common
@@ -694,7 +2763,7 @@ justproper : bool, default: False
 
 Returns
 -------
-np.ndarray[np.int32]
+numpy.ndarray[np.int64]
    Face array shaped ``(m, 3)`` of self-intersecting triangles.
 
 )doc",
@@ -706,9 +2775,182 @@ np.ndarray[np.int32]
             R"doc(
 Remove all but the largest connected mesh component.
 )doc")
+        .def(
+            "decimate",
+            &PyTMesh::decimate,
+            R"doc(
+Reduce the number of faces by collapsing edges.
+
+Edges are collapsed in order of their quadric error, the sum of the
+squared distances from the planes of the original faces around them, and
+the remaining vertex is placed where this error is the smallest. The
+candidates are kept in a heap updated around each collapse.
+
+Collapses that would make the mesh non-manifold or flip a face are
+skipped, so fewer faces than requested may be removed. Boundaries are
+preserved: boundary edges and edges joining two boundary vertices are
+never collapsed, and boundary vertices are not moved.
+
+Parameters
+----------
+target_faces : int, optional
+    Number of faces to reduce the mesh to.
+target_reduction : float, optional
+    Fraction of the faces to remove, in ``[0, 1)``. Exactly one of
+    ``target_faces`` and ``target_reduction`` must be given.
+
+Returns
+-------
+int
+    Number of faces removed.
+
+Raises
+------
+ValueError
+    If not exactly one valid target is given.
+
+Examples
+--------
+>>> from pymeshfix import _meshfix
+>>> from pymeshfix.examples import bunny_scan
+>>> tin = _meshfix.PyTMesh()
+>>> tin.load_file(bunny_scan)
+>>> n_removed = tin.decimate(target_reduction=0.5)
+)doc",
+            nb::arg("target_faces") = nb::none(),
+            nb::arg("target_reduction") = nb::none())
+        .def(
+            "reorder",
+            &PyTMesh::reorder,
+            R"doc(
+Sort the points, edges and faces of the mesh along a space-filling curve.
+
+Points are sorted by their position, and edges and faces by their center,
+quantized to 21 bits per axis within the bounding box of the mesh. Elements
+close in space are then close in memory and in the exported arrays, which
+speeds up the traversals of the repair and of downstream processing. Hole
+filling and other repairs append their new elements out of order, so the
+mesh may be reordered again before further heavy stages.
+
+The geometry and connectivity of the mesh are unchanged. The indices of
+the points and faces are not, so arrays indexed by point or face, such as
+the faces returned by :func:`PyTMesh.clean_region`, must be computed after
+reordering. Provenance is kept.
+
+Parameters
+----------
+method : str, default: "morton"
+    Space-filling curve, either ``"morton"`` (Z-order) or ``"hilbert"``.
+    The Hilbert curve has no jumps between distant regions and gives a
+    slightly better locality, while Morton keys are faster to compute.
+
+Examples
+--------
+>>> tin.fill_small_boundaries()
+>>> tin.reorder("hilbert")
+>>> tin.clean()
+)doc",
+            nb::arg("method") = "morton")
+        .def(
+            "run_pipeline",
+            &PyTMesh::run_pipeline,
+            R"doc(
+Run a sequence of repair stages in a single call.
+
+The stages are validated before the repair starts and the whole pipeline
+runs without holding the GIL. See :class:`pymeshfix.RepairPipeline` for
+the available stages, their parameters and the built-in presets.
+
+Parameters
+----------
+stages : list[dict]
+    Stages to run in order. Each stage is a dict with a ``"stage"`` name
+    and the parameters of the stage.
+
+Returns
+-------
+list[dict]
+    Report for each stage with the keys:
+
+    * ``"stage"``: name of the stage.
+    * ``"result"``: number of components removed or joined, or of holes
+      filled, or whether the mesh could be completely cleaned.
+    * ``"time"``: time spent in the stage in seconds.
+    * ``"timed_out"``: whether the stage stopped at its ``time_limit``.
+
+Raises
+------
+ValueError
+    If a stage or one of its parameters is unknown.
+
+Examples
+--------
+>>> mfix.run_pipeline([{"stage": "fill_holes"}, {"stage": "clean", "max_iters": 1}])
+[{'stage': 'fill_holes', 'result': 4, 'time': 0.004, 'timed_out': False},
+ {'stage': 'clean', 'result': True, 'time': 0.051, 'timed_out': False}]
+)doc",
+            nb::arg("stages"))
+        .def(
+            "deviation",
+            &PyTMesh::deviation<int32_t>,
+            R"doc(
+Measure the distances between this mesh and an original mesh.
+
+Both surfaces are indexed with the space subdivision used to detect
+intersections and each distance is found with a closest point query.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Vertex array of the original mesh shaped ``(n, 3)``.
+faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array of the original mesh shaped ``(m, 3)``.
+symmetric : bool, default: True
+    Also measure the distances from the original mesh to this one.
+    Otherwise, only the distances from this mesh are measured.
+sample_spacing : float, default: 0.0
+    If positive, also measure the distances of points sampled on the faces
+    at most this far apart. Only the vertices are measured by default.
+tolerance : float, optional
+    Stop at the first distance above this value.
+tris_per_cell : int | str, default: "auto"
+    Maximum number of triangles per cell of the space subdivision, see
+    :func:`select_intersecting_triangles`.
+
+Returns
+-------
+dict
+    Dictionary with the keys:
+
+    * ``"distances"``: distance of each vertex of this mesh to the original
+      surface.
+    * ``"original_distances"``: distance of each original vertex to this
+      surface, or ``None`` unless ``symmetric``. Vertices not used by any
+      face are NaN.
+    * ``"hausdorff"``: largest distance measured.
+    * ``"mean"``: mean of the distances measured, including the samples.
+    * ``"exceeded"``: whether a distance is above ``tolerance``. The
+      measurement then stopped and the vertices not yet measured are NaN.
+
+)doc",
+            nb::arg("points"),
+            nb::arg("faces"),
+            nb::arg("symmetric") = true,
+            nb::arg("sample_spacing") = 0.0,
+            nb::arg("tolerance") = nb::none(),
+            nb::arg("tris_per_cell") = "auto")
+        .def(
+            "deviation",
+            &PyTMesh::deviation<int64_t>,
+            nb::arg("points"),
+            nb::arg("faces"),
+            nb::arg("symmetric") = true,
+            nb::arg("sample_spacing") = 0.0,
+            nb::arg("tolerance") = nb::none(),
+            nb::arg("tris_per_cell") = "auto")
         .def(
             "load_array",
-            &PyTMesh::load_array,
+            &PyTMesh::load_array<int32_t>,
             R"doc(
 Load a surface mesh from vertex and face arrays.
 
@@ -716,15 +2958,235 @@ Parameters
 ----------
 points_arr : numpy.ndarray
     Vertex array of shape ``(n, 3)``.
-faces_arr : numpy.ndarray
-    Face array of shape ``(m, 3)``.
+faces_arr : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array of shape ``(m, 3)``. Both ``int32`` and ``int64`` indices
+    are used without a copy.
 )doc",
             nb::arg("points_arr"),
-            nb::arg("faces_arr") = false);
+            nb::arg("faces_arr") = false)
+        .def(
+            "load_array",
+            &PyTMesh::load_array<int64_t>,
+            nb::arg("points_arr"),
+            nb::arg("faces_arr") = false)
+        .def(
+            "append_arrays",
+            &PyTMesh::append_arrays<int32_t>,
+            R"doc(
+Append a chunk of points and faces to the mesh.
+
+Builds a mesh from chunks, such as the tiles of a reconstruction, without
+concatenating them first. The points of each chunk that coincide with the
+points of the previous chunks are welded to them, so that the chunks are
+connected along their seams. Points are looked up in a spatial hash of a
+grid of cells of twice ``weld_tol``. Points of the same chunk are not
+welded together, as by :func:`PyTMesh.load_array`.
+
+The connectivity of the mesh is only fixed once all the chunks are
+appended, by :func:`PyTMesh.finalize`. Until then, the other methods
+raise a ``RuntimeError``, except for :attr:`PyTMesh.n_points`,
+:attr:`PyTMesh.n_faces` and the memory settings. The indices of the
+chunks are kept until then, in about the memory
+:func:`PyTMesh.load_array` uses to load the whole mesh.
+
+The origin of each point and face, see :func:`PyTMesh.return_provenance`,
+is its index in the concatenated chunks.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Points of the chunk, of shape ``(n, 3)``.
+faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Faces of the chunk, of shape ``(m, 3)``, indexing ``points``.
+weld_tol : float, optional
+    Distance within which a point is welded to the nearest point of the
+    previous chunks. By default, only exactly coincident points are
+    welded.
+
+Returns
+-------
+int
+    Number of points welded to the points of the previous chunks.
+
+Raises
+------
+ValueError
+    If the arrays have the wrong shape, a face index is out of range or
+    ``weld_tol`` is negative. The mesh is unchanged.
+RuntimeError
+    If the mesh was loaded from arrays or a file, or finalized.
+MemoryError
+    If the mesh would exceed :attr:`PyTMesh.memory_limit`.
+
+Examples
+--------
+>>> tin = PyTMesh()
+>>> for points, faces in chunks:
+...     tin.append_arrays(points, faces, weld_tol=1e-6)
+>>> tin.finalize()
+>>> tin.clean()
+)doc",
+            nb::arg("points"),
+            nb::arg("faces"),
+            nb::arg("weld_tol") = nb::none())
+        .def(
+            "append_arrays",
+            &PyTMesh::append_arrays<int64_t>,
+            nb::arg("points"),
+            nb::arg("faces"),
+            nb::arg("weld_tol") = nb::none())
+        .def(
+            "finalize",
+            &PyTMesh::finalize,
+            R"doc(
+Fix the connectivity of a mesh built with :func:`PyTMesh.append_arrays`.
+
+Frees the indices of the appended chunks, splits the non-manifold
+vertices and updates the numbers of boundaries, handles and shells, as
+:func:`PyTMesh.load_array` does after loading. No more chunks can be
+appended afterwards.
+
+Raises
+------
+RuntimeError
+    If no arrays have been appended.
+)doc");
+
+    nb::class_<TriangleIndex>(
+        m,
+        "MeshIndex",
+        R"doc(
+Spatial index of the faces of a mesh for intersection and containment
+queries.
+
+The index is built once from a copy of the mesh and may be queried against
+any number of other indexes. Build one index per mesh to avoid rebuilding
+it in every query, see :func:`pymeshfix.intersect`. Queries do not hold
+the GIL and may run concurrently from threads.
+
+The faces are indexed as independent triangles, so non-manifold meshes are
+supported. Faces with coincident indices are not indexed.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Vertex array of shape ``(n, 3)``.
+faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array of shape ``(m, 3)``.
+tris_per_cell : int | str, default: "auto"
+    Maximum number of triangles per cell of the space subdivision, see
+    :func:`PyTMesh.select_intersecting_triangles`.
+
+Raises
+------
+ValueError
+    If the arrays have the wrong shape or a face index is out of range.
+
+)doc")
+        .def(
+            "__init__",
+            &init_mesh_index<int32_t>,
+            nb::arg("points"),
+            nb::arg("faces"),
+            nb::arg("tris_per_cell") = "auto")
+        .def(
+            "__init__",
+            &init_mesh_index<int64_t>,
+            nb::arg("points"),
+            nb::arg("faces"),
+            nb::arg("tris_per_cell") = "auto")
+        .def_prop_ro(
+            "n_faces",
+            &TriangleIndex::numTriangles,
+            R"doc(
+Number of indexed faces.
+)doc")
+        .def_prop_ro(
+            "n_cells",
+            &TriangleIndex::numCells,
+            R"doc(
+Number of cells of the space subdivision, including the internal ones.
+)doc")
+        .def(
+            "intersect",
+            &mesh_index_intersect,
+            R"doc(
+Return the pairs of intersecting faces of this mesh and another one.
+
+Parameters
+----------
+other : MeshIndex
+    Index of the other mesh.
+justproper : bool, default: False
+    If ``True``, coincident edges and vertices are not regarded as
+    intersections.
+
+Returns
+-------
+numpy.ndarray[np.int64]
+    Array of shape ``(k, 2)`` with the index of a face of this mesh and of
+    a face of ``other`` in each row, sorted by row.
+
+)doc",
+            nb::arg("other"),
+            nb::arg("justproper") = false)
+        .def(
+            "intersects",
+            &mesh_index_intersects,
+            R"doc(
+Return whether this mesh intersects another one.
+
+The query stops at the first pair of intersecting faces.
+
+Parameters
+----------
+other : MeshIndex
+    Index of the other mesh.
+justproper : bool, default: False
+    If ``True``, coincident edges and vertices are not regarded as
+    intersections.
+
+Returns
+-------
+bool
+    Whether any face of this mesh intersects a face of ``other``.
+
+)doc",
+            nb::arg("other"),
+            nb::arg("justproper") = false)
+        .def(
+            "contains",
+            &mesh_index_contains,
+            R"doc(
+Return whether points are enclosed by the mesh.
+
+Each point casts a ray and counts the faces it crosses, visiting only the
+cells of the index crossed by the ray. Rays through edges and vertices are
+resolved exactly, so the result is reliable for closed meshes whatever the
+orientation of their faces. Points on the surface may be classified either
+way. Holes and intersecting faces make the result ambiguous near them.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Array of shape ``(n, 3)`` of the points to test.
+
+Returns
+-------
+numpy.ndarray[bool]
+    Whether each point is inside the mesh.
+
+Raises
+------
+ValueError
+    If ``points`` does not have shape ``(n, 3)``.
+
+)doc",
+            nb::arg("points"));
 
     m.def(
         "clean_from_arrays",
-        &clean_from_arrays,
+        &clean_from_arrays<int32_t>,
         R"doc(
 Clean and repair a triangular surface mesh from vertex and face arrays.
 
@@ -732,7 +3194,7 @@ Parameters
 ----------
 v : numpy.ndarray[np.float64]
     Vertex array of shape ``(n, 3)``.
-f : numpy.ndarray[np.int32]
+f : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
     Face array of shape ``(m, 3)``.
 verbose : bool, default: False
     Enable verbose output.
@@ -740,13 +3202,45 @@ joincomp : bool, default: False
     Attempt to join nearby open components.
 remove_smallest_components : bool, default: True
     Remove all but the largest connected component before repair.
+provenance : bool, default: False
+    Also return the provenance of the cleaned vertices and faces. See
+    :func:`PyTMesh.return_provenance`.
+int64 : bool, optional
+    Return the face indices as ``int64``. By default they are ``int32``
+    unless the mesh has too many points to index them with ``int32``.
+delta : bool, default: False
+    Return only the changes made to the input arrays instead of the cleaned
+    arrays. See :func:`PyTMesh.return_delta`. Not available with
+    ``provenance``.
+skip_if_clean : bool, default: False
+    Inspect the mesh first with :func:`pymeshfix.inspect`, including its
+    self-intersections, and return the input arrays without a copy if there
+    is nothing to fix. The face array keeps its type unless ``int64`` asks
+    for the other one, and the arrays are copied to those of ``out``. The
+    provenance of an unchanged mesh is the identity and its delta is empty.
+    Several components are accepted unless ``remove_smallest_components``
+    is set.
+memory_limit : int, optional
+    Limit of the estimated peak memory of the repair in bytes. See
+    :attr:`PyTMesh.memory_limit`.
+out : callable, optional
+    Called as ``out(n_points, n_faces)`` once the size of the cleaned mesh
+    is known, and returning a tuple of the vertex and face arrays to write
+    the cleaned mesh to, as the ``out_points`` and ``out_faces`` of
+    :func:`PyTMesh.return_arrays`. Either may be ``None`` to allocate a new
+    array. Not available with ``delta``.
 
 Returns
 -------
 numpy.ndarray
-    Cleaned vertex array.
+    Cleaned vertex array, or the one returned by ``out``.
 numpy.ndarray
-    Cleaned face array.
+    Cleaned face array, or the one returned by ``out``.
+dict[str, numpy.ndarray]
+    Provenance of the cleaned mesh. Only returned when ``provenance=True``.
+
+With ``delta=True``, the indices of the removed faces, the new vertices and
+the new faces are returned instead, as from :func:`PyTMesh.return_delta`.
 
 Examples
 --------
@@ -756,12 +3250,98 @@ Examples
 >>> faces = np.load('faces.npy')
 >>> clean_points, clean_faces = pymeshfix.clean_from_arrays(points, faces)
 
+Skip the repair of meshes with nothing to fix.
+
+>>> clean_points, clean_faces = pymeshfix.clean_from_arrays(
+...     points, faces, skip_if_clean=True
+... )
+
+Fail with a ``MemoryError`` instead of exceeding 2 GB.
+
+>>> clean_points, clean_faces = pymeshfix.clean_from_arrays(
+...     points, faces, memory_limit=2 * 1024**3
+... )
+
+Write the cleaned mesh to memory-mapped files.
+
+>>> def out(n_points, n_faces):
+...     return (
+...         np.lib.format.open_memmap('clean_points.npy', 'w+', np.float64, (n_points, 3)),
+...         np.lib.format.open_memmap('clean_faces.npy', 'w+', np.int32, (n_faces, 3)),
+...     )
+>>> clean_points, clean_faces = pymeshfix.clean_from_arrays(points, faces, out=out)
+
 )doc",
         nb::arg("v"),
         nb::arg("f"),
         nb::arg("verbose") = false,
         nb::arg("joincomp") = false,
-        nb::arg("remove_smallest_components") = true);
+        nb::arg("remove_smallest_components") = true,
+        nb::arg("provenance") = false,
+        nb::arg("int64") = nb::none(),
+        nb::arg("delta") = false,
+        nb::arg("skip_if_clean") = false,
+        nb::arg("memory_limit") = nb::none(),
+        nb::arg("out") = nb::none());
+    m.def(
+        "clean_from_arrays",
+        &clean_from_arrays<int64_t>,
+        nb::arg("v"),
+        nb::arg("f"),
+        nb::arg("verbose") = false,
+        nb::arg("joincomp") = false,
+        nb::arg("remove_smallest_components") = true,
+        nb::arg("provenance") = false,
+        nb::arg("int64") = nb::none(),
+        nb::arg("delta") = false,
+        nb::arg("skip_if_clean") = false,
+        nb::arg("memory_limit") = nb::none(),
+        nb::arg("out") = nb::none());
+
+    m.def(
+        "estimate_memory",
+        &estimate_memory,
+        R"doc(
+Estimate the memory needed to load and repair a mesh.
+
+The estimate is computed from the numbers of elements only, before any
+allocation, and matches :func:`PyTMesh.memory_usage` of the loaded mesh.
+Compare its ``"peak"`` with the available memory or pass it as
+:attr:`PyTMesh.memory_limit`.
+
+Parameters
+----------
+n_points : int
+    Number of points of the mesh.
+n_faces : int
+    Number of faces of the mesh.
+new_faces : int, default: 0
+    Number of faces expected to be added by the repair, for instance by
+    filling holes.
+
+Returns
+-------
+dict[str, int]
+    Estimated bytes by category, as from :func:`PyTMesh.memory_usage`.
+    ``"buffers"`` covers the temporary memory of both loading and
+    intersection detection.
+
+Raises
+------
+ValueError
+    If a count is negative.
+
+Examples
+--------
+>>> import pymeshfix
+>>> estimate = pymeshfix.estimate_memory(500_000, 1_000_000)
+>>> estimate["peak"] > estimate["total"]
+True
+
+)doc",
+        nb::arg("n_points"),
+        nb::arg("n_faces"),
+        nb::arg("new_faces") = 0);
 
     m.def(
         "clean_from_file",
@@ -792,4 +3372,117 @@ Clean a mesh without using pyvista or vtk.
         nb::arg("outfile"),
         nb::arg("verbose") = false,
         nb::arg("joincomp") = false);
+
+    m.def(
+        "inspect",
+        &inspect<int32_t>,
+        R"doc(
+Count the defects of a triangular surface mesh given as arrays.
+
+The mesh is not loaded as a :class:`PyTMesh`. Its edges are matched by
+sorting their vertex indices, so inspecting a mesh is much cheaper than
+repairing it, and a mesh with no defects can skip the repair, see
+``skip_if_clean`` in :func:`pymeshfix.clean_from_arrays`.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Vertex array of shape ``(n, 3)``.
+faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array of shape ``(m, 3)``.
+intersections : bool, default: False
+    Also count the faces intersecting other faces, using the index of
+    :class:`pymeshfix.MeshIndex`. This is the most expensive check.
+tris_per_cell : int | str, default: "auto"
+    Maximum number of triangles per cell of the index used to find the
+    intersections.
+
+Returns
+-------
+dict
+    Dictionary with the keys:
+
+    * ``"n_points"`` and ``"n_faces"``: size of the mesh.
+    * ``"boundary_edges"``: edges used by one face.
+    * ``"nonmanifold_edges"``: edges used by more than two faces.
+    * ``"misoriented_edges"``: edges used by two faces in the same
+      direction.
+    * ``"nonmanifold_vertices"``: vertices where separate fans of faces
+      meet.
+    * ``"duplicate_faces"``: faces with the same vertices as another one,
+      counted once per repetition.
+    * ``"degenerate_faces"``: faces with repeated indices or collinear
+      vertices.
+    * ``"unused_vertices"``: vertices not used by any face.
+    * ``"components"``: number of sets of faces connected through their
+      edges.
+    * ``"intersecting_faces"``: faces intersecting another one, or ``None``
+      unless ``intersections``.
+
+Raises
+------
+ValueError
+    If the arrays have the wrong shape or a face index is out of range.
+
+Examples
+--------
+>>> import pymeshfix
+>>> report = pymeshfix.inspect(points, faces)
+>>> report["boundary_edges"]
+12
+
+)doc",
+        nb::arg("points"),
+        nb::arg("faces"),
+        nb::arg("intersections") = false,
+        nb::arg("tris_per_cell") = "auto");
+    m.def(
+        "inspect",
+        &inspect<int64_t>,
+        nb::arg("points"),
+        nb::arg("faces"),
+        nb::arg("intersections") = false,
+        nb::arg("tris_per_cell") = "auto");
+
+    m.def(
+        "is_clean",
+        &is_clean<int32_t>,
+        R"doc(
+Return whether a mesh given as arrays has nothing for the repair to fix.
+
+Runs the checks of :func:`pymeshfix.inspect` and only looks for
+intersecting faces, the most expensive check, when every other count is
+zero. The search for intersections stops at the first intersecting pair.
+This is the check of ``skip_if_clean`` in
+:func:`pymeshfix.clean_from_arrays`.
+
+Parameters
+----------
+points : numpy.ndarray[np.float64]
+    Vertex array of shape ``(n, 3)``.
+faces : numpy.ndarray[np.int32] | numpy.ndarray[np.int64]
+    Face array of shape ``(m, 3)``.
+single_component : bool, default: False
+    Also require the mesh to have a single component.
+
+Returns
+-------
+bool
+    ``True`` if the mesh has no defect.
+
+Raises
+------
+ValueError
+    If the arrays have the wrong shape or a face index is out of range.
+
+)doc",
+        nb::arg("points"),
+        nb::arg("faces"),
+        nb::arg("single_component") = false);
+    m.def(
+        "is_clean",
+        &is_clean<int64_t>,
+        nb::arg("points"),
+        nb::arg("faces"),
+        nb::arg("single_component") = false);
 }
@@ -9,6 +9,9 @@
 #if defined(__linux__) || defined(__APPLE__)
 #include <sys/mman.h> // for madvise on Linux
 #endif
+#if defined(__GLIBC__)
+#include <malloc.h> // for malloc_trim
+#endif
 
 namespace nb = nanobind;
 // using namespace nb::literals;
@@ -35,22 +38,31 @@ template <typename T> T *AllocateArray(size_t total, bool zero_initialize = fals
     return data;
 }
 
+// Number of elements deleted between two calls of ReleaseFreedMemory when
+// releasing a mesh.
+const size_t RELEASE_BATCH = 1u << 20u;
+
+// Give the memory of deleted small objects back to the operating system.
+//
+// glibc keeps freed chunks in the heap, where they cannot be reused by the
+// large allocations of output arrays.
+inline void ReleaseFreedMemory() {
+#if defined(__GLIBC__)
+    malloc_trim(0);
+#endif
+}
+
 // wrap an existing array as a numpy ndarray
 template <typename T, size_t N>
 NDArray<T, N>
-WrapNDarray(T *data, const std::array<int, N> shape, bool zero_initialize = false) {
-    size_t shape_[N];
-    for (size_t i = 0; i < N; ++i) {
-        shape_[i] = shape[i];
-    }
-
+WrapNDarray(T *data, const std::array<size_t, N> shape, bool zero_initialize = false) {
     nb::capsule owner(data, [](void *p) noexcept { delete[] (T *)p; });
 
-    return NDArray<T, N>(data, N, shape_, owner);
+    return NDArray<T, N>(data, N, shape.data(), owner);
 }
 
 template <typename T, size_t N>
-NDArray<T, N> MakeNDArray(const std::array<int, N> shape, bool zero_initialize = false) {
+NDArray<T, N> MakeNDArray(const std::array<size_t, N> shape, bool zero_initialize = false) {
 
     // Calculate the total number of elements in the ndarray
     size_t total = 1;
@@ -58,15 +70,10 @@ NDArray<T, N> MakeNDArray(const std::array<int, N> shape, bool zero_initialize =
         total *= shape[i];
     }
 
-    size_t shape_[N];
-    for (size_t i = 0; i < N; i++) {
-        shape_[i] = shape[i];
-    }
-
     T *data = AllocateArray<T>(total, zero_initialize);
     nb::capsule owner(data, [](void *p) noexcept { delete[] (T *)p; });
 
-    return NDArray<T, N>(data, N, shape_, owner);
+    return NDArray<T, N>(data, N, shape.data(), owner);
 }
 
 #endif // ARRAY_SUPPORT_HEADER_H
@@ -68,7 +68,7 @@ class TMesh
 
  static const char *filename; // This might be null. If not, it represents the file we are currently working with.
 
- static bool quiet;
+ static thread_local bool quiet; // Per thread, so that meshes can be repaired concurrently
 
  static void init(void (*)(const char *, int) = NULL);
 
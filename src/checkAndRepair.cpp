@@ -31,6 +31,7 @@
 #include "tmesh.h"
 #include "jqsort.h"
 #include <stdlib.h>
+#include <inttypes.h>
 #include <string.h>
 
 namespace T_MESH
@@ -52,8 +53,8 @@ const char *Basic_TMesh::checkConnectivity()
  Vertex *v;
  Edge *e,*e2;
  Triangle *t;
- Node *n,*m;
- List *ve;
+ Node *n;
+ VertexFan<Edge> ve;
 
  FOREACHVERTEX(v, n)
  {
@@ -95,20 +96,18 @@ const char *Basic_TMesh::checkConnectivity()
 
  FOREACHEDGE(e, n)
  {
-  ve = e->v1->VE();
-  FOREACHVEEDGE(ve, e2, m)
+  e->v1->VE(ve);
+  for (int i = 0; i < ve.numels(); i++)
   {
-   if (e2 != e && e2->oppositeVertex(e->v1) == e->v2) return "checkConnectivity: detected duplicate edge!";
+   if ((e2 = ve[i]) != e && e2->oppositeVertex(e->v1) == e->v2) return "checkConnectivity: detected duplicate edge!";
   }
-  if (ve->containsNode(e) == NULL) return "checkConnectivity: detected non manifold vertex!";
-  delete(ve);
-  ve = e->v2->VE();
-  FOREACHVEEDGE(ve, e2, m)
+  if (!ve.contains(e)) return "checkConnectivity: detected non manifold vertex!";
+  e->v2->VE(ve);
+  for (int i = 0; i < ve.numels(); i++)
   {
-   if (e2 != e && e2->oppositeVertex(e->v2) == e->v1) return "checkConnectivity: detected duplicate edge!";
+   if ((e2 = ve[i]) != e && e2->oppositeVertex(e->v2) == e->v1) return "checkConnectivity: detected duplicate edge!";
   }
-  if (ve->containsNode(e) == NULL) return "checkConnectivity: detected non manifold vertex!";
-  delete(ve);
+  if (!ve.contains(e)) return "checkConnectivity: detected non manifold vertex!";
  }
 
  return NULL;
@@ -125,47 +124,45 @@ const char *Basic_TMesh::checkConnectivity()
 //
 ////////////////////////////////////////////////////////////////////
 
-int Basic_TMesh::duplicateNonManifoldVertices()
+int64_t Basic_TMesh::duplicateNonManifoldVertices()
 {
  Vertex *v;
- Edge *e, *f;
- Node *n, *m;
- List *ve;
- int dv = 0;
+ Edge *e;
+ Node *n;
+ VertexFan<Edge> ve;
+ int64_t dv = 0;
 
  FOREACHEDGE(e, n)
  {
-  ve = e->v1->VE();
-  if (ve->containsNode(e) == NULL)
+  e->v1->VE(ve);
+  if (!ve.contains(e))
   {
    v = newVertex(e->v1);		//!
    v->info = e->v1->info;		//! < AMF_CHANGE 1.1-2 >
    v->mask = 0;					//!
    V.appendHead(v);
 
-   FOREACHVEEDGE(ve, f, m) f->replaceVertex(e->v1, v);
+   for (int i = 0; i < ve.numels(); i++) ve[i]->replaceVertex(e->v1, v);
    v->e0 = e->v1->e0;
    e->v1->e0 = e;
    dv++;
   }
-  delete(ve);
  }
  FOREACHEDGE(e, n)
  {
-  ve = e->v2->VE();
-  if (ve->containsNode(e) == NULL)
+  e->v2->VE(ve);
+  if (!ve.contains(e))
   {
    v = newVertex(e->v2);		//!
    v->info = e->v2->info;		//! < AMF_CHANGE 1.1-2 >
    v->mask = 0;					//!
    V.appendHead(v);
 
-   FOREACHVEEDGE(ve, f, m) f->replaceVertex(e->v2, v);
+   for (int i = 0; i < ve.numels(); i++) ve[i]->replaceVertex(e->v2, v);
    v->e0 = e->v2->e0;
    e->v2->e0 = e;
    dv++;
   }
-  delete(ve);
  }
 
  if (dv) d_boundaries = d_handles = d_shells = 1;
@@ -196,8 +193,8 @@ Vertex *Basic_TMesh::checkGeometry()
  if (varr == NULL) TMesh::warning("checkGeometry: Not enough memory. Can't check for coincident vertices.\n");
  else
  {
-  jqsort((void **)varr, V.numels(), xyzCompare);
-  for (i=0; i<(V.numels()-1); i++)
+  xyzSort((void **)varr, V.numels());
+  for (int64_t i=0; i<(V.numels()-1); i++)
   {
    v1 = ((Vertex *)varr[i]);
    v2 = ((Vertex *)varr[i+1]);
@@ -220,8 +217,8 @@ Vertex *Basic_TMesh::checkGeometry()
  if (evarr == NULL) TMesh::warning("checkGeometry: Not enough memory. Can't check for coincident edges.\n");
  else
  {
-  jqsort((void **)evarr, E.numels(), lexEdgeCompare);
-  for (i=0; i<(E.numels()-1); i++)
+  lexEdgeSort((void **)evarr, E.numels());
+  for (int64_t i=0; i<(E.numels()-1); i++)
   {
    if (!lexEdgeCompare(evarr[i], evarr[i+1]))
    {
@@ -256,7 +253,7 @@ Vertex *Basic_TMesh::checkGeometry()
 
 int Basic_TMesh::mergeCoincidentEdges()
 {
-	V.sort(&xyzCompare);
+	V.sort(&xyzSort);
 	Node *n;
 	Vertex *v, *pv = (Vertex *)V.head()->data;
 
@@ -282,10 +279,10 @@ int Basic_TMesh::mergeCoincidentEdges()
 		if (e->v2->info != e->v2) e->v2 = (Vertex *)e->v2->info;
 		e->v1->e0 = e->v2->e0 = e;
 	}
-	int rv = removeVertices();
+	int64_t rv = removeVertices();
 
 	// At this point the mesh should no longer have duplicated vertices, but may have duplicated edges
-	E.sort(&vtxEdgeCompare);
+	E.sort(&vtxEdgeSort);
 	Edge *pe = (Edge *)E.head()->data;
 	FOREACHEDGE(e, n)
 	{
@@ -311,13 +308,13 @@ int Basic_TMesh::mergeCoincidentEdges()
 
 bool Basic_TMesh::fixConnectivity(){ //!< AMF_ADD 1.1>
  bool retval = true;
- int i;
+ int64_t i;
 
- if ((i = removeVertices())) { retval = false; TMesh::warning("%d isolated vertices have been removed.\n", i); }
+ if ((i = removeVertices())) { retval = false; TMesh::warning("%" PRId64 " isolated vertices have been removed.\n", i); }
  if (cutAndStitch()) { retval=false; TMesh::warning("Some cuts were necessary to cope with non manifold configuration.\n"); }
  if (forceNormalConsistence()) { retval = false; TMesh::warning("Some triangles have been reversed to achieve orientation.\n"); }
- if ((i=duplicateNonManifoldVertices())) { retval=false; TMesh::warning("%d non-manifold vertices have been duplicated.\n",i); }
- if ((i=removeDuplicatedTriangles())) { retval=false; TMesh::warning("%d double-triangles have been removed.\n",i); }
+ if ((i=duplicateNonManifoldVertices())) { retval=false; TMesh::warning("%" PRId64 " non-manifold vertices have been duplicated.\n",i); }
+ if ((i=removeDuplicatedTriangles())) { retval=false; TMesh::warning("%" PRId64 " double-triangles have been removed.\n",i); }
 
  return retval;
 }
@@ -327,7 +324,7 @@ bool Basic_TMesh::fixConnectivity(){ //!< AMF_ADD 1.1>
 bool Basic_TMesh::rebuildConnectivity(bool fixconnectivity) //!< AMF_CHANGE 1.1>
 {
  if (V.numels() == 0) return false;
- V.sort(&xyzCompare);
+ V.sort(&xyzSort);
  Node *n;
  Vertex *v, *pv=(Vertex *)V.head()->data;
 
@@ -348,37 +345,40 @@ bool Basic_TMesh::rebuildConnectivity(bool fixconnectivity) //!< AMF_CHANGE 1.1>
   if (e->v2->info != e->v2) e->v2 = (Vertex *)e->v2->info;
   e->v1->e0 = e->v2->e0 = e;
  }
- int rv = removeVertices();
+ int64_t rv = removeVertices();
 
  // At this point the mesh should no longer have duplicated vertices, but may have duplicated edges
 
  Triangle *t;
  ExtVertex **var = new ExtVertex *[V.numels()];
- int i=0;
+ int64_t i=0;
  FOREACHVERTEX(v, n) { v->e0 = NULL; var[i] = new ExtVertex(v); v->info = (void *)(intptr_t)i; i++; }
- int nt = T.numels();
- int *triangles = new int[nt*3];
+ int64_t nt = T.numels();
+ int64_t *triangles = new int64_t[nt*3];
+ int64_t *origins = new int64_t[nt];
  i = 0; FOREACHTRIANGLE(t, n)
  {
   triangles[i * 3]     = reinterpret_cast<intptr_t>(t->v1()->info);
   triangles[i * 3 + 1] = reinterpret_cast<intptr_t>(t->v2()->info);
   triangles[i * 3 + 2] = reinterpret_cast<intptr_t>(t->v3()->info);
+  origins[i] = t->origin;
   i++;
  }
  T.freeNodes();
  E.freeNodes();
- int v1,v2,v3;
+ int64_t v1,v2,v3;
  for (i = 0; i<nt; i++)
  {
   v1 = triangles[i*3];
   v2 = triangles[i*3+1];
   v3 = triangles[i*3+2];
-  if (v1!=v2 && v2!=v3 && v1!=v3) CreateIndexedTriangle(var, v1, v2, v3);
+  if (v1!=v2 && v2!=v3 && v1!=v3 && (t = CreateIndexedTriangle(var, v1, v2, v3)) != NULL) t->origin = origins[i];
  }
 
  for (i=0; i<V.numels(); i++) delete(var[i]);
  delete [] var;
  delete [] triangles;
+ delete [] origins;
 
  if(fixconnectivity)	return fixConnectivity();
  else					return true;
@@ -387,12 +387,12 @@ bool Basic_TMesh::rebuildConnectivity(bool fixconnectivity) //!< AMF_CHANGE 1.1>
 
 //////// Eliminates duplicated triangles (i.e. having the same vertices) /////////
 
-int Basic_TMesh::removeDuplicatedTriangles()
+int64_t Basic_TMesh::removeDuplicatedTriangles()
 {
  Edge *e;
  Node *n;
  Point p;
- int i=0;
+ int64_t i=0;
 
  FOREACHEDGE(e, n)
   if (!e->isOnBoundary() && e->t1->oppositeVertex(e) == e->t2->oppositeVertex(e))
@@ -400,9 +400,9 @@ int Basic_TMesh::removeDuplicatedTriangles()
 	  unlinkTriangle(e->t2);
    i++;
   }
- removeUnlinkedElements();
+ if (i) removeUnlinkedElements();
 
- if (i)  d_boundaries = d_handles = d_shells = 1;
+ d_boundaries = d_handles = d_shells = 1;
 
  return i;
 }
@@ -461,7 +461,7 @@ int multiSplitEdge(Basic_TMesh *tin, Edge *e)
 
 //////// Split caps and collapse needles to eliminate degenerate triangles /////////
 
-int Basic_TMesh::removeDegenerateTriangles()
+int64_t Basic_TMesh::removeDegenerateTriangles()
 {
 	Node *n;
 	Triangle *t;
@@ -498,18 +498,26 @@ int Basic_TMesh::removeDegenerateTriangles()
 		}
 	}
 
-	int nc = 0;	// Num of collapses to remove needles
+	int64_t nc = 0;	// Num of collapses to remove needles
+	int64_t nu = 0;	// Num of needles removed by unlinking their triangles
 
-	// Remove needles
-	FOREACHEDGE(e, n) if (e->isLinked() && ((*e->v1) == (*e->v2))) if (e->collapse()) nc++;
+	// Remove needles, keeping locked vertices
+	FOREACHEDGE(e, n) if (e->isLinked() && ((*e->v1) == (*e->v2)))
+	{
+		if (IS_LOCKED(e->v2) && !IS_LOCKED(e->v1)) { if (e->collapseOnV2() != NULL) nc++; }
+		else if (e->collapse()) nc++;
+	}
 	FOREACHEDGE(e, n) if (e->isLinked() && ((*e->v1) == (*e->v2)))
 	{
 		if (e->t1) unlinkTriangle(e->t1);
 		if (e->t2) unlinkTriangle(e->t2);
+		nu++;
 	}
-	removeUnlinkedElements();
+	// Failed collapses leave no unlinked elements, so the lists are swept only if needed
+	if (nc || nu) removeUnlinkedElements();
+	else d_boundaries = d_handles = d_shells = 1;
 
-	int degn = 0;
+	int64_t degn = 0;
 	FOREACHTRIANGLE(t, n) if (t->isExactlyDegenerate()) degn++;
 	if (degn)
 	{
@@ -774,17 +782,29 @@ bool Basic_TMesh::strongDegeneracyRemoval(int max_iters)
  return true;
 }
 
+//// TRUE if any triangle in 'l' has a locked vertex ////
+
+static bool hasLockedVertices(List *l)
+{
+ Node *n;
+ Triangle *t;
+ FOREACHVTTRIANGLE(l, t, n)
+  if (IS_LOCKED(t->v1()) || IS_LOCKED(t->v2()) || IS_LOCKED(t->v3())) return true;
+ return false;
+}
+
 //// If the mesh is made of more than one connected component ////
 //// keep only the biggest one and remove all the others.     ////
+//// Components with locked vertices are never removed.       ////
 
-int Basic_TMesh::removeSmallestComponents()
+int64_t Basic_TMesh::removeSmallestComponents()
 {
  Node *n,*m;
  List todo;
  List components;
  List *component, *biggest = NULL;
  Triangle *t, *t1, *t2, *t3;
- int nt = 0, gnt = 0;
+ int64_t nt = 0, gnt = 0;
 
  if (T.numels() == 0) return 0;
 
@@ -820,7 +840,7 @@ int Basic_TMesh::removeSmallestComponents()
  }
  while (n != NULL);
 
- int num_comps = components.numels();
+ int64_t num_comps = components.numels();
 
  FOREACHNODE(components, n)
   if ((nt = ((List *)n->data)->numels()) > gnt) {gnt=nt; biggest = (List *)n->data;}
@@ -829,7 +849,7 @@ int Basic_TMesh::removeSmallestComponents()
 
  nt = 0;
  FOREACHNODE(components, n)
-  if (((List *)n->data) != biggest)
+  if (((List *)n->data) != biggest && !hasLockedVertices((List *)n->data))
    FOREACHVTTRIANGLE(((List *)n->data), t, m)
    {
     if (t->e1->v1 != NULL) t->e1->v1->e0 = NULL;
@@ -858,12 +878,12 @@ int Basic_TMesh::removeSmallestComponents()
 
 //// Remove components whose area is < eps_area
 
-int Basic_TMesh::removeSmallestComponents(double eps_area)
+int64_t Basic_TMesh::removeSmallestComponents(double eps_area)
 {
 	Node *n;
 	List todo, component;
 	Triangle *t, *s;
-	int rem_comps=0;
+	int64_t rem_comps=0;
 	double pa;
 
 	if (T.numels() == 0) return 0;
@@ -1030,7 +1050,7 @@ int Basic_TMesh::removeOverlappingTriangles()
 }
 
 
-bool Basic_TMesh::meshclean(int max_iters, int inner_loops)
+bool Basic_TMesh::meshclean(int max_iters, int inner_loops, UINT16 tris_per_cell, int max_cells)
 {
  bool ni, nd;
  Triangle *t;
@@ -1044,7 +1064,7 @@ bool Basic_TMesh::meshclean(int max_iters, int inner_loops)
   TMesh::info("********* ITERATION %d *********\n",n);
   nd = strongDegeneracyRemoval(inner_loops);
   deselectTriangles(); invertSelection();
-  ni = strongIntersectionRemoval(inner_loops);
+  ni = strongIntersectionRemoval(inner_loops, tris_per_cell, max_cells);
   if (ni && nd)
   {
    FOREACHTRIANGLE(t, m) if (t->isExactlyDegenerate()) ni=false;
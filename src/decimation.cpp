@@ -0,0 +1,281 @@
+// Simplification of a mesh by edge collapses.
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <vector>
+
+#include "decimation.h"
+#include "heap.h"
+
+namespace T_MESH {
+
+namespace {
+
+// Sum of the squared distances from a set of weighted planes, stored as
+// the upper triangle of a symmetric 4x4 matrix.
+struct Quadric {
+    // xx, xy, xz, xw, yy, yz, yw, zz, zw, ww
+    double a[10] = {0, 0, 0, 0, 0, 0, 0, 0, 0, 0};
+
+    Quadric() = default;
+
+    // Plane through 'p' with unit normal 'n', weighted by 'w'.
+    Quadric(const double n[3], const double p[3], double w) {
+        double d = -(n[0] * p[0] + n[1] * p[1] + n[2] * p[2]);
+        double v[4] = {n[0], n[1], n[2], d};
+        for (int i = 0, k = 0; i < 4; i++) {
+            for (int j = i; j < 4; j++) {
+                a[k++] = w * v[i] * v[j];
+            }
+        }
+    }
+
+    Quadric &operator+=(const Quadric &o) {
+        for (int i = 0; i < 10; i++)
+            a[i] += o.a[i];
+        return *this;
+    }
+
+    double error(const double p[3]) const {
+        const double x = p[0], y = p[1], z = p[2];
+        return a[0] * x * x + 2 * a[1] * x * y + 2 * a[2] * x * z + 2 * a[3] * x +
+               a[4] * y * y + 2 * a[5] * y * z + 2 * a[6] * y + a[7] * z * z + 2 * a[8] * z +
+               a[9];
+    }
+
+    // Write the point of minimum error to 'p'. Returns false if the error
+    // has no unique minimum, as for planar and linear neighborhoods.
+    bool minimum(double p[3]) const {
+        const double m00 = a[0], m01 = a[1], m02 = a[2], m11 = a[4], m12 = a[5], m22 = a[7];
+        const double c0 = m11 * m22 - m12 * m12;
+        const double c1 = m02 * m12 - m01 * m22;
+        const double c2 = m01 * m12 - m02 * m11;
+        const double det = m00 * c0 + m01 * c1 + m02 * c2;
+        const double scale = std::max({std::fabs(m00), std::fabs(m11), std::fabs(m22)});
+        if (!(std::fabs(det) > 1e-10 * scale * scale * scale))
+            return false;
+        const double b0 = -a[3], b1 = -a[6], b2 = -a[8];
+        p[0] = (c0 * b0 + c1 * b1 + c2 * b2) / det;
+        p[1] = (c1 * b0 + (m00 * m22 - m02 * m02) * b1 + (m02 * m01 - m00 * m12) * b2) / det;
+        p[2] = (c2 * b0 + (m01 * m02 - m00 * m12) * b1 + (m00 * m11 - m01 * m01) * b2) / det;
+        return true;
+    }
+};
+
+// Min-heap of edge indices, 1 to n, sorted by their cost. The positions
+// of the indices let the heap be updated when a cost changes.
+class EdgeHeap : public abstractHeap {
+  public:
+    EdgeHeap(int n, const std::vector<double> &costs) : abstractHeap(n), costs(costs) {
+        positions = new int[n + 1]();
+    }
+    ~EdgeHeap() { delete[] positions; }
+
+    bool contains(int i) const { return positions[i] != 0; }
+    // Restore the order after the cost of 'i' changed
+    void update(int i) { downheap(upheap(positions[i])); }
+
+  protected:
+    int compare(const void *a, const void *b) override {
+        double ca = costs[reinterpret_cast<intptr_t>(a)];
+        double cb = costs[reinterpret_cast<intptr_t>(b)];
+        return (ca < cb) ? -1 : ((ca > cb) ? 1 : 0);
+    }
+
+  private:
+    const std::vector<double> &costs;
+};
+
+inline void coordinates(const Vertex *v, double p[3]) {
+    p[0] = TMESH_TO_DOUBLE(v->x);
+    p[1] = TMESH_TO_DOUBLE(v->y);
+    p[2] = TMESH_TO_DOUBLE(v->z);
+}
+
+inline void normal(const double a[3], const double b[3], const double c[3], double n[3]) {
+    double u[3] = {b[0] - a[0], b[1] - a[1], b[2] - a[2]};
+    double v[3] = {c[0] - a[0], c[1] - a[1], c[2] - a[2]};
+    n[0] = u[1] * v[2] - u[2] * v[1];
+    n[1] = u[2] * v[0] - u[0] * v[2];
+    n[2] = u[0] * v[1] - u[1] * v[0];
+}
+
+inline intptr_t index(const void *info) { return reinterpret_cast<intptr_t>(info); }
+
+// Edge collapses driven by the quadric errors of the vertices. Vertices
+// and edges are numbered through their info field, edges from 1.
+class Decimator {
+  public:
+    explicit Decimator(Basic_TMesh *tin) : tin(tin) {
+        Node *n;
+        Vertex *v;
+        Edge *e;
+        Triangle *t;
+
+        intptr_t i = 0;
+        FOREACHVVVERTEX((&tin->V), v, n) {
+            v->info = reinterpret_cast<void *>(i++);
+            boundary.push_back(v->isOnBoundary() != 0);
+        }
+        quadrics.resize(i);
+        edges.push_back(NULL);
+        FOREACHVEEDGE((&tin->E), e, n) {
+            e->info = reinterpret_cast<void *>((intptr_t)edges.size());
+            edges.push_back(e);
+        }
+        costs.resize(edges.size());
+        targets.resize(edges.size());
+
+        // the planes of the triangles weighted by their area
+        FOREACHVTTRIANGLE((&tin->T), t, n) {
+            Vertex *tv[3] = {t->v1(), t->v2(), t->v3()};
+            double p[3][3], nor[3];
+            for (int k = 0; k < 3; k++)
+                coordinates(tv[k], p[k]);
+            normal(p[0], p[1], p[2], nor);
+            double len = std::sqrt(nor[0] * nor[0] + nor[1] * nor[1] + nor[2] * nor[2]);
+            if (len == 0)
+                continue;
+            double unit[3] = {nor[0] / len, nor[1] / len, nor[2] / len};
+            Quadric q(unit, p[0], len / 2);
+            for (int k = 0; k < 3; k++)
+                quadrics[index(tv[k]->info)] += q;
+        }
+    }
+
+    ~Decimator() {
+        Node *n;
+        Vertex *v;
+        Edge *e;
+        FOREACHVVVERTEX((&tin->V), v, n) v->info = NULL;
+        FOREACHVEEDGE((&tin->E), e, n) e->info = NULL;
+    }
+
+    void run(int64_t target_triangles) {
+        int64_t nt = tin->T.numels();
+        EdgeHeap heap((int)edges.size() - 1, costs);
+        VertexFan<Edge> ve;
+        for (size_t i = 1; i < edges.size(); i++) {
+            if (evaluate(edges[i]))
+                heap.insert(reinterpret_cast<void *>((intptr_t)i));
+        }
+
+        while (nt > target_triangles && !heap.isEmpty()) {
+            Edge *e = edges[index(heap.removeHead())];
+            if (!e->isLinked() || !evaluate(e))
+                continue;
+            // the boundary vertex, if any, is kept
+            if (boundary[index(e->v2->info)])
+                e->invert();
+            const double *p = targets[index(e->info)].data();
+            if (flipsTriangles(e, p))
+                continue;
+
+            int removed = (e->t1 != NULL) + (e->t2 != NULL);
+            Vertex *v2 = e->v2;
+            Vertex *v = e->collapseOnV1();
+            if (v == NULL)
+                continue;
+            nt -= removed;
+            Point pos(p[0], p[1], p[2]);
+            v->setValue(&pos);
+            quadrics[index(v->info)] += quadrics[index(v2->info)];
+
+            // the costs of the edges around the moved vertex changed
+            v->VE(ve);
+            for (Edge *f : ve) {
+                intptr_t j = index(f->info);
+                if (evaluate(f)) {
+                    if (heap.contains(j))
+                        heap.update(j);
+                    else
+                        heap.insert(reinterpret_cast<void *>(j));
+                }
+            }
+        }
+
+        tin->removeUnlinkedElements();
+    }
+
+  private:
+    Basic_TMesh *tin;
+    std::vector<Edge *> edges;
+    std::vector<double> costs;
+    std::vector<std::array<double, 3>> targets;
+    std::vector<Quadric> quadrics;
+    std::vector<bool> boundary;
+
+    // Compute the cost and target position of the collapse of 'e'. Returns
+    // false if 'e' must not be collapsed.
+    bool evaluate(Edge *e) {
+        if (e->isOnBoundary())
+            return false;
+        intptr_t i1 = index(e->v1->info), i2 = index(e->v2->info);
+        if (boundary[i1] && boundary[i2])
+            return false;
+
+        Quadric q = quadrics[i1];
+        q += quadrics[i2];
+        double p1[3], p2[3];
+        coordinates(e->v1, p1);
+        coordinates(e->v2, p2);
+
+        double *p = targets[index(e->info)].data();
+        if (boundary[i1]) {
+            std::copy(p1, p1 + 3, p);
+        } else if (boundary[i2]) {
+            std::copy(p2, p2 + 3, p);
+        } else if (!q.minimum(p)) {
+            // the best of the end points and the midpoint
+            double mid[3] = {(p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2, (p1[2] + p2[2]) / 2};
+            const double *candidates[3] = {mid, p1, p2};
+            const double *best = mid;
+            for (const double *c : candidates) {
+                if (q.error(c) < q.error(best))
+                    best = c;
+            }
+            std::copy(best, best + 3, p);
+        }
+        costs[index(e->info)] = q.error(p);
+        return true;
+    }
+
+    // Whether moving both ends of 'e' to 'p' flips or degenerates a
+    // triangle not incident to 'e'.
+    bool flipsTriangles(Edge *e, const double *p) {
+        VertexFan<Triangle> vt;
+        for (Vertex *w : {e->v1, e->v2}) {
+            w->VT(vt);
+            for (Triangle *t : vt) {
+                if (t->hasEdge(e))
+                    continue;
+                Vertex *tv[3] = {t->v1(), t->v2(), t->v3()};
+                double before[3][3], after[3][3], n0[3], n1[3];
+                for (int k = 0; k < 3; k++) {
+                    coordinates(tv[k], before[k]);
+                    if (tv[k] == w)
+                        std::copy(p, p + 3, after[k]);
+                    else
+                        std::copy(before[k], before[k] + 3, after[k]);
+                }
+                normal(before[0], before[1], before[2], n0);
+                normal(after[0], after[1], after[2], n1);
+                if (n0[0] * n1[0] + n0[1] * n1[1] + n0[2] * n1[2] <= 0)
+                    return true;
+            }
+        }
+        return false;
+    }
+};
+
+} // namespace
+
+int64_t decimateMesh(Basic_TMesh *tin, int64_t target_triangles) {
+    int64_t nt = tin->T.numels();
+    if (target_triangles >= nt)
+        return 0;
+    Decimator(tin).run(target_triangles);
+    return nt - tin->T.numels();
+}
+
+} // namespace T_MESH
@@ -0,0 +1,28 @@
+// Simplification of a mesh by edge collapses.
+#ifndef DECIMATION_H
+#define DECIMATION_H
+
+#include <cstdint>
+
+#include "tmesh.h"
+
+namespace T_MESH {
+
+// Collapse edges of 'tin' until it has at most 'target_triangles'
+// triangles or no edge can be collapsed. Returns the number of triangles
+// removed.
+//
+// Edges are collapsed in order of their quadric error (Garland and
+// Heckbert), taken from a heap of candidates which is updated around each
+// collapse, and the remaining vertex is moved to the position minimizing
+// the error. Collapses which would make the mesh non-manifold or flip a
+// triangle are skipped.
+//
+// The boundaries are preserved: boundary edges and edges joining two
+// boundary vertices are never collapsed, and an edge with one boundary
+// vertex is collapsed onto it without moving it.
+int64_t decimateMesh(Basic_TMesh *tin, int64_t target_triangles);
+
+} // namespace T_MESH
+
+#endif // DECIMATION_H
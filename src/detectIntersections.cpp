@@ -102,6 +102,76 @@ namespace T_MESH
 		return nc;
 	}
 
+	// Undoes fork(). The triangles of 'nc' which are not in this cell are moved
+	// back, the bounds are reset to 'omp' and 'oMp', and 'nc' is deleted.
+	void di_cell::unfork(di_cell *nc, const Point &omp, const Point &oMp)
+	{
+		Node *n;
+		Triangle *t;
+
+		FOREACHVTTRIANGLE((&triangles), t, n) MARK_BIT(t, 5);
+		FOREACHVTTRIANGLE((&(nc->triangles)), t, n) if (!IS_BIT(t, 5)) triangles.appendTail(t);
+		FOREACHVTTRIANGLE((&triangles), t, n) UNMARK_BIT(t, 5);
+
+		mp = omp; Mp = oMp;
+		delete nc;
+	}
+
+	// Chooses the maximum number of triangles per cell and the maximum number of
+	// cell subdivisions. Bounding boxes overlapping the box of a triangle will
+	// share most cells with it, so the cells are made a few times larger than the
+	// mean number of such overlaps, which is counted for a sample of triangles.
+	void di_cell::autoParameters(int *tris_per_cell, int *max_cells) const
+	{
+		Node *n;
+		Triangle *t;
+		int64_t i, j, nt = triangles.numels();
+		int ns = (int)MIN(nt, (int64_t)DI_AUTO_OVERLAP_SAMPLES);
+
+		*tris_per_cell = DI_AUTO_MIN_TRIS_PER_CELL;
+		*max_cells = DI_MAX_NUMBER_OF_CELLS;
+		if (ns < 2) return;
+
+		// Bounding boxes as (min x, min y, min z, max x, max y, max z)
+		double *bb = (double *)malloc(sizeof(double)*6*nt), *b;
+		if (bb == NULL) TMesh::error("Not enough memory.\n");
+		i=0; FOREACHVTTRIANGLE((&triangles), t, n)
+		{
+			b = bb + 6*(i++);
+			b[0] = TMESH_TO_DOUBLE(MIN(t->v1()->x, MIN(t->v2()->x, t->v3()->x)));
+			b[1] = TMESH_TO_DOUBLE(MIN(t->v1()->y, MIN(t->v2()->y, t->v3()->y)));
+			b[2] = TMESH_TO_DOUBLE(MIN(t->v1()->z, MIN(t->v2()->z, t->v3()->z)));
+			b[3] = TMESH_TO_DOUBLE(MAX(t->v1()->x, MAX(t->v2()->x, t->v3()->x)));
+			b[4] = TMESH_TO_DOUBLE(MAX(t->v1()->y, MAX(t->v2()->y, t->v3()->y)));
+			b[5] = TMESH_TO_DOUBLE(MAX(t->v1()->z, MAX(t->v2()->z, t->v3()->z)));
+		}
+
+		// Mean number of bounding boxes overlapping the box of the sampled triangles
+		double overlaps = 0;
+		for (int s = 0; s < ns; s++)
+		{
+			b = bb + 6*((s*nt)/ns);
+			for (j = 0; j < nt; j++)
+			{
+				double *c = bb + 6*j;
+				if (c[0] <= b[3] && c[3] >= b[0] && c[1] <= b[4] && c[4] >= b[1] &&
+				    c[2] <= b[5] && c[5] >= b[2]) overlaps++;
+			}
+		}
+		free(bb);
+		overlaps /= ns;
+
+		double tpc = DI_AUTO_OVERLAP_FACTOR*overlaps;
+		if (tpc < DI_AUTO_MIN_TRIS_PER_CELL) tpc = DI_AUTO_MIN_TRIS_PER_CELL;
+		if (tpc > DI_AUTO_MAX_TRIS_PER_CELL) tpc = DI_AUTO_MAX_TRIS_PER_CELL;
+		*tris_per_cell = (int)tpc;
+
+		// Enough subdivisions for leaves of tris_per_cell triangles
+		int64_t mc = (DI_AUTO_MAX_DUPLICATION*nt)/(*tris_per_cell);
+		if (mc > INT_MAX) mc = INT_MAX;
+		if (mc > *max_cells) *max_cells = (int)mc;
+	}
+
 
 	// Brute force all-with-all intersection test of the triangles in 'triangles'.
 	void di_cell::selectIntersections(bool justproper)
@@ -135,7 +205,7 @@ namespace T_MESH
 //                                                                     ||
 /////////////////////////////////////////////////////////////////////////
 
-int Basic_TMesh::selectIntersectingTriangles(UINT16 tris_per_cell, bool justproper)
+int Basic_TMesh::selectIntersectingTriangles(UINT16 tris_per_cell, bool justproper, int max_cells)
 {
  Triangle *t;
  Vertex *v;
@@ -160,20 +230,45 @@ int Basic_TMesh::selectIntersectingTriangles(UINT16 tris_per_cell, bool justprop
 
  di_cell *c2, *c = new di_cell(this, !isSelection);
  List cells, todo(c);
- int i=0;
+ int i=0, tpc = tris_per_cell;
+ bool adaptive = (tris_per_cell == 0);
+ int64_t nt = c->triangles.numels(), nrefs = nt, n0, n1, n2;
+ Point omp, oMp;
+
+ if (adaptive)
+ {
+  c->autoParameters(&tpc, &max_cells);
+  TMesh::info("Intersection cells: %d triangles per cell, %d subdivisions.\n", tpc, max_cells);
+ }
+ else if (max_cells <= 0) max_cells = DI_MAX_NUMBER_OF_CELLS;
 
  while ((c = (di_cell *)todo.popHead()) != NULL)
  {
-  if (i>DI_MAX_NUMBER_OF_CELLS || c->triangles.numels() <= tris_per_cell) cells.appendHead(c);
+  if (i>max_cells || c->triangles.numels() <= tpc) cells.appendHead(c);
+  else if (adaptive && nrefs > DI_AUTO_MAX_DUPLICATION*nt) cells.appendHead(c);
   else
   {
    if (!(i % 1000)) TMesh::report_progress(NULL);
    i++;
+   n0 = c->triangles.numels(); omp = c->mp; oMp = c->Mp;
    c2 = c->fork();
-   todo.appendTail(c);
-   todo.appendTail(c2);
+   n1 = c->triangles.numels(); n2 = c2->triangles.numels();
+   // Splitting does not pay if most triangles straddle the cut, as they are
+   // about as large as the cell and further splits would only duplicate them
+   if (adaptive && 2*(n1+n2-n0) > n0)
+   {
+    c->unfork(c2, omp, oMp);
+    cells.appendHead(c);
+   }
+   else
+   {
+    nrefs += n1+n2-n0;
+    todo.appendTail(c);
+    todo.appendTail(c2);
+   }
   }
  }
+ if (adaptive) TMesh::info("Intersection cells: %d cells, duplication %.2f.\n", (int)cells.numels(), ((double)nrefs)/MAX(nt, (int64_t)1));
 
  // Deselect everything and select only intersecting triangles
  deselectTriangles();
@@ -181,7 +276,7 @@ int Basic_TMesh::selectIntersectingTriangles(UINT16 tris_per_cell, bool justprop
  i=0; FOREACHNODE(cells, n)
  {
   (((di_cell *)n->data)->selectIntersections(justproper));
-  if (!(i % 100)) TMesh::report_progress("%d %% done   ", ((i)* 100) / cells.numels());
+  if (!(i % 100)) TMesh::report_progress("%d %% done   ", (int)(((i)* 100) / cells.numels()));
   i++;
  }
  TMesh::end_progress();
@@ -371,14 +466,14 @@ void remints_selectTrianglesInCubes(Basic_TMesh *tin)
 
 // returns true on success
 
-bool Basic_TMesh::strongIntersectionRemoval(int max_iters)
+bool Basic_TMesh::strongIntersectionRemoval(int max_iters, UINT16 tris_per_cell, int max_cells)
 {
  int n, iter_count = 0;
  bool qstatus = TMesh::quiet;
 
  TMesh::info("Removing self-intersections...\n");
 
- while ((++iter_count) <= max_iters && selectIntersectingTriangles())
+ while ((++iter_count) <= max_iters && selectIntersectingTriangles(tris_per_cell, false, max_cells))
  {
   for (n=1; n<iter_count; n++) growSelection();
   removeSelectedTriangles();
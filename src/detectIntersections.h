@@ -38,6 +38,13 @@ namespace T_MESH
 #define DI_MAX_NUMBER_OF_CELLS	10000
 #define DI_EPSILON_POINT Point(1.0e-9, 1.0e-9, 1.0e-9)
 
+// Automatic cell parameters (tris_per_cell = 0)
+#define DI_AUTO_OVERLAP_SAMPLES	16	// Triangles whose bounding box overlaps are counted
+#define DI_AUTO_OVERLAP_FACTOR	2	// Ratio between tris_per_cell and the mean overlap count
+#define DI_AUTO_MIN_TRIS_PER_CELL	8
+#define DI_AUTO_MAX_TRIS_PER_CELL	400
+#define DI_AUTO_MAX_DUPLICATION	4	// Maximum ratio between the cell entries and the triangles
+
 class di_cell
 {
 public:
@@ -50,6 +57,8 @@ public:
     bool is_triangleBB_in_cell(Triangle *t) const;
 
 	di_cell *fork();
+	void unfork(di_cell *nc, const Point &omp, const Point &oMp);
+	void autoParameters(int *tris_per_cell, int *max_cells) const;
 	void selectIntersections(bool justproper = false);
 	bool doesNotIntersectForSure();
 };
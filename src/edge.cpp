@@ -30,6 +30,7 @@
 
 #include "edge.h"
 #include "triangle.h"
+#include "jqsort.h"
 
 namespace T_MESH
 {
@@ -88,6 +89,44 @@ int vtxEdgeCompare(const void *a, const void *b)
 }
 
 
+//////// Edge sorting by radix sort //////////
+
+void lexEdgeSort(void *v[], int64_t numels)
+{
+#ifdef USE_HYBRID_KERNEL
+ // Rational coordinates may not be represented exactly by keys
+ jqsort(v, numels, lexEdgeCompare);
+#else
+ uint64_t *keys = new uint64_t[numels*6];
+ for (int64_t i = 0; i < numels; i++)
+ {
+  Vertex *v1 = ((Edge *)v[i])->v1;
+  Vertex *v2 = ((Edge *)v[i])->v2;
+  if (xyzCompare(v1, v2) > 0) p_swap((void **)&v1, (void **)&v2);
+  uint64_t *k = keys + i*6;
+  k[0] = xyzKey(v1->x); k[1] = xyzKey(v1->y); k[2] = xyzKey(v1->z);
+  k[3] = xyzKey(v2->x); k[4] = xyzKey(v2->y); k[5] = xyzKey(v2->z);
+ }
+ jrsort(v, numels, keys, 6);
+ delete [] keys;
+#endif
+}
+
+void vtxEdgeSort(void *v[], int64_t numels)
+{
+ uint64_t *keys = new uint64_t[numels*2];
+ for (int64_t i = 0; i < numels; i++)
+ {
+  uint64_t a = (uint64_t)(uintptr_t)((Edge *)v[i])->v1;
+  uint64_t b = (uint64_t)(uintptr_t)((Edge *)v[i])->v2;
+  keys[i*2] = MIN(a, b);
+  keys[i*2 + 1] = MAX(a, b);
+ }
+ jrsort(v, numels, keys, 2);
+ delete [] keys;
+}
+
+
 //////////////////////// Constructor ///////////////////////
 //!< AMF_ADD 1.1-2 >
 Edge::Edge(){
@@ -169,9 +208,9 @@ bool Edge::swap(const bool fast)
 Vertex *Edge::collapseOnV1()
 {
  Edge *e;
- Node *n;
- List *ve;
+ VertexFan<Edge> ve;
  Vertex *tv;
+ int i;
 
  Edge *e1 = (t1 != NULL)?(t1->nextEdge(this)):(NULL);
  Edge *e2 = (t1 != NULL)?(t1->prevEdge(this)):(NULL);
@@ -198,14 +237,13 @@ Vertex *Edge::collapseOnV1()
  if (v3 != NULL) v3->e0 = e2;
  if (v4 != NULL) v4->e0 = e3;
 
- ve = v2->VE();
- FOREACHVEEDGE(ve, e, n)
+ v2->VE(ve);
+ for (i = 0; i < ve.numels(); i++)
  {
-  tv = e->oppositeVertex(v2);
-  if (tv != v3 && tv != v4 && tv->getEdge(v1) != NULL) {delete(ve); return NULL;}
+  tv = ve[i]->oppositeVertex(v2);
+  if (tv != v3 && tv != v4 && tv->getEdge(v1) != NULL) return NULL;
  }
- FOREACHVEEDGE(ve, e, n) if (e != this) e->replaceVertex(v2, v1);
- delete(ve);
+ for (i = 0; i < ve.numels(); i++) if ((e = ve[i]) != this) e->replaceVertex(v2, v1);
 
  if (e2 != NULL) e2->replaceTriangle(t1, ta1);
  if (e3 != NULL) e3->replaceTriangle(t2, ta4);
@@ -246,6 +246,14 @@ int lexEdgeCompare(const void *a, const void *b);
 //! Duplicated edges are contiguous in this sorting.
 int vtxEdgeCompare(const void *a, const void *b);
 
+//! Sorts an array of edges as jqsort() with lexEdgeCompare() would do, but
+//! by radix sort of the coordinate keys of their vertices. The sort is stable.
+void lexEdgeSort(void *v[], int64_t numels);
+
+//! Sorts an array of edges as jqsort() with vtxEdgeCompare() would do, but
+//! by radix sort of the addresses of their vertices. The sort is stable.
+void vtxEdgeSort(void *v[], int64_t numels);
+
 } //namespace T_MESH
 
 #endif //_EDGE_H
@@ -261,7 +261,7 @@ int Basic_TMesh::TriangulateHole(Edge *e, List *vl)
  } while (sw);
 
  // Inserisco i punti interni
- int ntt = T.numels()-nt;
+ int64_t ntt = T.numels()-nt;
  List ivs;
 
  FOREACHNODE((*vl), n)
@@ -296,10 +296,11 @@ int Basic_TMesh::TriangulateHole(Edge *e, List *vl)
 
 Vertex *Basic_TMesh::watsonInsert(Point *p, List *tR, int nt)
 {
- Node *n, *m;
+ Node *n;
  Edge *e;
  Triangle *t;
- List bdr, bdrs, todo, *ve;
+ List bdr, bdrs, todo;
+ VertexFan<Edge> ve;
  Vertex *v1, *v2, *v3;
  int i;
 
@@ -321,9 +322,8 @@ Vertex *Basic_TMesh::watsonInsert(Point *p, List *tR, int nt)
 
  FOREACHVVVERTEX((&(bdr)), v1, n)
  {
-  ve = v1->VE();
-  FOREACHVEEDGE(ve, e, m) if (!IS_BIT(e->t1, 6) || !IS_BIT(e->t2, 6)) v1->e0 = e;
-  delete(ve);
+  v1->VE(ve);
+  for (int i = 0; i < ve.numels(); i++) if (!IS_BIT(ve[i]->t1, 6) || !IS_BIT(ve[i]->t2, 6)) v1->e0 = ve[i];
  }
 
  while (todo.numels())
@@ -508,13 +508,16 @@ void Basic_TMesh::FillHole(Edge *e, bool refine)
 
 //// Triangulate Small Boundaries (with less than 'nbe' edges) /////
 
-int Basic_TMesh::fillSmallBoundaries(int nbe, bool refine_patches)
+int64_t Basic_TMesh::fillSmallBoundaries(int64_t nbe, bool refine_patches, double target_length,
+                                          double density_scale, int64_t max_new_triangles,
+                                          int64_t *patch_sizes)
 {
  if (nbe == 0) nbe = E.numels();
  Vertex *v,*w;
  Triangle *t;
  Node *n;
- int grd, is_selection=0, tbds = 0, pct = 100;
+ int is_selection=0;
+ int64_t grd, tbds = 0, pct = 100, ntb, nnt;
  List bdrs;
 
  TMesh::begin_progress();
@@ -539,7 +542,7 @@ int Basic_TMesh::fillSmallBoundaries(int nbe, bool refine_patches)
    w = v;
    do
    {
-    if (IS_BIT(w, 6)) grd=nbe+1;
+    if (IS_BIT(w, 6) || IS_LOCKED(w)) grd=nbe+1;
 	MARK_BIT(w, 6);
     grd++;
     w = w->nextOnBoundary();
@@ -553,15 +556,21 @@ int Basic_TMesh::fillSmallBoundaries(int nbe, bool refine_patches)
 
  pct=0; FOREACHNODE(bdrs, n)
  {
-  if (TriangulateHole((Edge *)n->data) && refine_patches)
+  if (max_triangles > 0 && T.numels() >= max_triangles) {max_triangles_reached = true; break;}
+  ntb = T.numels();
+  nnt = TriangulateHole((Edge *)n->data);
+  // the initial triangulation is kept even if it exceeds the limit
+  if (nnt && refine_patches && (max_new_triangles <= 0 || max_new_triangles-nnt >= 2))
   {
    t = (Triangle *)T.head()->data;
-   refineSelectedHolePatches(t);
+   refineSelectedHolePatches(t, target_length, density_scale,
+                             (max_new_triangles > 0) ? (max_new_triangles-nnt) : 0);
   }
-  TMesh::report_progress("%d%% done ",((++pct)*100)/bdrs.numels());
+  if (patch_sizes != NULL) patch_sizes[pct] = T.numels()-ntb;
+  TMesh::report_progress("%d%% done ",(int)(((++pct)*100)/bdrs.numels()));
  }
 
- grd = bdrs.numels();
+ grd = pct; // fewer than bdrs.numels() if max_triangles was reached
 
  TMesh::end_progress();
 
@@ -573,15 +582,18 @@ int Basic_TMesh::fillSmallBoundaries(int nbe, bool refine_patches)
 // to reflect the density of the surrounding mesh.
 // This method assumes that the selection has no internal vertices.
 
-int Basic_TMesh::refineSelectedHolePatches(Triangle *t0)
+int Basic_TMesh::refineSelectedHolePatches(Triangle *t0, double target_length,
+                                           double density_scale, int64_t max_new_triangles)
 {
- Node *n, *m;
+ Node *n;
  Triangle *t, *t1, *t2;
  Edge *e, *f;
  Vertex *v;
- List *ve, toswap, reg, all_edges, interior_edges, boundary_edges, boundary_vertices, interior_vertices;
+ VertexFan<Edge> ve;
+ List toswap, reg, all_edges, interior_edges, boundary_edges, boundary_vertices, interior_vertices;
  coord sigma, l, sv1, sv2, sv3, dv1, dv2, dv3;
- int swaps, totits, nee, ntb, nnt=-1, pnnt, gits=0;
+ int swaps, totits, nee, nnt=-1, pnnt, gits=0;
+ int64_t ntb;
  const double alpha = sqrt(2.0);
  Point vc;
 
@@ -628,10 +640,30 @@ int Basic_TMesh::refineSelectedHolePatches(Triangle *t0)
 
  FOREACHVVVERTEX((&boundary_vertices), v, n)
  {
-  ve = v->VE();
-  sigma=0; nee=0; FOREACHVEEDGE(ve, e, m) if (!IS_BIT(e, 5)) {nee++; sigma += e->length();}
-  sigma /= nee; v->info = new coord(sigma);
-  delete(ve);
+  v->VE(ve);
+  sigma=0; nee=0; for (int i = 0; i < ve.numels(); i++) if (!IS_BIT(ve[i], 5)) {nee++; sigma += ve[i]->length();}
+  sigma /= nee;
+  if (target_length > 0) sigma = target_length;
+  sigma /= sqrt(density_scale);
+  v->info = new coord(sigma);
+ }
+
+ // A patch whose edges are about sigma long has area/(sqrt(3)/4*sigma^2)
+ // triangles. Increase sigma if this exceeds the limit.
+ int64_t nt0 = T.numels();
+ bool capped = false;
+ if (max_new_triangles > 0 && boundary_vertices.numels())
+ {
+  double area = 0, msig = 0;
+  FOREACHVTTRIANGLE((&reg), t, n) area += t->area();
+  FOREACHVVVERTEX((&boundary_vertices), v, n) msig += TMESH_TO_DOUBLE(*(coord *)v->info);
+  msig /= boundary_vertices.numels();
+  double est = (msig > 0) ? (area/(0.4330127*msig*msig)) : 0;
+  if (est > reg.numels()+max_new_triangles)
+  {
+   double scale = sqrt(est/(reg.numels()+max_new_triangles));
+   FOREACHVVVERTEX((&boundary_vertices), v, n) *(coord *)v->info *= scale;
+  }
  }
 
  FOREACHVEEDGE((&interior_edges), e, n) UNMARK_BIT(e, 5);
@@ -653,6 +685,8 @@ int Basic_TMesh::refineSelectedHolePatches(Triangle *t0)
    dv3 = alpha*(t->v3()->distance(&vc));
    if (dv1>sigma && dv1>sv1 && dv2>sigma && dv2>sv2 && dv3>sigma && dv3>sv3)
    {
+    if (max_new_triangles > 0 && T.numels()-nt0+2 > max_new_triangles) {capped = true; break;}
+    if (max_triangles > 0 && T.numels()+2 > max_triangles) {capped = max_triangles_reached = true; break;}
     ntb = T.numels();
     v = splitTriangle(t,&vc,1);
     nnt += (T.numels()-ntb);
@@ -696,6 +730,7 @@ int Basic_TMesh::refineSelectedHolePatches(Triangle *t0)
    }
   }
 
+  if (capped) break;
   if (pnnt==nnt) gits++;
  } while (nnt && gits<10);
 
@@ -30,6 +30,7 @@
 
 #include "tmesh.h"
 #include <stdlib.h>
+#include <inttypes.h>
 #include <string.h>
 #include <ctype.h>
 #include <iostream>
@@ -298,7 +299,7 @@ Triangle * Basic_TMesh::CreateTriangleFromVertices(ExtVertex *vari1, ExtVertex *
 
 // This part is common to all the loaders
 
-Triangle * Basic_TMesh::CreateIndexedTriangle(ExtVertex **var, int i1, int i2, int i3)
+Triangle * Basic_TMesh::CreateIndexedTriangle(ExtVertex **var, int64_t i1, int64_t i2, int64_t i3)
 {
  return CreateTriangleFromVertices(var[i1], var[i2], var[i3]);
 }
@@ -308,7 +309,7 @@ Triangle * Basic_TMesh::CreateIndexedTriangle(ExtVertex **var, int i1, int i2, i
 
 void Basic_TMesh::closeLoadingSession(FILE *fp, int loaded_faces, ExtVertex **var, bool triangulate)
 {
- int i, nv = V.numels();
+ int64_t i, nv = V.numels();
 
  fclose(fp);
 
@@ -320,7 +321,7 @@ void Basic_TMesh::closeLoadingSession(FILE *fp, int loaded_faces, ExtVertex **va
 
  if (loaded_faces)
  {
-  TMesh::info("Loaded %d vertices and %d faces.\n",nv,loaded_faces);
+  TMesh::info("Loaded %" PRId64 " vertices and %d faces.\n",nv,loaded_faces);
   if (triangulate) TMesh::warning("Some polygonal faces needed to be triangulated.\n");
   fixConnectivity();
  }
@@ -339,7 +340,7 @@ void Basic_TMesh::coordBackApproximation()
  char floatver[32];
  float x;
 
- FOREACHVERTEX(v, n)
+ FOREACHVERTEX(v, n) if (!IS_LOCKED(v))
  {
   sprintf(floatver, "%f", TMESH_TO_FLOAT(v->x)); sscanf(floatver, "%f", &x); v->x = x;
   sprintf(floatver, "%f", TMESH_TO_FLOAT(v->y)); sscanf(floatver, "%f", &x); v->y = x;
@@ -808,7 +809,7 @@ int Basic_TMesh::saveOFF(const char *fname)
 
  fprintf(fp,"OFF\n");
  PRINT_HEADING_COMMENT(fp);
- fprintf(fp,"%d %d 0\n",V.numels(),T.numels());
+ fprintf(fp,"%" PRId64 " %" PRId64 " 0\n",V.numels(),T.numels());
 
  FOREACHVERTEX(v, n) fprintf(fp, "%f %f %f\n", TMESH_TO_FLOAT(v->x), TMESH_TO_FLOAT(v->y), TMESH_TO_FLOAT(v->z));
 
@@ -874,7 +875,7 @@ int Basic_TMesh::saveVerTri(const char *fname)
  }
 #endif
 
- fprintf(fpv,"%d\n",V.numels());
+ fprintf(fpv,"%" PRId64 "\n",V.numels());
  FOREACHVERTEX(v, n)
  {
 	 fprintf(fpv, "%f %f %f\n", TMESH_TO_FLOAT(v->x), TMESH_TO_FLOAT(v->y), TMESH_TO_FLOAT(v->z));
@@ -895,7 +896,7 @@ int Basic_TMesh::saveVerTri(const char *fname)
  i=0; FOREACHVERTEX(v, n) v->x = ++i;
  i=0; FOREACHTRIANGLE(t, n) {i++; t->info = (void *)(intptr_t)i;}
 
- fprintf(fpt,"%d\n",T.numels());
+ fprintf(fpt,"%" PRId64 "\n",T.numels());
  FOREACHTRIANGLE(t, n)
  {
   i1 = TMESH_TO_INT(t->v1()->x); i2 = TMESH_TO_INT(t->v2()->x); i3 = TMESH_TO_INT(t->v3()->x);
@@ -1003,7 +1004,7 @@ int Basic_TMesh::cutAndStitch()
 	forceNormalConsistence();
 	duplicateNonManifoldVertices();
 
-	singular_edges.sort(&lexEdgeCompare);
+	singular_edges.sort(&lexEdgeSort);
 	FOREACHEDGE(e1, n) e1->info = NULL;
 	e2 = NULL;
 	FOREACHVEEDGE((&singular_edges), e1, n)
@@ -1020,7 +1021,8 @@ int Basic_TMesh::cutAndStitch()
 	// Then, pinch the remaining unbounded chains starting from any of the edges
 	FOREACHVEEDGE((&singular_edges), e1, n) if (e1->isLinked()) pinch(e1, false);
 
-	removeUnlinkedElements();
+	// Only pinching unlinks elements
+	if (singular_edges.numels()) removeUnlinkedElements();
 
 	d_boundaries = d_handles = d_shells = 1;
 
@@ -1311,11 +1313,11 @@ int Basic_TMesh::savePLY(const char *fname, bool ascii)
  if (ascii) fprintf(fp,"format ascii 1.0\n");
  else fprintf(fp,"format binary_little_endian 1.0\n");
  PRINT_PLY_COMMENT(fp);
- fprintf(fp,"element vertex %d\n",V.numels());
+ fprintf(fp,"element vertex %" PRId64 "\n",V.numels());
  fprintf(fp,"property float x\n");
  fprintf(fp,"property float y\n");
  fprintf(fp,"property float z\n");
- fprintf(fp,"element face %d\n",T.numels());
+ fprintf(fp,"element face %" PRId64 "\n",T.numels());
  fprintf(fp,"property list uchar int vertex_indices\n");
  fprintf(fp,"end_header\n");
 
@@ -1541,7 +1543,7 @@ int Basic_TMesh::loadSTL(const char *fname)
 
  fclose(fp);
 
- TMesh::info("Loaded %d vertices and %d faces.\n",V.numels(),T.numels());
+ TMesh::info("Loaded %" PRId64 " vertices and %" PRId64 " faces.\n",V.numels(),T.numels());
 
  if (T.numels()) rebuildConnectivity(); else return IO_UNKNOWN;
  TMesh::setFilename(fname);
@@ -30,8 +30,10 @@
 
 #define USE_STD_SORT
 
-#ifdef USE_STD_SORT
+#include <stdint.h>
 #include <vector>
+
+#ifdef USE_STD_SORT
 #include <algorithm>
 #endif
 
@@ -39,16 +41,16 @@ namespace T_MESH
 {
 
 #ifndef USE_STD_SORT
-inline void jswap(void *v[], int i, int j)
+inline void jswap(void *v[], int64_t i, int64_t j)
 {
  void *temp = v[i];
  v[i] = v[j];
  v[j] = temp;
 }
 
-void jqsort_prv(void *v[], int left, int right, int (*comp)(const void *, const void *))
+void jqsort_prv(void *v[], int64_t left, int64_t right, int (*comp)(const void *, const void *))
 {
- register int i, last;
+ int64_t i, last;
 
  if (left >= right) return;
  jswap(v, left, (left+right)/2);
@@ -60,7 +62,7 @@ void jqsort_prv(void *v[], int left, int right, int (*comp)(const void *, const
  jqsort_prv(v, last+1, right, comp);
 }
 
-void jqsort(void *v[], int numels, int(*comp)(const void *, const void *))
+void jqsort(void *v[], int64_t numels, int(*comp)(const void *, const void *))
 {
 	jqsort_prv(v, 0, numels-1, comp);
 }
@@ -76,12 +78,67 @@ public:
 	bool operator()(void *a, void *b) {	return (comp(a, b) < 0); }
 };
 
-void jqsort(void *v[], int numels, int(*comp)(const void *, const void *))
+void jqsort(void *v[], int64_t numels, int(*comp)(const void *, const void *))
 {
 	compobj a(comp);
 	std::sort(v, v + numels, a);
 }
 #endif
 
+
+//////// Radix sort by integer keys //////////
+
+struct jrkey
+{
+ uint64_t key;
+ int64_t idx;
+};
+
+// Stable sort of 'a' by the 'key' fields, one pass per digit of 'bits'
+// bits. Digits which are the same for all the elements are skipped. 'b' is
+// a buffer of the same size, and the sorted elements end up in 'a'.
+
+static void jrsort_prv(jrkey *&a, jrkey *&b, int64_t numels, int bits)
+{
+ const int nd = 64 / bits, size = 1 << bits;
+ const uint64_t mask = size - 1;
+ std::vector<int64_t> count((size_t)nd*size, 0);
+ int64_t i, sum, c;
+ int k;
+
+ for (i = 0; i < numels; i++)
+  for (k = 0; k < nd; k++) count[k*size + ((a[i].key >> (bits*k)) & mask)]++;
+
+ for (k = 0; k < nd; k++)
+ {
+  int64_t *cnt = count.data() + k*size;
+  if (cnt[(a[0].key >> (bits*k)) & mask] == numels) continue;
+  for (i = sum = 0; i < size; i++) { c = cnt[i]; cnt[i] = sum; sum += c; }
+  for (i = 0; i < numels; i++) b[cnt[(a[i].key >> (bits*k)) & mask]++] = a[i];
+  jrkey *t = a; a = b; b = t;
+ }
+}
+
+void jrsort(void *v[], int64_t numels, const uint64_t *keys, int nk)
+{
+ if (numels < 2) return;
+
+ std::vector<jrkey> abuf(numels), bbuf(numels);
+ jrkey *a = abuf.data(), *b = bbuf.data();
+ int64_t i;
+
+ for (i = 0; i < numels; i++) a[i].idx = i;
+
+ // From the least to the most significant key, each pass being stable
+ for (int k = nk - 1; k >= 0; k--)
+ {
+  for (i = 0; i < numels; i++) a[i].key = keys[a[i].idx*nk + k];
+  jrsort_prv(a, b, numels, (numels < 65536) ? 8 : 16);
+ }
+
+ std::vector<void *> tmp(v, v + numels);
+ for (i = 0; i < numels; i++) v[i] = tmp[a[i].idx];
+}
+
 } //namespace T_MESH
 
@@ -29,7 +29,7 @@
 ****************************************************************************/
 
 //! \file
-//! \brief Declaration of a generic QuickSort function.
+//! \brief Declaration of generic QuickSort and radix sort functions.
 //!
 //! The  jqsort()  function sorts an array with numels elements.
 //! The v argument points to the start of the array of elements casted to void *.
@@ -41,10 +41,21 @@
 //! less than, equal to, or greater than the second.  If two members
 //! compare as equal, their order in the sorted array is undefined.
 //! See the manpage of the standard library qsort() function for further information.
+//!
+//! The  jrsort()  function sorts an array with numels elements by unsigned
+//! integer keys instead of a comparison function. Each element has nk keys,
+//! stored in the keys argument from keys[i*nk] to keys[i*nk+nk-1] for the
+//! i-th element, which are compared lexicographically. The keys are sorted by
+//! a LSD radix sort, in linear time and without calling a function per
+//! comparison. Differently from jqsort(), the sort is stable: members with
+//! equal keys keep their relative order.
+
+#include <stdint.h>
 
 namespace T_MESH
 {
 
-extern void jqsort(void *v[], int numels, int (*comp)(const void *, const void *));
+extern void jqsort(void *v[], int64_t numels, int (*comp)(const void *, const void *));
+extern void jrsort(void *v[], int64_t numels, const uint64_t *keys, int nk);
 
 } //namespace T_MESH
@@ -58,10 +58,10 @@ Node::~Node()
 
 /////////// Constructor from list ///////////////////
 
-List::List(const void **d, int n)
+List::List(const void **d, int64_t n)
 {
  l_head = l_tail = NULL; l_numels = 0;
- for (int i=0; i<n; i++) appendTail(d[i]);
+ for (int64_t i=0; i<n; i++) appendTail(d[i]);
 }
 
 ///////////////////////// Destructor //////////////////////////
@@ -269,7 +269,7 @@ void List::removeNodes()
 void **List::toArray() const
 {
  Node *n = l_head;
- int i;
+ int64_t i;
  void **array;
 
  if (l_numels == 0) return NULL;
@@ -280,19 +280,41 @@ void **List::toArray() const
  return array;
 }
 
+///// Conversion from array ///////
+
+void List::fromArray(void **array)
+{
+ Node *n;
+ int64_t i = 0;
+
+ for (n = l_head; n != NULL; n = n->n_next) n->data = array[i++];
+}
+
 ///// Sorts the list /////////
 
 int List::sort(int (*comp)(const void *, const void *))
 {
  void **array;
- int ne = l_numels-1;
 
  if (l_numels < 2) return 0;
  if ((array = toArray()) == NULL) return 1;
 
  jqsort(array, l_numels, comp);
- removeNodes();
- for (; ne >= 0; ne--) appendHead(array[ne]);
+ fromArray(array);
+ free(array);
+
+ return 0;
+}
+
+int List::sort(void (*sorter)(void *[], int64_t))
+{
+ void **array;
+
+ if (l_numels < 2) return 0;
+ if ((array = toArray()) == NULL) return 1;
+
+ sorter(array, l_numels);
+ fromArray(array);
  free(array);
 
  return 0;
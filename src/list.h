@@ -32,6 +32,7 @@
 #define _JLIST_H
 
 #include <stdio.h>
+#include <stdint.h>
 
 namespace T_MESH
 {
@@ -74,7 +75,7 @@ class List
 
  Node *l_head;			//!< First node pointer
  Node *l_tail;			//!< Last node pointer
- int l_numels;			//!< Number of elements in the list
+ int64_t l_numels;		//!< Number of elements in the list
 
  public :
 
@@ -85,7 +86,7 @@ class List
  List(const void *d) {l_head = l_tail = new Node(d); l_numels = 1;}
 
  //! Creates a list out of an array 'd' made of 'n' elements.
- List(const void **d, int n);
+ List(const void **d, int64_t n);
 
  //! Creates a duplicated list.
  List(List& l) {l_head = l_tail = NULL; l_numels = 0; appendList(&l);}
@@ -98,7 +99,7 @@ class List
 
  Node *head() const {return l_head;}	//!< Gets the first node, NULL if empty. \n O(1).
  Node *tail() const {return l_tail;}	//!< Gets the last node, NULL if empty. \n O(1).
- int numels() const {return l_numels;}	//!< Gets the number of elements. \n O(1).
+ int64_t numels() const {return l_numels;}	//!< Gets the number of elements. \n O(1).
 
  void appendHead(const void *d);	//!< Appends a new node storing 'd' to the head. \n O(1).
  void appendTail(const void *d);	//!< Appends a new node storing 'd' to the tail. \n O(1).
@@ -160,6 +161,10 @@ class List
 
  void **toArray() const;		//!< Creates an array out of the list. \n O(numels()).
 
+ //! Replaces the elements of the list with the first numels() elements of 'array',
+ //! keeping the nodes. \n O(numels()).
+ void fromArray(void **array);
+
  //! Sorts the list using 'comp' as comparison function for two elements. \n O(numels()^2).
 
  //! This method uses the QuickSort algorithm for sorting, thus the complexity is N^2 in the
@@ -168,6 +173,10 @@ class List
  //! based on the 'abstractHeap' class. See the documentation of the standard 'qsort' library
  //! function for details on the prototype of the comparison function 'comp'.
  int sort(int (*comp)(const void *, const void *));
+
+ //! Sorts the list using 'sorter', a function sorting an array of elements in place,
+ //! such as xyzSort() or vtxEdgeSort(). \n O(numels()) plus the cost of 'sorter'.
+ int sort(void (*sorter)(void *[], int64_t));
 };
 
 //! Convenience macro to scan the nodes of a list.
@@ -0,0 +1,455 @@
+// Repair restricted to a region of the mesh.
+#include <algorithm>
+#include <array>
+#include <initializer_list>
+#include <map>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+#include "localRepair.h"
+
+namespace T_MESH {
+
+namespace {
+
+// number of times the halo of a region is widened when its repair needs to
+// modify the seam
+const int REGION_RETRIES = 2;
+
+// Copy of a region of a mesh. The vertices on the seam with the rest of the
+// surface are locked in the copy.
+struct RegionCopy {
+    Basic_TMesh mesh;
+
+    // elements of the region in the original mesh
+    std::vector<Vertex *> vertices;
+    std::vector<Edge *> edges;
+
+    // seam edges in the original mesh, whether the region is on their t1
+    // side, and the matching edges of the repaired copy
+    std::vector<Edge *> seam;
+    std::vector<bool> seam_t1;
+    std::vector<Edge *> seam_copy;
+
+    // locked vertices of the copy mapped to the original vertices
+    std::unordered_map<Vertex *, Vertex *> locked;
+
+    // vertices of the triangles of the copy and their positions before the
+    // repair
+    std::unordered_map<Triangle *, std::array<Vertex *, 3>> snapshot;
+    std::unordered_map<Vertex *, Point> positions;
+};
+
+std::vector<Triangle *> selectedTriangles(Basic_TMesh *tin) {
+    std::vector<Triangle *> region;
+    Node *n;
+    Triangle *t;
+    FOREACHVTTRIANGLE((&(tin->T)), t, n) if (IS_VISITED(t)) region.push_back(t);
+    return region;
+}
+
+// Append to 'region' the triangles within 'rings' rings of it and select them.
+void growRegion(std::vector<Triangle *> &region, int rings) {
+    Node *n;
+    Triangle *s;
+    size_t begin = 0;
+
+    for (int r = 0; r < rings; r++) {
+        size_t end = region.size();
+        for (size_t i = begin; i < end; i++) {
+            Triangle *t = region[i];
+            for (Vertex *v : {t->v1(), t->v2(), t->v3()}) {
+                List *vt = v->VT();
+                FOREACHVTTRIANGLE(vt, s, n) if (!IS_VISITED(s)) {
+                    MARK_VISIT(s);
+                    region.push_back(s);
+                }
+                delete vt;
+            }
+        }
+        begin = end;
+    }
+}
+
+// TRUE if the triangles of 'region' around 'v' form more than one sector.
+bool isPinched(Vertex *v) {
+    List *vt = v->VT();
+    Node *n;
+    Triangle *t;
+    bool closed = !v->isOnBoundary(), prev = false;
+    int sectors = 0;
+
+    if (closed) {
+        t = (Triangle *)vt->tail()->data;
+        prev = IS_VISITED(t);
+    }
+    FOREACHVTTRIANGLE(vt, t, n) {
+        bool in = IS_VISITED(t);
+        if (in && !prev) {
+            sectors++;
+        }
+        prev = in;
+    }
+    delete vt;
+
+    return sectors > 1;
+}
+
+// Add to 'region' the triangles around the vertices where it touches itself,
+// which would otherwise become coincident vertices in the copy and be
+// reported as intersections.
+void closePinches(std::vector<Triangle *> &region) {
+    Node *n;
+    Triangle *s;
+
+    for (size_t i = 0; i < region.size(); i++) {
+        Triangle *t = region[i];
+        for (Vertex *v : {t->v1(), t->v2(), t->v3()}) {
+            if (!isPinched(v)) {
+                continue;
+            }
+            List *vt = v->VT();
+            FOREACHVTTRIANGLE(vt, s, n) if (!IS_VISITED(s)) {
+                MARK_VISIT(s);
+                region.push_back(s);
+            }
+            delete vt;
+        }
+    }
+}
+
+void copyRegion(const std::vector<Triangle *> &region, RegionCopy &rc) {
+    Basic_TMesh &sub = rc.mesh;
+    Node *n;
+    Vertex *v;
+
+    // other algorithms may leave the bit set
+    for (Triangle *t : region) {
+        for (Edge *e : {t->e1, t->e2, t->e3}) {
+            UNMARK_BIT(e, 5);
+            UNMARK_BIT(e->v1, 5);
+            UNMARK_BIT(e->v2, 5);
+        }
+    }
+    for (Triangle *t : region) {
+        for (Edge *e : {t->e1, t->e2, t->e3}) {
+            if (IS_BIT(e, 5)) {
+                continue;
+            }
+            MARK_BIT(e, 5);
+            rc.edges.push_back(e);
+            for (Vertex *w : {e->v1, e->v2}) {
+                if (!IS_BIT(w, 5)) {
+                    MARK_BIT(w, 5);
+                    rc.vertices.push_back(w);
+                }
+            }
+        }
+    }
+
+    std::vector<void *> vinfo, einfo;
+    vinfo.reserve(rc.vertices.size());
+    einfo.reserve(rc.edges.size());
+
+    for (Vertex *w : rc.vertices) {
+        UNMARK_BIT(w, 5);
+        Vertex *nv = sub.newVertex(w);
+        nv->info = w;
+        sub.V.appendTail(nv);
+        vinfo.push_back(w->info);
+        w->info = nv;
+    }
+
+    std::unordered_set<Vertex *> seam_vertices;
+    for (Edge *e : rc.edges) {
+        UNMARK_BIT(e, 5);
+        Edge *ne = sub.newEdge((Vertex *)e->v1->info, (Vertex *)e->v2->info);
+        sub.E.appendTail(ne);
+        ne->v1->e0 = ne->v2->e0 = ne;
+        einfo.push_back(e->info);
+        e->info = ne;
+
+        bool in1 = (e->t1 != NULL && IS_VISITED(e->t1));
+        bool in2 = (e->t2 != NULL && IS_VISITED(e->t2));
+        if (e->t1 != NULL && e->t2 != NULL && in1 != in2) {
+            rc.seam.push_back(e);
+            rc.seam_t1.push_back(in1);
+            seam_vertices.insert(e->v1);
+            seam_vertices.insert(e->v2);
+        }
+    }
+
+    for (Triangle *t : region) {
+        Triangle *nt =
+            sub.newTriangle((Edge *)t->e1->info, (Edge *)t->e2->info, (Edge *)t->e3->info);
+        nt->origin = t->origin;
+        sub.T.appendTail(nt);
+        for (Edge *e : {t->e1, t->e2, t->e3}) {
+            Edge *ne = (Edge *)e->info;
+            if (e->t1 == t) {
+                ne->t1 = nt;
+            } else {
+                ne->t2 = nt;
+            }
+        }
+    }
+
+    for (size_t i = 0; i < rc.vertices.size(); i++)
+        rc.vertices[i]->info = vinfo[i];
+    for (size_t i = 0; i < rc.edges.size(); i++)
+        rc.edges[i]->info = einfo[i];
+
+    // split non-manifold vertices of the copy while keeping their reference
+    // to the original vertex
+    sub.duplicateNonManifoldVertices();
+    FOREACHVVVERTEX((&(sub.V)), v, n) {
+        Vertex *ov = (Vertex *)v->info;
+        if (seam_vertices.count(ov)) {
+            MARK_LOCKED(v);
+            rc.locked[v] = ov;
+        }
+        v->info = NULL;
+    }
+    sub.eulerUpdate();
+
+    Triangle *t;
+    FOREACHVTTRIANGLE((&(sub.T)), t, n) rc.snapshot[t] = {t->v1(), t->v2(), t->v3()};
+    FOREACHVVVERTEX((&(sub.V)), v, n) rc.positions[v] = *v;
+}
+
+// Find the seam edges of the repaired copy. Returns false if the repair
+// moved or removed a locked vertex or modified the seam.
+bool matchSeam(RegionCopy &rc) {
+    Node *n;
+    Vertex *v;
+    Edge *e;
+
+    size_t n_locked = 0;
+    FOREACHVVVERTEX((&(rc.mesh.V)), v, n) if (IS_LOCKED(v)) {
+        auto it = rc.locked.find(v);
+        if (it == rc.locked.end()) {
+            return false;
+        }
+        Vertex *ov = it->second;
+        if (v->x != ov->x || v->y != ov->y || v->z != ov->z) {
+            return false;
+        }
+        n_locked++;
+    }
+    if (n_locked != rc.locked.size()) {
+        return false;
+    }
+
+    std::map<std::pair<Vertex *, Vertex *>, size_t> keys;
+    for (size_t i = 0; i < rc.seam.size(); i++) {
+        e = rc.seam[i];
+        keys[std::minmax(e->v1, e->v2)] = i;
+    }
+
+    rc.seam_copy.assign(rc.seam.size(), NULL);
+    size_t n_matched = 0;
+    FOREACHVEEDGE((&(rc.mesh.E)), e, n) {
+        if (!IS_LOCKED(e->v1) || !IS_LOCKED(e->v2)) {
+            continue;
+        }
+        Vertex *ov1 = rc.locked[e->v1], *ov2 = rc.locked[e->v2];
+        auto it = keys.find(std::minmax(ov1, ov2));
+        if (it == keys.end()) {
+            continue;
+        }
+        size_t i = it->second;
+        if (rc.seam_copy[i] != NULL || !e->isOnBoundary() || e->isIsolated()) {
+            return false;
+        }
+        // the copy must lie on the same side of the seam as the region
+        bool same_direction = (ov1 == rc.seam[i]->v1);
+        if (same_direction != ((e->t1 != NULL) == rc.seam_t1[i])) {
+            return false;
+        }
+        rc.seam_copy[i] = e;
+        n_matched++;
+    }
+
+    return n_matched == rc.seam.size();
+}
+
+// Select the triangles of the copy that differ from the ones it was made of,
+// including the ones whose vertices were moved.
+void selectChangedTriangles(RegionCopy &rc) {
+    Node *n;
+    Triangle *t;
+    FOREACHVTTRIANGLE((&(rc.mesh.T)), t, n) {
+        std::array<Vertex *, 3> vs = {t->v1(), t->v2(), t->v3()};
+        auto it = rc.snapshot.find(t);
+        bool changed = (it == rc.snapshot.end() || it->second != vs);
+        for (int i = 0; i < 3 && !changed; i++) {
+            auto pos = rc.positions.find(vs[i]);
+            changed = (pos == rc.positions.end() || pos->second != *vs[i]);
+        }
+        if (changed) {
+            MARK_VISIT(t);
+        } else {
+            UNMARK_VISIT(t);
+        }
+    }
+}
+
+// Replace 'region' with the repaired copy. The replaced elements are
+// unlinked and must be removed through removeUnlinkedElements().
+void spliceRegion(Basic_TMesh *tin, const std::vector<Triangle *> &region, RegionCopy &rc) {
+    Node *n;
+    Vertex *v;
+    Edge *e;
+
+    for (Triangle *t : region) {
+        t->e1->replaceTriangle(t, NULL);
+        t->e2->replaceTriangle(t, NULL);
+        t->e3->replaceTriangle(t, NULL);
+        t->e1 = t->e2 = t->e3 = NULL;
+    }
+    for (Edge *oe : rc.edges) {
+        if (oe->isIsolated()) {
+            oe->v1 = oe->v2 = NULL;
+        }
+    }
+    for (Vertex *ov : rc.vertices)
+        ov->e0 = NULL;
+    for (Edge *oe : rc.seam)
+        oe->v1->e0 = oe->v2->e0 = oe;
+
+    FOREACHVEEDGE((&(rc.mesh.E)), e, n) {
+        if (IS_LOCKED(e->v1)) {
+            e->v1 = rc.locked[e->v1];
+        }
+        if (IS_LOCKED(e->v2)) {
+            e->v2 = rc.locked[e->v2];
+        }
+    }
+    for (size_t i = 0; i < rc.seam.size(); i++) {
+        Edge *oe = rc.seam[i], *ce = rc.seam_copy[i];
+        Triangle *t = (ce->t1 != NULL) ? ce->t1 : ce->t2;
+        t->replaceEdge(ce, oe);
+        if (rc.seam_t1[i]) {
+            oe->t1 = t;
+        } else {
+            oe->t2 = t;
+        }
+        ce->v1 = ce->v2 = NULL;
+        ce->t1 = ce->t2 = NULL;
+    }
+    FOREACHVVVERTEX((&(rc.mesh.V)), v, n) if (IS_LOCKED(v)) v->e0 = NULL;
+
+    tin->V.joinTailList(&(rc.mesh.V));
+    tin->E.joinTailList(&(rc.mesh.E));
+    tin->T.joinTailList(&(rc.mesh.T));
+}
+
+} // namespace
+
+int64_t selectTrianglesFromMask(Basic_TMesh *tin, const bool *mask, size_t n) {
+    Node *m;
+    Triangle *t;
+    size_t i = 0;
+    int64_t ns = 0;
+    FOREACHVTTRIANGLE((&(tin->T)), t, m) {
+        if (i < n && mask[i]) {
+            MARK_VISIT(t);
+            ns++;
+        } else {
+            UNMARK_VISIT(t);
+        }
+        i++;
+    }
+    return ns;
+}
+
+bool cleanSelectedRegion(
+    Basic_TMesh *tin,
+    int halo,
+    int max_iters,
+    int inner_loops,
+    bool *localized,
+    UINT16 tris_per_cell) {
+    Node *n;
+    Triangle *t;
+
+    std::vector<Triangle *> region = selectedTriangles(tin);
+    growRegion(region, halo);
+    closePinches(region);
+    *localized = true;
+    if (region.empty()) {
+        return true;
+    }
+
+    // retry with a wider halo before falling back to the whole mesh
+    int width = std::max(halo, 1);
+    for (int attempt = 0; attempt <= REGION_RETRIES; attempt++) {
+        if (attempt) {
+            TMesh::info(
+                "cleanSelectedRegion: the seam of the region was modified. "
+                "Retrying with %d more rings.\n",
+                width);
+            growRegion(region, width);
+            closePinches(region);
+            width *= 2;
+        }
+        RegionCopy rc;
+        copyRegion(region, rc);
+        bool is_clean = rc.mesh.meshclean(max_iters, inner_loops, tris_per_cell);
+        if (matchSeam(rc)) {
+            selectChangedTriangles(rc);
+            spliceRegion(tin, region, rc);
+            tin->removeUnlinkedElements();
+            return is_clean;
+        }
+    }
+
+    TMesh::info(
+        "cleanSelectedRegion: the seam of the region was modified. "
+        "Cleaning the whole mesh.\n");
+    *localized = false;
+    bool is_clean = tin->meshclean(max_iters, inner_loops, tris_per_cell);
+    FOREACHVTTRIANGLE((&(tin->T)), t, n) MARK_VISIT(t);
+
+    return is_clean;
+}
+
+int64_t fillSelectedRegionHoles(
+    Basic_TMesh *tin,
+    int halo,
+    int64_t nbe,
+    bool refine_patches,
+    double target_length,
+    double density_scale,
+    int64_t max_new_triangles) {
+    Node *n;
+    Triangle *t;
+
+    // without a selection fillSmallBoundaries() patches every hole
+    std::vector<Triangle *> region = selectedTriangles(tin);
+    if (region.empty()) {
+        return 0;
+    }
+    growRegion(region, halo);
+
+    int64_t nt = tin->T.numels();
+    int64_t nh = tin->fillSmallBoundaries(
+        nbe, refine_patches, target_length, density_scale, max_new_triangles);
+
+    // patches are prepended to the triangle list
+    int64_t n_new = tin->T.numels() - nt;
+    int64_t i = 0;
+    FOREACHVTTRIANGLE((&(tin->T)), t, n) {
+        if (i++ < n_new) {
+            MARK_VISIT(t);
+        } else {
+            UNMARK_VISIT(t);
+        }
+    }
+
+    return nh;
+}
+
+} // namespace T_MESH
@@ -0,0 +1,53 @@
+// Repair restricted to a region of the mesh.
+#ifndef LOCAL_REPAIR_H
+#define LOCAL_REPAIR_H
+
+#include <cstddef>
+
+#include "tmesh.h"
+
+namespace T_MESH {
+
+// Select the triangles flagged in 'mask', which is indexed in the order of
+// the triangle list, and deselect all the others. Returns the number of
+// selected triangles.
+int64_t selectTrianglesFromMask(Basic_TMesh *tin, const bool *mask, size_t n);
+
+// Remove degeneracies and self-intersections within the selected triangles
+// grown by 'halo' rings.
+//
+// The region is copied to a separate mesh whose seam with the rest of the
+// surface is locked, cleaned with meshclean() and spliced back. The
+// expensive steps therefore only visit the region. If the repair needs to
+// modify the seam, the whole mesh is cleaned instead and 'localized' is set
+// to false.
+//
+// On exit the triangles created or modified by the repair are selected.
+// Returns true only if the region could be completely cleaned.
+// 'tris_per_cell' is passed to selectIntersectingTriangles().
+bool cleanSelectedRegion(
+    Basic_TMesh *tin,
+    int halo,
+    int max_iters,
+    int inner_loops,
+    bool *localized,
+    UINT16 tris_per_cell = 50);
+
+// Fill the holes with less than 'nbe' boundary edges (all if 0) whose
+// boundary is entirely within the selected triangles grown by 'halo'
+// rings. The refinement of the patches is controlled by 'target_length',
+// 'density_scale' and 'max_new_triangles' as in fillSmallBoundaries(). On
+// exit the triangles created to patch the holes are selected. Returns the
+// number of holes patched.
+int64_t fillSelectedRegionHoles(
+    Basic_TMesh *tin,
+    int halo,
+    int64_t nbe,
+    bool refine_patches,
+    double target_length = 0,
+    double density_scale = 1,
+    int64_t max_new_triangles = 0);
+
+} // namespace T_MESH
+
+#endif // LOCAL_REPAIR_H
@@ -29,6 +29,7 @@
 ****************************************************************************/
 
 #include "marchIntersections.h"
+#include <inttypes.h>
 
 namespace T_MESH
 {
@@ -832,7 +833,7 @@ void mc_grid::remesh(bool simplify_result)
  FOREACHVTTRIANGLE((&ntin.T), t, n)
  {
   sample_triangle(t); t->info=NULL;
-  if (!((i++)%1000)) TMesh::report_progress("%d %% done   ",(i*50)/ntin.T.numels());
+  if (!((i++)%1000)) TMesh::report_progress("%d %% done   ",(int)((i*50)/ntin.T.numels()));
  }
 
  sort();		// Sort the intersections
@@ -851,8 +852,8 @@ void mc_grid::remesh(bool simplify_result)
 
 
  tin->removeVertices();
- int count = tin->duplicateNonManifoldVertices();
- TMesh::info("Duplicated %d non-manifold vertices.\n",count);
+ int64_t count = tin->duplicateNonManifoldVertices();
+ TMesh::info("Duplicated %" PRId64 " non-manifold vertices.\n",count);
 
  trackOuterHull();
 
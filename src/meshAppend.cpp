@@ -0,0 +1,160 @@
+// Incremental construction of a mesh from chunks of indexed triangles.
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+
+#include "meshAppend.h"
+
+namespace T_MESH {
+
+namespace {
+
+// Mix the bits of 'x', as the finalizer of splitmix64.
+uint64_t mix(uint64_t x) {
+    x ^= x >> 30;
+    x *= 0xbf58476d1ce4e5b9ULL;
+    x ^= x >> 27;
+    x *= 0x94d049bb133111ebULL;
+    x ^= x >> 31;
+    return x;
+}
+
+// Bits of 'x', with -0 and 0 equal.
+uint64_t doubleBits(double x) {
+    x += 0.0;
+    uint64_t bits;
+    std::memcpy(&bits, &x, sizeof(bits));
+    return bits;
+}
+
+// Index of the grid cell of size 'cell' containing 'x', clamped so that
+// far points stay in range.
+int64_t cellIndex(double x, double cell) {
+    const double limit = 4e18;
+    return (int64_t)std::max(-limit, std::min(limit, std::floor(x / cell)));
+}
+
+void coordinates(const Vertex *v, double *p) {
+    p[0] = TMESH_TO_DOUBLE(v->x);
+    p[1] = TMESH_TO_DOUBLE(v->y);
+    p[2] = TMESH_TO_DOUBLE(v->z);
+}
+
+} // namespace
+
+MeshAppender::~MeshAppender() {
+    for (ExtVertex *ev : vertices) {
+        delete ev;
+    }
+}
+
+uint64_t MeshAppender::cellKey(uint64_t i, uint64_t j, uint64_t k) const {
+    return mix(mix(mix(i) ^ j) ^ k);
+}
+
+uint64_t MeshAppender::pointKey(const double *p) const {
+    if (tol == 0) {
+        return cellKey(doubleBits(p[0]), doubleBits(p[1]), doubleBits(p[2]));
+    }
+    return cellKey(cellIndex(p[0], cell), cellIndex(p[1], cell), cellIndex(p[2], cell));
+}
+
+void MeshAppender::insert(int64_t index) {
+    double p[3];
+    coordinates(vertices[index]->v, p);
+    grid.emplace(pointKey(p), index);
+}
+
+// Index of the vertex of 'grid' nearest to 'p' within the tolerance, or -1.
+int64_t MeshAppender::nearest(const double *p) const {
+    int64_t best = -1;
+    double q[3];
+
+    if (tol == 0) {
+        auto range = grid.equal_range(pointKey(p));
+        for (auto it = range.first; it != range.second; ++it) {
+            coordinates(vertices[it->second]->v, q);
+            if (q[0] == p[0] && q[1] == p[1] && q[2] == p[2]) {
+                best = it->second;
+                break;
+            }
+        }
+        return best;
+    }
+
+    // the cube of half size 'tol' around 'p' overlaps at most 2 cells per axis
+    int64_t lo[3], hi[3];
+    for (int a = 0; a < 3; a++) {
+        lo[a] = cellIndex(p[a] - tol, cell);
+        hi[a] = cellIndex(p[a] + tol, cell);
+    }
+    double best_dist = tol * tol;
+    for (int64_t i = lo[0]; i <= hi[0]; i++) {
+        for (int64_t j = lo[1]; j <= hi[1]; j++) {
+            for (int64_t k = lo[2]; k <= hi[2]; k++) {
+                auto range = grid.equal_range(cellKey(i, j, k));
+                for (auto it = range.first; it != range.second; ++it) {
+                    coordinates(vertices[it->second]->v, q);
+                    double dx = q[0] - p[0], dy = q[1] - p[1], dz = q[2] - p[2];
+                    double dist = dx * dx + dy * dy + dz * dz;
+                    if (dist <= best_dist) {
+                        best_dist = dist;
+                        best = it->second;
+                    }
+                }
+            }
+        }
+    }
+    return best;
+}
+
+size_t MeshAppender::addPoints(const double *xyz, size_t n, double weld_tol, int64_t *index) {
+    if (weld_tol != tol) {
+        // the hash is only valid for its tolerance
+        grid.clear();
+        tol = weld_tol;
+        cell = 2 * tol;
+        for (size_t i = 0; i < vertices.size(); i++) {
+            insert((int64_t)i);
+        }
+    }
+
+    const size_t first = vertices.size();
+    size_t n_welded = 0;
+    vertices.reserve(first + n);
+    for (size_t i = 0; i < n; i++) {
+        const double *p = xyz + 3 * i;
+        int64_t found = grid.empty() ? -1 : nearest(p);
+        if (found >= 0) {
+            index[i] = found;
+            n_welded++;
+            continue;
+        }
+        Vertex *v = tin->newVertex(p[0], p[1], p[2]);
+        v->origin = n_points + (int64_t)i;
+        tin->V.appendTail(v);
+        index[i] = (int64_t)vertices.size();
+        vertices.push_back(new ExtVertex(v));
+    }
+
+    n_points += (int64_t)n;
+    // points are only welded to the points of the previous chunks
+    for (size_t i = first; i < vertices.size(); i++) {
+        insert((int64_t)i);
+    }
+    return n_welded;
+}
+
+void MeshAppender::finish() {
+    for (ExtVertex *ev : vertices) {
+        delete ev;
+    }
+    std::vector<ExtVertex *>().swap(vertices);
+    std::unordered_multimap<uint64_t, int64_t>().swap(grid);
+    tol = -1;
+
+    tin->fixConnectivity();
+    tin->eulerUpdate();
+}
+
+} // namespace T_MESH
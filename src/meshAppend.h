@@ -0,0 +1,96 @@
+// Incremental construction of a mesh from chunks of indexed triangles.
+#ifndef MESH_APPEND_H
+#define MESH_APPEND_H
+
+#include <cstddef>
+#include <cstdint>
+#include <unordered_map>
+#include <vector>
+
+#include "tmesh.h"
+
+namespace T_MESH {
+
+// Appends chunks of points and triangles to a mesh, welding the points of
+// each chunk to the points of the previous chunks, as along the seams of a
+// tiled mesh.
+//
+// The indexed vertices and the lists of their edges are kept between the
+// chunks, so that a triangle of a chunk shares the edges created by the
+// triangles of the previous chunks. The connectivity of the mesh is only
+// fixed by finish().
+class MeshAppender {
+  public:
+    explicit MeshAppender(Basic_TMesh *tin) : tin(tin) {}
+    ~MeshAppender();
+
+    MeshAppender(const MeshAppender &) = delete;
+    MeshAppender &operator=(const MeshAppender &) = delete;
+
+    // Append the 'n' points of coordinates 'xyz', shaped (n, 3). Points
+    // within 'weld_tol' of a point of a previous chunk are welded to the
+    // nearest one, and only exactly coincident points if 'weld_tol' is 0.
+    // The points are looked up in a hash of a grid of cells of size
+    // 2 * 'weld_tol', so that at most 8 cells are searched for each point.
+    // Fills 'index' with the index of each point among the appended
+    // vertices and returns the number of welded points.
+    size_t addPoints(const double *xyz, size_t n, double weld_tol, int64_t *index);
+
+    // Append the 'nt' triangles of 'faces', shaped (nt, 3), whose points
+    // are indexed by the 'index' filled by addPoints(). Triangles whose
+    // points were welded together or that cannot be created are skipped.
+    // Returns the number of skipped triangles.
+    template <typename I>
+    size_t addTriangles(const I *faces, size_t nt, const int64_t *index) {
+        size_t n_skipped = 0;
+        for (size_t i = 0; i < nt; i++) {
+            int64_t i1 = index[faces[3 * i]];
+            int64_t i2 = index[faces[3 * i + 1]];
+            int64_t i3 = index[faces[3 * i + 2]];
+            Triangle *t = NULL;
+            if (i1 == i2 || i2 == i3 || i3 == i1) {
+                TMesh::warning("Coincident points at triangle %zu. Skipping.", i);
+            } else if (
+                (t = tin->CreateIndexedTriangle(vertices.data(), i1, i2, i3)) == NULL) {
+                TMesh::warning("Failed to create triangle at face %zu. Skipping.", i);
+            }
+            if (t == NULL) {
+                n_skipped++;
+            } else {
+                t->origin = n_faces + (int64_t)i;
+            }
+        }
+        n_faces += (int64_t)nt;
+        return n_skipped;
+    }
+
+    // Free the indexed vertices and the hash, then fix the connectivity of
+    // the mesh and update its topological invariants.
+    void finish();
+
+    // Number of appended vertices, not counting the welded points.
+    size_t numVertices() const { return vertices.size(); }
+
+  private:
+    Basic_TMesh *tin;
+    std::vector<ExtVertex *> vertices;
+    // Indices of the appended vertices by the key of their grid cell.
+    std::unordered_multimap<uint64_t, int64_t> grid;
+    // Welding tolerance of 'grid', or negative if it is empty, and the size
+    // of its cells.
+    double tol = -1;
+    double cell = 0;
+    // Numbers of points and faces appended so far, welded or not. The
+    // origin of each element is its index in the concatenated chunks.
+    int64_t n_points = 0;
+    int64_t n_faces = 0;
+
+    uint64_t cellKey(uint64_t i, uint64_t j, uint64_t k) const;
+    uint64_t pointKey(const double *p) const;
+    void insert(int64_t index);
+    int64_t nearest(const double *p) const;
+};
+
+} // namespace T_MESH
+
+#endif // MESH_APPEND_H
@@ -0,0 +1,177 @@
+// Defect counts of a mesh given as arrays.
+#include <algorithm>
+#include <array>
+#include <numeric>
+#include <vector>
+
+#include "meshInspection.h"
+#include "meshIntersection.h"
+
+namespace T_MESH {
+
+namespace {
+
+// Union-find over 0..n-1 with path halving. The root of each set is its
+// smallest element.
+struct DisjointSets {
+    std::vector<size_t> parent;
+
+    explicit DisjointSets(size_t n) : parent(n) {
+        std::iota(parent.begin(), parent.end(), (size_t)0);
+    }
+
+    size_t find(size_t i) {
+        while (parent[i] != i) {
+            parent[i] = parent[parent[i]];
+            i = parent[i];
+        }
+        return i;
+    }
+
+    void join(size_t i, size_t j) {
+        i = find(i);
+        j = find(j);
+        if (i != j)
+            parent[std::max(i, j)] = std::min(i, j);
+    }
+};
+
+// Edge 'k' of a face, from its corner 'k' to its corner 'k + 1'. 'a' is the
+// smaller of the vertex indices.
+struct HalfEdge {
+    uint64_t a, b;
+    size_t face;
+    int k;
+    bool forward;
+
+    bool operator<(const HalfEdge &o) const { return a < o.a || (a == o.a && b < o.b); }
+    bool sameEdge(const HalfEdge &o) const { return a == o.a && b == o.b; }
+};
+
+} // namespace
+
+bool MeshInspection::isClean(bool single_component) const {
+    return boundary_edges == 0 && nonmanifold_edges == 0 && misoriented_edges == 0 &&
+           nonmanifold_vertices == 0 && duplicate_faces == 0 && degenerate_faces == 0 &&
+           unused_vertices == 0 && intersecting_faces == 0 && components > 0 &&
+           (!single_component || components == 1);
+}
+
+template <typename I>
+MeshInspection
+inspectMesh(const double *points, size_t n_points, const I *faces, size_t n_faces) {
+    MeshInspection r;
+
+    // Faces with coincident indices have no edges and are not loaded
+    std::vector<bool> valid(n_faces);
+    std::vector<std::array<uint64_t, 3>> keys;
+    keys.reserve(n_faces);
+    for (size_t i = 0; i < n_faces; i++) {
+        const I *f = faces + 3 * i;
+        valid[i] = f[0] != f[1] && f[1] != f[2] && f[2] != f[0];
+        if (!valid[i]) {
+            r.degenerate_faces++;
+            continue;
+        }
+        Point a(points[3 * f[0]], points[3 * f[0] + 1], points[3 * f[0] + 2]);
+        Point b(points[3 * f[1]], points[3 * f[1] + 1], points[3 * f[1] + 2]);
+        Point c(points[3 * f[2]], points[3 * f[2] + 1], points[3 * f[2] + 2]);
+        if (!a.exactMisalignment(&b, &c))
+            r.degenerate_faces++;
+
+        std::array<uint64_t, 3> key = {(uint64_t)f[0], (uint64_t)f[1], (uint64_t)f[2]};
+        std::sort(key.begin(), key.end());
+        keys.push_back(key);
+    }
+    std::sort(keys.begin(), keys.end());
+    for (size_t i = 1; i < keys.size(); i++) {
+        if (keys[i] == keys[i - 1])
+            r.duplicate_faces++;
+    }
+    keys = std::vector<std::array<uint64_t, 3>>();
+
+    std::vector<HalfEdge> edges;
+    edges.reserve(3 * n_faces);
+    std::vector<bool> used(n_points, false);
+    for (size_t i = 0; i < n_faces; i++) {
+        if (!valid[i])
+            continue;
+        const I *f = faces + 3 * i;
+        for (int k = 0; k < 3; k++) {
+            uint64_t v1 = (uint64_t)f[k], v2 = (uint64_t)f[(k + 1) % 3];
+            edges.push_back({std::min(v1, v2), std::max(v1, v2), i, k, v1 < v2});
+            used[v1] = true;
+        }
+    }
+    r.unused_vertices = std::count(used.begin(), used.end(), false);
+    std::sort(edges.begin(), edges.end());
+
+    // Join the faces sharing an edge into components, and the corners of two
+    // faces at the ends of a manifold edge into fans
+    DisjointSets components(n_faces), fans(3 * n_faces);
+    auto corner = [faces](const HalfEdge &e, uint64_t v) {
+        size_t c = 3 * e.face + e.k;
+        return ((uint64_t)faces[c] == v) ? c : 3 * e.face + (e.k + 1) % 3;
+    };
+    for (size_t i = 0, j; i < edges.size(); i = j) {
+        for (j = i + 1; j < edges.size() && edges[j].sameEdge(edges[i]); j++) {
+            components.join(edges[i].face, edges[j].face);
+        }
+        if (j - i == 1) {
+            r.boundary_edges++;
+        } else if (j - i > 2) {
+            r.nonmanifold_edges++;
+        } else {
+            const HalfEdge &e1 = edges[i], &e2 = edges[i + 1];
+            if (e1.forward == e2.forward)
+                r.misoriented_edges++;
+            fans.join(corner(e1, e1.a), corner(e2, e1.a));
+            fans.join(corner(e1, e1.b), corner(e2, e1.b));
+        }
+    }
+    edges = std::vector<HalfEdge>();
+
+    // Each set of corners is a fan around a vertex
+    std::vector<int> n_fans(n_points, 0);
+    for (size_t i = 0; i < n_faces; i++) {
+        if (!valid[i])
+            continue;
+        if (components.find(i) == i)
+            r.components++;
+        for (size_t c = 3 * i; c < 3 * i + 3; c++) {
+            if (fans.find(c) == c && ++n_fans[faces[c]] == 2)
+                r.nonmanifold_vertices++;
+        }
+    }
+
+    return r;
+}
+
+template <typename I>
+size_t intersectingFaces(
+    const double *points,
+    size_t n_points,
+    const I *faces,
+    size_t n_faces,
+    bool first_only,
+    UINT16 tris_per_cell) {
+    TriangleIndex index(points, n_points, faces, n_faces, tris_per_cell);
+    std::vector<std::array<int64_t, 2>> pairs;
+    index.selfIntersect(first_only, pairs);
+    std::vector<int64_t> crossed;
+    for (const std::array<int64_t, 2> &pair : pairs) {
+        crossed.push_back(pair[0]);
+        crossed.push_back(pair[1]);
+    }
+    std::sort(crossed.begin(), crossed.end());
+    return std::unique(crossed.begin(), crossed.end()) - crossed.begin();
+}
+
+template MeshInspection inspectMesh(const double *, size_t, const int32_t *, size_t);
+template MeshInspection inspectMesh(const double *, size_t, const int64_t *, size_t);
+template size_t
+intersectingFaces(const double *, size_t, const int32_t *, size_t, bool, UINT16);
+template size_t
+intersectingFaces(const double *, size_t, const int64_t *, size_t, bool, UINT16);
+
+} // namespace T_MESH
@@ -0,0 +1,62 @@
+// Defect counts of a mesh given as arrays.
+#ifndef MESH_INSPECTION_H
+#define MESH_INSPECTION_H
+
+#include <cstddef>
+#include <cstdint>
+
+#include "tmesh.h"
+
+namespace T_MESH {
+
+struct MeshInspection {
+    // edges used by one face
+    size_t boundary_edges = 0;
+    // edges used by more than two faces
+    size_t nonmanifold_edges = 0;
+    // edges used by two faces in the same direction
+    size_t misoriented_edges = 0;
+    // vertices where separate fans of faces meet
+    size_t nonmanifold_vertices = 0;
+    // faces with the same vertices as a previous face
+    size_t duplicate_faces = 0;
+    // faces with coincident indices or collinear vertices
+    size_t degenerate_faces = 0;
+    // vertices not used by any face
+    size_t unused_vertices = 0;
+    // sets of faces connected through their edges
+    size_t components = 0;
+    // faces intersecting another one, -1 if not checked
+    int64_t intersecting_faces = -1;
+
+    // Whether the repair has nothing to fix. Several components are
+    // accepted unless 'single_component' is set. Intersections must have
+    // been checked.
+    bool isClean(bool single_component) const;
+};
+
+// Count the defects of the mesh with the 'n_faces' faces of 'faces', three
+// indices into 'points' per face, which must be valid. Intersections are
+// not checked.
+//
+// No Basic_TMesh is built: the edges are matched by sorting their vertex
+// indices and the fans and components are joined through the matched edges.
+template <typename I>
+MeshInspection
+inspectMesh(const double *points, size_t n_points, const I *faces, size_t n_faces);
+
+// Number of faces intersecting another face of the same mesh, found with a
+// TriangleIndex. If 'first_only' is set, the search stops at the first
+// intersecting pair.
+template <typename I>
+size_t intersectingFaces(
+    const double *points,
+    size_t n_points,
+    const I *faces,
+    size_t n_faces,
+    bool first_only = false,
+    UINT16 tris_per_cell = 0);
+
+} // namespace T_MESH
+
+#endif // MESH_INSPECTION_H
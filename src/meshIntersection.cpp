@@ -0,0 +1,573 @@
+// Intersection and distance queries between two meshes.
+#include <algorithm>
+#include <cfloat>
+#include <cmath>
+#include <limits>
+#include <utility>
+
+#include "detectIntersections.h"
+#include "meshIntersection.h"
+
+namespace T_MESH {
+
+namespace {
+
+bool boxesOverlap(const double *a, const double *b) {
+    return a[0] <= b[3] && b[0] <= a[3] && a[1] <= b[4] && b[1] <= a[4] && a[2] <= b[5] &&
+           b[2] <= a[5];
+}
+
+void emptyBox(double *box) {
+    box[0] = box[1] = box[2] = DBL_MAX;
+    box[3] = box[4] = box[5] = -DBL_MAX;
+}
+
+void growBox(double *box, const double *other) {
+    for (int i = 0; i < 3; i++) {
+        box[i] = std::min(box[i], other[i]);
+        box[i + 3] = std::max(box[i + 3], other[i + 3]);
+    }
+}
+
+// Squared distance of 'p' from a box, 0 if inside.
+double boxSquaredDistance(const double *box, const double *p) {
+    double d = 0;
+    for (int i = 0; i < 3; i++) {
+        double e = std::max(std::max(box[i] - p[i], p[i] - box[i + 3]), 0.0);
+        d += e * e;
+    }
+    return d;
+}
+
+// Squared distance of 'p' from the closest point of the triangle a, b, c.
+//
+// Unlike Triangle::pointTriangleSquaredDistance(), degenerate triangles are
+// measured as segments or points, and the closest point is searched on all
+// the edges when it is outside the triangle.
+double
+pointTriangleSquaredDistance(const Point &p, const Point &a, const Point &b, const Point &c) {
+    Point ab = b - a, ac = c - a, ap = p - a;
+    double d1 = ab * ap, d2 = ac * ap;
+    if (d1 <= 0 && d2 <= 0)
+        return ap.squaredLength();
+
+    Point bp = p - b;
+    double d3 = ab * bp, d4 = ac * bp;
+    if (d3 >= 0 && d4 <= d3)
+        return bp.squaredLength();
+
+    double vc = d1 * d4 - d3 * d2;
+    if (vc <= 0 && d1 >= 0 && d3 <= 0) {
+        double v = d1 / (d1 - d3);
+        return (ap - ab * v).squaredLength();
+    }
+
+    Point cp = p - c;
+    double d5 = ab * cp, d6 = ac * cp;
+    if (d6 >= 0 && d5 <= d6)
+        return cp.squaredLength();
+
+    double vb = d5 * d2 - d1 * d6;
+    if (vb <= 0 && d2 >= 0 && d6 <= 0) {
+        double w = d2 / (d2 - d6);
+        return (ap - ac * w).squaredLength();
+    }
+
+    double va = d3 * d6 - d5 * d4;
+    if (va <= 0 && (d4 - d3) >= 0 && (d5 - d6) >= 0) {
+        double w = (d4 - d3) / ((d4 - d3) + (d5 - d6));
+        return (bp - (c - b) * w).squaredLength();
+    }
+
+    double denom = va + vb + vc;
+    if (denom <= 0) {
+        // degenerate triangle, measured from its edges
+        double d =
+            std::min(ap.squaredLength(), std::min(bp.squaredLength(), cp.squaredLength()));
+        const Point *ends[3][2] = {{&a, &b}, {&b, &c}, {&c, &a}};
+        for (int k = 0; k < 3; k++) {
+            Point e = *ends[k][1] - *ends[k][0], q = p - *ends[k][0];
+            double l = e * e;
+            if (l > 0) {
+                double u = std::min(std::max((q * e) / l, 0.0), 1.0);
+                d = std::min(d, (q - e * u).squaredLength());
+            }
+        }
+        return d;
+    }
+    double v = vb / denom, w = vc / denom;
+    return (ap - ab * v - ac * w).squaredLength();
+}
+
+// Side of 'p' with respect to the line through 'a' and 'b' in the YZ plane,
+// as the sign of orient2D() for 'p' moved by (e, e^2) with e infinitesimal.
+// It is 0 only if 'a' and 'b' coincide in the plane.
+int perturbedSide(const Point &p, const Point &a, const Point &b) {
+    coord o = orient2D(p.y, p.z, a.y, a.z, b.y, b.z);
+    if (o == 0)
+        o = a.z - b.z;
+    if (o == 0)
+        o = b.y - a.y;
+    return (o > 0) - (o < 0);
+}
+
+} // namespace
+
+template <typename I>
+TriangleIndex::TriangleIndex(
+    const double *points,
+    size_t n_points,
+    const I *faces,
+    size_t n_faces,
+    UINT16 tris_per_cell)
+    : vertices(n_points), used(n_points, false) {
+    for (size_t i = 0; i < n_points; i++) {
+        vertices[i].x = points[3 * i];
+        vertices[i].y = points[3 * i + 1];
+        vertices[i].z = points[3 * i + 2];
+    }
+
+    size_t nt = 0;
+    for (size_t i = 0; i < n_faces; i++) {
+        const I *f = faces + 3 * i;
+        if (f[0] != f[1] && f[1] != f[2] && f[2] != f[0])
+            nt++;
+    }
+
+    // The edges and triangles must not move once linked
+    edges.resize(3 * nt);
+    triangles.resize(nt);
+    boxes.resize(6 * nt);
+    size_t j = 0;
+    for (size_t i = 0; i < n_faces; i++) {
+        const I *f = faces + 3 * i;
+        if (f[0] == f[1] || f[1] == f[2] || f[2] == f[0])
+            continue;
+        setTriangle(j++, &vertices[f[0]], &vertices[f[1]], &vertices[f[2]], (int64_t)i);
+    }
+
+    build(tris_per_cell);
+}
+
+TriangleIndex::TriangleIndex(Basic_TMesh *tin, UINT16 tris_per_cell)
+    : vertices(tin->V.numels()), used(tin->V.numels(), false) {
+    Node *n;
+    Vertex *v;
+    Triangle *t;
+
+    size_t i = 0;
+    FOREACHVVVERTEX((&(tin->V)), v, n) {
+        vertices[i].x = v->x;
+        vertices[i].y = v->y;
+        vertices[i].z = v->z;
+        v->info = (void *)(intptr_t)i++;
+    }
+
+    edges.resize(3 * tin->T.numels());
+    triangles.resize(tin->T.numels());
+    boxes.resize(6 * tin->T.numels());
+    i = 0;
+    FOREACHVTTRIANGLE((&(tin->T)), t, n) {
+        setTriangle(
+            i,
+            &vertices[(intptr_t)t->v1()->info],
+            &vertices[(intptr_t)t->v2()->info],
+            &vertices[(intptr_t)t->v3()->info],
+            (int64_t)i);
+        i++;
+    }
+    FOREACHVVVERTEX((&(tin->V)), v, n) v->info = NULL;
+
+    build(tris_per_cell);
+}
+
+template TriangleIndex::TriangleIndex(
+    const double *, size_t, const int32_t *, size_t, UINT16);
+template TriangleIndex::TriangleIndex(
+    const double *, size_t, const int64_t *, size_t, UINT16);
+
+void TriangleIndex::setTriangle(size_t j, Vertex *a, Vertex *b, Vertex *c, int64_t origin) {
+    Vertex *v[3] = {a, b, c};
+    Edge *e = &edges[3 * j];
+    for (int k = 0; k < 3; k++) {
+        e[k].v1 = v[k];
+        e[k].v2 = v[(k + 1) % 3];
+        used[v[k] - &vertices[0]] = true;
+    }
+    Triangle *t = &triangles[j];
+    t->e1 = &e[0];
+    t->e2 = &e[1];
+    t->e3 = &e[2];
+    t->origin = origin;
+
+    double *box = &boxes[6 * j];
+    emptyBox(box);
+    for (int k = 0; k < 3; k++) {
+        double p[6] = {
+            TMESH_TO_DOUBLE(v[k]->x), TMESH_TO_DOUBLE(v[k]->y), TMESH_TO_DOUBLE(v[k]->z)};
+        std::copy(p, p + 3, p + 3);
+        growBox(box, p);
+    }
+}
+
+// Subdivide space as selectIntersectingTriangles() does with automatic
+// parameters, but keep the hierarchy of the cells. Cells are left whole when
+// most of their triangles straddle the cut even with a fixed 'tris_per_cell',
+// since the queries compare every pair of overlapping leaves and duplicated
+// triangles would multiply their number.
+void TriangleIndex::build(UINT16 tris_per_cell) {
+    int64_t nt = (int64_t)triangles.size();
+
+    di_cell *root = new di_cell;
+    double bounds[6];
+    emptyBox(bounds);
+    for (int64_t i = 0; i < nt; i++) {
+        growBox(bounds, &boxes[6 * i]);
+        root->triangles.appendTail(&triangles[i]);
+    }
+    if (nt) {
+        root->mp = Point(bounds[0], bounds[1], bounds[2]) - DI_EPSILON_POINT;
+        root->Mp = Point(bounds[3], bounds[4], bounds[5]) + DI_EPSILON_POINT;
+    }
+
+    int tpc = tris_per_cell, max_cells = DI_MAX_NUMBER_OF_CELLS;
+    if (tris_per_cell == 0)
+        root->autoParameters(&tpc, &max_cells);
+
+    // Cells of the tree and the di_cell of each leaf
+    std::vector<di_cell *> leaves(1, root);
+    cells.push_back(Cell{{0}, -1, 0, 0});
+    int64_t nrefs = nt;
+    int forks = 0;
+    for (size_t c = 0; c < cells.size(); c++) {
+        di_cell *dc = leaves[c];
+        int64_t n0 = dc->triangles.numels();
+        if (forks > max_cells || n0 <= tpc)
+            continue;
+        if (nrefs > DI_AUTO_MAX_DUPLICATION * nt)
+            continue;
+
+        Point omp = dc->mp, oMp = dc->Mp;
+        di_cell *dc2 = dc->fork();
+        int64_t n1 = dc->triangles.numels(), n2 = dc2->triangles.numels();
+        if (2 * (n1 + n2 - n0) > n0) {
+            dc->unfork(dc2, omp, oMp);
+            continue;
+        }
+        forks++;
+        nrefs += n1 + n2 - n0;
+
+        cells[c].child = (int64_t)cells.size();
+        leaves[c] = NULL;
+        cells.push_back(Cell{{0}, -1, 0, 0});
+        cells.push_back(Cell{{0}, -1, 0, 0});
+        leaves.push_back(dc);
+        leaves.push_back(dc2);
+    }
+
+    // Flatten the triangle lists of the leaves and bound every cell by the
+    // boxes of its triangles. Children always follow their parent.
+    entries.reserve(nrefs);
+    for (size_t c = 0; c < cells.size(); c++) {
+        if (leaves[c] == NULL)
+            continue;
+        Node *n;
+        Triangle *t;
+        cells[c].begin = entries.size();
+        FOREACHVTTRIANGLE((&(leaves[c]->triangles)), t, n)
+        entries.push_back(t - &triangles[0]);
+        cells[c].end = entries.size();
+        delete leaves[c];
+    }
+    for (size_t c = cells.size(); c-- > 0;) {
+        Cell &cell = cells[c];
+        emptyBox(cell.box);
+        if (cell.child < 0) {
+            for (size_t k = cell.begin; k < cell.end; k++) {
+                growBox(cell.box, &boxes[6 * entries[k]]);
+            }
+        } else {
+            growBox(cell.box, cells[cell.child].box);
+            growBox(cell.box, cells[cell.child + 1].box);
+        }
+    }
+}
+
+size_t TriangleIndex::intersect(
+    const TriangleIndex &other,
+    bool justproper,
+    bool first_only,
+    std::vector<std::array<int64_t, 2>> &pairs) const {
+    size_t n_pairs = pairs.size();
+
+    // Descend both trees together, splitting the larger of two overlapping
+    // cells, and test the triangles of overlapping leaves
+    std::vector<std::pair<int64_t, int64_t>> todo(1, std::make_pair(0, 0));
+    while (!todo.empty()) {
+        int64_t ia = todo.back().first, ib = todo.back().second;
+        todo.pop_back();
+        const Cell &a = cells[ia];
+        const Cell &b = other.cells[ib];
+        if (!boxesOverlap(a.box, b.box))
+            continue;
+
+        if (a.child >= 0 || b.child >= 0) {
+            bool split_a = b.child < 0;
+            if (a.child >= 0 && b.child >= 0) {
+                double ea = 0, eb = 0;
+                for (int k = 0; k < 3; k++) {
+                    ea = std::max(ea, a.box[k + 3] - a.box[k]);
+                    eb = std::max(eb, b.box[k + 3] - b.box[k]);
+                }
+                split_a = ea >= eb;
+            }
+            if (split_a) {
+                todo.push_back(std::make_pair(a.child, ib));
+                todo.push_back(std::make_pair(a.child + 1, ib));
+            } else {
+                todo.push_back(std::make_pair(ia, b.child));
+                todo.push_back(std::make_pair(ia, b.child + 1));
+            }
+            continue;
+        }
+
+        for (size_t i = a.begin; i < a.end; i++) {
+            size_t ta = entries[i];
+            for (size_t j = b.begin; j < b.end; j++) {
+                size_t tb = other.entries[j];
+                if (!boxesOverlap(&boxes[6 * ta], &other.boxes[6 * tb]))
+                    continue;
+                if (!triangles[ta].intersects(&other.triangles[tb], justproper))
+                    continue;
+                pairs.push_back({triangles[ta].origin, other.triangles[tb].origin});
+                if (first_only)
+                    return pairs.size() - n_pairs;
+            }
+        }
+    }
+
+    // The same pair is found in every pair of leaves holding both triangles
+    std::sort(pairs.begin() + n_pairs, pairs.end());
+    pairs.erase(std::unique(pairs.begin() + n_pairs, pairs.end()), pairs.end());
+    return pairs.size() - n_pairs;
+}
+
+size_t TriangleIndex::selfIntersect(
+    bool first_only, std::vector<std::array<int64_t, 2>> &pairs) const {
+    size_t n_pairs = pairs.size();
+    auto test = [&](size_t ta, size_t tb) {
+        if (ta == tb || !boxesOverlap(&boxes[6 * ta], &boxes[6 * tb]))
+            return false;
+        if (!triangles[ta].intersects(&triangles[tb], true))
+            return false;
+        int64_t a = triangles[ta].origin, b = triangles[tb].origin;
+        pairs.push_back({std::min(a, b), std::max(a, b)});
+        return first_only;
+    };
+    // The first vertex shared by two triangles, or NULL. The corners of a
+    // triangle are the first vertices of its edges.
+    auto sharedVertex = [&](size_t ta, size_t tb) {
+        const Vertex *first = NULL;
+        for (int i = 0; i < 3; i++) {
+            for (int j = 0; j < 3; j++) {
+                const Vertex *v = edges[3 * ta + i].v1;
+                if (v == edges[3 * tb + j].v1 && (first == NULL || v < first))
+                    first = v;
+            }
+        }
+        return first;
+    };
+
+    // Triangles sharing a vertex are in every leaf around the vertex, which
+    // holds its whole fan when its valence is high. They are tested once
+    // here, from the fan of the first vertex they share.
+    std::vector<size_t> fan_begin(vertices.size() + 1, 0), fans(edges.size());
+    for (const Edge &e : edges)
+        fan_begin[e.v1 - &vertices[0] + 1]++;
+    for (size_t v = 0; v < vertices.size(); v++)
+        fan_begin[v + 1] += fan_begin[v];
+    std::vector<size_t> fan_end(fan_begin.begin(), fan_begin.end() - 1);
+    for (size_t k = 0; k < edges.size(); k++)
+        fans[fan_end[edges[k].v1 - &vertices[0]]++] = k / 3;
+    for (size_t v = 0; v < vertices.size(); v++) {
+        for (size_t i = fan_begin[v]; i < fan_end[v]; i++) {
+            for (size_t j = i + 1; j < fan_end[v]; j++) {
+                if (sharedVertex(fans[i], fans[j]) == &vertices[v] && test(fans[i], fans[j]))
+                    return 1;
+            }
+        }
+    }
+
+    // The other triangles are tested within each leaf, as by the di_cell
+    // broad phase. The leaves partition space and hold every triangle whose
+    // box overlaps them, so two intersecting triangles share the leaf
+    // holding a common point and the leaves need not be compared.
+    for (const Cell &cell : cells) {
+        if (cell.child >= 0)
+            continue;
+        for (size_t i = cell.begin; i < cell.end; i++) {
+            for (size_t j = i + 1; j < cell.end; j++) {
+                if (!sharedVertex(entries[i], entries[j]) && test(entries[i], entries[j]))
+                    return 1;
+            }
+        }
+    }
+
+    // The same pair is found in every leaf holding both triangles
+    std::sort(pairs.begin() + n_pairs, pairs.end());
+    pairs.erase(std::unique(pairs.begin() + n_pairs, pairs.end()), pairs.end());
+    return pairs.size() - n_pairs;
+}
+
+double TriangleIndex::distance(const Point &p, size_t *hint) const {
+    double q[3] = {TMESH_TO_DOUBLE(p.x), TMESH_TO_DOUBLE(p.y), TMESH_TO_DOUBLE(p.z)};
+    double best = DBL_MAX;
+    size_t closest = 0;
+    if (hint != NULL && *hint < triangles.size()) {
+        const Triangle &t = triangles[*hint];
+        best = pointTriangleSquaredDistance(p, *t.v1(), *t.v2(), *t.v3());
+        closest = *hint;
+    }
+
+    // Depth first, visiting the closer child first and skipping the cells
+    // farther than the closest face found so far
+    std::vector<std::pair<double, int64_t>> todo(1, std::make_pair(0.0, (int64_t)0));
+    while (!todo.empty()) {
+        double d = todo.back().first;
+        const Cell &cell = cells[todo.back().second];
+        todo.pop_back();
+        if (d >= best)
+            continue;
+
+        if (cell.child >= 0) {
+            double d1 = boxSquaredDistance(cells[cell.child].box, q);
+            double d2 = boxSquaredDistance(cells[cell.child + 1].box, q);
+            if (d1 <= d2) {
+                todo.push_back(std::make_pair(d2, cell.child + 1));
+                todo.push_back(std::make_pair(d1, cell.child));
+            } else {
+                todo.push_back(std::make_pair(d1, cell.child));
+                todo.push_back(std::make_pair(d2, cell.child + 1));
+            }
+            continue;
+        }
+
+        for (size_t k = cell.begin; k < cell.end; k++) {
+            size_t i = entries[k];
+            if (boxSquaredDistance(&boxes[6 * i], q) >= best)
+                continue;
+            const Triangle &t = triangles[i];
+            double d = pointTriangleSquaredDistance(p, *t.v1(), *t.v2(), *t.v3());
+            if (d < best) {
+                best = d;
+                closest = i;
+            }
+        }
+    }
+    if (hint != NULL)
+        *hint = closest;
+    return (best == DBL_MAX) ? DBL_MAX : std::sqrt(best);
+}
+
+bool TriangleIndex::deviation(
+    const TriangleIndex &other,
+    double spacing,
+    double tolerance,
+    double *vertex_distances,
+    double *max,
+    double *sum,
+    size_t *count) const {
+    // Consecutive points are usually close, so the closest face of a point
+    // bounds the search for the next one
+    size_t hint = 0;
+    auto measure = [&](const Point &p, double *d_out) {
+        double d = other.distance(p, &hint);
+        if (d_out != NULL)
+            *d_out = d;
+        *max = std::max(*max, d);
+        *sum += d;
+        (*count)++;
+        return tolerance < 0 || d <= tolerance;
+    };
+
+    for (size_t i = 0; i < vertices.size(); i++) {
+        if (!used[i]) {
+            vertex_distances[i] = std::numeric_limits<double>::quiet_NaN();
+            continue;
+        }
+        if (!measure(vertices[i], &vertex_distances[i]))
+            return false;
+    }
+    if (spacing <= 0)
+        return true;
+
+    // Points of a barycentric grid on each face, excluding its vertices
+    for (const Triangle &t : triangles) {
+        Point a = *t.v1(), b = *t.v2(), c = *t.v3();
+        double longest = std::sqrt(
+            std::max(
+                (b - a).squaredLength(),
+                std::max((c - b).squaredLength(), (a - c).squaredLength())));
+        int64_t k = (int64_t)std::ceil(longest / spacing);
+        for (int64_t i = 0; i <= k; i++) {
+            for (int64_t j = 0; i + j <= k; j++) {
+                if ((i == 0 && j == 0) || i == k || j == k)
+                    continue;
+                double u = (double)i / k, v = (double)j / k;
+                if (!measure(a + (b - a) * u + (c - a) * v, NULL))
+                    return false;
+            }
+        }
+    }
+    return true;
+}
+
+bool TriangleIndex::contains(const Point &p) const {
+    double q[3] = {TMESH_TO_DOUBLE(p.x), TMESH_TO_DOUBLE(p.y), TMESH_TO_DOUBLE(p.z)};
+    auto crossedBy = [&q](const double *box) {
+        return box[1] <= q[1] && q[1] <= box[4] && box[2] <= q[2] && q[2] <= box[5] &&
+               q[0] <= box[3];
+    };
+
+    // Triangles straddling a cut are listed in several leaves, so the
+    // crossed ones are collected and counted once
+    std::vector<size_t> crossed;
+    std::vector<int64_t> todo(1, 0);
+    while (!todo.empty()) {
+        const Cell &cell = cells[todo.back()];
+        todo.pop_back();
+        if (!crossedBy(cell.box))
+            continue;
+        if (cell.child >= 0) {
+            todo.push_back(cell.child);
+            todo.push_back(cell.child + 1);
+            continue;
+        }
+
+        for (size_t k = cell.begin; k < cell.end; k++) {
+            size_t i = entries[k];
+            if (!crossedBy(&boxes[6 * i]))
+                continue;
+            const Triangle &t = triangles[i];
+            const Vertex *a = t.v1(), *b = t.v2(), *c = t.v3();
+            int s = perturbedSide(p, *a, *b);
+            if (s == 0 || perturbedSide(p, *b, *c) != s || perturbedSide(p, *c, *a) != s)
+                continue;
+            // The ray crosses the plane ahead of 'p' if 'p' is behind the
+            // face as seen along +X
+            coord o = p.exactOrientation(a, b, c);
+            if ((s > 0 && o < 0) || (s < 0 && o > 0))
+                crossed.push_back(i);
+        }
+    }
+    std::sort(crossed.begin(), crossed.end());
+    return (std::unique(crossed.begin(), crossed.end()) - crossed.begin()) % 2 == 1;
+}
+
+void TriangleIndex::contains(const double *points, size_t n, bool *inside) const {
+    for (size_t i = 0; i < n; i++) {
+        inside[i] = contains(Point(points[3 * i], points[3 * i + 1], points[3 * i + 2]));
+    }
+}
+
+} // namespace T_MESH
@@ -0,0 +1,128 @@
+// Intersection and distance queries between two meshes.
+#ifndef MESH_INTERSECTION_H
+#define MESH_INTERSECTION_H
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+#include "tmesh.h"
+
+namespace T_MESH {
+
+// Spatial index of the faces of a mesh for intersection and distance
+// queries against other meshes.
+//
+// The faces are stored as independent triangles sharing only the vertices,
+// so that non-manifold input is indexed as is, and are not modified by the
+// queries. Several queries may therefore run concurrently on the same index.
+//
+// The index is the subdivision of space computed by the di_cell broad phase
+// of selectIntersectingTriangles(). Its cells are kept as a tree whose
+// nodes are bounded by the boxes of their triangles, so that two indexes are
+// compared by descending both trees together.
+class TriangleIndex {
+  public:
+    // 'faces' holds three indices into 'points' per face, which must be
+    // valid. Faces with coincident indices are not indexed. 'tris_per_cell'
+    // is the maximum number of triangles per cell as in
+    // selectIntersectingTriangles(), 0 to choose it automatically.
+    template <typename I>
+    TriangleIndex(
+        const double *points,
+        size_t n_points,
+        const I *faces,
+        size_t n_faces,
+        UINT16 tris_per_cell = 0);
+
+    // Index the current faces of 'tin'. Vertices and faces are numbered in
+    // the order of its lists.
+    explicit TriangleIndex(Basic_TMesh *tin, UINT16 tris_per_cell = 0);
+
+    TriangleIndex(const TriangleIndex &) = delete;
+    TriangleIndex &operator=(const TriangleIndex &) = delete;
+
+    // Append to 'pairs' the indices of the faces of this mesh and 'other'
+    // which intersect, sorted and without repetitions. If 'first_only' is
+    // true, stops at the first pair found. 'justproper' is passed to
+    // Triangle::intersects(). Returns the number of pairs appended.
+    size_t intersect(
+        const TriangleIndex &other,
+        bool justproper,
+        bool first_only,
+        std::vector<std::array<int64_t, 2>> &pairs) const;
+
+    // Same as intersect() with this mesh as 'other' and 'justproper' set,
+    // but each pair of faces is reported once. Each pair holds the smaller
+    // index first.
+    size_t selfIntersect(bool first_only, std::vector<std::array<int64_t, 2>> &pairs) const;
+
+    // Distance of 'p' from the closest indexed face, or DBL_MAX if there are
+    // no faces. If 'hint' is given, it holds the index of a face close to
+    // 'p', which bounds the search, and is set to the closest face found.
+    double distance(const Point &p, size_t *hint = NULL) const;
+
+    // Distances from this mesh to the surface of 'other'.
+    //
+    // The distance of each vertex used by a face is written to
+    // 'vertex_distances', which holds one value per point, and is NaN for
+    // unused points. If 'spacing' is positive, points are also sampled on
+    // the faces at most 'spacing' apart. The largest distance and the sum
+    // and number of the distances measured are accumulated into 'max',
+    // 'sum' and 'count'. If 'tolerance' is not negative, the measurement
+    // stops at the first distance above it and false is returned, leaving
+    // the following vertex distances untouched.
+    bool deviation(
+        const TriangleIndex &other,
+        double spacing,
+        double tolerance,
+        double *vertex_distances,
+        double *max,
+        double *sum,
+        size_t *count) const;
+
+    // Whether 'p' is enclosed by the indexed faces, by the parity of the
+    // number of faces crossed by a ray along +X. Unlike
+    // Basic_TMesh::isInnerPoint(), the faces need not be oriented, only the
+    // cells crossed by the ray are visited, and rays through edges and
+    // vertices are resolved by a symbolic perturbation of 'p', so that
+    // each point of a closed surface is counted once. Points on the surface
+    // may be classified either way.
+    bool contains(const Point &p) const;
+
+    // Write contains() of each of the 'n' points of 'points', given as
+    // (x, y, z) triplets, to 'inside'.
+    void contains(const double *points, size_t n, bool *inside) const;
+
+    size_t numPoints() const { return vertices.size(); }
+    size_t numTriangles() const { return triangles.size(); }
+    size_t numCells() const { return cells.size(); }
+
+  private:
+    struct Cell {
+        // bounding box of the triangles in the cell
+        double box[6];
+        // index of the first of the two children, -1 for leaves
+        int64_t child;
+        // range of 'entries' listing the triangles of a leaf
+        size_t begin, end;
+    };
+
+    std::vector<Vertex> vertices;
+    // whether each vertex is used by an indexed face
+    std::vector<bool> used;
+    std::vector<Edge> edges;
+    std::vector<Triangle> triangles;
+    // bounding box of each triangle as (min x, min y, min z, max x, max y, max z)
+    std::vector<double> boxes;
+    std::vector<Cell> cells;
+    std::vector<size_t> entries;
+
+    void setTriangle(size_t j, Vertex *a, Vertex *b, Vertex *c, int64_t origin);
+    void build(UINT16 tris_per_cell);
+};
+
+} // namespace T_MESH
+
+#endif // MESH_INTERSECTION_H
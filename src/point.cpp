@@ -29,7 +29,9 @@
 ****************************************************************************/
 
 #include "point.h"
+#include "jqsort.h"
 #include <stdlib.h>
+#include <string.h>
 #include <limits.h>
 #include <errno.h>
 
@@ -249,6 +251,37 @@ int xyzCompare(const void *a, const void *b)
  return 0;
 }
 
+//////// Lexicographic Point sorting by radix sort //////////
+
+uint64_t xyzKey(const coord& c)
+{
+ double d = TMESH_TO_DOUBLE(c);
+ uint64_t u;
+
+ if (d == 0) d = 0; // -0 is equal to 0
+ memcpy(&u, &d, sizeof(u));
+ return (u & 0x8000000000000000ULL) ? (~u) : (u | 0x8000000000000000ULL);
+}
+
+void xyzSort(void *v[], int64_t numels)
+{
+#ifdef USE_HYBRID_KERNEL
+ // Rational coordinates may not be represented exactly by keys
+ jqsort(v, numels, xyzCompare);
+#else
+ uint64_t *keys = new uint64_t[numels*3];
+ for (int64_t i = 0; i < numels; i++)
+ {
+  Point *p = (Point *)v[i];
+  keys[i*3] = xyzKey(p->x);
+  keys[i*3 + 1] = xyzKey(p->y);
+  keys[i*3 + 2] = xyzKey(p->z);
+ }
+ jrsort(v, numels, keys, 3);
+ delete [] keys;
+#endif
+}
+
 //////////////// Normalization /////////////////////////
 
 void Point::normalize()
@@ -287,6 +287,14 @@ class Point
 //! Lexycographic comparison to be used with jqsort() or abstractHeap.
 int xyzCompare(const void *p1, const void *p2);
 
+//! Unsigned integer having the same order as the coordinate 'c', to be used
+//! as a key with jrsort(). -0 and 0 have the same key.
+uint64_t xyzKey(const coord& c);
+
+//! Sorts an array of points lexycographically, as jqsort() with xyzCompare()
+//! would do, but by radix sort of their coordinate keys. The sort is stable.
+void xyzSort(void *v[], int64_t numels);
+
 //! Static point with DBL_MAX coordinates.
 extern const Point INFINITE_POINT;
 
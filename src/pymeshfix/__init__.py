@@ -2,8 +2,21 @@
 
 from importlib.metadata import PackageNotFoundError, version
 
-from pymeshfix._meshfix import PyTMesh, clean_from_arrays, clean_from_file
+from pymeshfix._meshfix import (
+    MeshIndex,
+    PyTMesh,
+    clean_from_arrays,
+    clean_from_file,
+    estimate_memory,
+    inspect,
+    is_clean,
+)
+from pymeshfix.cache import RepairCache
+from pymeshfix.intersection import intersect, meshes_intersect
 from pymeshfix.meshfix import MeshFix
+from pymeshfix.pipeline import RepairPipeline
+from pymeshfix.server import RemoteRepairer
+from pymeshfix.tiled import tiled_repair
 
 try:
     __version__ = version("pymeshfix")
@@ -11,4 +24,20 @@ except PackageNotFoundError:
     __version__ = "unknown"
 
 
-__all__ = ["MeshFix", "PyTMesh", "clean_from_arrays", "clean_from_file", "__version__"]
+__all__ = [
+    "MeshFix",
+    "MeshIndex",
+    "PyTMesh",
+    "RemoteRepairer",
+    "RepairCache",
+    "RepairPipeline",
+    "clean_from_arrays",
+    "clean_from_file",
+    "estimate_memory",
+    "inspect",
+    "intersect",
+    "is_clean",
+    "meshes_intersect",
+    "tiled_repair",
+    "__version__",
+]
@@ -0,0 +1,8 @@
+"""Allow running the command line interface with ``python -m pymeshfix``."""
+
+import sys
+
+from pymeshfix._cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
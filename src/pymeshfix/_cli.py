@@ -0,0 +1,374 @@
+"""Command line interface for batch mesh repair.
+
+This module must only depend on the compiled extension and the standard
+library so that ``pymeshfix`` starts quickly within shell pipelines. Do not
+import ``pyvista`` or ``vtk`` here.
+
+"""
+
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Iterator
+
+from pymeshfix import _meshfix
+from pymeshfix.pipeline import PRESETS, RepairPipeline
+
+# extensions readable by ``Basic_TMesh::load``
+SUPPORTED_EXTENSIONS = (".ply", ".off", ".stl", ".obj", ".wrl", ".iv", ".tri", ".eff")
+
+
+def _glob_root(pattern: str) -> Path:
+    """Return the leading directories of ``pattern`` without wildcards."""
+    root = Path()
+    for part in Path(pattern).parent.parts:
+        if glob.has_magic(part):
+            break
+        root /= part
+    return root
+
+
+def _iter_inputs(patterns: list[str]) -> Iterator[tuple[Path, Path]]:
+    """Yield ``(path, relative_path)`` for every mesh matched by ``patterns``.
+
+    Directories are searched recursively for files with a supported extension
+    and their relative layout is preserved. Glob matches are relative to the
+    leading directories of the pattern without wildcards, and files are
+    yielded by name only.
+
+    """
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            for root, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                        file_path = Path(root, filename)
+                        yield file_path, file_path.relative_to(path)
+        elif glob.has_magic(pattern):
+            root = _glob_root(pattern)
+            for match in sorted(glob.iglob(pattern, recursive=True)):
+                match_path = Path(match)
+                if match_path.is_file():
+                    yield match_path, match_path.relative_to(root)
+        elif path.is_file():
+            yield path, Path(path.name)
+        else:
+            raise FileNotFoundError(f"No such file, directory, or pattern: '{pattern}'")
+
+
+def _is_up_to_date(infile: Path, outfile: Path) -> bool:
+    """Return ``True`` when ``outfile`` exists and is newer than ``infile``."""
+    try:
+        return outfile.stat().st_mtime >= infile.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def repair_file(
+    infile: str,
+    outfile: str,
+    joincomp: bool = False,
+    remove_smallest_components: bool = True,
+    verbose: bool = False,
+    pipeline: str | None = None,
+) -> dict[str, Any]:
+    """Repair a single mesh file and return a summary of the repair.
+
+    Follows the same sequence as :func:`pymeshfix.clean_from_file`, or runs
+    a preset :class:`pymeshfix.RepairPipeline`, and records timings and
+    repair counts. The output is first written to a
+    temporary file in the output directory and then moved into place so
+    partially written files are never considered up to date.
+
+    Parameters
+    ----------
+    infile : str
+        Input mesh filename.
+    outfile : str
+        Output mesh filename. The format is deduced from the extension.
+    joincomp : bool, default: False
+        Attempt to join nearby open components.
+    remove_smallest_components : bool, default: True
+        Remove all but the largest connected component before repair.
+    verbose : bool, default: False
+        Enable verbose output from MeshFix.
+    pipeline : str, optional
+        Name of the preset pipeline to run. ``joincomp`` and
+        ``remove_smallest_components`` are ignored when given.
+
+    Returns
+    -------
+    dict
+        Summary of the repair containing timings and repair counts.
+
+    """
+    summary: dict[str, Any] = {"input": str(infile), "output": str(outfile)}
+    tstart = time.perf_counter()
+
+    tin = _meshfix.PyTMesh()
+    tin.set_quiet(not verbose)
+    tin.load_file(str(infile))
+    tload = time.perf_counter()
+    summary.update(
+        n_points_in=tin.n_points,
+        n_faces_in=tin.n_faces,
+        n_boundaries_in=tin.n_boundaries,
+    )
+
+    components_removed = 0
+    holes_filled = 0
+    if pipeline is not None:
+        is_clean = False
+        for report in RepairPipeline.from_preset(pipeline).run(tin):
+            if report["stage"] == "remove_components":
+                components_removed += report["result"]
+            elif report["stage"] == "fill_holes":
+                holes_filled += report["result"]
+            elif report["stage"] == "clean":
+                is_clean = report["result"]
+    else:
+        if remove_smallest_components:
+            components_removed = tin.remove_smallest_components()
+        if joincomp:
+            tin.join_closest_components()
+        if tin.n_boundaries:
+            holes_filled += tin.fill_small_boundaries()
+        is_clean = tin.clean()
+        if tin.n_boundaries:
+            holes_filled += tin.fill_small_boundaries()
+            is_clean = tin.clean()
+    trepair = time.perf_counter()
+
+    outfile_path = Path(outfile)
+    outfile_path.parent.mkdir(parents=True, exist_ok=True)
+    tmpfile = outfile_path.with_name(f".{outfile_path.stem}.{os.getpid()}.tmp{outfile_path.suffix}")
+    try:
+        tin.save_file(str(tmpfile))
+        os.replace(tmpfile, outfile_path)
+    finally:
+        if tmpfile.exists():
+            tmpfile.unlink()
+    tsave = time.perf_counter()
+
+    summary.update(
+        status="repaired",
+        n_points_out=tin.n_points,
+        n_faces_out=tin.n_faces,
+        n_boundaries_out=tin.n_boundaries,
+        components_removed=components_removed,
+        holes_filled=holes_filled,
+        clean=is_clean,
+        time_load=tload - tstart,
+        time_repair=trepair - tload,
+        time_save=tsave - trepair,
+        time_total=tsave - tstart,
+    )
+    return summary
+
+
+def _run_job(job: tuple[str, str, dict[str, Any]]) -> dict[str, Any]:
+    """Run a single job within a worker and never raise."""
+    infile, outfile, kwargs = job
+    try:
+        return repair_file(infile, outfile, **kwargs)
+    except Exception as exc:
+        return {"input": infile, "output": outfile, "status": "error", "error": str(exc)}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pymeshfix",
+        description=(
+            "Repair triangular surface meshes in bulk. Inputs may be files, directories "
+            "(searched recursively), or glob patterns. A JSON summary line is written for "
+            "each input file. Run 'pymeshfix serve --help' for the repair daemon."
+        ),
+    )
+    parser.add_argument("inputs", nargs="+", help="Input files, directories, or glob patterns.")
+    parser.add_argument(
+        "-o", "--output-dir", required=True, type=Path, help="Directory to write repaired meshes."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "-s",
+        "--summary",
+        default="-",
+        help="File to write the JSONL summary to. Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=[ext[1:] for ext in SUPPORTED_EXTENSIONS],
+        help="Output file format. Defaults to the format of each input file.",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="Repair even when the output is up to date."
+    )
+    parser.add_argument(
+        "--joincomp", action="store_true", help="Attempt to join nearby open components."
+    )
+    parser.add_argument(
+        "--keep-small-components",
+        action="store_true",
+        help="Do not remove all but the largest connected component.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        choices=list(PRESETS),
+        help=("Run a preset repair pipeline. Overrides --joincomp and --keep-small-components."),
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable MeshFix output.")
+    return parser
+
+
+def _build_serve_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pymeshfix serve",
+        description=(
+            "Run a local repair daemon with a pool of warm worker processes. Jobs are "
+            "received from pymeshfix.RemoteRepairer clients over a Unix domain socket. "
+            "A JSON line of metrics is written on exit."
+        ),
+    )
+    parser.add_argument(
+        "--socket", required=True, type=Path, help="Path of the Unix domain socket."
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+    parser.add_argument("--timeout", type=float, help="Default time limit of a job in seconds.")
+    parser.add_argument("--max-jobs", type=int, help="Replace a worker after this many jobs.")
+    parser.add_argument(
+        "--max-rss",
+        type=float,
+        help="Replace a worker once its resident memory exceeds this many MiB.",
+    )
+    return parser
+
+
+def serve(argv: list[str]) -> int:
+    """Run the ``pymeshfix serve`` daemon until interrupted or terminated.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Command line arguments following ``serve``.
+
+    Returns
+    -------
+    int
+        Exit status.
+
+    """
+    from pymeshfix.server import RepairServer
+
+    args = _build_serve_parser().parse_args(argv)
+    if args.workers < 1:
+        raise SystemExit("pymeshfix serve: error: --workers must be at least 1")
+    max_rss = None if args.max_rss is None else int(args.max_rss * 2**20)
+
+    # stop on SIGTERM as on an interrupt
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with RepairServer(args.socket, args.workers, args.timeout, args.max_jobs, max_rss) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps(server.metrics()), flush=True)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``pymeshfix`` command line interface.
+
+    ``pymeshfix serve`` runs the repair daemon instead, see :func:`serve`.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        Command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        Exit status. Non-zero when any file failed to repair.
+
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "serve":
+        return serve(argv[1:])
+    args = _build_parser().parse_args(argv)
+    if args.jobs < 1:
+        raise SystemExit("pymeshfix: error: --jobs must be at least 1")
+
+    kwargs = {
+        "joincomp": args.joincomp,
+        "remove_smallest_components": not args.keep_small_components,
+        "verbose": args.verbose,
+        "pipeline": args.pipeline,
+    }
+
+    summary_file = sys.stdout if args.summary == "-" else open(args.summary, "a")
+
+    # skipped files are reported from the pool's task feeding thread
+    lock = threading.Lock()
+
+    def emit(record: dict[str, Any]) -> None:
+        with lock:
+            summary_file.write(json.dumps(record) + "\n")
+            summary_file.flush()
+
+    # refuse to write two inputs to the same output before repairing any
+    targets: dict[Path, Path] = {}
+    for infile, relpath in _iter_inputs(args.inputs):
+        outfile = args.output_dir / relpath
+        if args.fmt is not None:
+            outfile = outfile.with_suffix(f".{args.fmt}")
+        other = targets.setdefault(outfile, infile)
+        if other != infile:
+            raise SystemExit(
+                f"pymeshfix: error: '{other}' and '{infile}' would both be written to '{outfile}'"
+            )
+
+    def iter_jobs() -> Iterator[tuple[str, str, dict[str, Any]]]:
+        for outfile, infile in targets.items():
+            if not args.force and _is_up_to_date(infile, outfile):
+                emit({"input": str(infile), "output": str(outfile), "status": "skipped"})
+                continue
+            yield str(infile), str(outfile), kwargs
+
+    n_errors = 0
+    try:
+        if args.jobs == 1:
+            for record in map(_run_job, iter_jobs()):
+                n_errors += record["status"] == "error"
+                emit(record)
+        else:
+            with Pool(args.jobs) as pool:
+                for record in pool.imap_unordered(_run_job, iter_jobs(), chunksize=4):
+                    n_errors += record["status"] == "error"
+                    emit(record)
+    finally:
+        if summary_file is not sys.stdout:
+            summary_file.close()
+
+    return int(n_errors > 0)
@@ -1,3 +1,6 @@
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
 import numpy as np
 from numpy.typing import NDArray
 
@@ -8,23 +11,101 @@ class PyTMesh:
     def load_array(
         self,
         points_arr: NDArray[np.float64],
-        faces_arr: NDArray[np.int32],
+        faces_arr: NDArray[np.int32] | NDArray[np.int64],
     ) -> None: ...
+    def append_arrays(
+        self,
+        points: NDArray[np.float64],
+        faces: NDArray[np.int32] | NDArray[np.int64],
+        weld_tol: float | None = None,
+    ) -> int: ...
+    def finalize(self) -> None: ...
     def fix_connectivity(self) -> None: ...
+    def memory_usage(self) -> dict[str, int]: ...
+    @property
+    def memory_limit(self) -> int | None: ...
+    @memory_limit.setter
+    def memory_limit(self, limit: int | None) -> None: ...
     def join_closest_components(self) -> None: ...
     def set_quiet(self, quiet: int) -> None: ...
-    def clean(self, max_iters: int = 10, inner_loops: int = 3) -> bool: ...
+    def clean(
+        self, max_iters: int = 10, inner_loops: int = 3, tris_per_cell: int | str = 50
+    ) -> bool: ...
     def fill_small_boundaries(self, nbe: int = 0, refine: bool = True) -> int: ...
+    def fill_holes(
+        self,
+        nbe: int = 0,
+        refine: bool = True,
+        max_new_triangles: int = 0,
+        target_edge_length: float = 0.0,
+        density_scale: float = 1.0,
+    ) -> NDArray[np.int64]: ...
+    def faces_in_region(
+        self,
+        bounds: Sequence[float] | None = None,
+        center: Sequence[float] | None = None,
+        radius: float = 0.0,
+    ) -> NDArray[np.bool_]: ...
+    def clean_region(
+        self,
+        face_mask: NDArray[np.bool_],
+        halo: int = 2,
+        max_iters: int = 10,
+        inner_loops: int = 3,
+        tris_per_cell: int | str = 50,
+    ) -> tuple[bool, NDArray[np.int64]]: ...
+    def fill_region_boundaries(
+        self,
+        face_mask: NDArray[np.bool_],
+        halo: int = 2,
+        nbe: int = 0,
+        refine: bool = True,
+        max_new_triangles: int = 0,
+        target_edge_length: float = 0.0,
+        density_scale: float = 1.0,
+    ) -> tuple[int, NDArray[np.int64]]: ...
     def strong_degeneracy_removal(self, max_iter: int) -> bool: ...
-    def strong_intersection_removal(self, max_iter: int) -> bool: ...
+    def strong_intersection_removal(
+        self, max_iters: int, tris_per_cell: int | str = 50
+    ) -> bool: ...
     def select_intersecting_triangles(
-        self, tris_per_cell: int = 50, justproper: bool = False
-    ) -> NDArray[np.int32]: ...
+        self, tris_per_cell: int | str = 50, justproper: bool = False
+    ) -> NDArray[np.int64]: ...
     def remove_smallest_components(self) -> int: ...
-    def return_arrays(self) -> tuple[NDArray[np.float64], NDArray[np.int32]]: ...
+    def decimate(
+        self, target_faces: int | None = None, target_reduction: float | None = None
+    ) -> int: ...
+    def reorder(self, method: str = "morton") -> None: ...
+    def deviation(
+        self,
+        points: NDArray[np.float64],
+        faces: NDArray[np.int32] | NDArray[np.int64],
+        symmetric: bool = True,
+        sample_spacing: float = 0.0,
+        tolerance: float | None = None,
+        tris_per_cell: int | str = "auto",
+    ) -> dict[str, Any]: ...
+    def run_pipeline(self, stages: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]: ...
+    def return_arrays(
+        self,
+        int64: bool | None = None,
+        release: bool = False,
+        out_points: NDArray[np.float64] | None = None,
+        out_faces: NDArray[np.int32] | NDArray[np.int64] | None = None,
+        reorder: bool | str = False,
+    ) -> tuple[NDArray[np.float64], NDArray[np.int32] | NDArray[np.int64]]: ...
+    def output_shape(self) -> tuple[tuple[int, int], tuple[int, int]]: ...
     def return_points(self) -> NDArray[np.float64]: ...
-    def return_faces(self) -> NDArray[np.int32]: ...
+    def return_faces(self, int64: bool | None = None) -> NDArray[np.int32] | NDArray[np.int64]: ...
+    def return_provenance(self) -> dict[str, NDArray]: ...
+    def return_delta(
+        self,
+        points: NDArray[np.float64],
+        faces: NDArray[np.int32] | NDArray[np.int64],
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.int64]]: ...
+    def boundary_loops(self) -> dict[str, NDArray]: ...
     def _boundaries(self) -> None: ...
+    def _vertex_fan_mismatches(self) -> int: ...
     @property
     def n_boundaries(self) -> int: ...
     @property
@@ -32,6 +113,21 @@ class PyTMesh:
     @property
     def n_points(self) -> int: ...
 
+class MeshIndex:
+    def __init__(
+        self,
+        points: NDArray[np.float64],
+        faces: NDArray[np.int32] | NDArray[np.int64],
+        tris_per_cell: int | str = "auto",
+    ) -> None: ...
+    def intersect(self, other: MeshIndex, justproper: bool = False) -> NDArray[np.int64]: ...
+    def intersects(self, other: MeshIndex, justproper: bool = False) -> bool: ...
+    def contains(self, points: NDArray[np.float64]) -> NDArray[np.bool_]: ...
+    @property
+    def n_faces(self) -> int: ...
+    @property
+    def n_cells(self) -> int: ...
+
 def clean_from_file(
     infile: str,
     outfile: str,
@@ -40,8 +136,34 @@ def clean_from_file(
 ) -> None: ...
 def clean_from_arrays(
     v: NDArray[np.float64],
-    f: NDArray[np.int32],
+    f: NDArray[np.int32] | NDArray[np.int64],
     verbose: bool = False,
     joincomp: bool = False,
     remove_smallest_components: bool = True,
-) -> tuple[NDArray[np.float64], NDArray[np.int32]]: ...
+    provenance: bool = False,
+    int64: bool | None = None,
+    delta: bool = False,
+    skip_if_clean: bool = False,
+    memory_limit: int | None = None,
+    out: Callable[
+        [int, int],
+        tuple[NDArray[np.float64] | None, NDArray[np.int32] | NDArray[np.int64] | None],
+    ]
+    | None = None,
+) -> (
+    tuple[NDArray[np.float64], NDArray[np.int32] | NDArray[np.int64]]
+    | tuple[NDArray[np.float64], NDArray[np.int32] | NDArray[np.int64], dict[str, NDArray]]
+    | tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.int64]]
+): ...
+def estimate_memory(n_points: int, n_faces: int, new_faces: int = 0) -> dict[str, int]: ...
+def inspect(
+    points: NDArray[np.float64],
+    faces: NDArray[np.int32] | NDArray[np.int64],
+    intersections: bool = False,
+    tris_per_cell: int | str = "auto",
+) -> dict[str, int | None]: ...
+def is_clean(
+    points: NDArray[np.float64],
+    faces: NDArray[np.int32] | NDArray[np.int64],
+    single_component: bool = False,
+) -> bool: ...
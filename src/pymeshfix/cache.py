@@ -0,0 +1,300 @@
+"""Content-addressed on-disk cache of repair results."""
+
+import hashlib
+import json
+import os
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pymeshfix import _meshfix
+
+try:
+    _VERSION = version("pymeshfix")
+except PackageNotFoundError:
+    _VERSION = "unknown"
+
+_POINTS_SUFFIX = ".points.npy"
+_FACES_SUFFIX = ".faces.npy"
+
+
+def _default_cache_dir() -> Path:
+    """Return the default cache directory.
+
+    Uses ``PYMESHFIX_CACHE_DIR`` when set, otherwise ``$XDG_CACHE_HOME/pymeshfix``
+    or ``~/.cache/pymeshfix``.
+
+    """
+    if "PYMESHFIX_CACHE_DIR" in os.environ:
+        return Path(os.environ["PYMESHFIX_CACHE_DIR"])
+    root = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(root) / "pymeshfix"
+
+
+class RepairCache:
+    """Content-addressed on-disk cache of repaired meshes.
+
+    Entries are keyed on a hash of the input point and face bytes, the repair
+    parameters, and the ``pymeshfix`` version. Repaired arrays are stored as
+    ``.npy`` pairs and returned memory-mapped on a cache hit without running
+    the repair. Writes are atomic, so a single cache directory can be shared
+    by many processes.
+
+    Parameters
+    ----------
+    cache_dir : str | pathlib.Path, optional
+        Directory to store cached results. Defaults to the
+        ``PYMESHFIX_CACHE_DIR`` environment variable, falling back to
+        ``~/.cache/pymeshfix``.
+    max_bytes : int, optional
+        Maximum total size of the cache in bytes. Least recently used entries
+        are evicted when exceeded. Set to ``None`` to disable eviction.
+        Defaults to 1 GiB.
+
+    Examples
+    --------
+    Repair a mesh twice. The second call is served from the cache.
+
+    >>> import tempfile
+    >>> import pyvista as pv
+    >>> from pymeshfix import RepairCache
+    >>> sphere = pv.Sphere()
+    >>> points, faces = sphere.points, sphere.faces.reshape(-1, 4)[:, 1:]
+    >>> cache = RepairCache(tempfile.mkdtemp())
+    >>> clean_points, clean_faces = cache.clean_from_arrays(points, faces)
+    >>> clean_points, clean_faces = cache.clean_from_arrays(points, faces)
+    >>> stats = cache.stats()
+    >>> stats["hits"], stats["misses"], stats["entries"]
+    (1, 1, 1)
+
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int | None = 2**30):
+        """Initialize the cache."""
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _default_cache_dir()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(
+        self, points: NDArray[np.float64], faces: NDArray[np.int32 | np.int64], **params: Any
+    ) -> str:
+        """Return the cache key of a mesh and its repair parameters.
+
+        Parameters
+        ----------
+        points : np.ndarray[np.float64]
+            ``(n, 3)`` vertex array.
+        faces : np.ndarray[np.int32] | np.ndarray[np.int64]
+            ``(m, 3)`` face array.
+        **params : dict
+            Repair parameters. Must be JSON serializable.
+
+        Returns
+        -------
+        str
+            Hexadecimal cache key.
+
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        header = {"version": _VERSION, "params": params}
+        for name, arr in (("points", points), ("faces", faces)):
+            arr = np.ascontiguousarray(arr)
+            header[name] = [arr.dtype.str, arr.shape]
+            hasher.update(memoryview(arr).cast("B"))
+        hasher.update(json.dumps(header, sort_keys=True).encode())
+        return hasher.hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}{_POINTS_SUFFIX}", self.cache_dir / f"{key}{_FACES_SUFFIX}"
+
+    def get(self, key: str) -> tuple[NDArray[np.float64], NDArray[np.int32 | np.int64]] | None:
+        """Return the memory-mapped arrays stored under ``key`` or ``None``.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :func:`RepairCache.key`.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray] | None
+            Read-only memory-mapped points and faces, or ``None`` on a miss.
+
+        """
+        points_path, faces_path = self._paths(key)
+        try:
+            points = np.load(points_path, mmap_mode="r")
+            faces = np.load(faces_path, mmap_mode="r")
+            # refresh the access time used for LRU eviction
+            os.utime(points_path)
+            os.utime(faces_path)
+        except (FileNotFoundError, ValueError):
+            # missing, or evicted or truncated by another process
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return points, faces
+
+    def _atomic_save(self, path: Path, arr: NDArray) -> None:
+        fd, tmpname = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".npy")
+        try:
+            with os.fdopen(fd, "wb") as fid:
+                np.save(fid, arr)
+            os.replace(tmpname, path)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+
+    def put(
+        self, key: str, points: NDArray[np.float64], faces: NDArray[np.int32 | np.int64]
+    ) -> None:
+        """Store repaired arrays under ``key`` and evict old entries.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :func:`RepairCache.key`.
+        points : np.ndarray[np.float64]
+            Repaired ``(n, 3)`` vertex array.
+        faces : np.ndarray[np.int32] | np.ndarray[np.int64]
+            Repaired ``(m, 3)`` face array.
+
+        """
+        points_path, faces_path = self._paths(key)
+        # faces are written first so that the points file marks a complete entry
+        self._atomic_save(faces_path, faces)
+        self._atomic_save(points_path, points)
+        self.evict()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Return ``(last_used, nbytes, key)`` for each complete entry."""
+        entries = []
+        for points_path in self.cache_dir.glob(f"*{_POINTS_SUFFIX}"):
+            key = points_path.name[: -len(_POINTS_SUFFIX)]
+            faces_path = self._paths(key)[1]
+            try:
+                pstat = points_path.stat()
+                nbytes = pstat.st_size + faces_path.stat().st_size
+            except FileNotFoundError:
+                continue
+            entries.append((pstat.st_mtime, nbytes, key))
+        return entries
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Evict least recently used entries until the cache fits.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Size to shrink the cache to. Defaults to ``max_bytes`` of this cache.
+
+        Returns
+        -------
+        int
+            Number of entries evicted.
+
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return 0
+
+        entries = sorted(self._entries())
+        total = sum(nbytes for _, nbytes, _ in entries)
+        n_evicted = 0
+        for _, nbytes, key in entries:
+            if total <= max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except OSError:
+                    # already evicted by another process or mapped on Windows
+                    pass
+            total -= nbytes
+            n_evicted += 1
+
+        self.evictions += n_evicted
+        return n_evicted
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self.evict(0)
+
+    def stats(self) -> dict[str, int]:
+        """Return cache statistics.
+
+        Returns
+        -------
+        dict[str, int]
+            Hits, misses, and evictions of this instance along with the
+            number of entries and total bytes currently on disk.
+
+        """
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(nbytes for _, nbytes, _ in entries),
+        }
+
+    def clean_from_arrays(
+        self,
+        v: NDArray[np.float64],
+        f: NDArray[np.int32 | np.int64],
+        verbose: bool = False,
+        joincomp: bool = False,
+        remove_smallest_components: bool = True,
+    ) -> tuple[NDArray[np.float64], NDArray[np.int32 | np.int64]]:
+        """Cached version of :func:`pymeshfix.clean_from_arrays`.
+
+        Parameters
+        ----------
+        v : numpy.ndarray[np.float64]
+            Vertex array of shape ``(n, 3)``.
+        f : numpy.ndarray[np.int32]
+            Face array of shape ``(m, 3)``.
+        verbose : bool, default: False
+            Enable verbose output.
+        joincomp : bool, default: False
+            Attempt to join nearby open components.
+        remove_smallest_components : bool, default: True
+            Remove all but the largest connected component before repair.
+
+        Returns
+        -------
+        numpy.ndarray
+            Cleaned vertex array. Memory-mapped and read-only on a cache hit.
+        numpy.ndarray
+            Cleaned face array. Memory-mapped and read-only on a cache hit.
+
+        """
+        v = np.ascontiguousarray(v, dtype=np.float64)
+        f = np.ascontiguousarray(f)
+        if f.dtype not in (np.int32, np.int64):
+            f = f.astype(np.int64)
+        key = self.key(
+            v,
+            f,
+            method="clean_from_arrays",
+            joincomp=joincomp,
+            remove_smallest_components=remove_smallest_components,
+        )
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        points, faces = _meshfix.clean_from_arrays(
+            v, f, verbose, joincomp, remove_smallest_components
+        )
+        self.put(key, points, faces)
+        return points, faces
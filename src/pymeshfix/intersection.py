@@ -0,0 +1,114 @@
+"""Intersection queries between two meshes."""
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pymeshfix import _meshfix
+from pymeshfix.meshfix import MeshFix
+
+MeshLike = _meshfix.MeshIndex | MeshFix | _meshfix.PyTMesh | tuple[NDArray, NDArray]
+
+
+def _as_index(mesh: MeshLike, tris_per_cell: int | str) -> _meshfix.MeshIndex:
+    """Return the index of a mesh, building it unless already given one."""
+    if isinstance(mesh, _meshfix.MeshIndex):
+        return mesh
+    if isinstance(mesh, _meshfix.PyTMesh):
+        points, faces = mesh.return_arrays()
+    elif isinstance(mesh, tuple):
+        points, faces = mesh
+    elif isinstance(mesh, MeshFix):
+        points, faces = mesh.points, mesh.faces
+    else:
+        raise TypeError(
+            "Expected a MeshIndex, MeshFix, PyTMesh or (points, faces) tuple, "
+            f"got {type(mesh).__name__}"
+        )
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    faces = np.ascontiguousarray(faces)
+    if faces.dtype not in (np.int32, np.int64):
+        faces = faces.astype(np.int64)
+    return _meshfix.MeshIndex(points, faces, tris_per_cell)
+
+
+def intersect(
+    mesh_a: MeshLike,
+    mesh_b: MeshLike,
+    justproper: bool = False,
+    tris_per_cell: int | str = "auto",
+) -> NDArray[np.int64]:
+    """Return the pairs of intersecting faces of two meshes.
+
+    Each mesh is indexed with the space subdivision used to detect
+    self-intersections, see :func:`pymeshfix.PyTMesh.select_intersecting_triangles`.
+    Building the index is the most expensive part of a query, so when a mesh
+    is tested against many others, build its :class:`pymeshfix.MeshIndex`
+    once and pass it instead of the mesh.
+
+    Parameters
+    ----------
+    mesh_a : pymeshfix.MeshIndex | pymeshfix.MeshFix | pymeshfix.PyTMesh | tuple
+        First mesh, its index, or a tuple of its points and faces.
+    mesh_b : pymeshfix.MeshIndex | pymeshfix.MeshFix | pymeshfix.PyTMesh | tuple
+        Second mesh, its index, or a tuple of its points and faces.
+    justproper : bool, default: False
+        If ``True``, coincident edges and vertices are not regarded as
+        intersections.
+    tris_per_cell : int | str, default: "auto"
+        Maximum number of triangles per cell of the indexes built for the
+        meshes. Ignored for the meshes given as an index.
+
+    Returns
+    -------
+    numpy.ndarray[np.int64]
+        Array of shape ``(k, 2)`` with the index of a face of ``mesh_a`` and
+        of a face of ``mesh_b`` in each row, sorted by row.
+
+    Examples
+    --------
+    Find the parts of an assembly intersecting a tool.
+
+    >>> import pymeshfix
+    >>> tool = pymeshfix.MeshIndex(tool_points, tool_faces)
+    >>> for points, faces in parts:
+    ...     pairs = pymeshfix.intersect(tool, (points, faces))
+
+    """
+    index_a = _as_index(mesh_a, tris_per_cell)
+    index_b = _as_index(mesh_b, tris_per_cell)
+    return index_a.intersect(index_b, justproper)
+
+
+def meshes_intersect(
+    mesh_a: MeshLike,
+    mesh_b: MeshLike,
+    justproper: bool = False,
+    tris_per_cell: int | str = "auto",
+) -> bool:
+    """Return whether two meshes intersect.
+
+    Same as :func:`pymeshfix.intersect`, but stops at the first pair of
+    intersecting faces.
+
+    Parameters
+    ----------
+    mesh_a : pymeshfix.MeshIndex | pymeshfix.MeshFix | pymeshfix.PyTMesh | tuple
+        First mesh, its index, or a tuple of its points and faces.
+    mesh_b : pymeshfix.MeshIndex | pymeshfix.MeshFix | pymeshfix.PyTMesh | tuple
+        Second mesh, its index, or a tuple of its points and faces.
+    justproper : bool, default: False
+        If ``True``, coincident edges and vertices are not regarded as
+        intersections.
+    tris_per_cell : int | str, default: "auto"
+        Maximum number of triangles per cell of the indexes built for the
+        meshes. Ignored for the meshes given as an index.
+
+    Returns
+    -------
+    bool
+        Whether any face of ``mesh_a`` intersects a face of ``mesh_b``.
+
+    """
+    index_a = _as_index(mesh_a, tris_per_cell)
+    index_b = _as_index(mesh_b, tris_per_cell)
+    return index_a.intersects(index_b, justproper)
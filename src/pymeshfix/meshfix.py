@@ -1,5 +1,8 @@
 """Python module to interface with wrapped meshfix."""
 
+import os
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from importlib.util import find_spec
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -12,6 +15,9 @@ from pymeshfix import _meshfix
 if TYPE_CHECKING:
     from pyvista.core.pointset import PolyData
 
+    from pymeshfix.cache import RepairCache
+    from pymeshfix.pipeline import RepairPipeline
+
 
 class InvalidMeshFixInputError(TypeError):
     def __init__(self, message=None):
@@ -24,7 +30,9 @@ class InvalidMeshFixInputError(TypeError):
         super().__init__(message)
 
 
-def _polydata_from_faces(points: NDArray[np.float64], faces: NDArray[np.int32]) -> "PolyData":
+def _polydata_from_faces(
+    points: NDArray[np.float64], faces: NDArray[np.int32 | np.int64]
+) -> "PolyData":
     """
     Generate a polydata from a faces array containing no padding and all triangles.
 
@@ -40,6 +48,40 @@ def _polydata_from_faces(points: NDArray[np.float64], faces: NDArray[np.int32])
     PolyData
         New mesh.
 
+    """
+    if faces.ndim != 2:
+        raise ValueError("Expected a two dimensional face array.")
+
+    offset = np.arange(0, faces.size + 1, faces.shape[1], dtype=faces.dtype)
+    return _polydata_from_cells(points, offset, faces.ravel())
+
+
+def _polydata_from_cells(
+    points: NDArray[np.float64],
+    offset: NDArray[np.int32 | np.int64],
+    connectivity: NDArray[np.int32 | np.int64],
+    lines: bool = False,
+) -> "PolyData":
+    """
+    Generate a polydata from cell offset and connectivity arrays without copying them.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Points array.
+    offset : np.ndarray
+        ``(n_cells + 1,)`` start of each cell in ``connectivity``.
+    connectivity : np.ndarray
+        Point indices of all cells, back to back. Arrays are only copied
+        when not ``int32`` or ``int64``, or when ``offset`` has a different type.
+    lines : bool, default: False
+        Store the cells as lines instead of polygons.
+
+    Returns
+    -------
+    PolyData
+        New mesh.
+
     """
     if find_spec("pyvista.core") is None:
         raise ModuleNotFoundError(
@@ -48,29 +90,39 @@ def _polydata_from_faces(points: NDArray[np.float64], faces: NDArray[np.int32])
 
     from pyvista.core.pointset import PolyData
     from vtkmodules.util.numpy_support import numpy_to_vtk
-    from vtkmodules.vtkCommonCore import vtkTypeInt32Array
+    from vtkmodules.vtkCommonCore import vtkTypeInt32Array, vtkTypeInt64Array
     from vtkmodules.vtkCommonDataModel import vtkCellArray
 
-    if faces.ndim != 2:
-        raise ValueError("Expected a two dimensional face array.")
-
     pdata = PolyData()
     pdata.points = points
 
     # convert to vtk arrays without copying
-    vtk_dtype = vtkTypeInt32Array().GetDataType()
-
-    offset = np.arange(0, faces.size + 1, faces.shape[1], dtype=np.int32)
+    if connectivity.dtype == np.int32 and offset.dtype == np.int32:
+        vtk_dtype = vtkTypeInt32Array().GetDataType()
+    else:
+        vtk_dtype = vtkTypeInt64Array().GetDataType()
+        offset = offset.astype(np.int64, copy=False)
+        connectivity = connectivity.astype(np.int64, copy=False)
     offset_vtk = numpy_to_vtk(offset, deep=False, array_type=vtk_dtype)
-    faces_vtk = numpy_to_vtk(faces.ravel(), deep=False, array_type=vtk_dtype)
+    connectivity_vtk = numpy_to_vtk(connectivity, deep=False, array_type=vtk_dtype)
 
     carr = vtkCellArray()
-    carr.SetData(offset_vtk, faces_vtk)
+    carr.SetData(offset_vtk, connectivity_vtk)
 
-    pdata.SetPolys(carr)
+    if lines:
+        pdata.SetLines(carr)
+    else:
+        pdata.SetPolys(carr)
     return pdata
 
 
+def _decimation_target(target: int | float) -> dict[str, int | float]:
+    """Return the arguments of :func:`MeshFix.decimate` for a face count or a reduction."""
+    if isinstance(target, (int, np.integer)):
+        return {"target_faces": int(target)}
+    return {"target_reduction": float(target)}
+
+
 class MeshFix:
     """Clean and tetrahedralize surface meshes using MeshFix.
 
@@ -82,6 +134,10 @@ class MeshFix:
         supports reading directly from a file.
     verbose : bool, default: False
         Set this to ``True`` to enable additional output from MeshFix.
+    memory_limit : int, optional
+        Limit of the estimated peak memory of the mesh in bytes. Loading or
+        repairing a mesh beyond it raises a ``MemoryError``. See
+        :attr:`pymeshfix.PyTMesh.memory_limit`.
 
     Examples
     --------
@@ -123,11 +179,20 @@ class MeshFix:
 
     """
 
-    def __init__(self, *args, verbose: bool = False):
+    def __init__(self, *args, verbose: bool = False, memory_limit: int | None = None):
         """Initialize meshfix."""
 
+        self._verbose = verbose
+        self._changed_faces = None
+        self._patch_sizes = None
+        self._loaded = None
+        # MeshIndex of the mesh and its tris_per_cell, built by contains()
+        self._index = None
+        # whether the mesh is unchanged since it was loaded from _loaded
+        self._pristine = False
         self._mfix = _meshfix.PyTMesh()
         self._mfix.set_quiet(not verbose)
+        self._mfix.memory_limit = memory_limit
 
         if len(args) == 0:
             raise InvalidMeshFixInputError()
@@ -162,7 +227,7 @@ class MeshFix:
             if not mesh.is_all_triangles:
                 mesh = mesh.triangulate()
 
-            f = mesh._connectivity_array.reshape(-1, 3).astype(np.int32, copy=False)
+            f = mesh._connectivity_array.reshape(-1, 3)
             self.load_arrays(v, f)
 
     @property
@@ -170,7 +235,64 @@ class MeshFix:
         """Return the number of boundaries (holes) in this mesh."""
         return self._mfix.n_boundaries
 
-    def load_arrays(self, v: NDArray[np.float64], f: NDArray[np.int32]) -> None:
+    @property
+    def changed_faces(self) -> NDArray[np.int64] | None:
+        """Return the faces changed by the last localized repair.
+
+        Indices into :attr:`MeshFix.faces` of the faces created or modified
+        by the last call of :func:`MeshFix.clean` or
+        :func:`MeshFix.fill_holes` restricted to a region. ``None`` after a
+        repair of the whole mesh.
+
+        """
+        return self._changed_faces
+
+    @property
+    def patch_sizes(self) -> NDArray[np.int64] | None:
+        """Return the number of faces added to each hole by the last fill.
+
+        Set by :func:`MeshFix.fill_holes` when filling the holes of the
+        whole mesh. ``None`` after a fill restricted to a region.
+
+        """
+        return self._patch_sizes
+
+    def _region_mask(
+        self,
+        face_mask: NDArray[np.bool_] | None,
+        bounds: Sequence[float] | None,
+        sphere: tuple[Sequence[float], float] | None,
+    ) -> NDArray[np.bool_] | None:
+        """Return the mask of the faces in a region or ``None`` without a region."""
+        if face_mask is None and bounds is None and sphere is None:
+            return None
+
+        n_faces = self._mfix.n_faces
+        if face_mask is None:
+            mask = np.ones(n_faces, dtype=bool)
+        else:
+            mask = np.array(face_mask, dtype=bool)
+            if mask.shape != (n_faces,):
+                raise ValueError(
+                    f"`face_mask` must be a boolean array of shape ({n_faces},), not {mask.shape}"
+                )
+
+        if bounds is not None:
+            if len(bounds) != 6:
+                raise ValueError("`bounds` must be (xmin, xmax, ymin, ymax, zmin, zmax)")
+            mask &= self._mfix.faces_in_region(bounds=bounds)
+        if sphere is not None:
+            center, radius = sphere
+            mask &= self._mfix.faces_in_region(center=center, radius=radius)
+
+        return mask
+
+    def _modified(self) -> None:
+        """Drop the data cached from the mesh once it is modified."""
+        self._index = None
+        self._pristine = False
+
+    def load_arrays(self, v: NDArray[np.float64], f: NDArray[np.integer]) -> None:
         """
         Load triangular mesh from vertex and face numpy arrays.
 
@@ -181,8 +303,9 @@ class MeshFix:
         ----------
         v : np.ndarray[np.float64]
             ``(n, 3)`` vertex array.
-        f : np.ndarray[np.int32]
-            ``(m, 3)`` face array.
+        f : np.ndarray[np.int32] | np.ndarray[np.int64]
+            ``(m, 3)`` face array. Other integer types are converted to
+            ``int64``.
 
         Examples
         --------
@@ -217,12 +340,16 @@ class MeshFix:
         >>> mfix = MeshFix(points, faces)
 
         """
-        self._mfix.load_array(
-            v.astype(np.float64, copy=False),
-            f.astype(np.int32, copy=False),
-        )
-
-    def _return_arrays(self) -> tuple[NDArray[np.float64], NDArray[np.int32]]:
+        if f.dtype not in (np.int32, np.int64):
+            f = f.astype(np.int64)
+        v = v.astype(np.float64, copy=False)
+        self._mfix.load_array(v, f)
+        self._modified()
+        # referenced to compute the changes made by the repair
+        self._loaded = (v, f)
+        self._pristine = True
+
+    def _return_arrays(self) -> tuple[NDArray[np.float64], NDArray[np.int32 | np.int64]]:
         """
         Return the arrays from the mesh fix instance.
 
@@ -230,12 +357,58 @@ class MeshFix:
         -------
         np.ndarray[np.float64]
             Array of points shaped ``(n, 3)``.
-        np.ndarray[np.float64]
-            Array of faces shaped ``(m, 3)``.
+        np.ndarray[np.int32] | np.ndarray[np.int64]
+            Array of faces shaped ``(m, 3)``. Indices are ``int64`` only when
+            the mesh has too many points for ``int32``.
 
         """
         return self._mfix.return_arrays()
 
+    def to_arrays(
+        self, release: bool = False, reorder: bool | str = False
+    ) -> tuple[NDArray[np.float64], NDArray[np.int32 | np.int64]]:
+        """
+        Return the points and faces of the mesh.
+
+        Parameters
+        ----------
+        release : bool, default: False
+            Free the internal mesh while the arrays are written instead of
+            keeping both in memory, which lowers the peak memory usage of the
+            export. This :class:`MeshFix` is empty afterwards.
+        reorder : bool | str, default: False
+            Sort the mesh along a space-filling curve before exporting it, so
+            that points and faces close in space are close in the arrays. May
+            be ``"morton"``, ``"hilbert"`` or ``True`` for ``"morton"``. See
+            :func:`MeshFix.reorder`.
+
+        Returns
+        -------
+        np.ndarray[np.float64]
+            Array of points shaped ``(n, 3)``.
+        np.ndarray[np.int32] | np.ndarray[np.int64]
+            Array of faces shaped ``(m, 3)``. Indices are ``int64`` only when
+            the mesh has too many points for ``int32``.
+
+        Examples
+        --------
+        Repair a mesh and export it without holding two copies in memory.
+
+        >>> from pyvista import examples
+        >>> from pymeshfix import MeshFix
+        >>> mfix = MeshFix(examples.download_bunny())
+        >>> mfix.repair()
+        >>> points, faces = mfix.to_arrays(release=True)
+        >>> mfix.points.shape
+        (0, 3)
+
+        """
+        if reorder is not False:
+            self._changed_faces = None
+        if release or reorder is not False:
+            self._modified()
+        return self._mfix.return_arrays(release=release, reorder=reorder)
+
     @property
     def mesh(self) -> "PolyData":
         """
@@ -275,11 +448,149 @@ class MeshFix:
         """
         return _polydata_from_faces(self.points, self.faces)
 
+    def provenance(self) -> dict[str, NDArray]:
+        """
+        Return the provenance of the current points and faces.
+
+        Maps each point and face of the mesh back to the arrays it was loaded
+        from, which allows transferring attributes to the repaired mesh without
+        any spatial search.
+
+        Returns
+        -------
+        dict[str, numpy.ndarray]
+            Dictionary containing:
+
+            * ``"vertex_origin"`` - Index of the input point of each point, or
+              ``-1`` if it was created during the repair.
+            * ``"face_origin"`` - Index of the input face of each face, or
+              ``-1`` if it was created during the repair.
+            * ``"vertex_parents"`` - ``(n, 3)`` input points that each point
+              derives from. Points created while filling holes use the closest
+              input points of their patch. Unused entries are ``-1``.
+            * ``"vertex_weights"`` - ``(n, 3)`` interpolation weights of
+              ``"vertex_parents"``. Unused entries are ``0``.
+
+        Examples
+        --------
+        Transfer point and cell data to the repaired mesh.
+
+        >>> import numpy as np
+        >>> from pyvista import examples
+        >>> from pymeshfix import MeshFix
+        >>> mesh = examples.download_bunny()
+        >>> mesh["z"] = mesh.points[:, 2]
+        >>> mesh["area"] = mesh.compute_cell_sizes()["Area"]
+        >>> mfix = MeshFix(mesh)
+        >>> mfix.repair()
+        >>> prov = mfix.provenance()
+        >>> repaired = mfix.mesh
+        >>> parents, weights = prov["vertex_parents"], prov["vertex_weights"]
+        >>> repaired["z"] = (mesh["z"][parents] * weights).sum(axis=1)
+        >>> face_origin = prov["face_origin"]
+        >>> repaired["area"] = np.where(face_origin >= 0, mesh["area"][face_origin], np.nan)
+
+        """
+        return self._mfix.return_provenance()
+
+    def delta(self) -> tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Return the changes made to the loaded arrays.
+
+        Only the faces and vertices changed by :func:`MeshFix.repair`,
+        :func:`MeshFix.clean`, :func:`MeshFix.fill_holes` and the other
+        repair methods are returned, so the size of the output depends on
+        the size of the defects rather than the size of the mesh. The
+        changes are relative to the arrays the mesh was loaded from, which
+        are referenced rather than copied and must not be modified.
+
+        Returns
+        -------
+        numpy.ndarray[np.int64]
+            ``(r,)`` indices of the removed input faces.
+        numpy.ndarray[np.float64]
+            ``(k, 3)`` new points, indexed after the input points.
+        numpy.ndarray[np.int64]
+            ``(j, 3)`` new faces indexing the input points followed by the
+            new points.
+
+        Examples
+        --------
+        Store only the changes and apply them to the input arrays. The
+        result has the same faces as :attr:`MeshFix.faces` in a different
+        order, and keeps the input points no longer used. Points only rounded
+        by the repair keep their input coordinates, see
+        :func:`pymeshfix.PyTMesh.return_delta`.
+
+        >>> mfix = MeshFix(points, faces)
+        >>> mfix.clean(bounds=(0.0, 0.1, 0.0, 0.1, 0.0, 0.1))
+        >>> removed, new_points, new_faces = mfix.delta()
+        >>> points = np.vstack((points, new_points))
+        >>> faces = np.vstack((np.delete(faces, removed, axis=0), new_faces))
+
+        """
+        points, faces = self._loaded
+        return self._mfix.return_delta(points, faces)
+
+    def boundary_loops(self) -> dict[str, NDArray]:
+        """
+        Return the ordered boundary loops of the mesh.
+
+        Loops are traced directly on the mesh in a single pass over its points
+        and stored back to back, where loop ``i`` is
+        ``indices[offsets[i]:offsets[i + 1]]``.
+
+        Returns
+        -------
+        dict[str, numpy.ndarray]
+            Dictionary containing:
+
+            * ``"indices"`` - Point indices of all loops in boundary order.
+            * ``"offsets"`` - ``(n_loops + 1,)`` start of each loop in
+              ``"indices"``.
+            * ``"n_edges"`` - Number of edges of each loop.
+            * ``"perimeter"`` - Length of each loop.
+            * ``"bounds"`` - ``(n_loops, 6)`` bounds of each loop as
+              ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+            * ``"closed"`` - ``(n_loops,)`` whether each loop is closed.
+              Loops are only open chains on non-manifold boundaries, see
+              :func:`pymeshfix.PyTMesh.boundary_loops`.
+
+        Examples
+        --------
+        Find the largest hole of a mesh.
+
+        >>> from pyvista import examples
+        >>> from pymeshfix import MeshFix
+        >>> mfix = MeshFix(examples.download_bunny())
+        >>> loops = mfix.boundary_loops()
+        >>> i = loops["perimeter"].argmax()
+        >>> largest = loops["indices"][loops["offsets"][i] : loops["offsets"][i + 1]]
+
+        """
+        return self._mfix.boundary_loops()
+
     def extract_holes(self) -> "PolyData":
-        """Extract the boundaries of the holes in this mesh to a new PyVista mesh of lines."""
-        return self.mesh.extract_feature_edges(
-            boundary_edges=True, feature_edges=False, manifold_edges=False
-        )
+        """
+        Extract the boundaries of the holes in this mesh to a new PyVista mesh of lines.
+
+        Each hole is a single closed polyline following the boundary loop in
+        order, or an open polyline for the open chains of non-manifold
+        boundaries. Only the boundary points are included.
+
+        Returns
+        -------
+        pyvista.PolyData
+            Boundary loops as polylines.
+
+        """
+        loops = self._mfix.boundary_loops()
+        indices, offsets, closed = loops["indices"], loops["offsets"], loops["closed"]
+
+        # close each closed loop by repeating its first point
+        connectivity = np.insert(np.arange(indices.size), offsets[1:][closed], offsets[:-1][closed])
+        line_offset = offsets + np.concatenate(([0], np.cumsum(closed)))
+        return _polydata_from_cells(self.points[indices], line_offset, connectivity, lines=True)
 
     @property
     def points(self) -> NDArray[np.float64]:
@@ -312,14 +623,16 @@ class MeshFix:
         return self._mfix.return_points()
 
     @property
-    def faces(self) -> NDArray[np.int32]:
+    def faces(self) -> NDArray[np.int32 | np.int64]:
         """
         Return the indices of the faces of the mesh.
 
         Returns
         -------
         numpy.ndarray
-            The points of the mesh.
+            The ``(m, 3)`` faces of the mesh. Indices are ``int32`` unless the
+            mesh has too many points for them to fit, in which case they are
+            ``int64``.
 
         Examples
         --------
@@ -389,6 +702,11 @@ class MeshFix:
         self,
         joincomp: bool = False,
         remove_smallest_components: bool = True,
+        cache: "RepairCache | None" = None,
+        pipeline: "str | RepairPipeline | None" = None,
+        skip_if_clean: bool = False,
+        decimate_before: int | float | None = None,
+        decimate_after: int | float | None = None,
     ) -> None:
         """
         Perform mesh repair using MeshFix's default repair process.
@@ -400,6 +718,31 @@ class MeshFix:
         remove_smallest_components : bool, default: True
             Remove all but the largest isolated component from the mesh before
             beginning the repair process.
+        cache : pymeshfix.RepairCache, optional
+            Cache of repair results. When the mesh has been repaired before
+            with the same parameters, the cached result is loaded instead of
+            repairing the mesh again.
+        pipeline : str | pymeshfix.RepairPipeline, optional
+            Run this pipeline, or the built-in preset with this name, instead
+            of the default sequence. ``joincomp`` and
+            ``remove_smallest_components`` are ignored when given. See
+            :class:`pymeshfix.RepairPipeline`.
+        skip_if_clean : bool, default: False
+            Check the mesh first with :func:`pymeshfix.is_clean` and leave
+            it unchanged if there is nothing to fix. The self-intersections
+            are only checked when the cheaper checks find nothing, and the
+            arrays the mesh was loaded from are checked without a copy
+            unless the mesh was modified since. Several
+            components are accepted unless ``remove_smallest_components``
+            is set. Decimation is still applied to a clean mesh.
+        decimate_before : int | float, optional
+            Decimate the mesh with :func:`MeshFix.decimate` before the
+            repair, to this number of faces if an ``int`` or by this
+            fraction of its faces if a ``float``. This bounds the cost of
+            repairing finely sampled meshes.
+        decimate_after : int | float, optional
+            Decimate the repaired mesh in the same way. Decimation may
+            introduce new self-intersections, which are not repaired.
 
         Notes
         -----
@@ -422,42 +765,197 @@ class MeshFix:
         >>> mfix.repair()
         >>> mfix.plot(show_holes=True)
 
-        """
-        self._mfix.fill_small_boundaries(0, True)
-        if joincomp:
-            self._mfix.join_closest_components()
-        if remove_smallest_components:
-            self._mfix.remove_smallest_components()
-        self._mfix.clean()
+        Reuse the results of previous repairs.
+
+        >>> from pymeshfix import RepairCache
+        >>> mfix.repair(cache=RepairCache())
+
+        Repair using the ``"fast"`` preset.
+
+        >>> mfix.repair(pipeline="fast")
+
+        Skip the repair of a mesh with nothing to fix.
+
+        >>> mfix.repair(skip_if_clean=True)
+
+        Reduce a scan to 100,000 faces before repairing it.
+
+        >>> mfix.repair(decimate_before=100_000)
 
-    def fill_holes(self, n_edges: int = 0, refine: bool = True) -> int:
+        """
+        if skip_if_clean:
+            # the loaded arrays are inspected in place until the mesh is modified
+            points, faces = self._loaded if self._pristine else self._mfix.return_arrays()
+            if _meshfix.is_clean(points, faces, remove_smallest_components):
+                for target in (decimate_before, decimate_after):
+                    if target is not None:
+                        self.decimate(**_decimation_target(target))
+                return
+
+        self._modified()
+        if isinstance(pipeline, str):
+            from pymeshfix.pipeline import RepairPipeline
+
+            pipeline = RepairPipeline.from_preset(pipeline)
+
+        if cache is not None:
+            if pipeline is None:
+                params = {
+                    "joincomp": joincomp,
+                    "remove_smallest_components": remove_smallest_components,
+                }
+            else:
+                params = {"pipeline": pipeline.stages}
+            if decimate_before is not None:
+                params["decimate_before"] = decimate_before
+            if decimate_after is not None:
+                params["decimate_after"] = decimate_after
+            key = cache.key(*self._mfix.return_arrays(), method="MeshFix.repair", **params)
+            result = cache.get(key)
+            if result is not None:
+                memory_limit = self._mfix.memory_limit
+                self._mfix = _meshfix.PyTMesh()
+                self._mfix.set_quiet(not self._verbose)
+                self._mfix.memory_limit = memory_limit
+                self._mfix.load_array(*result)
+                return
+
+        if decimate_before is not None:
+            self.decimate(**_decimation_target(decimate_before))
+        if pipeline is not None:
+            pipeline.run(self._mfix)
+        else:
+            self._mfix.fill_small_boundaries(0, True)
+            if joincomp:
+                self._mfix.join_closest_components()
+            if remove_smallest_components:
+                self._mfix.remove_smallest_components()
+            self._mfix.clean()
+        if decimate_after is not None:
+            self.decimate(**_decimation_target(decimate_after))
+
+        if cache is not None:
+            cache.put(key, *self._mfix.return_arrays())
+
+    def fill_holes(
+        self,
+        n_edges: int = 0,
+        refine: bool = True,
+        face_mask: NDArray[np.bool_] | None = None,
+        bounds: Sequence[float] | None = None,
+        sphere: tuple[Sequence[float], float] | None = None,
+        halo: int = 2,
+        max_new_triangles: int | None = None,
+        target_edge_length: float | None = None,
+        density_scale: float = 1.0,
+    ) -> int:
         """
         Fill small boundary loops (holes) in the mesh.
 
+        The filling can be restricted to a region of the mesh given by
+        ``face_mask``, ``bounds`` and ``sphere``. Only the holes entirely
+        surrounded by the region, grown by ``halo`` rings of neighboring
+        faces, are filled, and the new faces are available from
+        :attr:`MeshFix.changed_faces`.
+
+        When ``refine`` is set, vertices are inserted in each patch until
+        its edges match the edges surrounding the hole. Filling large holes
+        on finely sampled meshes can add millions of faces, so the
+        refinement can be bounded with ``max_new_triangles``. Patches
+        expected to exceed it are refined with longer edges to fit, and the
+        refinement stops once the limit is reached. The number of faces
+        added to each hole is available from :attr:`MeshFix.patch_sizes`.
+
         Parameters
         ----------
-        nbe : int, default: 0
+        n_edges : int, default: 0
             Maximum number of boundary edges to fill. If 0, fill all.
         refine : bool, default: True
             Refine filled regions.
+        face_mask : numpy.ndarray[bool], optional
+            Boolean mask with one entry per face flagging the region to fill.
+        bounds : sequence[float], optional
+            Restrict the region to the faces with a vertex within the box
+            ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+        sphere : tuple[sequence[float], float], optional
+            Restrict the region to the faces with a vertex within the sphere
+            given as ``(center, radius)``.
+        halo : int, default: 2
+            Number of rings of neighboring faces added to the region.
+        max_new_triangles : int, optional
+            Maximum number of faces added to each hole. The initial
+            triangulation of a hole is always kept, even when it alone
+            exceeds the limit.
+        target_edge_length : float, optional
+            Edge length of the refined patches. Defaults to the length of the
+            edges surrounding each hole.
+        density_scale : float, default: 1.0
+            Scale of the number of vertices per unit area of the refined
+            patches. Values below 1 produce coarser patches.
 
         Returns
         -------
         int
             Number of holes filled.
 
+        Examples
+        --------
+        Fill the holes in the bottom half of a mesh.
+
+        >>> xmin, xmax, ymin, ymax, zmin, zmax = mesh.bounds
+        >>> mfix = MeshFix(mesh)
+        >>> mfix.fill_holes(bounds=(xmin, xmax, ymin, (ymin + ymax) / 2, zmin, zmax))
+        12
+        >>> mfix.changed_faces
+        array([    0,     1,     2, ..., 10221, 10222, 10223])
+
+        Add at most 1000 faces to each hole.
+
+        >>> mfix = MeshFix(mesh)
+        >>> mfix.fill_holes(max_new_triangles=1000)
+        28
+        >>> mfix.patch_sizes.max()
+        998
+
         """
-        return self._mfix.fill_small_boundaries(n_edges, refine)
+        refinement = {
+            "max_new_triangles": max_new_triangles or 0,
+            "target_edge_length": target_edge_length or 0.0,
+            "density_scale": density_scale,
+        }
+        mask = self._region_mask(face_mask, bounds, sphere)
+        self._modified()
+        if mask is None:
+            self._changed_faces = None
+            self._patch_sizes = self._mfix.fill_holes(n_edges, refine, **refinement)
+            return self._patch_sizes.size
+
+        self._patch_sizes = None
+        n_filled, self._changed_faces = self._mfix.fill_region_boundaries(
+            mask, halo, n_edges, refine, **refinement
+        )
+        return n_filled
 
     def join_closest_components(self) -> None:
         """Attempt to join nearby open components."""
+        self._modified()
         self._mfix.join_closest_components()
 
     def remove_smallest_components(self) -> None:
         """Remove all but the largest connected component."""
+        self._modified()
         self._mfix.remove_smallest_components()
 
-    def clean(self, max_iters: int = 10, inner_loops: int = 3) -> bool:
+    def clean(
+        self,
+        max_iters: int = 10,
+        inner_loops: int = 3,
+        face_mask: NDArray[np.bool_] | None = None,
+        bounds: Sequence[float] | None = None,
+        sphere: tuple[Sequence[float], float] | None = None,
+        halo: int = 2,
+        tris_per_cell: int | str = 50,
+    ) -> bool:
         """
         Remove degenerate triangles and self-intersections.
 
@@ -468,12 +966,65 @@ class MeshFix:
         'inner_loops' as a parameter.  Returns ``True`` only if the mesh could
         be completely cleaned.
 
+        The repair can be restricted to a region of the mesh given by
+        ``face_mask``, ``bounds`` and ``sphere``. The region, grown by
+        ``halo`` rings of neighboring faces, is repaired while its seam with
+        the rest of the mesh is held fixed, so the cost scales with the size
+        of the region rather than the size of the mesh. The faces created or
+        modified by the repair are available from
+        :attr:`MeshFix.changed_faces`. See
+        :func:`pymeshfix.PyTMesh.clean_region` for details.
+
         Parameters
         ----------
-        max_iters
+        max_iters : int, default: 10
+            Maximum number of cleaning iterations.
+        inner_loops : int, default: 3
+            Number of inner optimization loops per iteration.
+        face_mask : numpy.ndarray[bool], optional
+            Boolean mask with one entry per face flagging the region to clean.
+        bounds : sequence[float], optional
+            Restrict the region to the faces with a vertex within the box
+            ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+        sphere : tuple[sequence[float], float], optional
+            Restrict the region to the faces with a vertex within the sphere
+            given as ``(center, radius)``.
+        halo : int, default: 2
+            Number of rings of neighboring faces added to the region.
+        tris_per_cell : int | str, default: 50
+            Maximum number of triangles per cell of the space subdivision
+            used to detect intersections. With ``"auto"``, it is chosen from
+            the overlaps of the triangle bounding boxes, which suits meshes
+            with uneven triangle sizes. See
+            :func:`pymeshfix.PyTMesh.select_intersecting_triangles`.
+
+        Returns
+        -------
+        bool
+            ``True`` when the mesh, or the region, could be completely
+            cleaned.
+
+        Examples
+        --------
+        Clean the faces around a point after an edit.
+
+        >>> mfix = MeshFix(mesh)
+        >>> mfix.clean(sphere=((0.0, 0.1, 0.0), 0.01))
+        True
+        >>> mfix.changed_faces
+        array([    3,     4,    12, ..., 61224, 61225, 61226])
 
         """
-        return self._mfix.clean(max_iters, inner_loops)
+        mask = self._region_mask(face_mask, bounds, sphere)
+        self._modified()
+        if mask is None:
+            self._changed_faces = None
+            return self._mfix.clean(max_iters, inner_loops, tris_per_cell)
+
+        is_clean, self._changed_faces = self._mfix.clean_region(
+            mask, halo, max_iters, inner_loops, tris_per_cell
+        )
+        return is_clean
 
     def degeneracy_removal(self, max_iter: int = 3) -> bool:
         """
@@ -491,9 +1042,10 @@ class MeshFix:
             ``True`` when successful.
 
         """
+        self._modified()
         return self._mfix.strong_degeneracy_removal(max_iter)
 
-    def intersection_removal(self, max_iter: int = 3) -> bool:
+    def intersection_removal(self, max_iter: int = 3, tris_per_cell: int | str = 50) -> bool:
         """
         Remove self-intersecting triangles.
 
@@ -501,6 +1053,10 @@ class MeshFix:
         ----------
         max_iter : int, default: 3
             Maximum number of iterations to perform.
+        tris_per_cell : int | str, default: 50
+            Maximum number of triangles per cell of the space subdivision
+            used to detect intersections, or ``"auto"``. See
+            :func:`MeshFix.clean`.
 
         Returns
         -------
@@ -508,7 +1064,209 @@ class MeshFix:
             ``True`` when successful.
 
         """
-        return self._mfix.strong_intersection_removal(max_iter)
+        self._modified()
+        return self._mfix.strong_intersection_removal(max_iter, tris_per_cell)
+
+    def decimate(
+        self, target_faces: int | None = None, target_reduction: float | None = None
+    ) -> int:
+        """
+        Reduce the number of faces with quadric error edge collapses.
+
+        The mesh is kept manifold and its boundaries are preserved, so fewer
+        faces than requested may be removed. See
+        :func:`pymeshfix.PyTMesh.decimate` for details.
+
+        Parameters
+        ----------
+        target_faces : int, optional
+            Number of faces to reduce the mesh to.
+        target_reduction : float, optional
+            Fraction of the faces to remove, in ``[0, 1)``. Exactly one of
+            ``target_faces`` and ``target_reduction`` must be given.
+
+        Returns
+        -------
+        int
+            Number of faces removed.
+
+        Examples
+        --------
+        Remove 90% of the faces of a mesh before repairing it.
+
+        >>> mfix = MeshFix(mesh)
+        >>> mfix.decimate(target_reduction=0.9)
+        >>> mfix.repair()
+
+        """
+        self._changed_faces = None
+        self._modified()
+        return self._mfix.decimate(target_faces, target_reduction)
+
+    def reorder(self, method: str = "morton") -> None:
+        """
+        Sort the points, edges and faces along a space-filling curve.
+
+        Elements close in space become close in memory and in the exported
+        arrays, which improves the locality of later repairs and of
+        downstream processing of :attr:`MeshFix.points` and
+        :attr:`MeshFix.faces`. The geometry and connectivity of the mesh are
+        unchanged but its indices are not, so :attr:`MeshFix.changed_faces`
+        is reset. See :func:`pymeshfix.PyTMesh.reorder` for details.
+
+        Parameters
+        ----------
+        method : str, default: "morton"
+            Space-filling curve, either ``"morton"`` or ``"hilbert"``.
+
+        Examples
+        --------
+        Sort a mesh whose faces were appended out of order by hole filling.
+
+        >>> mfix = MeshFix(mesh)
+        >>> mfix.fill_holes()
+        >>> mfix.reorder("hilbert")
+        >>> points, faces = mfix.to_arrays()
+
+        """
+        self._changed_faces = None
+        self._modified()
+        self._mfix.reorder(method)
+
+    def deviation(
+        self,
+        original_points: NDArray[np.float64],
+        original_faces: NDArray[np.integer],
+        symmetric: bool = True,
+        sample_spacing: float = 0.0,
+        tolerance: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Measure the distances between the repaired and the original surfaces.
+
+        Each vertex is matched to the closest point of the other surface
+        with a native spatial index, so the measurement costs about as much
+        as detecting intersections. With ``tolerance``, the measurement
+        stops at the first distance above it, which rejects a bad repair
+        quickly.
+
+        Parameters
+        ----------
+        original_points : np.ndarray[np.float64]
+            ``(n, 3)`` vertex array of the mesh before the repair.
+        original_faces : np.ndarray[np.int32] | np.ndarray[np.int64]
+            ``(m, 3)`` face array of the mesh before the repair. Other
+            integer types are converted to ``int64``.
+        symmetric : bool, default: True
+            Also measure the distances from the original surface to the
+            repaired one. Otherwise, only the distances from the repaired
+            surface are measured.
+        sample_spacing : float, default: 0.0
+            If positive, also measure points sampled on the faces at most
+            this far apart, which bounds the error of the Hausdorff distance
+            on large faces. Only the vertices are measured by default.
+        tolerance : float, optional
+            Stop at the first distance above this value.
+
+        Returns
+        -------
+        dict
+            Dictionary with the keys:
+
+            * ``"distances"``: distance of each vertex of :attr:`MeshFix.points`
+              to the original surface.
+            * ``"original_distances"``: distance of each original vertex to
+              the repaired surface, or ``None`` unless ``symmetric``.
+              Vertices not used by any face are NaN.
+            * ``"hausdorff"``: largest distance measured.
+            * ``"mean"``: mean of the distances measured.
+            * ``"exceeded"``: whether a distance is above ``tolerance``.
+              The vertices not measured before stopping are NaN.
+
+        Examples
+        --------
+        Reject a repair which moved the surface by more than 0.1.
+
+        >>> import pyvista as pv
+        >>> from pymeshfix import MeshFix
+        >>> sphere = pv.Sphere()
+        >>> points, faces = sphere.points, sphere.faces.reshape(-1, 4)[:, 1:]
+        >>> mfix = MeshFix(points, faces)
+        >>> mfix.repair()
+        >>> report = mfix.deviation(points, faces, tolerance=0.1)
+        >>> report["exceeded"]
+        False
+        >>> bool(report["hausdorff"] < 0.1)
+        True
+
+        """
+        if original_faces.dtype not in (np.int32, np.int64):
+            original_faces = original_faces.astype(np.int64)
+        return self._mfix.deviation(
+            np.ascontiguousarray(original_points, dtype=np.float64),
+            np.ascontiguousarray(original_faces),
+            symmetric,
+            sample_spacing,
+            tolerance,
+        )
+
+    def contains(
+        self,
+        points: NDArray[np.floating],
+        n_workers: int | None = None,
+        tris_per_cell: int | str = "auto",
+    ) -> NDArray[np.bool_]:
+        """
+        Return whether points are inside the mesh.
+
+        The faces are indexed with the space subdivision used to detect
+        intersections, and each point counts the faces crossed by a ray
+        through the cells of the index it crosses. The index is built by the
+        first call and kept until the mesh is modified, so that later
+        batches of points against the same mesh only pay for the queries.
+        The points are split among ``n_workers`` threads, which do not hold
+        the GIL.
+
+        The result is reliable for closed meshes, such as the output of
+        :func:`MeshFix.repair`, and does not depend on the orientation of the
+        faces. Points on the surface may be classified either way.
+
+        Parameters
+        ----------
+        points : np.ndarray[np.float64]
+            ``(n, 3)`` array of the points to test.
+        n_workers : int, optional
+            Number of threads. Defaults to the number of CPUs.
+        tris_per_cell : int | str, default: "auto"
+            Maximum number of triangles per cell of the index. See
+            :func:`MeshFix.clean`.
+
+        Returns
+        -------
+        np.ndarray[bool]
+            Whether each point is inside the mesh.
+
+        Examples
+        --------
+        Check that a repaired mesh encloses its fixture points.
+
+        >>> mfix = MeshFix(points, faces)
+        >>> mfix.repair()
+        >>> mfix.contains(fixture_points).all()
+        True
+
+        """
+        points = np.ascontiguousarray(points, dtype=np.float64)
+        if self._index is None or self._index[0] != tris_per_cell:
+            index = _meshfix.MeshIndex(*self._return_arrays(), tris_per_cell)
+            self._index = (tris_per_cell, index)
+        index = self._index[1]
+        n_workers = min(n_workers or os.cpu_count() or 1, max(len(points), 1))
+        if n_workers == 1:
+            return index.contains(points)
+        chunks = np.array_split(points, n_workers)
+        with ThreadPoolExecutor(n_workers) as pool:
+            return np.concatenate(list(pool.map(index.contains, chunks)))
 
     def save(self, filename: str | Path, binary=True):
         """
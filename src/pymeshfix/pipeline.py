@@ -0,0 +1,146 @@
+"""Declarative repair pipelines executed natively."""
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from pymeshfix import _meshfix
+
+if TYPE_CHECKING:
+    from pymeshfix.meshfix import MeshFix
+
+PRESETS: dict[str, tuple[dict[str, Any], ...]] = {
+    # no refinement of the patches and a single cleaning pass
+    "fast": (
+        {"stage": "remove_components"},
+        {"stage": "fill_holes", "refine": False},
+        {"stage": "clean", "max_iters": 1},
+    ),
+    # same sequence as clean_from_arrays and clean_from_file
+    "default": (
+        {"stage": "remove_components"},
+        {"stage": "fill_holes"},
+        {"stage": "clean", "refill": True},
+    ),
+    "thorough": (
+        {"stage": "remove_components"},
+        {"stage": "fill_holes"},
+        {"stage": "clean", "max_iters": 20, "inner_loops": 5, "refill": True},
+    ),
+}
+
+
+class RepairPipeline:
+    """Sequence of repair stages executed natively in a single call.
+
+    Each stage is a dict with a ``"stage"`` name and the parameters of the
+    stage. The pipeline is validated and then run entirely within the
+    extension without holding the GIL, so several meshes can be repaired
+    concurrently from threads. Each mesh prints its messages according to
+    its own ``verbose`` setting.
+
+    Available stages and their parameters:
+
+    * ``"remove_components"``: remove all but the largest connected
+      component.
+    * ``"join_components"``: attempt to join nearby open components.
+    * ``"fill_holes"``: fill the holes with less than ``n_edges`` boundary
+      edges (all when 0, the default). ``refine`` (default ``True``) adds
+      inner vertices to the patches, bounded by ``max_new_triangles``,
+      ``target_edge_length`` and ``density_scale`` as in
+      :func:`pymeshfix.MeshFix.fill_holes`.
+    * ``"clean"``: remove degeneracies and self-intersections with up to
+      ``max_iters`` (default 10) iterations of ``inner_loops`` (default 3)
+      loops. Stops at the first iteration starting after ``time_limit``
+      seconds when given. When ``refill`` is ``True``, holes opened by the
+      cleaning are filled and the mesh is cleaned again. ``tris_per_cell``
+      (default 50) may be ``"auto"``, see
+      :func:`pymeshfix.PyTMesh.select_intersecting_triangles`.
+    * ``"degeneracy_removal"``: remove degenerate faces with up to
+      ``max_iters`` (default 3) iterations.
+    * ``"intersection_removal"``: remove self-intersections with up to
+      ``max_iters`` (default 3) iterations. Accepts ``tris_per_cell`` as
+      the ``"clean"`` stage.
+    * ``"decimate"``: collapse edges by quadric error down to
+      ``target_faces`` faces or by ``target_reduction`` of the faces, see
+      :func:`pymeshfix.MeshFix.decimate`. Reports the number of faces
+      removed.
+    * ``"reorder"``: sort the points, edges and faces along the
+      ``"morton"`` (default) or ``"hilbert"`` space-filling curve given by
+      ``method``, see :func:`pymeshfix.MeshFix.reorder`. Placed before
+      heavy stages, it improves the memory locality of their traversals.
+
+    Parameters
+    ----------
+    stages : sequence[dict]
+        Stages to run in order.
+
+    Examples
+    --------
+    Repair a mesh with the ``"fast"`` preset and only repair it again with
+    the ``"thorough"`` preset when it could not be completely cleaned.
+
+    >>> from pymeshfix import MeshFix, RepairPipeline
+    >>> mfix = MeshFix(points, faces)
+    >>> report = RepairPipeline.from_preset("fast").run(mfix)
+    >>> if not report[-1]["result"]:
+    ...     mfix = MeshFix(points, faces)
+    ...     report = RepairPipeline.from_preset("thorough").run(mfix)
+
+    Limit the time spent cleaning.
+
+    >>> pipeline = RepairPipeline(
+    ...     [
+    ...         {"stage": "fill_holes", "n_edges": 100},
+    ...         {"stage": "clean", "time_limit": 5.0},
+    ...     ]
+    ... )
+
+    """
+
+    def __init__(self, stages: Sequence[Mapping[str, Any]]):
+        """Initialize the pipeline."""
+        self.stages = [dict(stage) for stage in stages]
+
+    @classmethod
+    def from_preset(cls, name: str) -> "RepairPipeline":
+        """Return one of the built-in pipelines.
+
+        Parameters
+        ----------
+        name : str
+            One of ``"fast"``, ``"default"`` or ``"thorough"``.
+
+        Returns
+        -------
+        RepairPipeline
+            A new pipeline with the stages of the preset.
+
+        """
+        if name not in PRESETS:
+            raise ValueError(
+                f"Unknown preset '{name}'. Expected one of {', '.join(map(repr, PRESETS))}."
+            )
+        return cls(PRESETS[name])
+
+    def run(self, mesh: "MeshFix | _meshfix.PyTMesh") -> list[dict[str, Any]]:
+        """Run the pipeline on a mesh in place.
+
+        Parameters
+        ----------
+        mesh : pymeshfix.MeshFix | pymeshfix.PyTMesh
+            Mesh to repair.
+
+        Returns
+        -------
+        list[dict]
+            Report for each stage. See :func:`pymeshfix.PyTMesh.run_pipeline`.
+
+        """
+        if isinstance(mesh, _meshfix.PyTMesh):
+            return mesh.run_pipeline(self.stages)
+        mesh._modified()
+        return mesh._mfix.run_pipeline(self.stages)
+
+    def __repr__(self) -> str:
+        """Return the representation of the pipeline."""
+        return f"{type(self).__name__}({self.stages!r})"
@@ -0,0 +1,768 @@
+"""Local repair daemon with a pool of warm worker processes.
+
+Jobs are sent to the daemon over a Unix domain socket as small JSON headers,
+while the mesh arrays are passed through shared memory blocks. The workers
+stay alive between jobs, so a job does not pay for starting an interpreter
+and importing NumPy. Start the daemon with ``pymeshfix serve`` or
+:class:`RepairServer` and send jobs with :class:`RemoteRepairer`.
+
+This module must only depend on NumPy, the compiled extension and the
+standard library. Do not import ``pyvista`` or ``vtk`` here.
+
+"""
+
+import collections
+import contextlib
+import json
+import multiprocessing
+import os
+import queue
+import secrets
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pymeshfix import _meshfix
+
+# length prefix of the JSON headers sent over the socket
+_LENGTH = struct.Struct("!I")
+# alignment of the arrays packed in a shared memory block
+_ALIGN = 64
+# number of recent jobs the latency metrics are computed from
+_LATENCY_WINDOW = 1000
+_INT32_MAX = 2**31 - 1
+_PROVENANCE_KEYS = ("vertex_origin", "face_origin", "vertex_parents", "vertex_weights")
+_DELTA_KEYS = ("removed", "new_points", "new_faces")
+# errors of a job raised again by the client, others are raised as RuntimeError
+_EXCEPTIONS = {
+    exc.__name__: exc
+    for exc in (ValueError, TypeError, MemoryError, OverflowError, RuntimeError, TimeoutError)
+}
+
+
+def _send(sock: socket.socket, message: dict[str, Any]) -> None:
+    """Send a JSON message prefixed by its length."""
+    data = json.dumps(message).encode()
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes | None:
+    """Receive ``size`` bytes, or return ``None`` if the peer closed first."""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def _recv(sock: socket.socket) -> dict[str, Any] | None:
+    """Receive a message sent by :func:`_send`, or ``None`` once closed."""
+    prefix = _recv_exactly(sock, _LENGTH.size)
+    if prefix is None:
+        return None
+    data = _recv_exactly(sock, _LENGTH.unpack(prefix)[0])
+    if data is None:
+        return None
+    return json.loads(data)
+
+
+def _error_reply(exc: BaseException) -> dict[str, Any]:
+    return {"status": "error", "type": type(exc).__name__, "message": str(exc)}
+
+
+def _layout(arrays: list[tuple[str, Any, tuple[int, ...]]]) -> tuple[list[dict[str, Any]], int]:
+    """Return the header entries and the size of a block packing ``arrays``.
+
+    ``arrays`` holds the name, dtype and shape of each array.
+
+    """
+    entries = []
+    offset = 0
+    for name, dtype, shape in arrays:
+        dtype = np.dtype(dtype)
+        entries.append({"name": name, "dtype": dtype.str, "shape": list(shape), "offset": offset})
+        nbytes = dtype.itemsize * int(np.prod(shape))
+        offset += -(-nbytes // _ALIGN) * _ALIGN
+    # blocks cannot be empty
+    return entries, max(offset, _ALIGN)
+
+
+def _views(block: SharedMemory, entries: list[dict[str, Any]]) -> dict[str, NDArray]:
+    """Return the arrays of a block by name."""
+    return {
+        entry["name"]: np.ndarray(entry["shape"], entry["dtype"], block.buf, entry["offset"])
+        for entry in entries
+    }
+
+
+# Serializes the swaps of the resource tracker functions by _untracked().
+_TRACKER_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def _untracked() -> Iterator[None]:
+    """Keep the blocks opened or unlinked from the resource tracker.
+
+    The resource tracker is shared by the workers of a daemon, and by the
+    daemon itself, and it would unlink the blocks it tracks when they exit.
+    Blocks are handed over between the clients and the workers instead, and
+    the client unlinks them. The tracker keeps a single entry per name, so
+    the registration cannot be undone without dropping that of the client.
+
+    The functions of the tracker are swapped while holding a lock, so that
+    concurrent threads of this module restore them in order.
+
+    """
+    with _TRACKER_LOCK:
+        register, unregister = resource_tracker.register, resource_tracker.unregister
+        resource_tracker.register = resource_tracker.unregister = lambda name, rtype: None
+        try:
+            yield
+        finally:
+            resource_tracker.register, resource_tracker.unregister = register, unregister
+
+
+def _open_untracked(name: str, size: int = 0) -> SharedMemory:
+    """Create a block of ``size`` bytes, or attach it if ``size`` is 0."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, create=size > 0, size=size, track=False)
+    with _untracked():
+        return SharedMemory(name, create=size > 0, size=size)
+
+
+def _unlink_untracked(block: SharedMemory) -> None:
+    """Unlink a block opened by :func:`_open_untracked`."""
+    if sys.version_info >= (3, 13):
+        block.unlink()
+        return
+    with _untracked():
+        block.unlink()
+
+
+def _discard(name: str) -> None:
+    """Unlink the block ``name`` if it exists."""
+    try:
+        block = SharedMemory(name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def _close(block: SharedMemory) -> None:
+    """Close a block, even while arrays still use it."""
+    try:
+        block.close()
+    except BufferError:
+        # the arrays are still referenced, by the traceback of an error, and
+        # the block is unmapped once they are garbage collected
+        pass
+
+
+def _rss() -> int:
+    """Return the resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as fid:
+            return int(fid.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # peak rather than current size, in kilobytes except on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _repair(job: dict[str, Any], blocks: list[SharedMemory]) -> dict[str, Any]:
+    """Run a repair job and return the header of its output block.
+
+    The cleaned arrays are written directly to the output block named by the
+    job, except the faces whose type is only known after the repair. The
+    blocks opened are appended to ``blocks``.
+
+    """
+    kwargs = job["kwargs"]
+    arrays = _views(blocks[0], job["arrays"])
+    points, faces = arrays["points"], arrays["faces"]
+
+    if kwargs["delta"]:
+        result = _meshfix.clean_from_arrays(points, faces, **kwargs)
+        entries, size = _layout([(k, a.dtype, a.shape) for k, a in zip(_DELTA_KEYS, result)])
+        blocks.append(_open_untracked(job["out"], size))
+        for view, arr in zip(_views(blocks[1], entries).values(), result):
+            view[...] = arr
+        return {"status": "ok", "shm": job["out"], "arrays": entries}
+
+    entries: list[dict[str, Any]] = []
+    views: dict[str, NDArray] = {}
+
+    def out(n_points: int, n_faces: int) -> tuple[NDArray, NDArray | None]:
+        # the faces of an unchanged mesh keep their type by default
+        int64 = kwargs["int64"]
+        if int64 is None and not (kwargs["skip_if_clean"] and faces.dtype == np.int64):
+            int64 = n_points > _INT32_MAX
+        layout = [("points", np.float64, (n_points, 3)), ("faces", np.int64, (n_faces, 3))]
+        if kwargs["provenance"]:
+            layout += [
+                ("vertex_origin", np.int64, (n_points,)),
+                ("face_origin", np.int64, (n_faces,)),
+                ("vertex_parents", np.int64, (n_points, 3)),
+                ("vertex_weights", np.float64, (n_points, 3)),
+            ]
+        block_entries, size = _layout(layout)
+        blocks.append(_open_untracked(job["out"], size))
+        if int64 is not None:
+            block_entries[1]["dtype"] = np.dtype(np.int64 if int64 else np.int32).str
+        entries.extend(block_entries)
+        views.update(_views(blocks[1], entries))
+        return views["points"], views["faces"] if int64 is not None else None
+
+    result = _meshfix.clean_from_arrays(points, faces, **kwargs, out=out)
+    named = {"points": result[0], "faces": result[1]}
+    if kwargs["provenance"]:
+        named.update(result[2])
+    if named["faces"] is not views["faces"]:
+        # the faces slot is large enough for either type of index
+        entries[1]["dtype"] = named["faces"].dtype.str
+        views.update(_views(blocks[1], entries))
+    for key, arr in named.items():
+        if arr is not views[key]:
+            views[key][...] = arr
+    return {"status": "ok", "shm": job["out"], "arrays": entries}
+
+
+def _run_job(job: dict[str, Any]) -> dict[str, Any]:
+    """Run a repair job within a worker and never raise."""
+    blocks = [_open_untracked(job["shm"])]
+    try:
+        return _repair(job, blocks)
+    except Exception as exc:
+        for block in blocks[1:]:
+            _unlink_untracked(block)
+        return _error_reply(exc)
+    finally:
+        for block in blocks:
+            _close(block)
+
+
+def _worker_main(conn: Connection) -> None:
+    """Run the jobs received on ``conn`` until ``None`` is received."""
+    # the daemon shuts the workers down on an interrupt
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # warm up the allocator with a small repair
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+    faces = np.array([[0, 1, 2], [0, 3, 1], [1, 3, 2]], dtype=np.int32)
+    _meshfix.clean_from_arrays(points, faces)
+    conn.send("ready")
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            # the daemon exited
+            return
+        if job is None:
+            return
+        reply = _run_job(job)
+        reply["rss"] = _rss()
+        conn.send(reply)
+
+
+class _Worker:
+    """Worker process running the jobs sent over a pipe."""
+
+    def __init__(self, context: multiprocessing.context.BaseContext):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def wait_ready(self) -> None:
+        """Wait for the worker to finish warming up."""
+        try:
+            self.conn.recv()
+        except EOFError:
+            raise RuntimeError("A repair worker failed to start") from None
+
+    def stop(self, kill: bool = False, timeout: float = 5.0) -> None:
+        """Stop the worker, waiting for the job it runs unless ``kill`` is set."""
+        if not kill:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Answer the messages of a client connection until it is closed."""
+
+    def handle(self) -> None:
+        try:
+            while (message := _recv(self.request)) is not None:
+                _send(self.request, self.server.repair_server._handle(message))
+        except ConnectionError:
+            # the client exited without closing the connection
+            pass
+
+
+class RepairServer:
+    """Local daemon running repair jobs in a pool of warm worker processes.
+
+    Jobs are received from :class:`RemoteRepairer` clients over a Unix domain
+    socket and run by the first idle worker. Each worker is a separate
+    process, started once and reused, and is replaced after ``max_jobs``
+    jobs, when its memory exceeds ``max_rss``, or when a job exceeds its
+    timeout.
+
+    Only available on platforms with Unix domain sockets. The workers are
+    spawned, so a script creating a server must do so under an
+    ``if __name__ == "__main__":`` guard.
+
+    Parameters
+    ----------
+    socket_path : str | pathlib.Path
+        Path of the Unix domain socket to listen on. A stale socket file left
+        by a daemon that is no longer running is replaced.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    timeout : float, optional
+        Default time limit of a job in seconds, after which its worker is
+        killed and the job fails with a ``TimeoutError``. Clients may set
+        their own. Disabled by default.
+    max_jobs : int, optional
+        Number of jobs after which a worker is replaced. Unlimited by
+        default.
+    max_rss : int, optional
+        Resident memory in bytes above which a worker is replaced after its
+        job. Unlimited by default.
+
+    Examples
+    --------
+    Run the daemon until interrupted.
+
+    >>> from pymeshfix.server import RepairServer
+    >>> with RepairServer("/tmp/pymeshfix.sock", workers=4, max_jobs=1000) as server:
+    ...     server.serve_forever()
+
+    """
+
+    def __init__(
+        self,
+        socket_path: str | Path,
+        workers: int | None = None,
+        timeout: float | None = None,
+        max_jobs: int | None = None,
+        max_rss: int | None = None,
+    ):
+        """Start the workers and listen on the socket."""
+        self.socket_path = str(socket_path)
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss
+
+        if os.path.exists(self.socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(self.socket_path)
+            except ConnectionRefusedError:
+                os.unlink(self.socket_path)
+            else:
+                raise OSError(f"A repair server is already listening on '{self.socket_path}'")
+
+        # workers are spawned rather than forked from a multithreaded process
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._pool: set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        started = [self._start_worker() for _ in range(self.workers)]
+        for worker in started:
+            worker.wait_ready()
+            self._idle.put(worker)
+
+        self._start = time.monotonic()
+        self._jobs = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._latencies: collections.deque[float] = collections.deque(maxlen=_LATENCY_WINDOW)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _Handler)
+        self._server.daemon_threads = True
+        self._server.repair_server = self
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self._context)
+        with self._lock:
+            self._pool.add(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> None:
+        """Stop ``worker`` and start a new one in the background."""
+        with self._lock:
+            self._pool.discard(worker)
+            self._recycled += 1
+
+        def replace() -> None:
+            worker.stop()
+            if self._closed:
+                return
+            new_worker = self._start_worker()
+            try:
+                new_worker.wait_ready()
+            except RuntimeError:
+                with self._lock:
+                    self._pool.discard(new_worker)
+                raise
+            self._idle.put(new_worker)
+
+        threading.Thread(target=replace, daemon=True).start()
+
+    def _run(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Run a repair job on the next idle worker and return the reply."""
+        job = dict(message, out=f"pmf_{os.getpid()}_{secrets.token_hex(8)}")
+        timeout = message.get("timeout", self.timeout)
+        worker = self._idle.get()
+        try:
+            worker.conn.send(job)
+            finished = worker.conn.poll(timeout)
+            reply = worker.conn.recv() if finished else None
+        except (EOFError, OSError):
+            reply = _error_reply(RuntimeError("The repair worker exited during the job"))
+            finished = False
+        if not finished:
+            # the worker may still create the output block until it is killed
+            worker.stop(kill=True)
+            _discard(job["out"])
+            self._replace(worker)
+            if reply is not None:
+                return reply
+            with self._lock:
+                self._timeouts += 1
+            return _error_reply(TimeoutError(f"The repair did not finish within {timeout} s"))
+
+        worker.jobs += 1
+        rss = reply.pop("rss")
+        if (self.max_jobs is not None and worker.jobs >= self.max_jobs) or (
+            self.max_rss is not None and rss > self.max_rss
+        ):
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        return reply
+
+    def _handle(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Return the reply to a client message."""
+        op = message.get("op")
+        if op == "metrics":
+            return {"status": "ok", "metrics": self.metrics()}
+        if op != "repair":
+            return _error_reply(ValueError(f"Unknown operation {op!r}"))
+
+        tstart = time.perf_counter()
+        reply = self._run(message)
+        with self._lock:
+            self._jobs += 1
+            self._errors += reply["status"] == "error"
+            self._latencies.append(time.perf_counter() - tstart)
+        return reply
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the throughput and latency metrics of the server.
+
+        Returns
+        -------
+        dict
+            Dictionary containing:
+
+            * ``"workers"`` - Number of worker processes.
+            * ``"idle_workers"`` - Number of workers waiting for a job.
+            * ``"jobs"`` - Number of jobs run, including failed ones.
+            * ``"errors"`` - Number of failed jobs, including timeouts.
+            * ``"timeouts"`` - Number of jobs that exceeded their timeout.
+            * ``"recycled"`` - Number of workers replaced.
+            * ``"uptime"`` - Seconds since the server started.
+            * ``"throughput"`` - Jobs per second since the server started.
+            * ``"latency_mean"``, ``"latency_p50"``, ``"latency_p95"``,
+              ``"latency_max"`` - Time in seconds from receiving a job to
+              replying, including waiting for a worker, over the last 1000
+              jobs. ``None`` before the first job.
+
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            uptime = time.monotonic() - self._start
+            metrics: dict[str, Any] = {
+                "workers": self.workers,
+                "idle_workers": self._idle.qsize(),
+                "jobs": self._jobs,
+                "errors": self._errors,
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "uptime": uptime,
+                "throughput": self._jobs / uptime,
+            }
+        stats = {"mean": None, "p50": None, "p95": None, "max": None}
+        if latencies.size:
+            stats.update(
+                mean=float(latencies.mean()),
+                p50=float(np.percentile(latencies, 50)),
+                p95=float(np.percentile(latencies, 95)),
+                max=float(latencies.max()),
+            )
+        metrics.update({f"latency_{key}": value for key, value in stats.items()})
+        return metrics
+
+    def serve_forever(self) -> None:
+        """Answer clients until :func:`RepairServer.shutdown` is called."""
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop :func:`RepairServer.serve_forever` from another thread."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Close the socket and stop the workers."""
+        self._closed = True
+        self._server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            workers = list(self._pool)
+            self._pool.clear()
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "RepairServer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _write_out(
+    buffer: NDArray | None, arr: NDArray, name: str, dtypes: tuple[type, ...]
+) -> NDArray:
+    """Copy ``arr`` to an array returned by ``out``, or to a new array."""
+    if buffer is None:
+        return arr.copy()
+    if not (
+        isinstance(buffer, np.ndarray)
+        and buffer.flags.writeable
+        and buffer.flags.c_contiguous
+        and buffer.dtype in dtypes
+    ):
+        names = " or ".join(np.dtype(dtype).name for dtype in dtypes)
+        raise ValueError(f"{name} must be a writable C-contiguous {names} array")
+    if buffer.shape != arr.shape:
+        raise ValueError(f"{name} has shape {buffer.shape}, expected {arr.shape}")
+    if buffer.dtype == np.int32 and arr.dtype != np.int32 and arr.size and arr.max() > _INT32_MAX:
+        raise OverflowError("The mesh has too many points for int32 face indices")
+    buffer[...] = arr
+    return buffer
+
+
+class RemoteRepairer:
+    """Client of a :class:`RepairServer` started with ``pymeshfix serve``.
+
+    Sends the meshes to the server through shared memory and returns the
+    results of :func:`pymeshfix.clean_from_arrays` run by its workers. The
+    connection is opened on the first job and kept open. A client may be
+    shared between threads, which then send their jobs one at a time.
+
+    Parameters
+    ----------
+    socket_path : str | pathlib.Path
+        Path of the Unix domain socket of the server.
+    timeout : float, optional
+        Time limit of each job in seconds. Defaults to the timeout of the
+        server.
+
+    Examples
+    --------
+    Start the daemon from the shell.
+
+    .. code-block:: bash
+
+       pymeshfix serve --socket /tmp/pymeshfix.sock --workers 8
+
+    Repair meshes with its workers.
+
+    >>> import pyvista as pv
+    >>> from pymeshfix import RemoteRepairer
+    >>> sphere = pv.Sphere()
+    >>> points, faces = sphere.points, sphere.faces.reshape(-1, 4)[:, 1:]
+    >>> repairer = RemoteRepairer("/tmp/pymeshfix.sock", timeout=60)
+    >>> clean_points, clean_faces = repairer.clean_from_arrays(points, faces)
+    >>> latency = repairer.metrics()["latency_p50"]
+
+    """
+
+    def __init__(self, socket_path: str | Path, timeout: float | None = None):
+        """Initialize the client."""
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+
+    def _request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Send a message and return the reply, raising the error of a job."""
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self._sock.connect(self.socket_path)
+                _send(self._sock, message)
+                reply = _recv(self._sock)
+            except OSError:
+                self.close()
+                raise
+            if reply is None:
+                self.close()
+                raise ConnectionError("The repair server closed the connection")
+        if reply["status"] == "error":
+            raise _EXCEPTIONS.get(reply["type"], RuntimeError)(reply["message"])
+        return reply
+
+    def clean_from_arrays(
+        self,
+        v: NDArray[np.float64],
+        f: NDArray[np.int32] | NDArray[np.int64],
+        verbose: bool = False,
+        joincomp: bool = False,
+        remove_smallest_components: bool = True,
+        provenance: bool = False,
+        int64: bool | None = None,
+        delta: bool = False,
+        skip_if_clean: bool = False,
+        memory_limit: int | None = None,
+        out: Callable[[int, int], tuple[NDArray | None, NDArray | None]] | None = None,
+    ) -> tuple:
+        """Remote version of :func:`pymeshfix.clean_from_arrays`.
+
+        Takes and returns the same arguments. ``verbose`` output is written
+        by the server, and the arrays returned by ``out`` are copied to from
+        the shared memory of the result.
+
+        Raises
+        ------
+        TimeoutError
+            If the job exceeds its time limit.
+        ConnectionError
+            If the server closes the connection.
+
+        """
+        if delta and out is not None:
+            raise ValueError("out is not available with delta")
+        v = np.ascontiguousarray(v, dtype=np.float64)
+        f = np.ascontiguousarray(f)
+        if f.dtype not in (np.int32, np.int64):
+            f = f.astype(np.int64)
+        kwargs = {
+            "verbose": verbose,
+            "joincomp": joincomp,
+            "remove_smallest_components": remove_smallest_components,
+            "provenance": provenance,
+            "int64": int64,
+            "delta": delta,
+            "skip_if_clean": skip_if_clean,
+            "memory_limit": memory_limit,
+        }
+
+        entries, size = _layout([("points", v.dtype, v.shape), ("faces", f.dtype, f.shape)])
+        inputs = SharedMemory(create=True, size=size)
+        try:
+            views = _views(inputs, entries)
+            views["points"][...] = v
+            views["faces"][...] = f
+            del views
+            message = {"op": "repair", "shm": inputs.name, "arrays": entries, "kwargs": kwargs}
+            if self.timeout is not None:
+                message["timeout"] = self.timeout
+            reply = self._request(message)
+        finally:
+            _close(inputs)
+            inputs.unlink()
+
+        output = SharedMemory(reply["shm"])
+        try:
+            return self._result(output, reply["arrays"], kwargs, out)
+        finally:
+            _close(output)
+            output.unlink()
+
+    @staticmethod
+    def _result(
+        block: SharedMemory,
+        entries: list[dict[str, Any]],
+        kwargs: dict[str, Any],
+        out: Callable[[int, int], tuple[NDArray | None, NDArray | None]] | None,
+    ) -> tuple:
+        """Return the result of a job copied from its output block."""
+        arrays = _views(block, entries)
+        if kwargs["delta"]:
+            return tuple(arrays[key].copy() for key in _DELTA_KEYS)
+
+        points, faces = arrays["points"], arrays["faces"]
+        out_points = out_faces = None
+        if out is not None:
+            buffers = out(len(points), len(faces))
+            if not isinstance(buffers, tuple) or len(buffers) != 2:
+                raise ValueError("out must return a tuple of the points and faces arrays")
+            out_points, out_faces = buffers
+            faces_dtype = getattr(out_faces, "dtype", None)
+            if (
+                kwargs["int64"] is not None
+                and faces_dtype is not None
+                and faces_dtype != (np.int64 if kwargs["int64"] else np.int32)
+            ):
+                raise ValueError("int64 does not match the type of out_faces")
+        result = (
+            _write_out(out_points, points, "out_points", (np.float64,)),
+            _write_out(out_faces, faces, "out_faces", (np.int32, np.int64)),
+        )
+        if kwargs["provenance"]:
+            result += ({key: arrays[key].copy() for key in _PROVENANCE_KEYS},)
+        return result
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the metrics of the server, see :func:`RepairServer.metrics`."""
+        return self._request({"op": "metrics"})["metrics"]
+
+    def close(self) -> None:
+        """Close the connection to the server."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "RemoteRepairer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,462 @@
+"""Out-of-core repair of meshes larger than memory."""
+
+import itertools
+import os
+import tempfile
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from numpy.typing import NDArray
+
+from pymeshfix import _meshfix
+
+# offsets of a tile and of its neighbors
+_OFFSETS = list(itertools.product((-1, 0, 1), repeat=3))
+
+
+def _as_array(arr: "NDArray | str | Path", name: str) -> NDArray:
+    """Return an ``(n, 3)`` array, memory-mapping ``.npy`` files."""
+    if isinstance(arr, (str, Path)):
+        arr = np.load(arr, mmap_mode="r")
+    if arr.ndim != 2 or arr.shape[1] != 3:
+        raise ValueError(f"{name} must be shaped (n, 3), got {arr.shape}")
+    return arr
+
+
+class _TileStore:
+    """Faces of a mesh binned on disk into the cells of a grid of tiles.
+
+    Each cubic tile is split along each axis into a rim of width
+    ``overlap`` on both sides and its middle, giving 27 cells per tile, and
+    the faces are stored in the file of the cell containing their center.
+    Face indices refer to a copy of the input points followed by the points
+    created while repairing, which are kept in memory.
+
+    """
+
+    def __init__(
+        self, points: NDArray, tile_size: float, overlap: float, tmp: Path, chunk_size: int
+    ):
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        for start in range(0, points.shape[0], chunk_size):
+            chunk = np.asarray(points[start : start + chunk_size])
+            lo = np.minimum(lo, chunk.min(axis=0))
+            hi = np.maximum(hi, chunk.max(axis=0))
+
+        # working copy of the points, moved by the repair in place
+        self.points = np.memmap(tmp / "points", dtype=np.float64, mode="w+", shape=points.shape)
+        for start in range(0, points.shape[0], chunk_size):
+            self.points[start : start + chunk_size] = points[start : start + chunk_size]
+        self.new_points = np.empty((0, 3))
+        self.origin = lo
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.shape = np.maximum(np.ceil((hi - lo) / tile_size).astype(np.int64), 1)
+        self.tmp = tmp
+
+    @property
+    def n_points(self) -> int:
+        return self.points.shape[0] + len(self.new_points)
+
+    def phases(self) -> list[list[int]]:
+        """Return the tiles in groups where no two tiles are neighbors."""
+        index = np.indices(self.shape).reshape(3, -1).T % 2
+        return [
+            np.flatnonzero((index == parity).all(axis=1)).tolist()
+            for parity in itertools.product((0, 1), repeat=3)
+        ]
+
+    def take(self, index: NDArray[np.int64]) -> NDArray[np.float64]:
+        """Return the points at the sorted ``index``."""
+        split = np.searchsorted(index, self.points.shape[0])
+        return np.concatenate(
+            [
+                np.asarray(self.points[index[:split]], dtype=np.float64),
+                self.new_points[index[split:] - self.points.shape[0]],
+            ]
+        )
+
+    def bounds(self, tile: int, margin: float = 0.0) -> NDArray[np.float64]:
+        """Return the bounds of a tile grown by ``margin``."""
+        lo = self.origin + np.array(np.unravel_index(tile, self.shape)) * self.tile_size
+        return np.column_stack((lo - margin, lo + self.tile_size + margin)).ravel()
+
+    def cells(self, faces: NDArray[np.int64]) -> NDArray[np.int64]:
+        """Return the cell of each face."""
+        index, inverse = np.unique(faces, return_inverse=True)
+        centers = self.take(index)[inverse.reshape(-1, 3)].mean(axis=1)
+
+        tile = np.floor((centers - self.origin) / self.tile_size).astype(np.int64)
+        tile = np.clip(tile, 0, self.shape - 1)
+        frac = centers - self.origin - tile * self.tile_size
+        part = (frac >= self.overlap).astype(np.int64) + (frac >= self.tile_size - self.overlap)
+        return np.ravel_multi_index(tile.T, self.shape) * 27 + np.ravel_multi_index(
+            np.minimum(part, 2).T, (3, 3, 3)
+        )
+
+    def neighborhood(self, tile: int) -> list[int]:
+        """Return the cells of a tile and of its neighbors within the overlap."""
+        index = np.array(np.unravel_index(tile, self.shape))
+        cells = []
+        for offset in _OFFSETS:
+            neighbor = index + offset
+            if np.any(neighbor < 0) or np.any(neighbor >= self.shape):
+                continue
+            # only the rims of the neighbors facing the tile
+            parts = [(2,) if o < 0 else (0,) if o > 0 else (0, 1, 2) for o in offset]
+            base = int(np.ravel_multi_index(neighbor, self.shape)) * 27
+            cells.extend(
+                base + int(np.ravel_multi_index(part, (3, 3, 3)))
+                for part in itertools.product(*parts)
+            )
+        return cells
+
+    def path(self, cell: int) -> Path:
+        return self.tmp / f"{cell}.faces"
+
+    def stored_cells(self) -> list[int]:
+        """Return the cells holding faces in order."""
+        return sorted(int(path.stem) for path in self.tmp.glob("*.faces"))
+
+    def read(self, cells: list[int]) -> NDArray[np.int64]:
+        """Return the faces of ``cells``."""
+        arrays = [np.empty(0, dtype=np.int64)]
+        for cell in cells:
+            if self.path(cell).exists():
+                arrays.append(np.fromfile(self.path(cell), dtype=np.int64))
+        return np.concatenate(arrays).reshape(-1, 3)
+
+    def write(
+        self, faces: NDArray[np.int64], cells: NDArray[np.int64], replace: list[int] = ()
+    ) -> None:
+        """Append faces to their cells after emptying the ``replace`` cells."""
+        for cell in replace:
+            self.path(cell).unlink(missing_ok=True)
+        if not len(faces):
+            return
+        order = np.argsort(cells, kind="stable")
+        cells, faces = cells[order], faces[order]
+        splits = np.flatnonzero(np.diff(cells)) + 1
+        for cell, cell_faces in zip(cells[np.r_[0, splits]], np.split(faces, splits)):
+            with open(self.path(cell), "ab") as fid:
+                cell_faces.tofile(fid)
+
+    def update(
+        self,
+        cells: list[int],
+        faces: NDArray[np.int64],
+        new_points: NDArray[np.float64],
+        moved: NDArray[np.int64],
+        moved_points: NDArray[np.float64],
+    ) -> NDArray[np.int64]:
+        """Replace the faces of ``cells`` by the faces of a repaired tile.
+
+        New points are referenced by the bitwise complement of their index
+        in ``new_points``, and the points at ``moved`` are moved to
+        ``moved_points``. Returns the faces with a center outside of
+        ``cells``, which are left to the caller to store.
+
+        """
+        order = np.argsort(moved)
+        moved, moved_points = moved[order], moved_points[order]
+        split = np.searchsorted(moved, self.points.shape[0])
+        self.points[moved[:split]] = moved_points[:split]
+        self.new_points[moved[split:] - self.points.shape[0]] = moved_points[split:]
+        faces = np.where(faces >= 0, faces, self.n_points + ~faces)
+        self.new_points = np.concatenate([self.new_points, new_points])
+        face_cells = self.cells(faces)
+        inside = np.isin(face_cells, cells)
+        self.write(faces[inside], face_cells[inside], replace=cells)
+        return faces[~inside]
+
+
+def _repair_tile(store: _TileStore, tile: int, options: dict, clean: bool = True) -> tuple:
+    """Repair a tile with the faces of its neighbors within the overlap.
+
+    Returns the cells that were loaded and the repaired faces, which
+    reference the points created by the repair by the bitwise complement of
+    their index, followed by the created points, and the index and position
+    of the points moved by the repair.
+
+    """
+    cells = store.neighborhood(tile)
+    faces = store.read(cells)
+    if not len(faces):
+        return cells, faces, np.empty((0, 3)), np.empty(0, dtype=np.int64), np.empty((0, 3))
+    verts, local = np.unique(faces, return_inverse=True)
+    local = local.reshape(-1, 3)
+    points = store.take(verts)
+
+    tin = _meshfix.PyTMesh()
+    tin.set_quiet(not options["verbose"])
+    tin.load_array(points, local)
+
+    # the repair is restricted to the tile and half of the overlap, leaving
+    # the rest of the overlap as a margin to the faces that were not loaded
+    region = store.bounds(tile, store.overlap / 2)
+    loops = tin.boundary_loops()
+    lo, hi = loops["bounds"][:, ::2], loops["bounds"][:, 1::2]
+    inside = np.all((lo >= region[::2]) & (hi <= region[1::2]), axis=1)
+    inside = inside[np.repeat(np.arange(len(inside)), np.diff(loops["offsets"]))]
+    # the edges shared with the faces that were not loaded are on the loops
+    # left open, near the end of the overlap, and must not be modified
+    outer = store.bounds(tile, 3 * store.overlap / 4)
+    seam = np.zeros(len(points), dtype=bool)
+    seam[tin.return_provenance()["vertex_origin"][loops["indices"][~inside]]] = True
+    seam &= ~np.all((points >= outer[::2]) & (points <= outer[1::2]), axis=1)
+    tin.fill_region_boundaries(
+        np.isin(tin.return_faces(int64=True), loops["indices"][inside]).any(axis=1),
+        0,
+        options["n_edges"],
+        options["refine"],
+        options["max_new_triangles"] or 0,
+        options["target_edge_length"] or 0.0,
+        options["density_scale"],
+    )
+    if clean:
+        tin.clean_region(
+            tin.faces_in_region(bounds=region),
+            2,
+            options["max_iters"],
+            options["inner_loops"],
+            options["tris_per_cell"],
+        )
+
+    new_points, new_faces = tin.return_arrays(int64=True)
+    prov = tin.return_provenance()
+    del tin
+    vertex_origin, face_origin = prov["vertex_origin"], prov["face_origin"]
+    created = vertex_origin < 0
+    moved = ~created
+    moved[moved] = np.any(new_points[moved] != points[vertex_origin[moved]], axis=1)
+
+    # the cleaning grows the region when it cannot be repaired on its own
+    seam_faces = np.flatnonzero(seam[local].any(axis=1))
+    kept = np.where(created, False, seam[np.maximum(vertex_origin, 0)])
+    if clean and (
+        not np.isin(seam_faces, face_origin).all()
+        or (moved & kept).any()
+        or kept[new_faces[face_origin < 0]].any()
+    ):
+        warnings.warn(
+            f"The cleaning of tile {tile} reached beyond its overlap and was skipped. "
+            "Increase the overlap to clean it.",
+            stacklevel=2,
+        )
+        return _repair_tile(store, tile, options, clean=False)
+
+    index = np.where(created, -1, verts[vertex_origin])
+    index[created] = ~np.arange(created.sum())
+    return cells, index[new_faces], new_points[created], index[moved], new_points[moved]
+
+
+def tiled_repair(
+    points: "NDArray[np.float64] | str | Path",
+    faces: "NDArray[np.integer] | str | Path",
+    tile_size: float,
+    overlap: float | None = None,
+    n_workers: int | None = None,
+    out: str | Path | None = None,
+    tmp_dir: str | Path | None = None,
+    n_edges: int = 0,
+    refine: bool = True,
+    max_new_triangles: int | None = None,
+    target_edge_length: float | None = None,
+    density_scale: float = 1.0,
+    max_iters: int = 10,
+    inner_loops: int = 3,
+    tris_per_cell: int | str = 50,
+    chunk_size: int = 2**20,
+    verbose: bool = False,
+) -> tuple[NDArray[np.float64], NDArray[np.int32 | np.int64]]:
+    """
+    Repair a mesh too large to fit in memory one tile at a time.
+
+    The faces are read in chunks and binned by their center into cubic
+    tiles. Each tile is loaded with the faces of its neighbors within
+    ``overlap``, and the holes, degeneracies and self-intersections within
+    the tile and half of its overlap are repaired while the rest of the
+    overlap is held fixed. Neighboring tiles are never repaired at the same
+    time, and the faces of each repaired tile replace the faces it was
+    loaded from, so defects crossing the seams between tiles are repaired
+    once and the tiles stay stitched along their seams.
+
+    The faces are kept on disk between the repairs of the tiles, and only
+    about ``n_workers`` tiles are held in memory at a time. The result is
+    written to memory-mapped ``.npy`` files in ``out`` when given.
+
+    Parameters
+    ----------
+    points : numpy.ndarray | str | pathlib.Path
+        ``(n, 3)`` points, or the path of a ``.npy`` file which is
+        memory-mapped. Memory-mapped arrays are read in chunks.
+    faces : numpy.ndarray | str | pathlib.Path
+        ``(m, 3)`` triangular faces, or the path of a ``.npy`` file which is
+        memory-mapped.
+    tile_size : float
+        Edge length of the tiles. A tile should hold no more faces than fit
+        in memory ``n_workers`` times over.
+    overlap : float, optional
+        Width of the neighboring faces loaded with each tile. Defects
+        crossing the seams between tiles, including holes, must be smaller
+        than half of it to be repaired.
+        Defaults to a tenth of ``tile_size``, and must be at most half of
+        it.
+    n_workers : int, optional
+        Number of tiles repaired concurrently. Defaults to the number of
+        CPUs.
+    out : str | pathlib.Path, optional
+        Directory to write the repaired mesh to as ``points.npy`` and
+        ``faces.npy``. The arrays are returned memory-mapped. By default
+        they are returned in memory.
+    tmp_dir : str | pathlib.Path, optional
+        Directory for the intermediate files, which take about as much space
+        as the faces and points of the input. Defaults to the system
+        temporary directory.
+    n_edges : int, default: 0
+        Maximum number of boundary edges of the holes to fill. If 0, fill
+        all the holes smaller than the overlap.
+    refine : bool, default: True
+        Refine the patches filling the holes.
+    max_new_triangles : int, optional
+        Maximum number of faces added to each hole. See
+        :func:`pymeshfix.MeshFix.fill_holes`.
+    target_edge_length : float, optional
+        Edge length of the refined patches. See
+        :func:`pymeshfix.MeshFix.fill_holes`.
+    density_scale : float, default: 1.0
+        Scale of the sampling density of the refined patches. See
+        :func:`pymeshfix.MeshFix.fill_holes`.
+    max_iters : int, default: 10
+        Maximum number of cleaning iterations of each tile.
+    inner_loops : int, default: 3
+        Number of inner optimization loops per iteration.
+    tris_per_cell : int | str, default: 50
+        Maximum number of triangles per cell of the space subdivision used
+        to detect intersections, or ``"auto"``.
+    chunk_size : int, default: 1048576
+        Number of points or faces read at once while streaming the input
+        and the output.
+    verbose : bool, default: False
+        Print the progress of the repair of each tile.
+
+    Returns
+    -------
+    numpy.ndarray
+        Repaired points shaped ``(N, 3)``.
+    numpy.ndarray
+        Repaired faces shaped ``(M, 3)``. Indices are ``int32`` unless there
+        are too many points.
+
+    Notes
+    -----
+    Unlike :func:`pymeshfix.MeshFix.repair`, the components are neither
+    removed nor joined, and holes that do not fit within a tile and half of
+    its overlap are left open. The overlap should span several rings of
+    faces, so that the repair of a tile does not reach the faces that were
+    not loaded with it. The points created while filling the holes are kept
+    in memory until the result is written.
+
+    Examples
+    --------
+    Repair a mesh stored as ``.npy`` files with tiles of 100 units and
+    write the result next to it.
+
+    >>> from pymeshfix import tiled_repair
+    >>> points, faces = tiled_repair(
+    ...     "scan/points.npy", "scan/faces.npy", tile_size=100.0, out="scan/repaired"
+    ... )
+
+    """
+    points = _as_array(points, "points")
+    faces = _as_array(faces, "faces")
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive")
+    if overlap is None:
+        overlap = tile_size / 10
+    if not 0 <= overlap <= tile_size / 2:
+        raise ValueError("overlap must be between 0 and half of tile_size")
+    n_workers = n_workers or os.cpu_count() or 1
+    options = {
+        "n_edges": n_edges,
+        "refine": refine,
+        "max_new_triangles": max_new_triangles,
+        "target_edge_length": target_edge_length,
+        "density_scale": density_scale,
+        "max_iters": max_iters,
+        "inner_loops": inner_loops,
+        "tris_per_cell": tris_per_cell,
+        "verbose": verbose,
+    }
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmpdir:
+        store = _TileStore(points, tile_size, overlap, Path(tmpdir), chunk_size)
+        for start in range(0, faces.shape[0], chunk_size):
+            chunk = np.asarray(faces[start : start + chunk_size], dtype=np.int64)
+            store.write(chunk, store.cells(chunk))
+
+        # neighboring tiles are never repaired concurrently, and the faces of
+        # each repaired tile replace the faces it was loaded from
+        with ThreadPoolExecutor(n_workers) as pool:
+            for tiles in store.phases():
+                pending: deque = deque()
+                outside = []
+                for tile in tiles:
+                    pending.append(pool.submit(_repair_tile, store, tile, options))
+                    if len(pending) > n_workers:
+                        outside.append(store.update(*pending.popleft().result()))
+                while pending:
+                    outside.append(store.update(*pending.popleft().result()))
+                if outside:
+                    outside = np.concatenate(outside)
+                    store.write(outside, store.cells(outside))
+
+        # compact the points to the ones still used
+        cells = store.stored_cells()
+        n_points = store.n_points
+        used = np.memmap(store.tmp / "used", dtype=bool, mode="w+", shape=(n_points,))
+        n_faces = 0
+        for cell in cells:
+            cell_faces = store.read([cell])
+            used[cell_faces.ravel()] = True
+            n_faces += len(cell_faces)
+        remap = np.memmap(store.tmp / "remap", dtype=np.int64, mode="w+", shape=(n_points,))
+        n_out = 0
+        for start in range(0, n_points, chunk_size):
+            chunk = used[start : start + chunk_size]
+            remap[start : start + chunk_size] = np.cumsum(chunk) - 1 + n_out
+            n_out += int(chunk.sum())
+
+        dtype = np.int64 if n_out > np.iinfo(np.int32).max else np.int32
+        if out is None:
+            out_points = np.empty((n_out, 3), dtype=np.float64)
+            out_faces = np.empty((n_faces, 3), dtype=dtype)
+        else:
+            out = Path(out)
+            out.mkdir(parents=True, exist_ok=True)
+            out_points = open_memmap(out / "points.npy", "w+", np.float64, (n_out, 3))
+            out_faces = open_memmap(out / "faces.npy", "w+", dtype, (n_faces, 3))
+
+        row = 0
+        for start in range(0, n_points, chunk_size):
+            index = np.arange(start, min(start + chunk_size, n_points))
+            chunk = store.take(index[used[start : start + chunk_size]])
+            out_points[row : row + len(chunk)] = chunk
+            row += len(chunk)
+
+        row = 0
+        for cell in cells:
+            cell_faces = remap[store.read([cell])]
+            out_faces[row : row + len(cell_faces)] = cell_faces
+            row += len(cell_faces)
+        del used, remap, store
+
+    if out is not None:
+        out_points.flush()
+        out_faces.flush()
+    return out_points, out_faces
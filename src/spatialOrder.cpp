@@ -0,0 +1,127 @@
+// Ordering of the elements of a mesh along a space-filling curve.
+#include <algorithm>
+#include <cstdlib>
+#include <new>
+#include <vector>
+
+#include "jqsort.h"
+#include "spatialOrder.h"
+
+namespace T_MESH {
+
+namespace {
+
+const int KEY_BITS = 21;
+
+// Spread the 21 low bits of 'x' to every third bit of the result.
+uint64_t spreadBits(uint32_t x) {
+    uint64_t v = x & 0x1fffff;
+    v = (v | v << 32) & 0x1f00000000ffffULL;
+    v = (v | v << 16) & 0x1f0000ff0000ffULL;
+    v = (v | v << 8) & 0x100f00f00f00f00fULL;
+    v = (v | v << 4) & 0x10c30c30c30c30c3ULL;
+    v = (v | v << 2) & 0x1249249249249249ULL;
+    return v;
+}
+
+// Quantizes coordinates to the integer grid of the keys.
+struct Quantizer {
+    double origin[3];
+    double scale;
+
+    explicit Quantizer(Basic_TMesh *tin) {
+        Point b, t;
+        tin->getBoundingBox(b, t);
+        Point d = t - b;
+        origin[0] = TMESH_TO_DOUBLE(b.x);
+        origin[1] = TMESH_TO_DOUBLE(b.y);
+        origin[2] = TMESH_TO_DOUBLE(b.z);
+        // the same scale on every axis keeps the cells cubic
+        double extent =
+            std::max({TMESH_TO_DOUBLE(d.x), TMESH_TO_DOUBLE(d.y), TMESH_TO_DOUBLE(d.z)});
+        scale = (extent > 0) ? ((1 << KEY_BITS) - 1) / extent : 0.0;
+    }
+
+    uint32_t operator()(double c, int axis) const {
+        double q = (c - origin[axis]) * scale;
+        return (uint32_t)std::min(std::max(q, 0.0), (double)((1 << KEY_BITS) - 1));
+    }
+
+    uint64_t key(const Point &p, SpaceFillingCurve curve) const {
+        return curveKey(
+            (*this)(TMESH_TO_DOUBLE(p.x), 0),
+            (*this)(TMESH_TO_DOUBLE(p.y), 1),
+            (*this)(TMESH_TO_DOUBLE(p.z), 2),
+            curve);
+    }
+};
+
+// Sort the elements of 'list' by the keys computed by 'key' for each.
+template <typename T, typename KeyFunction> void sortList(List &list, KeyFunction key) {
+    const int64_t n = list.numels();
+    if (n < 2) {
+        return;
+    }
+    void **array = list.toArray();
+    if (array == NULL) {
+        throw std::bad_alloc();
+    }
+    std::vector<uint64_t> keys(n);
+    for (int64_t i = 0; i < n; i++) {
+        keys[i] = key((T *)array[i]);
+    }
+    jrsort(array, n, keys.data(), 1);
+    list.fromArray(array);
+    free(array);
+}
+
+} // namespace
+
+uint64_t curveKey(uint32_t x, uint32_t y, uint32_t z, SpaceFillingCurve curve) {
+    uint32_t X[3] = {x, y, z};
+    if (curve == SpaceFillingCurve::Hilbert) {
+        // transpose of the Hilbert index, from J. Skilling, "Programming the
+        // Hilbert curve", AIP Conference Proceedings 707, 381 (2004)
+        const uint32_t M = 1u << (KEY_BITS - 1);
+        uint32_t P, Q, t;
+        for (Q = M; Q > 1; Q >>= 1) {
+            P = Q - 1;
+            for (int i = 0; i < 3; i++) {
+                if (X[i] & Q) {
+                    X[0] ^= P;
+                } else {
+                    t = (X[0] ^ X[i]) & P;
+                    X[0] ^= t;
+                    X[i] ^= t;
+                }
+            }
+        }
+        X[1] ^= X[0];
+        X[2] ^= X[1];
+        t = 0;
+        for (Q = M; Q > 1; Q >>= 1) {
+            if (X[2] & Q) {
+                t ^= Q - 1;
+            }
+        }
+        for (int i = 0; i < 3; i++) {
+            X[i] ^= t;
+        }
+    }
+    return spreadBits(X[0]) << 2 | spreadBits(X[1]) << 1 | spreadBits(X[2]);
+}
+
+void spatialReorder(Basic_TMesh *tin, SpaceFillingCurve curve) {
+    if (tin->V.numels() == 0) {
+        return;
+    }
+    const Quantizer quantize(tin);
+
+    sortList<Vertex>(tin->V, [&](const Vertex *v) { return quantize.key(*v, curve); });
+    sortList<Edge>(
+        tin->E, [&](const Edge *e) { return quantize.key(e->getMidPoint(), curve); });
+    sortList<Triangle>(
+        tin->T, [&](const Triangle *t) { return quantize.key(t->getCenter(), curve); });
+}
+
+} // namespace T_MESH
@@ -0,0 +1,30 @@
+// Ordering of the elements of a mesh along a space-filling curve.
+#ifndef SPATIAL_ORDER_H
+#define SPATIAL_ORDER_H
+
+#include <cstdint>
+
+#include "tmesh.h"
+
+namespace T_MESH {
+
+enum class SpaceFillingCurve { Morton, Hilbert };
+
+// Key of the point at integer coordinates 'x', 'y' and 'z', of 21 bits
+// each, along a space-filling curve. Points with close keys are close in
+// space.
+uint64_t curveKey(uint32_t x, uint32_t y, uint32_t z, SpaceFillingCurve curve);
+
+// Sort the vertices, edges and triangles of 'tin' along a space-filling
+// curve, so that elements close in space are also close in their lists.
+//
+// Vertices are sorted by their position, and edges and triangles by their
+// center, quantized to 21 bits per axis within the bounding box of the
+// mesh. The elements themselves are not moved, so pointers to them stay
+// valid and only the traversal order of the lists changes. The sort is a
+// radix sort of the keys, in linear time.
+void spatialReorder(Basic_TMesh *tin, SpaceFillingCurve curve);
+
+} // namespace T_MESH
+
+#endif // SPATIAL_ORDER_H
@@ -30,6 +30,7 @@
 
 #include "tin.h"
 #include <stdlib.h>
+#include <inttypes.h>
 #include <string.h>
 
 namespace T_MESH
@@ -39,7 +40,7 @@ namespace T_MESH
 	Vertex *	Basic_TMesh::newVertex(const coord &x, const coord &y, const coord &z){ return new Vertex(x, y, z); }	//!< AMF_ADD 1.1>
 	Vertex *	Basic_TMesh::newVertex(Point *p){						return new Vertex(p);						}	//!< AMF_ADD 1.1>
 	Vertex *	Basic_TMesh::newVertex(Point &p){						return new Vertex(p);						}	//!< AMF_ADD 1.1>
-	Vertex *	Basic_TMesh::newVertex(Vertex *v){						return new Vertex(v);						}	//!< AMF_ADD 1.1-2>
+	Vertex *	Basic_TMesh::newVertex(Vertex *v){						Vertex *nv = new Vertex(v); nv->origin = v->origin; return nv; }	//!< AMF_ADD 1.1-2>
 	Edge *		Basic_TMesh::newEdge(Vertex *s, Vertex *d){				return new Edge(s, d);						}	//!< AMF_ADD 1.1>
 	Edge *		Basic_TMesh::newEdge(Edge *e){							return new Edge(e->v1,e->v2);				}	//!< AMF_ADD 1.1-2>
 	Triangle *	Basic_TMesh::newTriangle(){								return new Triangle();						}	//!< AMF_ADD 1.1>
@@ -57,6 +58,7 @@ namespace T_MESH
 Basic_TMesh::Basic_TMesh()
 {
  info=NULL;
+ max_triangles = 0; max_triangles_reached = false;
  n_boundaries = n_handles = n_shells = 0;
  d_boundaries = d_handles = d_shells = 0;
 }
@@ -69,6 +71,7 @@ Basic_TMesh::Basic_TMesh(const char *tin_definition) { init(tin_definition); }
 void Basic_TMesh::init(const char *tin_definition)
 {
  info=NULL;
+ max_triangles = 0; max_triangles_reached = false;
  if (!strcmp(tin_definition, "triangle"))
  {
   Vertex *v1 = newVertex(0,0,0);
@@ -181,12 +184,13 @@ Basic_TMesh::Basic_TMesh(const Basic_TMesh *tin, const bool clone_info) { init(t
 void Basic_TMesh::init(const Basic_TMesh *tin, const bool clone_info)
 {
  info=NULL;
+ max_triangles = 0; max_triangles_reached = false;
  Node *n;
  Vertex *v, *nv;
  Edge *e, *ne;
  Triangle *t, *nt;
 
- int i;
+ int64_t i;
  void **t_info = new void *[tin->T.numels()];
  i=0; FOREACHVTTRIANGLE((&(tin->T)), t, n) t_info[i++]=t->info;
  void **e_info = new void *[tin->E.numels()];
@@ -203,7 +207,7 @@ void Basic_TMesh::init(const Basic_TMesh *tin, const bool clone_info)
   {ne=newEdge((Vertex *)e->v1->info, (Vertex *)e->v2->info); E.appendTail(ne); e->info = ne;}
 
  FOREACHVTTRIANGLE((&(tin->T)), t, n)
-  {nt=newTriangle((Edge *)t->e1->info,(Edge *)t->e2->info,(Edge *)t->e3->info); T.appendTail(nt); t->info = nt;}
+  {nt=newTriangle((Edge *)t->e1->info,(Edge *)t->e2->info,(Edge *)t->e3->info); nt->origin = t->origin; T.appendTail(nt); t->info = nt;}
 
  FOREACHVVVERTEX((&(tin->V)), v, n) {((Vertex *)v->info)->e0 = (Edge *)v->e0->info; v->info = NULL;}
 
@@ -235,6 +239,7 @@ Basic_TMesh::Basic_TMesh(const Triangle *t0, const bool keep_reference) { init(t
 void Basic_TMesh::init(const Triangle *t0, const bool keep_reference)
 {
  info=NULL;
+ max_triangles = 0; max_triangles_reached = false;
  List todo(t0), st, sv, se;
  Node *n;
  Triangle *t, *nt;
@@ -271,7 +276,7 @@ void Basic_TMesh::init(const Triangle *t0, const bool keep_reference)
   {UNMARK_VISIT2(e); ne=newEdge((Vertex *)e->v1->info, (Vertex *)e->v2->info); E.appendTail(ne); e->info = ne;}
 
  FOREACHVTTRIANGLE((&st), t, n)
-  {nt=newTriangle((Edge *)t->e1->info,(Edge *)t->e2->info,(Edge *)t->e3->info); T.appendTail(nt); t->info = nt;}
+  {nt=newTriangle((Edge *)t->e1->info,(Edge *)t->e2->info,(Edge *)t->e3->info); nt->origin = t->origin; T.appendTail(nt); t->info = nt;}
 
  FOREACHVVVERTEX((&sv), v, n) ((Vertex *)v->info)->e0 = (Edge *)v->e0->info;
 
@@ -486,37 +491,36 @@ void Basic_TMesh::unlinkTriangle(Triangle *t)
  t->e1 = t->e2 = t->e3 = NULL;
 
  Vertex *nv;
- Edge *e;
- List *ve;
- Node *n;
+ VertexFan<Edge> ve;
+ int i;
 
  if (v1nm)
  {
   nv = newVertex(v1->x, v1->y, v1->z);
+  nv->origin = v1->origin;
   nv->e0 = v1->e0;
-  ve = v1->VE();
-  FOREACHVEEDGE(ve, e, n) e->replaceVertex(v1, nv);
-  delete(ve);
+  v1->VE(ve);
+  for (i = 0; i < ve.numels(); i++) ve[i]->replaceVertex(v1, nv);
   v1->e0 = e1;
   V.appendHead(nv);
  }
  if (v2nm)
  {
   nv = newVertex(v2->x, v2->y, v2->z);
+  nv->origin = v2->origin;
   nv->e0 = v2->e0;
-  ve = v2->VE();
-  FOREACHVEEDGE(ve, e, n) e->replaceVertex(v2, nv);
-  delete(ve);
+  v2->VE(ve);
+  for (i = 0; i < ve.numels(); i++) ve[i]->replaceVertex(v2, nv);
   v2->e0 = e2;
   V.appendHead(nv);
  }
  if (v3nm)
  {
   nv = newVertex(v3->x, v3->y, v3->z);
+  nv->origin = v3->origin;
   nv->e0 = v3->e0;
-  ve = v3->VE();
-  FOREACHVEEDGE(ve, e, n) e->replaceVertex(v3, nv);
-  delete(ve);
+  v3->VE(ve);
+  for (i = 0; i < ve.numels(); i++) ve[i]->replaceVertex(v3, nv);
   v3->e0 = e3;
   V.appendHead(nv);
  }
@@ -543,11 +547,11 @@ void Basic_TMesh::unlinkTriangleNoManifold(Triangle *t)
 
 ///// Removes all the triangles with NULL edges /////
 
-int Basic_TMesh::removeTriangles()
+int64_t Basic_TMesh::removeTriangles()
 {
  Node *n;
  Triangle *t;
- int r = 0;
+ int64_t r = 0;
 
  n = T.head();
  while (n != NULL)
@@ -570,11 +574,11 @@ int Basic_TMesh::removeTriangles()
 
 ///// Removes all the edges with NULL vertices /////
 
-int Basic_TMesh::removeEdges()
+int64_t Basic_TMesh::removeEdges()
 {
  Node *n;
  Edge *e;
- int r = 0;
+ int64_t r = 0;
 
  n = E.head();
  while (n != NULL)
@@ -597,11 +601,11 @@ int Basic_TMesh::removeEdges()
 
 /////////// Removes all the vertices with e0 field = NULL ////////////
 
-int Basic_TMesh::removeVertices()
+int64_t Basic_TMesh::removeVertices()
 {
  Node *n;
  Vertex *v;
- int r = 0;
+ int64_t r = 0;
 
  n = V.head();
  while (n != NULL)
@@ -623,13 +627,14 @@ int Basic_TMesh::removeVertices()
 
 
 //// Removes all the vertices that can be deleted without changing the geometric realization. O(N).
-int Basic_TMesh::removeRedundantVertices()
+int64_t Basic_TMesh::removeRedundantVertices()
 {
 	Node *n;
 	Vertex *v;
-	int fv = 0;
+	int64_t fv = 0;
 	FOREACHVERTEX(v, n) if (v->removeIfRedundant()) fv++;
-	removeUnlinkedElements();
+	if (fv) removeUnlinkedElements();
+	else d_boundaries = d_handles = d_shells = 1;
 	return fv;
 }
 
@@ -657,8 +662,11 @@ void Basic_TMesh::removeSelectedTriangles()
  Node *n;
  Triangle *t;
 
- FOREACHTRIANGLE(t, n) if (IS_VISITED(t)) unlinkTriangle(t);
- removeUnlinkedElements();
+ int64_t nt = 0;
+
+ FOREACHTRIANGLE(t, n) if (IS_VISITED(t)) { unlinkTriangle(t); nt++; }
+ if (nt) removeUnlinkedElements();
+ else d_boundaries = d_handles = d_shells = 1;
 }
 
 
@@ -837,7 +845,7 @@ Basic_TMesh *Basic_TMesh::createSubMeshFromSelection(Triangle *t0, bool keep_ref
 
  FOREACHVEEDGE((&sE), e, n) e->v1->e0 = e->v2->e0 = e;
 
- int i;
+ int64_t i;
  void **v_info = NULL, **e_info = NULL, **t_info = NULL;
  if (!keep_ref)
  {
@@ -1018,7 +1026,7 @@ bool Basic_TMesh::isSelectionSimple(List *s)
  if (nv != s->numels()) return 0; // Disconnected selection
 
  Edge *e, *f, *ge=NULL, *e0;
- List *ve;
+ VertexFan<Edge> ve;
  FOREACHVEEDGE((&(bdr)), e, n) MARK_VISIT(e);
  int nae;
 
@@ -1030,9 +1038,8 @@ bool Basic_TMesh::isSelectionSimple(List *s)
  {
   nv++;
   v = e->oppositeVertex(v);
-  ve = v->VE();
-  nae=0; FOREACHVEEDGE(ve, f, n) if (f!=e && IS_VISITED(f)) {ge=f; nae++;}
-  delete(ve);
+  v->VE(ve);
+  nae=0; for (int i = 0; i < ve.numels(); i++) if ((f = ve[i])!=e && IS_VISITED(f)) {ge=f; nae++;}
   if (nae > 1) break;
   e=ge;
  } while (e != e0);
@@ -1223,17 +1230,17 @@ Vertex *Basic_TMesh::nextVertexOnRegionBoundary(Vertex *sv) const
 {
  Triangle *lt, *rt;
  Edge *e;
- List *ve = sv->VE();
- Node *n;
+ VertexFan<Edge> ve;
 
- FOREACHVEEDGE(ve, e, n)
+ sv->VE(ve);
+ for (int i = 0; i < ve.numels(); i++)
  {
+  e = ve[i];
   lt = e->leftTriangle(sv);
   rt = e->rightTriangle(sv);
   if (lt != NULL && IS_VISITED(lt) && (rt == NULL || !IS_VISITED(rt)))
-   {delete(ve); return e->oppositeVertex(sv);}
+   return e->oppositeVertex(sv);
  }
- delete(ve);
 
  return NULL;
 }
@@ -1531,7 +1538,7 @@ void Basic_TMesh::addNormalNoise(double ns)
  Vertex *v;
  Node *n;
  Point np;
- int i;
+ int64_t i;
  double noise;
  coord *xyz = (coord *)malloc(sizeof(coord)*V.numels()*3);
  ns *= (getBoundingBallRadius()/100.0);
@@ -1890,6 +1897,8 @@ Vertex *Basic_TMesh::splitEdge(Edge *e, Point *p, bool copy_mask)
   if (nt1 != NULL) nt1->mask = e->t1->mask;
   if (nt2 != NULL) nt2->mask = e->t2->mask;
  }
+ if (nt1 != NULL) nt1->origin = e->t1->origin;
+ if (nt2 != NULL) nt2->origin = e->t2->origin;
 
  V.appendHead(v);
  E.appendHead(ne);
@@ -1918,6 +1927,7 @@ Vertex *Basic_TMesh::splitTriangle(Triangle *t, Point *p, bool copy_mask)
  Edge *ne3 = newEdge(v, v3);
  Triangle *nt1 = newTriangle(ne2, t->e3,ne3);
  Triangle *nt2 = newTriangle(ne3, t->e1,ne1);
+ nt1->origin = nt2->origin = t->origin;
  t->e3->replaceTriangle(t, nt1);
  t->e1->replaceTriangle(t, nt2);
  t->replaceEdge(t->e3, ne2);
@@ -1958,9 +1968,9 @@ void Basic_TMesh::printReport()
  eulerUpdate();
 
  TMesh::info("*** Basic_TMesh Report ***\n");
- TMesh::info("V: %d\n",V.numels());
- TMesh::info("E: %d\n",E.numels());
- TMesh::info("T: %d\n",T.numels());
+ TMesh::info("V: %" PRId64 "\n",V.numels());
+ TMesh::info("E: %" PRId64 "\n",E.numels());
+ TMesh::info("T: %" PRId64 "\n",T.numels());
 
  TMesh::info("Boundary: %d components.\n",boundaries());
  TMesh::info("Handles: %d.\n",handles());
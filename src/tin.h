@@ -77,6 +77,11 @@ class Basic_TMesh
 
 		void *info;		//! Generic information attached to this mesh
 
+		//! If positive, hole filling stops before the mesh exceeds this number of
+		//! triangles and sets 'max_triangles_reached'.
+		int64_t max_triangles;
+		bool max_triangles_reached;
+
 		/////////////////////////////////////////////////////////////////////////////
 		//
 		// Constructors/Destructor (Implemented in "MESH_STRUCTURE/io.cpp")
@@ -160,7 +165,7 @@ class Basic_TMesh
 		int loadSTL(const char *);		//!< Loads STL
 
 		int cutAndStitch();	//!< Convert to manifold
-		Triangle * CreateIndexedTriangle(ExtVertex **, int, int, int);
+		Triangle * CreateIndexedTriangle(ExtVertex **, int64_t, int64_t, int64_t);
 		TMESH_VIRTUAL Triangle * CreateTriangleFromVertices(ExtVertex *, ExtVertex *, ExtVertex *);
 
 		//! This function approximates the vertex coordinates with the values
@@ -334,19 +339,19 @@ class Basic_TMesh
 		void removeTriangle(Triangle *t) { unlinkTriangle(t); removeUnlinkedElements(); }
 
 		//! Removes all the unlinked triangles from List T. Returns the number of removed triangles. O(N).
-		int removeTriangles();
+		int64_t removeTriangles();
 
 		//! Removes all the unlinked edges from List E. Returns the number of removed edges. O(N).
-		int removeEdges();
+		int64_t removeEdges();
 
 		//! Removes all the unlinked vertices from List V. Returns the number of removed vertices. O(N).
-		int removeVertices();
+		int64_t removeVertices();
 
 		//! Removes all the unlinked elements from the lists. Returns the number of removed elements. O(N).
-		int removeUnlinkedElements() { return removeTriangles() + removeEdges() + removeVertices(); }
+		int64_t removeUnlinkedElements() { return removeTriangles() + removeEdges() + removeVertices(); }
 
 		//! Removes all the vertices that can be deleted without changing the geometric realization. O(N).
-		int removeRedundantVertices();
+		int64_t removeRedundantVertices();
 
 		/////////////////////////////////////////////////////////////////////////////
 		//
@@ -604,7 +609,7 @@ class Basic_TMesh
 
 		//! Removes all connected components but the one having most triangles.
 		//! Returns the number of components removed.
-		int       removeSmallestComponents();
+		int64_t   removeSmallestComponents();
 
 		//! Checks that triangles are consistently oriented and, if they are not,
 		//! invert some of them to achieve an overall consistency. If the mesh is
@@ -618,11 +623,11 @@ class Basic_TMesh
 
 		//! Detect singular vertices and duplicte them. Return number of singular
 		//! vertices being duplicated.
-		int       duplicateNonManifoldVertices();
+		int64_t   duplicateNonManifoldVertices();
 
 		//! Remove redundant triangles (i.e. having the same vertices as others)
 		//! and return their number.
-		int       removeDuplicatedTriangles();
+		int64_t   removeDuplicatedTriangles();
 
 		//! Check the mesh connectivity. If everything is fine NULL is returned,
 		//! otherwise an error string is returned.
@@ -655,7 +660,7 @@ class Basic_TMesh
 		//! The absolute value of the integer returned is the number of
 		//! collapses performed; the return value is negative if some
 		//! degenerate triangles could not be resolved.
-		int removeDegenerateTriangles();
+		int64_t removeDegenerateTriangles();
 
 		//! Calls 'removeDegenerateTriangles()' and, if some degeneracies remain,
 		//! removes them and fills the resulting holes. Then tries again and, if
@@ -669,14 +674,17 @@ class Basic_TMesh
 		//! If the patches still produce intersections, iterates again on a larger
 		//! neighborhood. Tries up to max_iters times before giving up. Returns
 		//! true only if all the intersections could be removed.
-		bool strongIntersectionRemoval(int max_iters);
+		//! 'tris_per_cell' and 'max_cells' are passed to selectIntersectingTriangles().
+		bool strongIntersectionRemoval(int max_iters, UINT16 tris_per_cell = 50, int max_cells = 0);
 
 		//! Iteratively call strongDegeneracyRemoval and strongIntersectionRemoval
 		//! to produce an eventually clean mesh without degeneracies and intersections.
 		//! The two aforementioned methods are called up to max_iter times and
 		//! each of them is called using 'inner_loops' as a parameter.
 		//! Returns true only if the mesh could be completely cleaned.
-		bool meshclean(int max_iters = 10, int inner_loops = 3);
+		//! 'tris_per_cell' and 'max_cells' are passed to selectIntersectingTriangles().
+		bool meshclean(int max_iters = 10, int inner_loops = 3, UINT16 tris_per_cell = 50,
+		               int max_cells = 0);
 
 		//! Removes overlapping triangles and return their number.
 		int removeOverlappingTriangles();
@@ -692,7 +700,12 @@ class Basic_TMesh
 		//! in most cases.
 		//! if 'justproper' is true, coincident edges and vertices are not regarded
 		//! as intersections even if they are not common subsimplexes.
-		int selectIntersectingTriangles(UINT16 tris_per_cell = 50, bool justproper = false);
+		//! 'max_cells' bounds the number of cell subdivisions (DI_MAX_NUMBER_OF_CELLS
+		//! if not positive). If 'tris_per_cell' is 0, both are chosen from the size
+		//! of the triangle bounding boxes and a sampled count of their overlaps, and
+		//! a subdivision is undone when most triangles straddle the cut.
+		int selectIntersectingTriangles(UINT16 tris_per_cell = 50, bool justproper = false,
+		                                int max_cells = 0);
 
 
 		//! This is as coordBackApproximation() but it also checks for
@@ -702,7 +715,7 @@ class Basic_TMesh
 
 		//! Removes all the connected components whose area is less than 'epsilon'.
 		//! Returns the number of components removed.
-		int       removeSmallestComponents(double epsilon);
+		int64_t   removeSmallestComponents(double epsilon);
 
 
 		/////////////////////////////////////////////////////////////////////////////
@@ -741,13 +754,27 @@ class Basic_TMesh
 		//! is true, adds inner vertices to reproduce the sampling density
 		//! of the surroundings. Returns number of holes patched.
 		//! If 'nbe' is 0 (default), all the holes are patched.
-		int fillSmallBoundaries(int nbe = 0, bool refine = true);
+		//! 'target_length' and 'density_scale' are passed to refineSelectedHolePatches().
+		//! If 'max_new_triangles' is positive, at most that many triangles are added
+		//! to each hole, unless its initial triangulation alone is larger.
+		//! If 'patch_sizes' is not NULL, the number of triangles added to each hole
+		//! is written to it, and it must have room for one value per boundary vertex.
+		int64_t fillSmallBoundaries(int64_t nbe = 0, bool refine = true, double target_length = 0,
+		                            double density_scale = 1, int64_t max_new_triangles = 0,
+		                            int64_t *patch_sizes = NULL);
 
 		//! Takes a selected region and inserts inner vertices to reproduce the
 		//! sampling density of the surroundings. If 't0' is not NULL, only the
 		//! selected region containing 't0' is refined. Returns the number of
 		//! vertices inserted.
-		TMESH_VIRTUAL int refineSelectedHolePatches(Triangle *t0 =NULL);
+		//! If 'target_length' is positive, it replaces the edge length of the
+		//! surroundings. The edge length is divided by sqrt('density_scale') so that
+		//! the sampling density scales with it. If 'max_new_triangles' is positive
+		//! and the refinement is expected to add more triangles, the edge length is
+		//! increased to fit and the refinement stops once the limit is reached.
+		TMESH_VIRTUAL int refineSelectedHolePatches(Triangle *t0 =NULL, double target_length = 0,
+		                                            double density_scale = 1,
+		                                            int64_t max_new_triangles = 0);
 
 		//! Retriangulates the vertex neghborhood based on heuristics.
 		int retriangulateVT(Vertex *);
@@ -784,6 +811,12 @@ class Basic_TMesh
 #define IS_SHARPEDGE(a)    (IS_BIT((a),7))
 #define UNTAG_SHARPEDGE(a) (UNMARK_BIT((a),7))
 
+//! Locked vertices must not be moved or removed. Hole filling skips
+//! the boundary loops passing through them.
+#define MARK_LOCKED(a)   (MARK_BIT((a),4))
+#define IS_LOCKED(a)     (IS_BIT((a),4))
+#define UNMARK_LOCKED(a) (UNMARK_BIT((a),4))
+
 
 	// Errors from loading
 
@@ -47,7 +47,7 @@ const char *TMesh::app_authors = NULL;
 const char *TMesh::app_url = NULL;
 const char *TMesh::app_maillist = NULL;
 const char *TMesh::filename = NULL;
-bool TMesh::quiet = false;
+thread_local bool TMesh::quiet = false;
 
 void TMesh::init(void (*dm)(const char *, int))
 {
@@ -68,7 +68,7 @@ void TMesh::init(void (*dm)(const char *, int))
 
 void TMesh::error(const char *msg, ...)
 {
- static char fmt[2048], fms[4096];
+ static thread_local char fmt[2048], fms[4096];
  va_list ap;
  va_start(ap, msg);
  strcpy(fmt,"\nERROR- ");
@@ -89,7 +89,7 @@ void TMesh::error(const char *msg, ...)
 void TMesh::warning(const char *msg, ...)
 {
  if (quiet) return;
- static char fmt[2048], fms[4096];
+ static thread_local char fmt[2048], fms[4096];
  va_list ap;
  va_start(ap, msg);
  strcpy(fmt,"WARNING- ");
@@ -109,7 +109,7 @@ void TMesh::warning(const char *msg, ...)
 void TMesh::info(const char *msg, ...)
 {
  if (quiet) return;
- static char fmt[2048], fms[4096];
+ static thread_local char fmt[2048], fms[4096];
  va_list ap;
  va_start(ap, msg);
  strcpy(fmt,"INFO- ");
@@ -138,10 +138,10 @@ void TMesh::begin_progress()
 void TMesh::report_progress(const char *msg, ...)
 {
  if (quiet) return;
- static char fmt[2048] = "\r";
- static char fms[4096];
+ static thread_local char fmt[2048] = "\r";
+ static thread_local char fms[4096];
  static char rotating_bar[5] = "-\\|/";
- static unsigned char wc=0;
+ static thread_local unsigned char wc=0;
 
  if (msg == NULL)
  {
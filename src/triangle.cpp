@@ -42,6 +42,7 @@ extern "C" double orient2d(double *, double *, double *);
 Triangle::Triangle(){
  mask = 0;
  info = NULL;
+ origin = -1;
 }
 
 Triangle::Triangle(Edge *a, Edge *b, Edge *c)
@@ -51,6 +52,7 @@ Triangle::Triangle(Edge *a, Edge *b, Edge *c)
  e3 = c;
  mask = 0;
  info = NULL;
+ origin = -1;
 }
 
 
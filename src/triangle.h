@@ -53,6 +53,7 @@ class Triangle
  Edge *e1, *e2, *e3; 		//!< Edges of the triangle
  void *info;			//!< Further information
  unsigned char mask;		//!< bit-mask for marking purposes
+ int64_t origin;		//!< Index of the input triangle this one derives from, -1 if created by the algorithms
 
  Triangle();
  Triangle(Edge *, Edge *, Edge *);		//!< Constructor
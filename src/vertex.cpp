@@ -43,6 +43,7 @@ Vertex::Vertex() : Point()
 {
  e0 = NULL;
  mask = 0;
+ origin = -1;
 }
 
 
@@ -50,6 +51,7 @@ Vertex::Vertex(const coord& a, const coord& b, const coord& c) : Point(a,b,c)
 {
  e0 = NULL;
  mask = 0;
+ origin = -1;
 }
 
 
@@ -57,6 +59,7 @@ Vertex::Vertex(const Point *p) : Point(p->x, p->y, p->z)
 {
  e0 = NULL;
  mask = 0;
+ origin = -1;
 }
 
 
@@ -64,6 +67,7 @@ Vertex::Vertex(const Point& p) : Point(p.x, p.y, p.z)
 {
  e0 = NULL;
  mask = 0;
+ origin = -1;
 }
 
 ///////////////////// Destructor ///////////////////////
@@ -186,18 +190,125 @@ List *Vertex::VT() const
  return vt;
 }
 
+/////////////// VE, VV and VT relations without allocations ///////////////
+//
+// The elements on the left of e0 are appended first. If the vertex is on the
+// boundary, those on its right are appended next and moved to the head, so
+// that the order is the same as above.
+
+void Vertex::VE(VertexFan<Edge>& ve) const
+{
+ Triangle *t;
+ Edge *e;
+ Vertex *v;
+ int nl;
+
+ ve.removeAll();
+ if (e0 == NULL) return;
+
+ e = e0;
+ do
+ {
+  ve.appendTail(e);
+  v = e->oppositeVertex(this);
+  t = e->leftTriangle(this);
+  if (t == NULL) break;
+  e = t->oppositeEdge(v);
+ } while (e != e0);
+
+ if (e == e0 && ve.numels() > 1) return;
+
+ nl = ve.numels();
+ e = e0;
+ while ((t = e->rightTriangle(this)) != NULL)
+ {
+  v = e->oppositeVertex(this);
+  e = t->oppositeEdge(v);
+  if (e == e0) break;
+  ve.appendTail(e);
+ }
+ ve.reverseTailToHead(nl);
+}
+
+void Vertex::VV(VertexFan<Vertex>& vv) const
+{
+ Triangle *t;
+ Edge *e;
+ Vertex *v;
+ int nl;
+
+ vv.removeAll();
+ if (e0 == NULL) return;
+
+ e = e0;
+ do
+ {
+  v = e->oppositeVertex(this);
+  vv.appendTail(v);
+  t = e->leftTriangle(this);
+  if (t == NULL) break;
+  e = t->oppositeEdge(v);
+ } while (e != e0);
+
+ if (e == e0 && vv.numels() > 1) return;
+
+ nl = vv.numels();
+ e = e0;
+ while ((t = e->rightTriangle(this)) != NULL)
+ {
+  v = e->oppositeVertex(this);
+  e = t->oppositeEdge(v);
+  if (e == e0) break;
+  vv.appendTail(e->oppositeVertex(this));
+ }
+ vv.reverseTailToHead(nl);
+}
+
+void Vertex::VT(VertexFan<Triangle>& vt) const
+{
+ Triangle *t;
+ Edge *e;
+ Vertex *v;
+ int nl;
+
+ vt.removeAll();
+ if (e0 == NULL) return;
+
+ e = e0;
+ do
+ {
+  v = e->oppositeVertex(this);
+  t = e->leftTriangle(this);
+  if (t == NULL) break;
+  vt.appendTail(t);
+  e = t->oppositeEdge(v);
+ } while (e != e0);
+
+ if (e == e0 && vt.numels() > 1) return;
+
+ nl = vt.numels();
+ e = e0;
+ do
+ {
+  v = e->oppositeVertex(this);
+  t = e->rightTriangle(this);
+  if (t == NULL) break;
+  vt.appendTail(t);
+  e = t->oppositeEdge(v);
+ } while (e != e0);
+ vt.reverseTailToHead(nl);
+}
+
 /////////////// Returns the edge (this,v2) ////////////////
 
 Edge *Vertex::getEdge(const Vertex *v2) const
 {
- List *ve = VE();
- Node *m;
- Edge *e;
+ VertexFan<Edge> ve;
+ VE(ve);
 
- FOREACHVEEDGE(ve, e, m)
-  if (e->oppositeVertex(this) == v2) {delete(ve); return e;}
+ for (int i = 0; i < ve.numels(); i++)
+  if (ve[i]->oppositeVertex(this) == v2) return ve[i];
 
- delete(ve);
  return NULL;
 }
 
@@ -206,10 +317,9 @@ Edge *Vertex::getEdge(const Vertex *v2) const
 
 int Vertex::valence() const
 {
- List *ve = VE();
- int n = ve->numels();
- delete(ve);
- return n;
+ VertexFan<Edge> ve;
+ VE(ve);
+ return ve.numels();
 }
 
 /////////////// Checks the boundary ////////////////////////////
@@ -305,34 +415,31 @@ Vertex *Vertex::prevOnBoundary() const
 //// TRUE iff vertex neighborhood is a flat disk. Always FALSE for boundary vertices.
 bool Vertex::isFlat() const
 {
-	List *ve = VE();
-	Node *n;
-	Edge *e;
+	VertexFan<Edge> ve;
+	VE(ve);
 
-	FOREACHVEEDGE(ve, e, n)
-	if (e->getConvexity() != 0) { delete ve; return false; }
+	for (int i = 0; i < ve.numels(); i++)
+	if (ve[i]->getConvexity() != 0) return false;
 
-	delete ve;
 	return true;
 }
 
 //// TRUE iff vertex neighborhood is made of either two flat halfdisks or one flat halfdisk on a rectilinear boundary.
 bool Vertex::isDoubleFlat(Edge **e1, Edge **e2) const
 {
-	List *ve = VE();
-	Node *n;
+	VertexFan<Edge> ve;
 	Edge *e;
 	int nne = 0;
 	*e1 = *e2 = NULL;
 
-	FOREACHVEEDGE(ve, e, n)
-	if (e->getConvexity() != 0)
+	VE(ve);
+	for (int i = 0; i < ve.numels(); i++)
+	if ((e = ve[i])->getConvexity() != 0)
 	{
-		if (++nne > 2) { delete ve; return false; }
+		if (++nne > 2) return false;
 		else if (nne == 1) *e1 = e;
 		else *e2 = e;
 	}
-	delete ve;
 	if (nne == 0) return true; // This means that vertex is flat
 	if (nne == 1) return false; // This should not be possible, but just in case...
 	return (!((*e1)->oppositeVertex(this)->exactMisalignment(this, (*e2)->oppositeVertex(this))));
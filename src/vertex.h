@@ -38,6 +38,64 @@
 namespace T_MESH
 {
 
+class Edge;
+class Triangle;
+
+//! Number of elements a VertexFan stores before allocating memory.
+#define VERTEX_FAN_SIZE 32
+
+//! Elements around a vertex.
+
+//! A fan is filled by the VE(), VT() and VV() methods of Vertex taking it as
+//! a parameter, and holds the same elements in the same order as the List
+//! returned by the other versions of these methods. Unlike a List, the
+//! elements are kept in an array within the fan, so that a fan declared on
+//! the stack allocates no memory unless the vertex has more than
+//! VERTEX_FAN_SIZE neighbors. Filling a fan again replaces its elements, so
+//! that a single fan can be reused across a loop over the vertices.
+
+template <class T> class VertexFan
+{
+ T *buf[VERTEX_FAN_SIZE];
+ T **els;
+ int n, maxels;
+
+ void reverse(int i, int j) { for (j--; i < j; i++, j--) p_swap((void **)(els + i), (void **)(els + j)); }
+
+ public :
+
+ VertexFan() : els(buf), n(0), maxels(VERTEX_FAN_SIZE) {}
+ ~VertexFan() { if (els != buf) delete[] els; }
+ VertexFan(const VertexFan &) = delete;
+ VertexFan &operator=(const VertexFan &) = delete;
+
+ int numels() const { return n; }				//!< Number of elements
+ T *operator[](int i) const { return els[i]; }	//!< Element in position 'i'
+ T *const *begin() const { return els; }
+ T *const *end() const { return els + n; }
+
+ //! TRUE iff 'e' is in the fan
+ bool contains(const T *e) const { for (int i = 0; i < n; i++) if (els[i] == e) return true; return false; }
+
+ void removeAll() { n = 0; }	//!< Removes all the elements
+
+ //! Appends 'e' to the fan
+ void appendTail(T *e)
+ {
+  if (n == maxels)
+  {
+   T **nels = new T *[maxels *= 2];
+   for (int i = 0; i < n; i++) nels[i] = els[i];
+   if (els != buf) delete[] els;
+   els = nels;
+  }
+  els[n++] = e;
+ }
+
+ //! Moves the elements from position 'i' on to the head of the fan, in reverse order
+ void reverseTailToHead(int i) { reverse(0, n); reverse(n - i, n); }
+};
+
 //! Vertex of a Basic_TMesh
 
 //! This class represents a vertex of a manifold and oriented triangulation.
@@ -53,6 +111,7 @@ class Vertex : public Point
  public :
  class Edge *e0;			//!< One of the incident edges
  unsigned char mask;			//!< bit-mask for marking purposes
+ int64_t origin;			//!< Index of the input vertex this one derives from, -1 if created by the algorithms
 
  //! Creates a new vertex with coordinates (0,0,0).
  Vertex();
@@ -98,6 +157,12 @@ class Vertex : public Point
  //! boundary triangle.
  List *VT() const;
 
+ //! Fills 've', 'vt' or 'vv' with the elements returned by VE(), VT() or VV()
+ //! respectively, without allocating a List.
+ void VE(VertexFan<Edge>& ve) const;
+ void VT(VertexFan<Triangle>& vt) const;
+ void VV(VertexFan<Vertex>& vv) const;
+
  //! Returns the edge connecting this vertex to 'v'. NULL if such an edge does not exist.
  class Edge *getEdge(const Vertex *v) const;
  int valence() const;				//!< Returns the number of incident edges
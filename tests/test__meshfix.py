@@ -36,6 +36,116 @@ def test_load_array() -> None:
     assert f.shape == f_out.shape
 
 
+def test_int64_indices() -> None:
+    f = bunny._connectivity_array.reshape(-1, 3)
+    ref = _meshfix.PyTMesh()
+    ref.set_quiet(True)
+    ref.load_array(bunny.points, f.astype(np.int32))
+    faces = ref.return_faces()
+    assert faces.dtype == np.int32
+
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_array(bunny.points, f.astype(np.int64))
+    assert np.array_equal(mfix.return_faces(), faces)
+
+    _, faces64 = mfix.return_arrays(int64=True)
+    assert faces64.dtype == np.int64
+    assert np.array_equal(faces64, faces)
+
+    _, f_out = _meshfix.clean_from_arrays(bunny.points, f.astype(np.int64), int64=True)
+    assert f_out.dtype == np.int64
+
+
+def test_return_arrays_release() -> None:
+    f = bunny._connectivity_array.reshape(-1, 3).astype(np.int32)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_array(bunny.points, f)
+    v_ref, f_ref = mfix.return_arrays()
+
+    v_out, f_out = mfix.return_arrays(release=True)
+    assert np.array_equal(v_out, v_ref)
+    assert np.array_equal(f_out, f_ref)
+    assert mfix.n_points == 0
+    assert mfix.n_faces == 0
+
+
+def test_return_arrays_out(tmp_path: Path) -> None:
+    f = bunny._connectivity_array.reshape(-1, 3).astype(np.int32)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_array(bunny.points, f)
+    v_ref, f_ref = mfix.return_arrays()
+    points_shape, faces_shape = mfix.output_shape()
+    assert points_shape == v_ref.shape
+    assert faces_shape == f_ref.shape
+
+    v_buf = np.empty(points_shape)
+    f_buf = np.empty(faces_shape, dtype=np.int64)
+    v_out, f_out = mfix.return_arrays(out_points=v_buf, out_faces=f_buf)
+    assert v_out is v_buf
+    assert f_out is f_buf
+    assert np.array_equal(v_out, v_ref)
+    assert np.array_equal(f_out, f_ref)
+
+    readonly = np.empty(points_shape)
+    readonly.flags.writeable = False
+    with pytest.raises(ValueError, match="writable"):
+        mfix.return_arrays(out_points=readonly)
+    with pytest.raises(ValueError, match="writable"):
+        mfix.return_arrays(out_points=np.empty(points_shape, dtype=np.float32))
+    with pytest.raises(ValueError, match="shape"):
+        mfix.return_arrays(out_faces=np.empty((faces_shape[0] + 1, 3), dtype=np.int32))
+    with pytest.raises(ValueError, match="int64"):
+        mfix.return_arrays(int64=False, out_faces=f_buf)
+
+    # a memory-mapped file is written while the mesh is released
+    memmap = np.lib.format.open_memmap(
+        tmp_path / "points.npy", mode="w+", dtype=np.float64, shape=points_shape
+    )
+    v_out, f_out = mfix.return_arrays(release=True, out_points=memmap)
+    assert v_out is memmap
+    assert f_out.dtype == np.int32
+    memmap.flush()
+    assert np.array_equal(np.load(tmp_path / "points.npy"), v_ref)
+    assert np.array_equal(f_out, f_ref)
+    assert mfix.n_points == 0
+
+
+def test_clean_from_arrays_out() -> None:
+    f = bunny._connectivity_array.reshape(-1, 3).astype(np.int32)
+    v_ref, f_ref = _meshfix.clean_from_arrays(bunny.points, f)
+
+    buffers = []
+
+    def out(n_points: int, n_faces: int) -> tuple[np.ndarray, np.ndarray]:
+        buffers.extend([np.empty((n_points, 3)), np.empty((n_faces, 3), dtype=np.int64)])
+        return tuple(buffers)
+
+    v_out, f_out, prov = _meshfix.clean_from_arrays(bunny.points, f, provenance=True, out=out)
+    assert v_out is buffers[0]
+    assert f_out is buffers[1]
+    assert np.array_equal(v_out, v_ref)
+    assert np.array_equal(f_out, f_ref)
+    assert len(prov["vertex_origin"]) == len(v_out)
+
+    # the input arrays of a clean mesh are copied
+    sphere = pv.Sphere()
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+    buffers.clear()
+    v_out, f_out = _meshfix.clean_from_arrays(v, f, skip_if_clean=True, out=out)
+    assert v_out is buffers[0]
+    assert np.array_equal(v_out, v)
+    assert np.array_equal(f_out, f)
+
+    with pytest.raises(ValueError, match="tuple"):
+        _meshfix.clean_from_arrays(v, f, out=lambda n_points, n_faces: None)
+    with pytest.raises(ValueError, match="delta"):
+        _meshfix.clean_from_arrays(v, f, delta=True, out=out)
+
+
 def test_load_and_save_file(tmp_path: Path) -> None:
     mfix = _meshfix.PyTMesh()
     mfix.set_quiet(True)
@@ -54,6 +164,36 @@ def test_load_and_save_file(tmp_path: Path) -> None:
     assert new_bunny.n_points == v.shape[0]
 
 
+def test_load_stl_welds_vertices(tmp_path: Path) -> None:
+    # STL files store each triangle with its own vertices, welded on loading
+    faces = bunny._connectivity_array.reshape(-1, 3)
+    soup = pv.PolyData.from_regular_faces(
+        bunny.points[faces].reshape(-1, 3), np.arange(faces.size).reshape(-1, 3)
+    )
+    filename = str(tmp_path / "soup.stl")
+    soup.save(filename)
+
+    indexed = _meshfix.PyTMesh()
+    indexed.set_quiet(True)
+    indexed.load_array(bunny.points, faces)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_file(filename)
+    assert mfix.n_points == indexed.n_points
+    assert mfix.n_faces == indexed.n_faces
+    assert mfix.n_boundaries == indexed.n_boundaries
+
+    # -0 and 0 are the same coordinate
+    points = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [-0.0, 0, 0], [1, 1, 0], [-0.0, 1, 0]])
+    filename = str(tmp_path / "square.stl")
+    pv.PolyData.from_regular_faces(points, [[0, 1, 2], [3, 4, 5]]).save(filename)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_file(filename)
+    assert mfix.n_points == 4
+    assert mfix.n_boundaries == 1
+
+
 def test_clean_from_file() -> None:
     mfix = _meshfix.PyTMesh()
     mfix.set_quiet(1)
@@ -103,6 +243,90 @@ def test_fill_small_boundaries() -> None:
     assert mfix.n_boundaries < n_init_boundaries
 
 
+def test_fill_holes_bounded() -> None:
+    def load() -> _meshfix.PyTMesh:
+        mfix = _meshfix.PyTMesh()
+        mfix.set_quiet(1)
+        mfix.load_file(examples.bunny_scan)
+        return mfix
+
+    mfix = load()
+    n_faces = mfix.n_faces
+    sizes = mfix.fill_holes()
+    assert sizes.dtype == np.int64
+    assert sizes.sum() == mfix.n_faces - n_faces
+
+    # each patch is within the limit, unless its initial triangulation is not
+    mfix = load()
+    n_edges = mfix.boundary_loops()["n_edges"]
+    bounded = mfix.fill_holes(max_new_triangles=50)
+    assert bounded.size == sizes.size
+    assert bounded.sum() < sizes.sum()
+    assert bounded.max() <= max(50, n_edges.max() - 2)
+
+    coarse = load().fill_holes(density_scale=0.25)
+    fine = load().fill_holes(density_scale=4.0)
+    assert coarse.sum() < sizes.sum() < fine.sum()
+
+    with pytest.raises(ValueError, match="density_scale"):
+        mfix.fill_holes(density_scale=0)
+
+
+def test_boundary_loops() -> None:
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(1)
+    mfix.load_file(examples.bunny_scan)
+    points = mfix.return_points()
+    loops = mfix.boundary_loops()
+
+    indices, offsets = loops["indices"], loops["offsets"]
+    assert loops["perimeter"].size == mfix.n_boundaries
+    assert offsets[0] == 0 and offsets[-1] == indices.size
+    assert np.array_equal(np.diff(offsets), loops["n_edges"])
+    assert loops["closed"].all()
+    assert np.unique(indices).size == indices.size
+
+    # consecutive loop points are joined by boundary edges
+    boundary = pv.PolyData(examples.bunny_scan).extract_feature_edges(
+        boundary_edges=True, feature_edges=False, manifold_edges=False
+    )
+    assert boundary.n_cells == indices.size
+    for i in range(loops["perimeter"].size):
+        loop_points = points[indices[offsets[i] : offsets[i + 1]]]
+        segments = np.roll(loop_points, -1, axis=0) - loop_points
+        assert np.isclose(np.linalg.norm(segments, axis=1).sum(), loops["perimeter"][i])
+        bounds = np.column_stack((loop_points.min(axis=0), loop_points.max(axis=0))).ravel()
+        assert np.allclose(loops["bounds"][i], bounds)
+
+    mfix.fill_small_boundaries()
+    assert mfix.boundary_loops()["perimeter"].size == mfix.n_boundaries
+
+
+def test_boundary_loops_bow_tie() -> None:
+    # two fans of two triangles touching at the origin, whose boundaries
+    # cross there. The vertex is split when loading, leaving two loops.
+    v = np.array(
+        [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [-1, 0, 0], [-1, -1, 0], [0, -1, 0]],
+        dtype=np.float64,
+    )
+    f = np.array([[0, 1, 2], [0, 2, 3], [0, 4, 5], [0, 5, 6]], dtype=np.int32)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_array(v, f)
+    points = mfix.return_points()
+
+    loops = mfix.boundary_loops()
+    indices, offsets = loops["indices"], loops["offsets"]
+    assert loops["closed"].all()
+    assert np.array_equal(loops["n_edges"], [4, 4])
+    for i in range(2):
+        loop_points = points[indices[offsets[i] : offsets[i + 1]]]
+        assert (loop_points == 0).all(axis=1).sum() == 1
+        segments = np.roll(loop_points, -1, axis=0) - loop_points
+        assert np.isclose(np.linalg.norm(segments, axis=1).sum(), loops["perimeter"][i])
+    assert np.allclose(loops["perimeter"], 4)
+
+
 def test_remove_components() -> None:
     mfix = _meshfix.PyTMesh()
     mfix.set_quiet(1)
@@ -117,6 +341,100 @@ def test_select_intersecting_triangles() -> None:
     faces = mfix.select_intersecting_triangles()
     assert faces.any()
 
+    # the subdivision only affects the speed of the detection
+    for tris_per_cell in ["auto", 8]:
+        mfix = _meshfix.PyTMesh()
+        mfix.set_quiet(1)
+        mfix.load_file(examples.bunny_scan)
+        assert np.array_equal(mfix.select_intersecting_triangles(tris_per_cell), faces)
+
+    with pytest.raises(ValueError, match="tris_per_cell"):
+        mfix.select_intersecting_triangles("fast")
+    with pytest.raises(ValueError, match="tris_per_cell"):
+        mfix.select_intersecting_triangles(0)
+
+
+def test_clean_auto_tris_per_cell() -> None:
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(1)
+    mfix.load_file(examples.bunny_scan)
+    assert mfix.clean(tris_per_cell="auto")
+    assert not mfix.select_intersecting_triangles("auto").size
+
+
+def test_faces_in_region() -> None:
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(1)
+    mfix.load_file(examples.bunny_scan)
+    assert mfix.faces_in_region(bounds=bunny.bounds).all()
+    assert not mfix.faces_in_region(bounds=[10, 11, 10, 11, 10, 11]).any()
+
+    mask = mfix.faces_in_region(center=bunny.points[0], radius=3.0)
+    assert mask.shape == (mfix.n_faces,)
+    assert 0 < mask.sum() < mfix.n_faces
+    with pytest.raises(RuntimeError, match="radius must be positive"):
+        mfix.faces_in_region(center=bunny.points[0])
+
+
+def test_clean_region() -> None:
+    v = bunny.points
+    f = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(1)
+    mfix.load_array(v, f)
+    n_intersecting = len(mfix.select_intersecting_triangles())
+    intersecting = mfix.select_intersecting_triangles().ravel()[:n_intersecting]
+    assert n_intersecting
+
+    mask = np.zeros(mfix.n_faces, dtype=bool)
+    mask[intersecting] = True
+    is_clean, changed = mfix.clean_region(mask)
+    assert is_clean
+    assert 0 < changed.size < mfix.n_faces // 10
+    assert not len(mfix.select_intersecting_triangles())
+
+    # faces outside of the repaired region are untouched
+    points, faces = mfix.return_arrays()
+    face_origin = mfix.return_provenance()["face_origin"]
+    unchanged = np.setdiff1d(np.arange(len(faces)), changed)
+    assert (face_origin[unchanged] >= 0).all()
+    assert np.allclose(
+        points[faces[unchanged]].sum(axis=1),
+        v[f[face_origin[unchanged]]].sum(axis=1),
+        rtol=0,
+        atol=1e-9,
+    )
+
+    # the spliced mesh is consistent
+    mfix_out = _meshfix.PyTMesh()
+    mfix_out.set_quiet(1)
+    mfix_out.load_array(points, faces)
+    assert mfix_out.n_faces == len(faces)
+    assert mfix_out.n_points == len(points)
+
+    with pytest.raises(RuntimeError, match="one entry per face"):
+        mfix.clean_region(mask[:10])
+
+
+def test_fill_region_boundaries() -> None:
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(1)
+    mfix.load_file(examples.bunny_scan)
+    n_init_boundaries = mfix.n_boundaries
+    n_init_faces = mfix.n_faces
+
+    xmin, xmax, ymin, ymax, zmin, zmax = bunny.bounds
+    mask = mfix.faces_in_region(bounds=[xmin, (xmin + xmax) / 2, ymin, ymax, zmin, zmax])
+    n_filled, new_faces = mfix.fill_region_boundaries(mask)
+    assert n_filled
+    assert new_faces.size == mfix.n_faces - n_init_faces
+    assert 0 < n_init_boundaries - mfix.n_boundaries < n_init_boundaries
+
+    # nothing is filled without a region
+    n_filled, new_faces = mfix.fill_region_boundaries(np.zeros(mfix.n_faces, dtype=bool))
+    assert not n_filled
+    assert not new_faces.size
+
 
 def test_clean_from_file(tmp_path: Path) -> None:
     outfile = str(tmp_path / "tmp.ply")
@@ -132,3 +450,405 @@ def test_native_example(tmp_path) -> None:
     outfile = tmp_path / "tmp2.ply"
     examples.native(str(outfile))
     assert outfile.exists()
+
+
+def test_return_provenance() -> None:
+    v = bunny.points
+    f = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_array(v, f)
+    mfix.fill_small_boundaries()
+    v_out, f_out = mfix.return_arrays()
+    prov = mfix.return_provenance()
+
+    vorigin = prov["vertex_origin"]
+    assert vorigin.shape == (v_out.shape[0],)
+    kept = vorigin >= 0
+    assert np.array_equal(v_out[kept], v[vorigin[kept]])
+    assert (~kept).any()  # hole filling adds vertices
+
+    forigin = prov["face_origin"]
+    assert forigin.shape == (f_out.shape[0],)
+    kept = forigin >= 0
+    assert (~kept).any()
+    # faces that were kept reference the same input points
+    assert np.allclose(v_out[f_out[kept]].sum(axis=1), v[f[forigin[kept]]].sum(axis=1))
+
+    parents, weights = prov["vertex_parents"], prov["vertex_weights"]
+    assert parents.shape == weights.shape == (v_out.shape[0], 3)
+    assert np.allclose(weights.sum(axis=1), 1)
+    assert (parents[:, 0] >= 0).all()
+    assert np.array_equal(parents[vorigin >= 0, 0], vorigin[vorigin >= 0])
+
+    # interpolating the coordinates lands new points near their patch
+    interp = (v[parents] * weights[..., None]).sum(axis=1)
+    new = vorigin < 0
+    assert np.linalg.norm(interp[new] - v_out[new], axis=1).max() < 0.1 * bunny.length
+
+
+def test_clean_from_arrays_provenance() -> None:
+    v = bunny.points
+    f = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+    v_out, f_out, prov = _meshfix.clean_from_arrays(v, f, provenance=True)
+    assert prov["vertex_origin"].size == v_out.shape[0]
+    assert prov["face_origin"].size == f_out.shape[0]
+
+
+def test_inspect() -> None:
+    sphere = pv.Sphere(theta_resolution=20, phi_resolution=20)
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+    report = _meshfix.inspect(v, f, intersections=True)
+    assert report["n_points"] == len(v)
+    assert report["n_faces"] == len(f)
+    assert report["components"] == 1
+    assert report["intersecting_faces"] == 0
+    assert not any(value for key, value in report.items() if key.endswith(("_edges", "_vertices")))
+    assert not report["duplicate_faces"] and not report["degenerate_faces"]
+    assert _meshfix.inspect(v, f)["intersecting_faces"] is None
+
+    assert _meshfix.inspect(v, f[1:])["boundary_edges"] == 3
+    report = _meshfix.inspect(v, np.vstack((f, f[:1])))
+    assert report["duplicate_faces"] == 1
+    assert report["nonmanifold_edges"] == 3
+    flipped = f.copy()
+    flipped[0] = flipped[0, ::-1]
+    assert _meshfix.inspect(v, flipped)["misoriented_edges"] == 3
+    assert _meshfix.inspect(np.vstack((v, v[:1])), f)["unused_vertices"] == 1
+    report = _meshfix.inspect(v, np.vstack((f, [[0, 0, 1]])))
+    assert report["degenerate_faces"] == 1
+    assert report["boundary_edges"] == 0
+
+    # two spheres touching at a vertex
+    touching = np.vstack((f, np.where(f == 0, 0, f + len(v))))
+    report = _meshfix.inspect(np.vstack((v, v)), touching)
+    assert report["components"] == 2
+    assert report["nonmanifold_vertices"] == 1
+
+    # two overlapping spheres, as found by the intersection detection
+    v2 = np.vstack((v, v + [0.3, 0.1, 0.05]))
+    f2 = np.vstack((f, f + len(v)))
+    report = _meshfix.inspect(v2, f2, intersections=True)
+    tin = _meshfix.PyTMesh()
+    tin.set_quiet(True)
+    tin.load_array(v2, f2)
+    assert report["intersecting_faces"] == len(tin.select_intersecting_triangles(justproper=True))
+
+    # a fan folded over itself at a pole of high valence, whose faces only
+    # intersect the faces sharing the pole
+    sphere = pv.Sphere(theta_resolution=100, phi_resolution=20)
+    v3 = sphere.points.astype(np.float64)
+    f3 = sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+    pole = np.bincount(f3.ravel()).argmax()
+    ring = f3[(f3 == pole).any(axis=1)].ravel()
+    v3[ring[ring != pole][0]] *= [-1, -1, 1]
+    report = _meshfix.inspect(v3, f3, intersections=True)
+    tin = _meshfix.PyTMesh()
+    tin.set_quiet(True)
+    tin.load_array(v3, f3)
+    assert report["intersecting_faces"] > 0
+    assert report["intersecting_faces"] == len(tin.select_intersecting_triangles(justproper=True))
+    assert not _meshfix.is_clean(v3, f3)
+
+    with pytest.raises(ValueError, match="within the point array"):
+        _meshfix.inspect(v, f + 1)
+
+
+def test_clean_from_arrays_skip_if_clean() -> None:
+    sphere = pv.Sphere(theta_resolution=20, phi_resolution=20)
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
+
+    v_out, f_out = _meshfix.clean_from_arrays(v, f, skip_if_clean=True)
+    assert v_out is v
+    assert f_out is f
+    v_out, f_out = _meshfix.clean_from_arrays(v, f, skip_if_clean=True, int64=False)
+    assert v_out is v
+    assert f_out.dtype == np.int32
+    assert np.array_equal(f_out, f)
+
+    _, _, prov = _meshfix.clean_from_arrays(v, f, skip_if_clean=True, provenance=True)
+    assert np.array_equal(prov["vertex_origin"], np.arange(len(v)))
+    assert np.array_equal(prov["face_origin"], np.arange(len(f)))
+    assert np.array_equal(prov["vertex_parents"][:, 0], np.arange(len(v)))
+    removed, new_points, new_faces = _meshfix.clean_from_arrays(
+        v, f, skip_if_clean=True, delta=True
+    )
+    assert removed.size == new_points.size == new_faces.size == 0
+
+    # a mesh with a hole is repaired
+    v_out, f_out = _meshfix.clean_from_arrays(v, f[1:], skip_if_clean=True)
+    assert len(f_out) == len(f)
+    # several components are kept if small components are not removed
+    v2 = np.vstack((v, v + 5))
+    f2 = np.vstack((f, f + len(v)))
+    assert _meshfix.clean_from_arrays(v2, f2, skip_if_clean=True)[0] is not v2
+    v_out, _ = _meshfix.clean_from_arrays(
+        v2, f2, skip_if_clean=True, remove_smallest_components=False
+    )
+    assert v_out is v2
+
+    assert _meshfix.is_clean(v, f)
+    assert not _meshfix.is_clean(v, f[1:])
+    assert _meshfix.is_clean(v2, f2)
+    assert not _meshfix.is_clean(v2, f2, single_component=True)
+    # overlapping spheres intersect
+    assert not _meshfix.is_clean(np.vstack((v, v + 0.2)), f2)
+
+
+def test_memory_usage() -> None:
+    v = bunny.points
+    f = bunny._connectivity_array.reshape(-1, 3)
+    mfix = _meshfix.PyTMesh()
+    usage = mfix.memory_usage()
+    assert usage["total"] == 0
+
+    mfix.load_array(v, f)
+    usage = mfix.memory_usage()
+    for key in ("vertices", "edges", "triangles", "list_nodes", "buffers"):
+        assert usage[key] > 0
+    assert usage["peak"] == usage["total"] + usage["buffers"]
+
+    # the estimate only differs by the number of edges
+    estimate = _meshfix.estimate_memory(len(v), len(f))
+    assert estimate["triangles"] == usage["triangles"]
+    assert estimate["total"] == pytest.approx(usage["total"], rel=0.01)
+    assert estimate["peak"] >= estimate["total"]
+
+    larger = _meshfix.estimate_memory(len(v), len(f), new_faces=10000)
+    assert larger["total"] > estimate["total"]
+    with pytest.raises(ValueError, match="negative"):
+        _meshfix.estimate_memory(-1, 10)
+
+
+def test_memory_limit() -> None:
+    v = bunny.points
+    f = bunny._connectivity_array.reshape(-1, 3)
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    assert mfix.memory_limit is None
+    with pytest.raises(ValueError, match="positive"):
+        mfix.memory_limit = 0
+
+    estimate = _meshfix.estimate_memory(len(v), len(f))
+    mfix.memory_limit = estimate["total"] // 2
+    with pytest.raises(MemoryError, match="Loading the mesh"):
+        mfix.load_array(v, f)
+    assert mfix.n_faces == 0
+
+    # hole filling stops at the limit and keeps the holes filled so far
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.memory_limit = _meshfix.estimate_memory(len(v), len(f), new_faces=1000)["peak"]
+    mfix.load_array(v, f)
+    n_boundaries = mfix.n_boundaries
+    with pytest.raises(MemoryError, match="Filling holes"):
+        mfix.fill_small_boundaries()
+    assert mfix.n_boundaries < n_boundaries
+    assert mfix.memory_usage()["peak"] < 1.01 * mfix.memory_limit
+
+    with pytest.raises(MemoryError):
+        _meshfix.clean_from_arrays(v, f, memory_limit=estimate["total"] // 2)
+    mfix.memory_limit = None
+    assert mfix.memory_limit is None
+
+
+def test_decimate() -> None:
+    sphere = pv.Sphere(theta_resolution=60, phi_resolution=60)
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:]
+    mfix = _meshfix.PyTMesh()
+    mfix.load_array(v, f)
+    n_faces = mfix.n_faces
+
+    n_removed = mfix.decimate(target_reduction=0.75)
+    assert n_removed == n_faces - mfix.n_faces
+    assert mfix.n_faces <= np.ceil(n_faces * 0.25)
+    v_out, f_out = mfix.return_arrays()
+    report = _meshfix.inspect(v_out, f_out, intersections=True)
+    assert report["components"] == 1
+    assert sum(report[key] for key in report if key.endswith(("_edges", "_vertices"))) == 0
+    assert report["intersecting_faces"] == 0
+    # vertices stay close to the surface
+    assert np.allclose(np.linalg.norm(v_out, axis=1), 0.5, atol=5e-3)
+
+    assert mfix.decimate(target_faces=mfix.n_faces) == 0
+    for kwargs in [{}, {"target_faces": 10, "target_reduction": 0.5}, {"target_reduction": 1}]:
+        with pytest.raises(ValueError):
+            mfix.decimate(**kwargs)
+
+
+def test_decimate_preserves_boundaries() -> None:
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_file(examples.bunny_scan)
+    loops = mfix.boundary_loops()
+    v_in = mfix.return_points()
+
+    mfix.decimate(target_faces=20000)
+    assert 19999 <= mfix.n_faces <= 20000
+    decimated = mfix.boundary_loops()
+    assert np.array_equal(np.sort(decimated["n_edges"]), np.sort(loops["n_edges"]))
+    assert np.allclose(np.sort(decimated["perimeter"]), np.sort(loops["perimeter"]))
+    # boundary vertices are not moved
+    v_out = mfix.return_points()
+    bnd_in = v_in[loops["indices"]]
+    bnd_out = v_out[decimated["indices"]]
+    assert np.array_equal(np.unique(bnd_in, axis=0), np.unique(bnd_out, axis=0))
+
+
+def _canonical_faces(v: np.ndarray, f: np.ndarray, v_ref: np.ndarray) -> np.ndarray:
+    """Return the faces indexing ``v_ref``, rotated and sorted for comparison."""
+    index = np.empty(len(v), np.int64)
+    index[np.lexsort(v.T)] = np.lexsort(v_ref.T)
+    f = index[f]
+    f = np.take_along_axis(f, (np.argmin(f, axis=1)[:, None] + np.arange(3)) % 3, axis=1)
+    return f[np.lexsort(f.T[::-1])]
+
+
+@pytest.mark.parametrize("method", ["morton", "hilbert"])
+def test_reorder(method: str) -> None:
+    sphere = pv.Sphere(theta_resolution=60, phi_resolution=60)
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:]
+    rng = np.random.default_rng(0)
+    perm = rng.permutation(len(v))
+    v_shuffled = v[perm]
+    f_shuffled = np.argsort(perm)[f][rng.permutation(len(f))]
+
+    mfix = _meshfix.PyTMesh()
+    mfix.load_array(v_shuffled, f_shuffled)
+    mfix.reorder(method)
+    v_out, f_out = mfix.return_arrays()
+    assert v_out.shape == v.shape
+    assert f_out.shape == f.shape
+    assert np.array_equal(np.unique(v_out, axis=0), np.unique(v, axis=0))
+    assert np.array_equal(_canonical_faces(v_out, f_out, v), _canonical_faces(v, f, v))
+
+    # points of a face are close in the arrays
+    span_in = np.abs(np.diff(f_shuffled, axis=1)).mean()
+    span_out = np.abs(np.diff(f_out, axis=1)).mean()
+    assert span_out < span_in / 10
+
+    mfix = _meshfix.PyTMesh()
+    mfix.load_array(v_shuffled, f_shuffled)
+    v_exp, f_exp = mfix.return_arrays(reorder=method)
+    assert np.array_equal(v_exp, v_out)
+    assert np.array_equal(f_exp, f_out)
+
+    with pytest.raises(ValueError, match="method"):
+        mfix.reorder("peano")
+    with pytest.raises(ValueError, match="method"):
+        mfix.return_arrays(reorder="peano")
+
+
+def _chunks(v: np.ndarray, f: np.ndarray, n: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Split a mesh in slabs of faces along z, each with its own points."""
+    slab = np.digitize(v[f].mean(axis=1)[:, 2], np.linspace(-0.5, 0.5, n + 1)[1:-1])
+    chunks = []
+    for i in range(n):
+        f_chunk = f[slab == i]
+        used, f_local = np.unique(f_chunk, return_inverse=True)
+        chunks.append((v[used], f_local.reshape(-1, 3).astype(np.int32)))
+    return chunks
+
+
+def test_append_arrays() -> None:
+    sphere = pv.Sphere(theta_resolution=60, phi_resolution=60)
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:]
+    chunks = _chunks(v, f, 4)
+
+    mfix = _meshfix.PyTMesh()
+    n_welded = mfix.append_arrays(*chunks[0])
+    # the mesh cannot be used until it is finalized
+    with pytest.raises(RuntimeError, match="finalize"):
+        mfix.remove_smallest_components()
+    with pytest.raises(RuntimeError, match="finalize"):
+        mfix.clean()
+    with pytest.raises(RuntimeError, match="finalize"):
+        mfix.return_arrays()
+    n_welded += sum(mfix.append_arrays(*chunk) for chunk in chunks[1:])
+    assert n_welded == sum(len(points) for points, _ in chunks) - len(v)
+    with pytest.raises(RuntimeError, match="Cannot load arrays"):
+        mfix.load_array(v, f)
+    mfix.finalize()
+    assert mfix.n_points == len(v)
+    assert mfix.n_faces == len(f)
+    assert mfix.n_boundaries == 0
+
+    v_out, f_out = mfix.return_arrays()
+    assert np.array_equal(_canonical_faces(v_out, f_out, v), _canonical_faces(v, f, v))
+    # origins index the concatenated chunks
+    prov = mfix.return_provenance()
+    v_cat = np.concatenate([points for points, _ in chunks])
+    assert np.array_equal(v_cat[prov["vertex_origin"]], v_out)
+
+    with pytest.raises(RuntimeError, match="finalized"):
+        mfix.append_arrays(*chunks[0])
+    with pytest.raises(RuntimeError, match="No arrays"):
+        mfix.finalize()
+
+
+def test_append_arrays_weld_tol() -> None:
+    sphere = pv.Sphere(theta_resolution=60, phi_resolution=60)
+    v = sphere.points.astype(np.float64)
+    f = sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
+    (v1, f1), (v2, f2) = _chunks(v, f, 2)
+    v2 = v2 + 1e-9
+
+    mfix = _meshfix.PyTMesh()
+    mfix.append_arrays(v1, f1)
+    assert mfix.append_arrays(v2, f2) == 0
+    mfix.finalize()
+    assert mfix.n_boundaries == 2
+
+    mfix = _meshfix.PyTMesh()
+    mfix.append_arrays(v1, f1.astype(np.int64), weld_tol=1e-6)
+    with pytest.raises(ValueError, match="weld_tol"):
+        mfix.append_arrays(v2, f2, weld_tol=-1)
+    with pytest.raises(ValueError, match="Face indices"):
+        mfix.append_arrays(v2, f2 + len(v2))
+    # a failed chunk leaves the mesh unchanged
+    assert mfix.n_points == len(v1)
+    assert mfix.append_arrays(v2, f2, weld_tol=1e-6) > 0
+    mfix.finalize()
+    assert mfix.n_points == len(v)
+    assert mfix.n_boundaries == 0
+
+
+def test_vertex_fans_match_lists() -> None:
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_file(examples.bunny_scan)
+    assert mfix.n_boundaries > 0
+    assert mfix._vertex_fan_mismatches() == 0
+
+    # open fans with different numbers of faces on each side of the first
+    # edge, and a bow tie vertex split into two open fans when loading
+    v = np.array(
+        [
+            [0, 0, 0],
+            [1, 0, 0],
+            [1, 1, 0],
+            [0, 1, 0],
+            [-1, 1, 0],
+            [-1, 0, 0],
+            [-1, -1, 0],
+            [1, -1, 0],
+        ],
+        dtype=np.float64,
+    )
+    fans = [
+        np.array([[0, 1, 2], [0, 2, 3], [0, 3, 4], [0, 4, 5], [0, 5, 6]]),
+        np.array([[0, 5, 6], [0, 4, 5], [0, 3, 4], [0, 2, 3], [0, 1, 2]]),
+        np.array([[0, 1, 2], [0, 2, 3], [0, 4, 5], [0, 5, 6]]),
+        np.array([[0, 1, 2], [0, 4, 5], [0, 6, 7]]),
+    ]
+    for f in fans:
+        mfix = _meshfix.PyTMesh()
+        mfix.set_quiet(True)
+        mfix.load_array(v, f.astype(np.int32))
+        assert mfix._vertex_fan_mismatches() == 0
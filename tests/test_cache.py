@@ -0,0 +1,72 @@
+from pathlib import Path
+import numpy as np
+import pymeshfix
+from pymeshfix import RepairCache, examples
+import pyvista as pv
+
+bunny = pv.PolyData(examples.bunny_scan)
+points = bunny.points.astype(np.float64)
+faces = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+
+
+def test_clean_from_arrays_cached(tmp_path: Path) -> None:
+    cache = RepairCache(tmp_path)
+    v_ref, f_ref = pymeshfix.clean_from_arrays(points, faces)
+
+    v_miss, f_miss = cache.clean_from_arrays(points, faces)
+    assert np.array_equal(v_miss, v_ref)
+    assert np.array_equal(f_miss, f_ref)
+
+    v_hit, f_hit = cache.clean_from_arrays(points, faces)
+    assert isinstance(v_hit, np.memmap)
+    assert np.array_equal(v_hit, v_ref)
+    assert np.array_equal(f_hit, f_ref)
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] > v_ref.nbytes + f_ref.nbytes
+
+    # parameters are part of the key
+    cache.clean_from_arrays(points, faces, remove_smallest_components=False)
+    assert cache.stats()["entries"] == 2
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_cache_eviction(tmp_path: Path) -> None:
+    cache = RepairCache(tmp_path, max_bytes=None)
+    arr_v = np.zeros((100, 3))
+    arr_f = np.zeros((100, 3), np.int32)
+    keys = [cache.key(arr_v + i, arr_f) for i in range(3)]
+    assert len(set(keys)) == 3
+    for key in keys:
+        cache.put(key, arr_v, arr_f)
+    assert cache.stats()["entries"] == 3
+
+    cache.max_bytes = cache.stats()["bytes"] - 1
+    assert cache.evict() == 1
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) is not None
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+def test_meshfix_repair_cached(tmp_path: Path) -> None:
+    cache = RepairCache(tmp_path)
+    mfix = pymeshfix.MeshFix(points, faces)
+    mfix.repair(cache=cache)
+    assert cache.stats()["misses"] == 1
+
+    mfix_cached = pymeshfix.MeshFix(points, faces)
+    mfix_cached.repair(cache=cache)
+    assert cache.stats()["hits"] == 1
+    assert np.allclose(mfix_cached.points, mfix.points)
+
+    # reloading the cached arrays may reorder the faces
+    def canonical(arr):
+        arr = np.sort(arr, axis=1)
+        return arr[np.lexsort(arr.T[::-1])]
+
+    assert np.array_equal(canonical(mfix_cached.faces), canonical(mfix.faces))
@@ -0,0 +1,149 @@
+import json
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+from pymeshfix import RemoteRepairer, _cli, _meshfix, examples
+
+
+def _read_summary(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_cli_directory(tmp_path: Path) -> None:
+    indir = tmp_path / "in"
+    (indir / "sub").mkdir(parents=True)
+    shutil.copy(examples.bunny_scan, indir / "bunny.ply")
+    shutil.copy(examples.bunny_scan, indir / "sub" / "bunny.ply")
+    (indir / "notes.txt").write_text("not a mesh")
+
+    outdir = tmp_path / "out"
+    summary = tmp_path / "summary.jsonl"
+    assert _cli.main([str(indir), "-o", str(outdir), "-j", "1", "-s", str(summary)]) == 0
+
+    records = _read_summary(summary)
+    assert len(records) == 2
+    for record in records:
+        assert record["status"] == "repaired"
+        assert record["n_boundaries_in"]
+        assert record["holes_filled"]
+        assert record["n_boundaries_out"] == 0
+        assert record["time_total"] > 0
+        assert Path(record["output"]).exists()
+    assert (outdir / "sub" / "bunny.ply").exists()
+
+    mfix = _meshfix.PyTMesh()
+    mfix.set_quiet(True)
+    mfix.load_file(str(outdir / "bunny.ply"))
+    assert not mfix.n_boundaries
+
+    # outputs are now up to date and must be skipped
+    summary.unlink()
+    assert _cli.main([str(indir), "-o", str(outdir), "-j", "1", "-s", str(summary)]) == 0
+    assert [record["status"] for record in _read_summary(summary)] == ["skipped"] * 2
+
+
+def test_cli_glob_pool(tmp_path: Path) -> None:
+    for name in ["a.ply", "b.ply"]:
+        shutil.copy(examples.bunny_scan, tmp_path / name)
+    (tmp_path / "bad.ply").write_text("not a mesh")
+
+    outdir = tmp_path / "out"
+    summary = tmp_path / "summary.jsonl"
+    pattern = str(tmp_path / "*.ply")
+    args = [pattern, "-o", str(outdir), "-j", "2", "-s", str(summary), "--format", "off"]
+    assert _cli.main(args) == 1
+
+    records = {Path(record["input"]).name: record for record in _read_summary(summary)}
+    assert records["a.ply"]["status"] == "repaired"
+    assert records["b.ply"]["status"] == "repaired"
+    assert records["bad.ply"]["status"] == "error"
+    assert (outdir / "a.off").exists()
+    assert not list(outdir.glob(".*"))
+
+
+def test_cli_glob_same_names(tmp_path: Path) -> None:
+    for name in ["a", "b"]:
+        (tmp_path / name).mkdir()
+        shutil.copy(examples.bunny_scan, tmp_path / name / "mesh.ply")
+
+    # matches keep their directories relative to the root of the pattern
+    outdir = tmp_path / "out"
+    summary = tmp_path / "summary.jsonl"
+    pattern = str(tmp_path / "*" / "mesh.ply")
+    assert _cli.main([pattern, "-o", str(outdir), "-j", "1", "-s", str(summary)]) == 0
+    assert (outdir / "a" / "mesh.ply").exists()
+    assert (outdir / "b" / "mesh.ply").exists()
+
+    # files are written by name and must not overwrite each other
+    files = [str(tmp_path / name / "mesh.ply") for name in ["a", "b"]]
+    with pytest.raises(SystemExit, match="would both be written"):
+        _cli.main([*files, "-o", str(outdir), "-s", str(summary)])
+
+
+def test_cli_does_not_import_pyvista() -> None:
+    code = (
+        "import sys; from pymeshfix import _cli; "
+        "assert 'pyvista' not in sys.modules and 'vtk' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_cli_module(tmp_path: Path) -> None:
+    shutil.copy(examples.bunny_scan, tmp_path / "bunny.ply")
+    outdir = tmp_path / "out"
+    result = subprocess.run(
+        [sys.executable, "-m", "pymeshfix", str(tmp_path / "bunny.ply"), "-o", str(outdir)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert json.loads(result.stdout)["status"] == "repaired"
+
+
+def test_cli_pipeline(tmp_path: Path) -> None:
+    shutil.copy(examples.bunny_scan, tmp_path / "bunny.ply")
+    outdir = tmp_path / "out"
+    summary = tmp_path / "summary.jsonl"
+    args = [str(tmp_path / "bunny.ply"), "-o", str(outdir), "-s", str(summary)]
+    assert _cli.main([*args, "-j", "1", "--pipeline", "fast"]) == 0
+
+    (record,) = _read_summary(summary)
+    assert record["status"] == "repaired"
+    assert record["holes_filled"]
+    assert record["n_boundaries_out"] == 0
+
+
+def test_cli_serve(tmp_path: Path) -> None:
+    socket_path = tmp_path / "pymeshfix.sock"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "pymeshfix", "serve", "--socket", str(socket_path), "-j", "1"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while not socket_path.exists():
+            assert process.poll() is None
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+
+        tin = _meshfix.PyTMesh()
+        tin.load_file(examples.bunny_scan)
+        points, faces = tin.return_arrays()
+        with RemoteRepairer(socket_path) as repairer:
+            v_out, f_out = repairer.clean_from_arrays(points, faces)
+        v_ref, f_ref = _meshfix.clean_from_arrays(points, faces)
+        assert np.array_equal(v_out, v_ref)
+        assert np.array_equal(f_out, f_ref)
+    finally:
+        process.terminate()
+        stdout, _ = process.communicate(timeout=60)
+
+    assert process.returncode == 0
+    assert json.loads(stdout)["jobs"] == 1
+    assert not socket_path.exists()
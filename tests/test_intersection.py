@@ -0,0 +1,112 @@
+import numpy as np
+import pymeshfix
+from pymeshfix import MeshFix, MeshIndex, PyTMesh
+import pytest
+import pyvista as pv
+
+
+def sphere_arrays(center, radius=1.0):
+    sphere = pv.Sphere(radius=radius, center=center, theta_resolution=40, phi_resolution=40)
+    return sphere.points.astype(np.float64), sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+
+
+def test_intersect_matches_self_intersections() -> None:
+    points_a, faces_a = sphere_arrays((0, 0, 0))
+    points_b, faces_b = sphere_arrays((1.2, 0.1, 0.05), 0.8)
+    pairs = pymeshfix.intersect((points_a, faces_a), (points_b, faces_b))
+    assert pairs.dtype == np.int64
+    assert pairs.shape[1] == 2
+    assert len(pairs)
+    assert np.array_equal(pairs, np.unique(pairs, axis=0))
+
+    # the faces of both spheres merged in one mesh intersect each other
+    tin = PyTMesh()
+    tin.set_quiet(True)
+    tin.load_array(np.vstack((points_a, points_b)), np.vstack((faces_a, faces_b + len(points_a))))
+    selected = tin.select_intersecting_triangles()
+    selected = np.sort(tin.return_provenance()["face_origin"][selected.ravel()[: len(selected)]])
+    found = np.union1d(np.unique(pairs[:, 0]), np.unique(pairs[:, 1]) + len(faces_a))
+    assert np.array_equal(found, selected)
+
+    assert pymeshfix.meshes_intersect((points_a, faces_a), (points_b, faces_b))
+
+
+def test_disjoint_and_nested() -> None:
+    outer = MeshIndex(*sphere_arrays((0, 0, 0)))
+    inner = MeshIndex(*sphere_arrays((0, 0, 0), 0.5))
+    apart = MeshIndex(*sphere_arrays((3, 0, 0)))
+    for other in (inner, apart):
+        assert pymeshfix.intersect(outer, other).shape == (0, 2)
+        assert not pymeshfix.meshes_intersect(outer, other)
+
+
+def test_reuse_index() -> None:
+    points, faces = sphere_arrays((0, 0, 0))
+    index = MeshIndex(points, faces, tris_per_cell=8)
+    assert index.n_faces == len(faces)
+    assert index.n_cells > 1
+
+    mfix = MeshFix(*sphere_arrays((1, 0, 0)))
+    ref = pymeshfix.intersect(index, mfix)
+    for x in np.linspace(-2.5, 2.5, 6):
+        other = sphere_arrays((x, 0, 0))
+        pairs = index.intersect(MeshIndex(*other))
+        swapped = pymeshfix.intersect(other, (points, faces))[:, ::-1]
+        assert np.array_equal(pairs, swapped[np.lexsort((swapped[:, 1], swapped[:, 0]))])
+        assert index.intersects(MeshIndex(*other)) == bool(len(pairs))
+    assert np.array_equal(ref, pymeshfix.intersect(index, (mfix.points, mfix.faces)))
+
+
+def test_invalid_input() -> None:
+    points, faces = sphere_arrays((0, 0, 0))
+    with pytest.raises(ValueError, match="within the point array"):
+        MeshIndex(points, faces + 1)
+    with pytest.raises(ValueError, match="tris_per_cell"):
+        MeshIndex(points, faces, tris_per_cell=0)
+    with pytest.raises(TypeError, match="Expected a MeshIndex"):
+        pymeshfix.intersect(points, (points, faces))
+
+
+def test_contains() -> None:
+    points, faces = sphere_arrays((0, 0, 0))
+    rng = np.random.default_rng(0)
+    query = rng.uniform(-1.5, 1.5, (2000, 3))
+    radius = np.linalg.norm(query, axis=1)
+    # the tessellated sphere lies between these radii
+    query = query[(radius < 0.98) | (radius > 1.0)]
+    expected = np.linalg.norm(query, axis=1) < 0.98
+    # points away from the decimated surface
+    radius_ok = np.abs(np.linalg.norm(query, axis=1) - 0.99) > 0.1
+
+    index = MeshIndex(points, faces)
+    inside = index.contains(query)
+    assert inside.dtype == bool
+    assert np.array_equal(inside, expected)
+    # the orientation of the faces does not matter
+    assert np.array_equal(MeshIndex(points, faces[:, ::-1]).contains(query), expected)
+    mfix = MeshFix(points, faces)
+    assert np.array_equal(mfix.contains(query, n_workers=3), expected)
+
+    # the index is kept until the mesh is modified
+    index = mfix._index
+    assert np.array_equal(mfix.contains(query), expected)
+    assert mfix._index is index
+    mfix.contains(query, tris_per_cell=50)
+    assert mfix._index is not index
+    mfix.decimate(target_reduction=0.5)
+    assert mfix._index is None
+    assert np.array_equal(mfix.contains(query[radius_ok]), expected[radius_ok])
+
+
+def test_contains_through_vertices() -> None:
+    # rays through the vertices and edges of a triangulated cube
+    cube = pv.Cube().triangulate()
+    points = cube.points.astype(np.float64)
+    faces = cube.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
+    grid = np.stack(np.meshgrid(*3 * [np.linspace(-1, 1, 9)], indexing="ij"), -1).reshape(-1, 3)
+    grid = grid[np.abs(grid).max(axis=1) != 0.5]
+    inside = MeshIndex(points, faces).contains(grid)
+    assert np.array_equal(inside, np.abs(grid).max(axis=1) < 0.5)
+
+    with pytest.raises(ValueError, match="shape"):
+        MeshIndex(points, faces).contains(grid[:, :2])
@@ -0,0 +1,137 @@
+import threading
+import numpy as np
+import pymeshfix
+from pymeshfix import MeshFix, RepairPipeline, examples
+import pytest
+import pyvista as pv
+
+bunny = pv.PolyData(examples.bunny_scan)
+points = bunny.points.astype(np.float64)
+faces = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+
+
+def test_default_preset_matches_clean_from_arrays() -> None:
+    v_ref, f_ref = pymeshfix.clean_from_arrays(points, faces)
+
+    mfix = MeshFix(points, faces)
+    report = RepairPipeline.from_preset("default").run(mfix)
+    assert [stage["stage"] for stage in report] == ["remove_components", "fill_holes", "clean"]
+    assert report[1]["result"] > 0
+    assert report[2]["result"] is True
+    assert not any(stage["timed_out"] for stage in report)
+
+    v, f = mfix.to_arrays()
+    assert np.allclose(v, v_ref)
+    assert np.array_equal(f, f_ref)
+
+
+def test_presets() -> None:
+    for name in ["fast", "thorough"]:
+        mfix = MeshFix(points, faces)
+        mfix.repair(pipeline=name)
+        assert mfix.n_boundaries == 0
+        assert mfix.faces.shape[0] > faces.shape[0]
+
+    with pytest.raises(ValueError, match="Unknown preset"):
+        RepairPipeline.from_preset("slow")
+
+
+def test_invalid_stages() -> None:
+    mfix = MeshFix(points, faces)
+    n_faces = mfix.faces.shape[0]
+    with pytest.raises(ValueError, match="Unknown repair stage 'smooth'"):
+        RepairPipeline([{"stage": "fill_holes"}, {"stage": "smooth"}]).run(mfix)
+    with pytest.raises(ValueError, match="Invalid parameter 'refine'"):
+        RepairPipeline([{"stage": "clean", "refine": False}]).run(mfix)
+    with pytest.raises(ValueError, match="requires a 'stage' name"):
+        RepairPipeline([{"max_iters": 1}]).run(mfix)
+
+    # stages are validated before any of them runs
+    assert mfix.faces.shape[0] == n_faces
+
+
+def test_auto_tris_per_cell() -> None:
+    mfix = MeshFix(points, faces)
+    report = RepairPipeline(
+        [{"stage": "fill_holes"}, {"stage": "clean", "tris_per_cell": "auto"}]
+    ).run(mfix)
+    assert report[1]["result"] is True
+
+    with pytest.raises(ValueError, match="tris_per_cell"):
+        RepairPipeline([{"stage": "intersection_removal", "tris_per_cell": -1}]).run(mfix)
+
+
+def test_time_limit() -> None:
+    mfix = MeshFix(points, faces)
+    report = RepairPipeline(
+        [
+            {"stage": "fill_holes", "n_edges": 10, "refine": False},
+            {"stage": "clean", "max_iters": 5, "time_limit": 1e-9},
+        ]
+    ).run(mfix)
+    assert report[0]["result"] > 0
+    assert report[0]["timed_out"] is False
+    # the first iteration always runs
+    assert report[1]["timed_out"] or report[1]["result"]
+
+
+def test_threads() -> None:
+    pipeline = RepairPipeline.from_preset("fast")
+    meshes = [MeshFix(points, faces) for _ in range(4)]
+    threads = [threading.Thread(target=pipeline.run, args=(mfix,)) for mfix in meshes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    f_ref = meshes[0].faces
+    for mfix in meshes[1:]:
+        assert np.array_equal(mfix.faces, f_ref)
+
+
+def test_threads_quiet(capfd: pytest.CaptureFixture) -> None:
+    pipeline = RepairPipeline.from_preset("fast")
+    quiet = MeshFix(points, faces)
+    verbose = MeshFix(points, faces, verbose=True)
+    capfd.readouterr()
+
+    # the quiet state belongs to the mesh, not to the thread or the last mesh
+    thread = threading.Thread(target=pipeline.run, args=(quiet,))
+    thread.start()
+    thread.join()
+    assert capfd.readouterr() == ("", "")
+
+    threads = [threading.Thread(target=pipeline.run, args=(mfix,)) for mfix in (quiet, verbose)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    out, err = capfd.readouterr()
+    assert out or err
+
+
+def test_decimate_stage() -> None:
+    mfix = MeshFix(points, faces)
+    report = RepairPipeline(
+        [{"stage": "decimate", "target_reduction": 0.5}, *RepairPipeline.from_preset("fast").stages]
+    ).run(mfix)
+    assert report[0]["result"] >= len(faces) // 2 - 1
+    assert mfix.n_boundaries == 0
+
+    with pytest.raises(ValueError, match="Exactly one"):
+        RepairPipeline([{"stage": "decimate"}]).run(mfix)
+
+
+def test_reorder_stage() -> None:
+    v_ref, f_ref = pymeshfix.clean_from_arrays(points, faces)
+    mfix = MeshFix(points, faces)
+    report = RepairPipeline(
+        [{"stage": "reorder", "method": "hilbert"}, *RepairPipeline.from_preset("default").stages]
+    ).run(mfix)
+    assert report[0]["stage"] == "reorder"
+    assert mfix.points.shape == v_ref.shape
+    assert mfix.faces.shape == f_ref.shape
+    assert mfix.n_boundaries == 0
+
+    with pytest.raises(ValueError, match="method"):
+        RepairPipeline([{"stage": "reorder", "method": "peano"}]).run(mfix)
@@ -2,6 +2,7 @@ from pathlib import Path
 import numpy as np
 import pytest
 import pymeshfix
+from pymeshfix import _meshfix
 from pymeshfix.examples import bunny_scan
 from pymeshfix.meshfix import InvalidMeshFixInputError
 import pyvista as pv
@@ -29,6 +30,38 @@ def test_repair_vtk() -> None:
     assert pdata.n_points == 0
 
 
+def test_repair_skip_if_clean(monkeypatch: pytest.MonkeyPatch) -> None:
+    checked = []
+    check = _meshfix.is_clean
+
+    def is_clean(points, faces, single_component=False):
+        checked.append(faces)
+        return check(points, faces, single_component)
+
+    monkeypatch.setattr(_meshfix, "is_clean", is_clean)
+    sphere = pv.Sphere()
+    mfix = pymeshfix.MeshFix(sphere)
+    points, faces = mfix.points, mfix.faces
+    mfix.repair(skip_if_clean=True)
+    assert np.array_equal(mfix.points, points)
+    assert np.array_equal(mfix.faces, faces)
+    # the loaded arrays are checked without exporting the mesh
+    assert checked[-1] is mfix._loaded[1]
+
+    mfix = pymeshfix.MeshFix(pv.PolyData(bunny_scan))
+    mfix.repair(skip_if_clean=True)
+    assert not mfix.n_boundaries
+
+    # a mesh modified since it was loaded is exported to be checked
+    mfix = pymeshfix.MeshFix(points, faces[1:])
+    mfix.fill_holes()
+    points, faces = mfix.points, mfix.faces
+    mfix.repair(skip_if_clean=True)
+    assert len(checked[-1]) == len(faces)
+    assert np.array_equal(mfix.points, points)
+    assert np.array_equal(mfix.faces, faces)
+
+
 def test_repair_incremental() -> None:
     meshin = pv.PolyData(bunny_scan)
     mfix = pymeshfix.MeshFix(meshin, verbose=False)
@@ -39,6 +72,16 @@ def test_repair_incremental() -> None:
     assert not mfix.n_boundaries
 
 
+def test_extract_holes() -> None:
+    mfix = pymeshfix.MeshFix(pv.PolyData(bunny_scan))
+    holes = mfix.extract_holes()
+    assert holes.n_lines == mfix.n_boundaries
+    boundary = mfix.mesh.extract_feature_edges(
+        boundary_edges=True, feature_edges=False, manifold_edges=False
+    )
+    assert sum(cell.n_points - 1 for cell in holes.cell) == boundary.n_cells
+
+
 def test_from_filename() -> None:
     mfix = pymeshfix.MeshFix(bunny_scan)
     assert mfix.points.shape[0]
@@ -59,3 +102,134 @@ def test_from_arrays() -> None:
     mfix = pymeshfix.MeshFix(meshin.points, f)
     assert mfix.points.shape[0]
     assert mfix.faces.shape[0]
+
+    with pytest.raises(MemoryError):
+        pymeshfix.MeshFix(meshin.points, f, memory_limit=1_000_000)
+
+
+def test_clean_region() -> None:
+    meshin = pv.PolyData(bunny_scan)
+    mfix = pymeshfix.MeshFix(meshin)
+    assert mfix.changed_faces is None
+
+    xmin, xmax, ymin, ymax, zmin, zmax = meshin.bounds
+    bounds = (xmin, (xmin + xmax) / 2, ymin, ymax, zmin, zmax)
+    n_filled = mfix.fill_holes(bounds=bounds)
+    assert n_filled
+    assert mfix.changed_faces.size
+    assert mfix.patch_sizes is None
+
+    n_filled = mfix.fill_holes(max_new_triangles=100)
+    assert mfix.patch_sizes.size == n_filled
+    assert mfix.changed_faces is None
+
+    assert mfix.clean(bounds=bounds)
+    changed = mfix.changed_faces
+    assert changed.size
+    assert changed.max() < mfix.faces.shape[0]
+
+    mfix.clean()
+    assert mfix.changed_faces is None
+
+    with pytest.raises(ValueError, match="face_mask"):
+        mfix.clean(face_mask=np.ones(3, dtype=bool))
+
+
+def test_deviation() -> None:
+    sphere = pv.Sphere(theta_resolution=30, phi_resolution=30)
+    points = sphere.points.astype(np.float64)
+    faces = sphere.faces.reshape(-1, 4)[:, 1:]
+    mfix = pymeshfix.MeshFix(points * 1.1, faces)
+
+    report = mfix.deviation(points, faces)
+    assert not report["exceeded"]
+    ref = np.abs(pv.PolyData(mfix.points).compute_implicit_distance(sphere)["implicit_distance"])
+    assert np.allclose(report["distances"], ref)
+    ref = np.abs(pv.PolyData(points).compute_implicit_distance(mfix.mesh)["implicit_distance"])
+    assert np.allclose(report["original_distances"], ref)
+    assert report["hausdorff"] == pytest.approx(
+        max(report["distances"].max(), report["original_distances"].max())
+    )
+
+    # points sampled within the faces are closer to the inner sphere
+    sampled = mfix.deviation(points, faces, symmetric=False, sample_spacing=0.01)
+    assert sampled["original_distances"] is None
+    assert np.array_equal(sampled["distances"], report["distances"])
+    assert sampled["hausdorff"] == pytest.approx(report["distances"].max())
+    assert sampled["mean"] < report["distances"].mean()
+
+    stopped = mfix.deviation(points, faces, tolerance=report["hausdorff"] / 2)
+    assert stopped["exceeded"]
+    assert np.isnan(stopped["original_distances"]).all()
+
+    assert mfix.deviation(mfix.points, mfix.faces)["hausdorff"] == 0
+
+    with pytest.raises(ValueError, match="sample_spacing"):
+        mfix.deviation(points, faces, sample_spacing=-1)
+
+
+def canonical_faces(points, faces):
+    """Return the vertex coordinates of each face in a canonical order."""
+    rank = np.empty(len(points), dtype=np.int64)
+    rank[np.lexsort(points.T[::-1])] = np.arange(len(points))
+    first = rank[faces].argmin(axis=1)
+    tris = points[faces]
+    tris = np.stack([tris[np.arange(len(tris)), (first + k) % 3] for k in range(3)], axis=1)
+    tris = tris.reshape(len(tris), -1)
+    return tris[np.lexsort(tris.T[::-1])]
+
+
+def back_approximate(points):
+    """Round the points to single precision with 6 decimals, as the repair does."""
+    decimals = np.char.mod("%f", points.astype(np.float32).astype(np.float64))
+    return decimals.astype(np.float32).astype(np.float64)
+
+
+def apply_delta(points, faces, delta):
+    removed, new_points, new_faces = delta
+    return np.vstack((points, new_points)), np.vstack(
+        (np.delete(faces, removed, axis=0), new_faces)
+    )
+
+
+def test_delta() -> None:
+    meshin = pv.PolyData(bunny_scan)
+    points = meshin.points.astype(np.float64)
+    faces = meshin.faces.reshape(-1, 4)[:, 1:]
+    mfix = pymeshfix.MeshFix(points, faces)
+
+    # filling holes only adds faces, besides splitting the non-manifold
+    # vertices when loading
+    xmin, xmax, ymin, ymax, zmin, zmax = meshin.bounds
+    mfix.fill_holes(bounds=(xmin, (xmin + xmax) / 2, ymin, ymax, zmin, zmax))
+    delta = mfix.delta()
+    assert delta[0].size < faces.shape[0] / 100
+    assert delta[2].shape[0] < mfix.faces.shape[0] / 20
+    expected = canonical_faces(mfix.points, mfix.faces)
+    assert np.array_equal(canonical_faces(*apply_delta(points, faces, delta)), expected)
+
+    # the vertices only rounded by the repair keep their input coordinates
+    v, f = pymeshfix.clean_from_arrays(points, faces)
+    delta = pymeshfix.clean_from_arrays(points, faces, delta=True)
+    assert delta[0].size < faces.shape[0] / 100
+    assert delta[2].shape[0] < f.shape[0] / 20
+    patched_points, patched_faces = apply_delta(points, faces, delta)
+    assert np.array_equal(
+        canonical_faces(back_approximate(patched_points), patched_faces),
+        canonical_faces(back_approximate(v), f),
+    )
+
+    with pytest.raises(ValueError, match="provenance"):
+        pymeshfix.clean_from_arrays(points, faces, delta=True, provenance=True)
+
+
+def test_repair_decimate() -> None:
+    mfix = pymeshfix.MeshFix(pv.PolyData(bunny_scan))
+    n_faces = mfix.faces.shape[0]
+    mfix.repair(decimate_before=0.5, decimate_after=20000)
+    assert 19999 <= mfix.faces.shape[0] <= 20000
+    assert mfix.n_boundaries == 0
+
+    mfix = pymeshfix.MeshFix(pv.PolyData(bunny_scan))
+    n_removed = mfix.decimate(target_faces=n_faces // 2)
+    assert n_faces - n_faces // 2 <= n_removed <= n_faces - n_faces // 2 + 1
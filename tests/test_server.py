@@ -0,0 +1,137 @@
+from collections.abc import Iterator
+import os
+from pathlib import Path
+import socket
+import threading
+
+import numpy as np
+import pymeshfix
+from pymeshfix import RemoteRepairer, examples
+from pymeshfix.server import RepairServer, _write_out
+import pytest
+import pyvista as pv
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Requires Unix domain sockets"
+)
+
+bunny = pv.PolyData(examples.bunny_scan)
+points = bunny.points.astype(np.float64)
+faces = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+
+
+def _leaked_blocks() -> list[str]:
+    if not os.path.isdir("/dev/shm"):
+        return []
+    return [name for name in os.listdir("/dev/shm") if name.startswith("pmf_")]
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Iterator[Path]:
+    yield tmp_path / "pymeshfix.sock"
+    assert not _leaked_blocks()
+
+
+def _serve(server: RepairServer) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_remote_clean_from_arrays(socket_path: Path) -> None:
+    with RepairServer(socket_path, workers=2) as server:
+        thread = _serve(server)
+        with RemoteRepairer(socket_path) as repairer:
+            v_ref, f_ref = pymeshfix.clean_from_arrays(points, faces)
+            v_out, f_out = repairer.clean_from_arrays(points, faces)
+            assert np.array_equal(v_out, v_ref)
+            assert np.array_equal(f_out, f_ref)
+            assert f_out.dtype == np.int32
+
+            _, f_out = repairer.clean_from_arrays(points, faces, int64=True)
+            assert f_out.dtype == np.int64
+
+            _, _, prov_ref = pymeshfix.clean_from_arrays(points, faces, provenance=True)
+            _, _, prov = repairer.clean_from_arrays(points, faces, provenance=True)
+            assert prov.keys() == prov_ref.keys()
+            for key, arr in prov_ref.items():
+                assert np.array_equal(prov[key], arr)
+
+            delta_ref = pymeshfix.clean_from_arrays(points, faces, delta=True)
+            delta = repairer.clean_from_arrays(points, faces, delta=True)
+            for arr, ref in zip(delta, delta_ref):
+                assert np.array_equal(arr, ref)
+
+            # the faces of an unchanged mesh keep their type
+            sphere = pv.Sphere()
+            v = sphere.points.astype(np.float64)
+            f = sphere.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
+            v_out, f_out = repairer.clean_from_arrays(v, f, skip_if_clean=True)
+            assert np.array_equal(v_out, v)
+            assert f_out.dtype == np.int64
+            assert np.array_equal(f_out, f)
+
+            buffers = []
+
+            def out(n_points: int, n_faces: int) -> tuple[np.ndarray, np.ndarray]:
+                buffers.extend([np.empty((n_points, 3)), np.empty((n_faces, 3), np.int32)])
+                return tuple(buffers)
+
+            v_out, f_out = repairer.clean_from_arrays(points, faces, out=out)
+            assert v_out is buffers[0]
+            assert f_out is buffers[1]
+            assert np.array_equal(v_out, v_ref)
+            assert np.array_equal(f_out, f_ref)
+
+            # errors of a job are raised by the client
+            with pytest.raises(ValueError, match="provenance"):
+                repairer.clean_from_arrays(points, faces, provenance=True, delta=True)
+            with pytest.raises(MemoryError):
+                repairer.clean_from_arrays(points, faces, memory_limit=1000)
+
+            metrics = repairer.metrics()
+        server.shutdown()
+        thread.join()
+
+    assert metrics["workers"] == 2
+    assert metrics["jobs"] == 8
+    assert metrics["errors"] == 2
+    assert metrics["throughput"] > 0
+    assert 0 < metrics["latency_p50"] <= metrics["latency_max"]
+    assert not socket_path.exists()
+
+
+def test_server_timeout_and_recycling(socket_path: Path) -> None:
+    with RepairServer(socket_path, workers=1, max_jobs=2) as server:
+        thread = _serve(server)
+        repairer = RemoteRepairer(socket_path)
+        for _ in range(3):
+            repairer.clean_from_arrays(points, faces)
+
+        with pytest.raises(TimeoutError):
+            RemoteRepairer(socket_path, timeout=1e-3).clean_from_arrays(points, faces)
+        # the killed worker is replaced
+        v_out, _ = repairer.clean_from_arrays(points, faces)
+        assert len(v_out)
+
+        metrics = repairer.metrics()
+        assert metrics["timeouts"] == 1
+        assert metrics["recycled"] == 2
+        repairer.close()
+        server.shutdown()
+        thread.join()
+
+    # a second server cannot listen on the socket of a running one
+    with RepairServer(socket_path, workers=1):
+        with pytest.raises(OSError, match="already listening"):
+            RepairServer(socket_path, workers=1)
+
+
+def test_write_out_overflow() -> None:
+    # faces returned as int64 do not fit an int32 out buffer past 2**31 points
+    faces64 = np.array([[0, 1, 2**31]], dtype=np.int64)
+    out_faces = np.empty((1, 3), dtype=np.int32)
+    with pytest.raises(OverflowError, match="int32 face indices"):
+        _write_out(out_faces, faces64, "out_faces", (np.int32, np.int64))
+    _write_out(out_faces, faces64 - 2, "out_faces", (np.int32, np.int64))
+    assert np.array_equal(out_faces, faces64 - 2)
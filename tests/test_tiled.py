@@ -0,0 +1,64 @@
+from pathlib import Path
+import numpy as np
+from pymeshfix import PyTMesh, examples, tiled_repair
+import pytest
+import pyvista as pv
+
+bunny = pv.PolyData(examples.bunny_scan)
+points = bunny.points.astype(np.float64)
+faces = bunny.faces.reshape(-1, 4)[:, 1:].astype(np.int32)
+size = np.ptp(points, axis=0).max()
+
+
+def _is_repaired(v, f) -> bool:
+    tin = PyTMesh()
+    tin.set_quiet(True)
+    tin.load_array(v, f)
+    return tin.n_boundaries == 0 and not tin.select_intersecting_triangles().any()
+
+
+def test_single_tile() -> None:
+    v, f = tiled_repair(points, faces, tile_size=size * 1.01)
+    assert f.dtype == np.int32
+    assert f.shape[0] > faces.shape[0]
+    assert v.max() <= points.max()
+    assert _is_repaired(v, f)
+
+
+def test_seams(tmp_path: Path) -> None:
+    # holes and intersections crossing the seams are repaired once
+    tile_size = size / 2 * 1.01
+    v, f = tiled_repair(points, faces, tile_size, overlap=tile_size / 2, n_workers=1)
+    assert _is_repaired(v, f)
+
+    np.save(tmp_path / "points.npy", points)
+    np.save(tmp_path / "faces.npy", faces)
+    v_out, f_out = tiled_repair(
+        tmp_path / "points.npy",
+        tmp_path / "faces.npy",
+        tile_size,
+        overlap=tile_size / 2,
+        n_workers=2,
+        out=tmp_path / "repaired",
+        tmp_dir=tmp_path,
+    )
+    assert isinstance(v_out, np.memmap)
+    assert np.array_equal(np.load(tmp_path / "repaired" / "points.npy"), v)
+    assert np.array_equal(np.load(tmp_path / "repaired" / "faces.npy"), f)
+    assert np.array_equal(f_out, f)
+
+    # the intermediate files are removed
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "faces.npy",
+        "points.npy",
+        "repaired",
+    ]
+
+
+def test_invalid_parameters() -> None:
+    with pytest.raises(ValueError, match="tile_size"):
+        tiled_repair(points, faces, 0.0)
+    with pytest.raises(ValueError, match="overlap"):
+        tiled_repair(points, faces, 1.0, overlap=0.6)
+    with pytest.raises(ValueError, match=r"faces must be shaped \(n, 3\)"):
+        tiled_repair(points, faces[:, :2], 1.0)